@@ -0,0 +1,68 @@
+"""analysis jobs queue
+
+Revision ID: 20261017_01
+Revises: 20241107_01
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_01"
+down_revision = "20241107_01"
+branch_labels = None
+depends_on = None
+
+
+job_status_enum = sa.Enum(
+    "queued",
+    "running",
+    "completed",
+    "failed",
+    name="job_status",
+    native_enum=False,
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    job_status_enum.create(bind, checkfirst=True)
+    op.create_table(
+        "analysis_jobs",
+        sa.Column("id", sa.Uuid(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column(
+            "analysis_id",
+            sa.Uuid(as_uuid=True),
+            sa.ForeignKey("project_analyses.id", ondelete="CASCADE"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("payload", sa.JSON(), nullable=False, server_default=None),
+        sa.Column("status", job_status_enum, nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="3"),
+        sa.Column("locked_by", sa.String(length=255), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        "ix_analysis_jobs_status_created_at", "analysis_jobs", ["status", "created_at"]
+    )
+    op.create_index(
+        "ix_analysis_jobs_status_lease_expires_at",
+        "analysis_jobs",
+        ["status", "lease_expires_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_analysis_jobs_status_lease_expires_at", table_name="analysis_jobs")
+    op.drop_index("ix_analysis_jobs_status_created_at", table_name="analysis_jobs")
+    op.drop_table("analysis_jobs")
+    job_status_enum.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,26 @@
+"""stage timings on project analyses
+
+Revision ID: 20261017_02
+Revises: 20261017_01
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_02"
+down_revision = "20261017_01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("project_analyses", sa.Column("stage_timings_ms", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("project_analyses", "stage_timings_ms")
@@ -0,0 +1,35 @@
+"""one image analysis per uploaded image
+
+Revision ID: 20261017_03
+Revises: 20261017_02
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_03"
+down_revision = "20261017_02"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("image_analyses", sa.Column("source_uri", sa.Text(), nullable=True))
+    op.add_column(
+        "image_analyses",
+        sa.Column("position", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "ix_image_analyses_project_id_position", "image_analyses", ["project_id", "position"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_image_analyses_project_id_position", table_name="image_analyses")
+    op.drop_column("image_analyses", "position")
+    op.drop_column("image_analyses", "source_uri")
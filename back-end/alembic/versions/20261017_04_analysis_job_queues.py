@@ -0,0 +1,45 @@
+"""queue column on analysis jobs (interactive or batch)
+
+Revision ID: 20261017_04
+Revises: 20261017_03
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_04"
+down_revision = "20261017_03"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "analysis_jobs",
+        sa.Column(
+            "queue",
+            sa.Enum(
+                "interactive",
+                "batch",
+                name="job_queue",
+                native_enum=False,
+            ),
+            nullable=False,
+            server_default="interactive",
+        ),
+    )
+    op.create_index(
+        "ix_analysis_jobs_queue_status_created_at",
+        "analysis_jobs",
+        ["queue", "status", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_analysis_jobs_queue_status_created_at", table_name="analysis_jobs")
+    op.drop_column("analysis_jobs", "queue")
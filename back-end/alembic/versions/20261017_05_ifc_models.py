@@ -0,0 +1,75 @@
+"""ifc models and elements
+
+Revision ID: 20261017_05
+Revises: 20261017_04
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_05"
+down_revision = "20261017_04"
+branch_labels = None
+depends_on = None
+
+
+ifc_model_status_enum = sa.Enum(
+    "processing",
+    "ready",
+    "error",
+    name="ifc_model_status",
+    native_enum=False,
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    ifc_model_status_enum.create(bind, checkfirst=True)
+    op.create_table(
+        "ifc_models",
+        sa.Column("id", sa.Uuid(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("project_id", sa.String(length=64), nullable=False),
+        sa.Column("source_uri", sa.Text(), nullable=False),
+        sa.Column("status", ifc_model_status_enum, nullable=False),
+        sa.Column("ifc_schema", sa.String(length=32), nullable=True),
+        sa.Column("elements_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        "ix_ifc_models_project_id_created_at", "ifc_models", ["project_id", "created_at"]
+    )
+    op.create_table(
+        "ifc_elements",
+        sa.Column(
+            "model_id",
+            sa.Uuid(as_uuid=True),
+            sa.ForeignKey("ifc_models.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("step_id", sa.BigInteger(), nullable=False, autoincrement=False),
+        sa.Column("ifc_type", sa.String(length=64), nullable=False),
+        sa.Column("global_id", sa.String(length=64), nullable=True),
+        sa.Column("name", sa.Text(), nullable=True),
+        sa.Column("tag", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("model_id", "step_id"),
+    )
+    op.create_index(
+        "ix_ifc_elements_model_id_ifc_type_step_id",
+        "ifc_elements",
+        ["model_id", "ifc_type", "step_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ifc_elements_model_id_ifc_type_step_id", table_name="ifc_elements")
+    op.drop_table("ifc_elements")
+    op.drop_index("ix_ifc_models_project_id_created_at", table_name="ifc_models")
+    op.drop_table("ifc_models")
+    ifc_model_status_enum.drop(op.get_bind(), checkfirst=True)
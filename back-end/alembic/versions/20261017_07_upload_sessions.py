@@ -0,0 +1,53 @@
+"""resumable upload sessions
+
+Revision ID: 20261017_07
+Revises: 20261017_06
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_07"
+down_revision = "20261017_06"
+branch_labels = None
+depends_on = None
+
+
+upload_status_enum = sa.Enum(
+    "open",
+    "completed",
+    name="upload_status",
+    native_enum=False,
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    upload_status_enum.create(bind, checkfirst=True)
+    op.create_table(
+        "upload_sessions",
+        sa.Column("id", sa.Uuid(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("filename", sa.String(length=255), nullable=True),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("offset_bytes", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("checksum", sa.String(length=64), nullable=True),
+        sa.Column("status", upload_status_enum, nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=True),
+        sa.Column("kind", sa.String(length=16), nullable=True),
+        sa.Column("source_uri", sa.Text(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_upload_sessions_expires_at", "upload_sessions", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_upload_sessions_expires_at", table_name="upload_sessions")
+    op.drop_table("upload_sessions")
+    upload_status_enum.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,45 @@
+"""analysis listing indexes
+
+Revision ID: 20261017_08
+Revises: 20261017_07
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "20261017_08"
+down_revision = "20261017_07"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_project_analyses_created_at_id", "project_analyses", ["created_at", "id"]
+    )
+    op.create_index(
+        "ix_project_analyses_status_created_at_id",
+        "project_analyses",
+        ["status", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_project_analyses_project_name_created_at_id",
+        "project_analyses",
+        ["project_name", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_project_analyses_requested_by_created_at_id",
+        "project_analyses",
+        ["requested_by", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_project_analyses_requested_by_created_at_id", table_name="project_analyses")
+    op.drop_index("ix_project_analyses_project_name_created_at_id", table_name="project_analyses")
+    op.drop_index("ix_project_analyses_status_created_at_id", table_name="project_analyses")
+    op.drop_index("ix_project_analyses_created_at_id", table_name="project_analyses")
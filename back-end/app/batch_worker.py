@@ -0,0 +1,193 @@
+"""Processo que executa a fila `batch` pela Batch API (`python -m app.batch_worker`).
+
+Reinspeções sem urgência são agrupadas em um único lote, com custo menor e
+sem consumir o orçamento de taxa das análises interativas.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+from contextlib import suppress
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import Settings, get_settings
+from app.domain.entities import AnalysisJob, JobQueue
+from app.infrastructure import (
+    OpenAIClientManager,
+    OpenAIService,
+    SQLAlchemyAnalysisJobRepository,
+    SQLAlchemyProjectAnalysisRepository,
+    get_file_storage,
+    get_ifc_inventory_service,
+    get_image_preprocessor,
+)
+from app.infrastructure.db.session import SessionFactory, engine
+from app.use_cases import AnalyzeProjectInput, BatchAnalyzeProjectsUseCase
+
+
+logger = logging.getLogger(__name__)
+
+
+class BatchAnalysisWorker:
+    """Reserva jobs da fila `batch`, executa-os em lote e finaliza cada job."""
+
+    def __init__(
+        self,
+        *,
+        ai_service: OpenAIService,
+        settings: Settings | None = None,
+        session_factory: async_sessionmaker[AsyncSession] = SessionFactory,
+    ) -> None:
+        self._settings = settings or get_settings()
+        self._config = self._settings.batch
+        self._session_factory = session_factory
+        self._ai_service = ai_service
+        self._worker_id = f"batch:{socket.gethostname()}:{os.getpid()}"
+        self._stopping = asyncio.Event()
+
+    @property
+    def worker_id(self) -> str:
+        return self._worker_id
+
+    def request_stop(self) -> None:
+        """Encerra após o lote em andamento; jobs não concluídos voltam à fila pelo lease."""
+
+        self._stopping.set()
+
+    async def run(self) -> None:
+        while not self._stopping.is_set():
+            processed = await self.run_once()
+            if processed:
+                continue
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._stopping.wait(), timeout=self._config.idle_interval)
+
+    async def run_once(self) -> int:
+        """Processa um lote com até `max_jobs` jobs; devolve quantos foram reservados."""
+
+        jobs = await self._with_jobs(
+            lambda repo: repo.claim_many(
+                worker_id=self._worker_id,
+                lease_seconds=self._config.lease_seconds,
+                limit=self._config.max_jobs,
+                queue=JobQueue.BATCH,
+            )
+        )
+        if not jobs:
+            return 0
+
+        logger.info("Lote com %s job(s) reservado por %s", len(jobs), self._worker_id)
+        async with self._session_factory() as session:
+            use_case = BatchAnalyzeProjectsUseCase(
+                repository=SQLAlchemyProjectAnalysisRepository(session=session),
+                ai_service=self._ai_service,
+                storage=get_file_storage(),
+            )
+            payloads = [
+                AnalyzeProjectInput.from_job_payload(
+                    job.analysis_id, job.payload, final_attempt=not job.can_retry
+                )
+                for job in jobs
+            ]
+            outcomes = await use_case.execute(payloads, on_poll=self._lease_renewer(jobs))
+
+        errors = {outcome.analysis_id: outcome.error for outcome in outcomes}
+        for job in jobs:
+            error = errors.get(job.analysis_id, "Análise sem resultado no lote")
+            if error is None:
+                await self._with_jobs(
+                    lambda repo, job=job: repo.mark_completed(job.id, worker_id=self._worker_id)
+                )
+            else:
+                await self._with_jobs(
+                    lambda repo, job=job, error=error: repo.mark_failed(
+                        job.id, worker_id=self._worker_id, error=error, retry=job.can_retry
+                    )
+                )
+        return len(jobs)
+
+    def _lease_renewer(self, jobs: list[AnalysisJob]):
+        """Renova os leases enquanto o lote é processado (no máximo a cada 1/3 do lease)."""
+
+        interval = self._config.lease_seconds / 3
+        last_renewal = time.monotonic()
+
+        async def renew() -> None:
+            nonlocal last_renewal
+            if time.monotonic() - last_renewal < interval:
+                return
+            last_renewal = time.monotonic()
+            for job in jobs:
+                try:
+                    await self._with_jobs(
+                        lambda repo, job=job: repo.renew_lease(
+                            job.id,
+                            worker_id=self._worker_id,
+                            lease_seconds=self._config.lease_seconds,
+                        )
+                    )
+                except Exception:  # pragma: no cover - banco indisponível
+                    logger.exception("Falha ao renovar lease do job %s", job.id)
+
+        return renew
+
+    async def _with_jobs(self, operation):
+        async with self._session_factory() as session:
+            return await operation(SQLAlchemyAnalysisJobRepository(session=session))
+
+
+async def _serve(*, once: bool) -> None:
+    settings = get_settings()
+    openai_clients = OpenAIClientManager(settings)
+    openai_clients.start()
+    worker = BatchAnalysisWorker(
+        ai_service=OpenAIService(
+            client=openai_clients.client,
+            settings=settings,
+            image_preprocessor=get_image_preprocessor(),
+            ifc_inventory=get_ifc_inventory_service(),
+        ),
+        settings=settings,
+    )
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with suppress(NotImplementedError):
+            loop.add_signal_handler(sig, worker.request_stop)
+    try:
+        if once:
+            await worker.run_once()
+        else:
+            await worker.run()
+    finally:
+        preprocessor = get_image_preprocessor()
+        if preprocessor is not None:
+            preprocessor.close()
+        ifc_inventory = get_ifc_inventory_service()
+        if ifc_inventory is not None:
+            ifc_inventory.close()
+        get_file_storage().close()
+        await openai_clients.aclose()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Executa análises da fila em lote.")
+    parser.add_argument(
+        "--once", action="store_true", help="processa um único lote e encerra (ex.: cron)"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    asyncio.run(_serve(once=args.once))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 
 from functools import lru_cache
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Literal
 
 from fastapi import Depends
 from pydantic import Field
@@ -23,6 +23,19 @@ class AppSettings(BaseSettings):
     mysql_port: int = Field(default=3306)
     mysql_db: str = Field(default="metro_bim")
     uploads_dir: str = Field(default="storage/uploads")
+    # Limites aplicados durante a gravação dos uploads.
+    upload_max_file_mb: int = Field(default=1024, ge=1)
+    upload_max_request_mb: int = Field(default=2048, ge=1)
+    upload_concurrency: int = Field(default=4, ge=1)
+    # IFC e ifcXML gravados comprimidos com zstd (requer o extra `compression`).
+    upload_compression: bool = Field(default=True)
+    upload_compression_level: int = Field(default=3, ge=1, le=22)
+    # Envios retomáveis (`/uploads`): validade renovada a cada parte e tamanho máximo da parte.
+    upload_session_ttl_hours: float = Field(default=24.0, gt=0)
+    upload_chunk_max_mb: int = Field(default=64, ge=1)
+    # Blobs sem referência e diretórios órfãos só são coletados após a carência.
+    upload_gc_grace_hours: float = Field(default=24.0, gt=0)
+    image_analysis_concurrency: int = Field(default=4, ge=1)
 
     @property
     def database_url(self) -> str:
@@ -46,6 +59,145 @@ class OpenAISettings(BaseSettings):
     model_image: str = Field(default="gpt-4.1-mini")
     model_comparison: str = Field(default="gpt-4.1-mini")
     timeout: int = Field(default=60)
+    max_connections: int = Field(default=50, ge=1)
+    max_keepalive_connections: int = Field(default=20, ge=0)
+    keepalive_expiry: float = Field(default=60.0, ge=0)
+    http2: bool = Field(default=True)
+
+
+class CacheSettings(BaseSettings):
+    """Cache de respostas do OpenAI endereçado por conteúdo."""
+
+    model_config = SettingsConfigDict(env_prefix="CACHE_", env_file=".env", extra="ignore")
+
+    backend: Literal["memory", "sqlite", "none"] = Field(default="sqlite")
+    max_entries: int = Field(default=10000, ge=1)
+    ttl_seconds: float = Field(default=7 * 24 * 3600, gt=0)
+    sqlite_path: str = Field(default="storage/cache/analysis_cache.sqlite3")
+
+
+class ImagePreprocessingSettings(BaseSettings):
+    """Derivados compactos das fotos enviados ao modelo (requer Pillow)."""
+
+    model_config = SettingsConfigDict(env_prefix="IMAGE_", env_file=".env", extra="ignore")
+
+    enabled: bool = Field(default=True)
+    max_edge: int = Field(default=1568, ge=64)
+    format: Literal["jpeg", "webp"] = Field(default="jpeg")
+    quality: int = Field(default=82, ge=1, le=100)
+    # Fotos com lado maior acima do limite também seguem recortadas em blocos (0 desativa).
+    tile_threshold: int = Field(default=0, ge=0)
+    tile_grid: int = Field(default=2, ge=2, le=4)
+    workers: int | None = Field(default=None, ge=1)
+    cache_dir: str = Field(default="storage/cache/derivatives")
+
+
+class IfcSettings(BaseSettings):
+    """Extração do inventário de modelos IFC enviado no prompt BIM."""
+
+    model_config = SettingsConfigDict(env_prefix="IFC_", env_file=".env", extra="ignore")
+
+    enabled: bool = Field(default=True)
+    cache_dir: str = Field(default="storage/cache/ifc")
+    inventory_token_budget: int = Field(default=1500, ge=100)
+    build_index: bool = Field(default=True)
+    workers: int | None = Field(default=None, ge=1)
+    parallel_min_chunk_mb: int = Field(default=32, ge=1)
+    element_insert_chunk: int = Field(default=1000, ge=1, le=5000)
+    # Colunas por elemento (requer NumPy) para agregados no prompt e na API.
+    columns_enabled: bool = Field(default=True)
+    aggregates_token_budget: int = Field(default=600, ge=50)
+    # Índices espaciais mantidos em memória (os mais recentes) por processo.
+    spatial_cache_size: int = Field(default=8, ge=0)
+    # Acima desta fração de elementos alterados, a nova versão é analisada por inteiro.
+    diff_max_changed_ratio: float = Field(default=0.3, gt=0, le=1)
+
+
+class RateLimitSettings(BaseSettings):
+    """Orçamentos por modelo e controle adaptativo de concorrência."""
+
+    model_config = SettingsConfigDict(env_prefix="RATE_LIMIT_", env_file=".env", extra="ignore")
+
+    backend: Literal["memory", "file"] = Field(default="file")
+    coordination_path: str = Field(default="storage/coordination/rate_limits.json")
+    requests_per_minute: int = Field(default=500, ge=1)
+    tokens_per_minute: int = Field(default=200_000, ge=1)
+    model_budgets: dict[str, dict[str, int]] = Field(default_factory=dict)
+    initial_concurrency: int = Field(default=8, ge=1)
+    min_concurrency: int = Field(default=1, ge=1)
+    max_concurrency: int = Field(default=32, ge=1)
+    latency_target_seconds: float = Field(default=45.0, gt=0)
+    default_retry_after: float = Field(default=5.0, ge=0)
+
+
+class ResilienceSettings(BaseSettings):
+    """Retentativas, hedging e circuit breaker das chamadas ao modelo."""
+
+    model_config = SettingsConfigDict(env_prefix="RESILIENCE_", env_file=".env", extra="ignore")
+
+    max_attempts: int = Field(default=3, ge=1)
+    base_delay: float = Field(default=1.0, ge=0)
+    max_delay: float = Field(default=20.0, ge=0)
+    jitter: bool = Field(default=True)
+    hedging_enabled: bool = Field(default=False)
+    hedge_min_samples: int = Field(default=20, ge=1)
+    hedge_min_delay: float = Field(default=2.0, ge=0)
+    breaker_failure_threshold: int = Field(default=5, ge=1)
+    breaker_reset_timeout: float = Field(default=30.0, gt=0)
+
+
+class WorkerSettings(BaseSettings):
+    """Configurações do processo `python -m app.worker`."""
+
+    model_config = SettingsConfigDict(env_prefix="WORKER_", env_file=".env", extra="ignore")
+
+    worker_id: str | None = Field(default=None)
+    concurrency: int = Field(default=2, ge=1)
+    poll_interval: float = Field(default=2.0, gt=0)
+    lease_seconds: int = Field(default=300, ge=10)
+    heartbeat_interval: float = Field(default=60.0, gt=0)
+    max_attempts: int = Field(default=3, ge=1)
+    drain_timeout: float = Field(default=120.0, ge=0)
+    telemetry_dir: str = Field(default="storage/coordination/workers")
+    telemetry_interval: float = Field(default=10.0, gt=0)
+    # Intervalo da coleta de lixo do armazenamento de uploads (0 desativa).
+    storage_gc_interval: float = Field(default=3600.0, ge=0)
+
+
+class BatchSettings(BaseSettings):
+    """Configurações do processo `python -m app.batch_worker` (Batch API)."""
+
+    model_config = SettingsConfigDict(env_prefix="BATCH_", env_file=".env", extra="ignore")
+
+    backend: Literal["openai", "local"] = Field(default="openai")
+    work_dir: str = Field(default="storage/batches")
+    completion_window: Literal["24h"] = Field(default="24h")
+    max_jobs: int = Field(default=200, ge=1)
+    poll_interval: float = Field(default=60.0, gt=0)
+    idle_interval: float = Field(default=300.0, gt=0)
+    lease_seconds: int = Field(default=3600, ge=60)
+
+
+class StorageSettings(BaseSettings):
+    """Onde os blobs enviados ficam guardados (disco local ou object store S3)."""
+
+    model_config = SettingsConfigDict(env_prefix="STORAGE_", env_file=".env", extra="ignore")
+
+    backend: Literal["local", "s3"] = Field(default="local")
+    # Com `s3`, o `APP_UPLOADS_DIR` vira cache local e deve ser o mesmo em todos os nós.
+    s3_endpoint: str | None = Field(default=None)
+    s3_bucket: str | None = Field(default=None)
+    s3_region: str = Field(default="us-east-1")
+    s3_access_key: str | None = Field(default=None)
+    s3_secret_key: str | None = Field(default=None)
+    s3_path_style: bool = Field(default=True)
+    s3_prefix: str = Field(default="")
+    s3_max_connections: int = Field(default=32, ge=1)
+    s3_timeout: float = Field(default=60.0, gt=0)
+    # O S3 exige partes de pelo menos 5 MB (exceto a última).
+    multipart_threshold_mb: int = Field(default=64, ge=5)
+    part_size_mb: int = Field(default=16, ge=5)
+    transfer_concurrency: int = Field(default=8, ge=1)
 
 
 class Settings(BaseSettings):
@@ -55,6 +207,14 @@ class Settings(BaseSettings):
 
     app: AppSettings = Field(default_factory=AppSettings)
     openai: OpenAISettings = Field(default_factory=OpenAISettings)
+    cache: CacheSettings = Field(default_factory=CacheSettings)
+    images: ImagePreprocessingSettings = Field(default_factory=ImagePreprocessingSettings)
+    ifc: IfcSettings = Field(default_factory=IfcSettings)
+    rate_limit: RateLimitSettings = Field(default_factory=RateLimitSettings)
+    resilience: ResilienceSettings = Field(default_factory=ResilienceSettings)
+    worker: WorkerSettings = Field(default_factory=WorkerSettings)
+    batch: BatchSettings = Field(default_factory=BatchSettings)
+    storage: StorageSettings = Field(default_factory=StorageSettings)
 
 
 @lru_cache(maxsize=1)
@@ -1,6 +1,8 @@
 """Definições das entidades centrais do domínio."""
 
 from .analysis import (
+    AnalysisCursor,
+    AnalysisListFilter,
     AnalysisStatus,
     BimAnalysis,
     ComparisonResult,
@@ -8,15 +10,50 @@ from .analysis import (
     ImageAnalysis,
     IssueSeverity,
     ProjectAnalysis,
+    ProjectAnalysisPage,
+    ProjectAnalysisSummary,
+    aggregate_image_analyses,
 )
+from .blob import FileBlob
+from .ifc import (
+    IfcAggregate,
+    IfcElement,
+    IfcElementBox,
+    IfcElementPage,
+    IfcLocation,
+    IfcLocationMatch,
+    IfcModel,
+    IfcModelStatus,
+)
+from .job import AnalysisJob, JobQueue, JobStatus
+from .upload import UploadSession, UploadStatus
 
 __all__ = [
+    "AnalysisCursor",
+    "AnalysisJob",
+    "AnalysisListFilter",
     "AnalysisStatus",
     "BimAnalysis",
     "ComparisonResult",
     "DetectedIssue",
+    "FileBlob",
+    "IfcAggregate",
+    "IfcElement",
+    "IfcElementBox",
+    "IfcElementPage",
+    "IfcLocation",
+    "IfcLocationMatch",
+    "IfcModel",
+    "IfcModelStatus",
     "ImageAnalysis",
     "IssueSeverity",
+    "JobQueue",
+    "JobStatus",
     "ProjectAnalysis",
+    "ProjectAnalysisPage",
+    "ProjectAnalysisSummary",
+    "UploadSession",
+    "UploadStatus",
+    "aggregate_image_analyses",
 ]
 
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional, Sequence
-from uuid import UUID, uuid4
+from pathlib import PurePath
+from typing import Dict, List, Optional, Sequence
+from uuid import NAMESPACE_URL, UUID, uuid4, uuid5
 
 
 class AnalysisStatus(str, Enum):
@@ -84,14 +86,21 @@ class ProjectAnalysis:
     project_name: str = ""
     requested_by: Optional[str] = None
     bim_source_uri: str = ""
+    # Primeira imagem enviada; cada imagem tem a sua em `image_analyses`.
     image_source_uri: str = ""
     status: AnalysisStatus = AnalysisStatus.PENDING
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     bim_analysis: Optional[BimAnalysis] = None
     image_analysis: Optional[ImageAnalysis] = None
+    image_analyses: List[ImageAnalysis] = field(default_factory=list)
     comparison_result: Optional[ComparisonResult] = None
     notes: Optional[str] = None
+    stage_timings_ms: Dict[str, float] = field(default_factory=dict)
+
+    def mark_pending(self) -> None:
+        self.status = AnalysisStatus.PENDING
+        self.updated_at = datetime.now(timezone.utc)
 
     def mark_running(self) -> None:
         self.status = AnalysisStatus.RUNNING
@@ -100,12 +109,13 @@ class ProjectAnalysis:
     def mark_completed(
         self,
         bim_analysis: BimAnalysis,
-        image_analysis: ImageAnalysis,
+        image_analyses: Sequence[ImageAnalysis],
         comparison: ComparisonResult,
     ) -> None:
         self.status = AnalysisStatus.COMPLETED
         self.bim_analysis = bim_analysis
-        self.image_analysis = image_analysis
+        self.image_analyses = list(image_analyses)
+        self.image_analysis = aggregate_image_analyses(self.image_analyses)
         self.comparison_result = comparison
         self.updated_at = datetime.now(timezone.utc)
 
@@ -114,3 +124,95 @@ class ProjectAnalysis:
         self.notes = notes
         self.updated_at = datetime.now(timezone.utc)
 
+
+@dataclass(frozen=True, slots=True)
+class AnalysisCursor:
+    """Posição na listagem (mais recentes primeiro): a última análise já entregue.
+
+    `encode` gera o token opaco devolvido ao cliente e `decode` o lê de volta,
+    com `ValueError` para tokens inválidos.
+    """
+
+    created_at: datetime
+    id: UUID
+
+    def encode(self) -> str:
+        raw = f"{self.created_at.isoformat()}|{self.id}".encode()
+        return urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> AnalysisCursor:
+        try:
+            raw = urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+            created_at, _, analysis_id = raw.partition("|")
+            return cls(created_at=datetime.fromisoformat(created_at), id=UUID(analysis_id))
+        except ValueError as exc:
+            raise ValueError("Cursor inválido") from exc
+
+
+@dataclass(frozen=True, slots=True)
+class AnalysisListFilter:
+    """Filtros da listagem; `created_from` é inclusivo e `created_to`, exclusivo."""
+
+    status: Optional[AnalysisStatus] = None
+    project_name: Optional[str] = None
+    requested_by: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectAnalysisSummary:
+    """Modelo de leitura da listagem: só as colunas da análise, sem as etapas."""
+
+    id: UUID
+    project_name: str
+    status: AnalysisStatus
+    requested_by: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(slots=True)
+class ProjectAnalysisPage:
+    """Página da listagem; `next_cursor` é `None` na última."""
+
+    items: Sequence[ProjectAnalysisSummary]
+    next_cursor: Optional[AnalysisCursor] = None
+
+
+
+def aggregate_image_analyses(analyses: Sequence[ImageAnalysis]) -> Optional[ImageAnalysis]:
+    """Consolida as análises individuais de imagem em uma visão única.
+
+    Apenas imagens concluídas entram no resumo e nas issues; falhas isoladas
+    são contabilizadas no texto do resumo. O id é derivado dos ids das análises
+    individuais, então a visão consolidada mantém o mesmo id a cada leitura.
+    """
+
+    if not analyses:
+        return None
+
+    completed = [item for item in analyses if item.status is AnalysisStatus.COMPLETED]
+    if len(analyses) == 1:
+        return analyses[0]
+
+    segments = [
+        f"[{PurePath(item.image_source_uri).name or index}] {item.summary}"
+        for index, item in enumerate(completed, start=1)
+        if item.summary
+    ]
+    failed = len(analyses) - len(completed)
+    if failed:
+        segments.append(f"{failed} de {len(analyses)} imagem(ns) não puderam ser analisadas.")
+
+    completed_at = [item.completed_at for item in completed if item.completed_at]
+    return ImageAnalysis(
+        id=uuid5(NAMESPACE_URL, "image-analyses:" + ",".join(str(item.id) for item in analyses)),
+        image_source_uri=analyses[0].image_source_uri,
+        status=AnalysisStatus.COMPLETED if completed else AnalysisStatus.FAILED,
+        summary="\n".join(segments) or None,
+        issues=tuple(issue for item in completed for issue in item.issues),
+        created_at=min(item.created_at for item in analyses),
+        completed_at=max(completed_at) if completed_at else None,
+    )
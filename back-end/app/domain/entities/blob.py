@@ -0,0 +1,16 @@
+"""Entidade dos arquivos enviados, armazenados uma única vez pelo conteúdo."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class FileBlob:
+    """Conteúdo identificado pelo sha256, compartilhado por análises e modelos IFC."""
+
+    sha256: str
+    size: int
+    kind: Optional[str] = None
+    ref_count: int = 0
@@ -0,0 +1,107 @@
+"""Entidades dos modelos IFC importados por projeto e de seus elementos."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Mapping, Optional, Sequence
+from uuid import UUID, uuid4
+
+
+class IfcModelStatus(str, Enum):
+    """Estados da importação de um modelo IFC."""
+
+    PROCESSING = "processing"
+    READY = "ready"
+    ERROR = "error"
+
+
+@dataclass(slots=True)
+class IfcModel:
+    """Arquivo IFC enviado para um projeto e o resultado da sua importação."""
+
+    project_id: str
+    source_uri: str
+    id: UUID = field(default_factory=uuid4)
+    status: IfcModelStatus = IfcModelStatus.PROCESSING
+    ifc_schema: Optional[str] = None
+    elements_count: int = 0
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def mark_ready(self, *, ifc_schema: Optional[str], elements_count: int) -> None:
+        self.status = IfcModelStatus.READY
+        self.ifc_schema = ifc_schema
+        self.elements_count = elements_count
+        self.error = None
+        self.updated_at = datetime.now(timezone.utc)
+
+    def mark_failed(self, reason: str) -> None:
+        self.status = IfcModelStatus.ERROR
+        self.error = reason
+        self.updated_at = datetime.now(timezone.utc)
+
+
+@dataclass(frozen=True, slots=True)
+class IfcElement:
+    """Elemento construtivo de um modelo, identificado pelo `#id` do arquivo STEP."""
+
+    model_id: UUID
+    step_id: int
+    ifc_type: str
+    global_id: Optional[str] = None
+    name: Optional[str] = None
+    tag: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class IfcElementPage:
+    """Página de elementos; `next_cursor` é o `step_id` a partir do qual continuar."""
+
+    items: Sequence[IfcElement]
+    next_cursor: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class IfcAggregate:
+    """Linha de um agrupamento de elementos (por tipo, pavimento e/ou espaço)."""
+
+    group: Mapping[str, Optional[str]]
+    count: int
+    total: Optional[float] = None
+    # Elementos do grupo que têm a quantidade somada em `total`.
+    measured: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class IfcElementBox:
+    """Elemento com a caixa envolvente (min x, y, z, max x, y, z) em coordenadas do modelo."""
+
+    step_id: int
+    ifc_type: str
+    bbox: Sequence[float]
+    storey: Optional[str] = None
+    space: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class IfcLocationMatch:
+    """Pavimento ou espaço cujo nome corresponde a uma indicação de local."""
+
+    kind: str
+    step_id: int
+    name: Optional[str]
+    score: float
+
+
+@dataclass(frozen=True, slots=True)
+class IfcLocation:
+    """Resolução de um `location_hint`: locais encontrados e elementos candidatos."""
+
+    hint: str
+    matches: Sequence[IfcLocationMatch]
+    element_ids: Sequence[int]
+    # Candidatos antes do limite aplicado a `element_ids`.
+    total: int = 0
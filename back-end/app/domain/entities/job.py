@@ -0,0 +1,47 @@
+"""Entidades relacionadas à fila de processamento de análises."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Optional
+from uuid import UUID, uuid4
+
+
+class JobStatus(str, Enum):
+    """Estados possíveis de um job na fila."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class JobQueue(str, Enum):
+    """Filas de execução: interativa (worker) ou em lote (batch worker)."""
+
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+
+
+@dataclass(slots=True)
+class AnalysisJob:
+    """Job durável que referencia uma `ProjectAnalysis` pendente."""
+
+    analysis_id: UUID
+    payload: dict[str, Any] = field(default_factory=dict)
+    id: UUID = field(default_factory=uuid4)
+    status: JobStatus = JobStatus.QUEUED
+    queue: JobQueue = JobQueue.INTERACTIVE
+    attempts: int = 0
+    max_attempts: int = 3
+    locked_by: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def can_retry(self) -> bool:
+        return self.attempts < self.max_attempts
@@ -0,0 +1,54 @@
+"""Entidades dos envios retomáveis, recebidos em partes por offset."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+from uuid import UUID, uuid4
+
+
+class UploadStatus(str, Enum):
+    """Estados de um envio retomável."""
+
+    OPEN = "open"
+    COMPLETED = "completed"
+
+
+@dataclass(slots=True)
+class UploadSession:
+    """Arquivo recebido em partes; ao finalizar, vira um blob referenciado pelo `id`."""
+
+    size: int
+    expires_at: datetime
+    filename: Optional[str] = None
+    # sha256 do arquivo inteiro informado pelo cliente, conferido ao finalizar.
+    checksum: Optional[str] = None
+    id: UUID = field(default_factory=uuid4)
+    offset: int = 0
+    status: UploadStatus = UploadStatus.OPEN
+    sha256: Optional[str] = None
+    kind: Optional[str] = None
+    source_uri: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def is_complete(self) -> bool:
+        return self.offset >= self.size
+
+    def is_expired(self, now: datetime | None = None) -> bool:
+        return (now or datetime.now(timezone.utc)) >= self.expires_at
+
+    def advance(self, received: int, *, expires_at: datetime) -> None:
+        self.offset += received
+        self.expires_at = expires_at
+        self.updated_at = datetime.now(timezone.utc)
+
+    def mark_completed(self, *, sha256: str, kind: Optional[str], source_uri: str) -> None:
+        self.status = UploadStatus.COMPLETED
+        self.sha256 = sha256
+        self.kind = kind
+        self.source_uri = source_uri
+        self.updated_at = datetime.now(timezone.utc)
@@ -1,6 +1,15 @@
 """Contratos de repositórios para persistência."""
 
+from .analysis_job import AnalysisJobRepository
+from .file_blob import FileBlobRepository
+from .ifc_model import IfcModelRepository
 from .project_analysis import ProjectAnalysisRepository
+from .upload_session import UploadSessionRepository
 
-__all__ = ["ProjectAnalysisRepository"]
-
+__all__ = [
+    "AnalysisJobRepository",
+    "FileBlobRepository",
+    "IfcModelRepository",
+    "ProjectAnalysisRepository",
+    "UploadSessionRepository",
+]
@@ -0,0 +1,69 @@
+"""Contratos de persistência para a fila de `AnalysisJob`."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Sequence
+from uuid import UUID
+
+from app.domain.entities import AnalysisJob, JobQueue, ProjectAnalysis
+
+
+class AnalysisJobRepository(ABC):
+    """Contrato para enfileirar, reservar e finalizar jobs de análise."""
+
+    @abstractmethod
+    async def enqueue(
+        self, job: AnalysisJob, *, analysis: ProjectAnalysis | None = None
+    ) -> AnalysisJob:
+        """Persiste um novo job na fila.
+
+        Com `analysis`, grava também a análise na mesma transação: uma falha no
+        meio não deixa análise pendente sem job.
+        """
+
+    @abstractmethod
+    async def claim_next(
+        self,
+        *,
+        worker_id: str,
+        lease_seconds: int,
+        queue: JobQueue = JobQueue.INTERACTIVE,
+    ) -> AnalysisJob | None:
+        """Reserva o próximo job disponível (ou com lease expirado) para o worker."""
+
+    @abstractmethod
+    async def claim_many(
+        self,
+        *,
+        worker_id: str,
+        lease_seconds: int,
+        limit: int,
+        queue: JobQueue = JobQueue.BATCH,
+    ) -> Sequence[AnalysisJob]:
+        """Reserva até `limit` jobs da fila de uma só vez (execução em lote)."""
+
+    @abstractmethod
+    async def renew_lease(self, job_id: UUID, *, worker_id: str, lease_seconds: int) -> bool:
+        """Estende o lease de um job ainda reservado pelo worker."""
+
+    @abstractmethod
+    async def mark_completed(self, job_id: UUID, *, worker_id: str) -> None:
+        """Marca o job como concluído."""
+
+    @abstractmethod
+    async def mark_failed(
+        self, job_id: UUID, *, worker_id: str, error: str, retry: bool
+    ) -> None:
+        """Registra falha, devolvendo o job à fila quando `retry` for verdadeiro."""
+
+    @abstractmethod
+    async def release(self, job_id: UUID, *, worker_id: str) -> None:
+        """Devolve à fila um job interrompido sem concluir (ex.: desligamento)."""
+
+    @abstractmethod
+    async def fail_exhausted(self) -> Sequence[UUID]:
+        """Falha jobs com lease expirado e sem tentativas restantes.
+
+        Retorna os identificadores das análises afetadas.
+        """
@@ -0,0 +1,40 @@
+"""Contratos de persistência para as referências aos arquivos armazenados."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Sequence
+
+from app.domain.entities import FileBlob
+
+
+class FileBlobRepository(ABC):
+    """Contagem de referências dos blobs, usada pela coleta de lixo do armazenamento."""
+
+    @abstractmethod
+    async def acquire(self, blobs: Sequence[FileBlob]) -> None:
+        """Registra os blobs (se novos) e soma uma referência por ocorrência."""
+
+    @abstractmethod
+    async def release(self, digests: Sequence[str]) -> None:
+        """Subtrai uma referência por ocorrência, sem passar de zero."""
+
+    @abstractmethod
+    async def claim_unreferenced(
+        self, digests: Sequence[str], *, older_than: datetime
+    ) -> set[str]:
+        """Dentre `digests`, os que podem ser apagados do disco.
+
+        São os sem registro ou sem referências e sem alteração desde `older_than`.
+        Os registros ficam bloqueados até `forget`: apague os arquivos antes dele,
+        para que um envio simultâneo do mesmo conteúdo espere a remoção terminar.
+        """
+
+    @abstractmethod
+    async def forget(self, digests: Sequence[str]) -> None:
+        """Remove os registros de `digests` que continuam sem referências."""
+
+    @abstractmethod
+    async def referenced_directories(self, directories: Sequence[str]) -> set[str]:
+        """Dentre `directories`, os que contêm arquivos de análises não falhas ou modelos IFC."""
@@ -0,0 +1,48 @@
+"""Contratos de persistência para modelos IFC e seus elementos."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Sequence
+from uuid import UUID
+
+from app.domain.entities import IfcElement, IfcElementPage, IfcModel
+
+
+class IfcModelRepository(ABC):
+    """Contrato para modelos IFC e a listagem paginada dos elementos."""
+
+    @abstractmethod
+    async def create(self, model: IfcModel) -> IfcModel:
+        """Registra um modelo recém-enviado."""
+
+    @abstractmethod
+    async def update(self, model: IfcModel) -> IfcModel:
+        """Atualiza estado, esquema e contagem de elementos."""
+
+    @abstractmethod
+    async def get_by_id(self, model_id: UUID) -> IfcModel | None:
+        """Recupera modelo pelo identificador."""
+
+    @abstractmethod
+    async def get_latest_for_project(self, project_id: str) -> IfcModel | None:
+        """Modelo mais recente enviado para o projeto."""
+
+    @abstractmethod
+    async def add_elements(self, elements: Sequence[IfcElement]) -> None:
+        """Insere um lote de elementos (inserções de várias linhas por comando)."""
+
+    @abstractmethod
+    async def delete_elements(self, model_id: UUID) -> None:
+        """Remove os elementos já gravados de um modelo (importação interrompida)."""
+
+    @abstractmethod
+    async def list_elements(
+        self,
+        model_id: UUID,
+        *,
+        ifc_type: str | None = None,
+        after: int | None = None,
+        limit: int = 500,
+    ) -> IfcElementPage:
+        """Página de elementos em ordem de `step_id`, opcionalmente filtrada por tipo."""
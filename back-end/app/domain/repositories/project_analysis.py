@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Sequence
 from uuid import UUID
 
-from app.domain.entities import ProjectAnalysis
+from app.domain.entities import (
+    AnalysisCursor,
+    AnalysisListFilter,
+    ProjectAnalysis,
+    ProjectAnalysisPage,
+)
 
 
 class ProjectAnalysisRepository(ABC):
@@ -25,6 +29,18 @@ class ProjectAnalysisRepository(ABC):
         """Recupera análise pelo identificador."""
 
     @abstractmethod
-    async def list_recent(self, limit: int = 20) -> Sequence[ProjectAnalysis]:
-        """Retorna lista das análises mais recentes."""
+    async def list_recent(
+        self,
+        *,
+        limit: int = 20,
+        filters: AnalysisListFilter | None = None,
+        after: AnalysisCursor | None = None,
+    ) -> ProjectAnalysisPage:
+        """Análises mais recentes primeiro (`created_at`, `id`), a partir de `after`."""
+
+    @abstractmethod
+    async def get_latest_completed(
+        self, project_name: str, *, exclude_id: UUID | None = None
+    ) -> ProjectAnalysis | None:
+        """Última análise concluída do projeto (versão anterior do modelo BIM)."""
 
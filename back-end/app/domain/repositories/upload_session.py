@@ -0,0 +1,34 @@
+"""Contratos de persistência para os envios retomáveis."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Sequence
+from uuid import UUID
+
+from app.domain.entities import UploadSession
+
+
+class UploadSessionRepository(ABC):
+    """Contrato para criar, avançar e expirar envios retomáveis."""
+
+    @abstractmethod
+    async def create(self, session: UploadSession) -> UploadSession:
+        """Registra um novo envio."""
+
+    @abstractmethod
+    async def update(self, session: UploadSession) -> UploadSession:
+        """Atualiza offset, validade e o resultado da finalização."""
+
+    @abstractmethod
+    async def get_by_id(self, session_id: UUID) -> UploadSession | None:
+        """Estado atual do envio, lido do banco (não de cache da sessão)."""
+
+    @abstractmethod
+    async def list_expired(self, now: datetime, *, limit: int = 500) -> Sequence[UploadSession]:
+        """Envios com validade vencida em `now`."""
+
+    @abstractmethod
+    async def delete(self, session_ids: Sequence[UUID]) -> None:
+        """Remove os envios informados."""
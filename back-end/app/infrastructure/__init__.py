@@ -1,20 +1,68 @@
 """Implementações concretas de persistência e serviços externos."""
 
+from .db.repositories.analysis_job import SQLAlchemyAnalysisJobRepository
+from .db.repositories.file_blob import SQLAlchemyFileBlobRepository
+from .db.repositories.ifc_model import SQLAlchemyIfcModelRepository
 from .db.repositories.project_analysis import SQLAlchemyProjectAnalysisRepository
+from .db.repositories.upload_session import SQLAlchemyUploadSessionRepository
 from .services import (
+    AnalysisCache,
+    BatchRequest,
+    BatchResult,
     ExternalServiceError,
+    FileStorage,
     FileStorageError,
+    FileTooLargeError,
+    IfcDiff,
+    IfcEntityIndex,
+    IfcInventory,
+    IfcInventoryService,
+    ImagePreprocessingError,
+    ImagePreprocessor,
+    LocalBatchBackend,
     LocalFileStorage,
+    OpenAIClientManager,
     OpenAIService,
     OpenAIServiceError,
+    UnsupportedFileTypeError,
+    get_analysis_cache,
+    get_file_storage,
+    get_ifc_inventory_service,
+    get_image_preprocessor,
+    get_rate_limiter,
+    get_resilient_caller,
 )
 
 __all__ = [
+    "AnalysisCache",
+    "BatchRequest",
+    "BatchResult",
     "ExternalServiceError",
+    "FileStorage",
     "FileStorageError",
+    "FileTooLargeError",
+    "IfcDiff",
+    "IfcEntityIndex",
+    "IfcInventory",
+    "IfcInventoryService",
+    "ImagePreprocessingError",
+    "ImagePreprocessor",
+    "LocalBatchBackend",
     "LocalFileStorage",
+    "OpenAIClientManager",
     "OpenAIService",
     "OpenAIServiceError",
+    "SQLAlchemyAnalysisJobRepository",
+    "SQLAlchemyFileBlobRepository",
+    "SQLAlchemyIfcModelRepository",
     "SQLAlchemyProjectAnalysisRepository",
+    "SQLAlchemyUploadSessionRepository",
+    "UnsupportedFileTypeError",
+    "get_analysis_cache",
+    "get_file_storage",
+    "get_ifc_inventory_service",
+    "get_image_preprocessor",
+    "get_rate_limiter",
+    "get_resilient_caller",
 ]
 
@@ -2,21 +2,26 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from typing import Sequence
 
 from app.domain.entities import (
-    AnalysisStatus,
+    AnalysisJob,
     BimAnalysis,
     ComparisonResult,
     DetectedIssue,
+    IfcModel,
     ImageAnalysis,
     IssueSeverity,
     ProjectAnalysis,
+    UploadSession,
+    aggregate_image_analyses,
 )
 from app.infrastructure.db import models
 
 
 def project_model_to_domain(model: models.ProjectAnalysisModel) -> ProjectAnalysis:
+    image_analyses = [image_model_to_domain(item) for item in model.image_analyses]
     return ProjectAnalysis(
         id=model.id,
         project_name=model.project_name,
@@ -27,12 +32,14 @@ def project_model_to_domain(model: models.ProjectAnalysisModel) -> ProjectAnalys
         created_at=model.created_at,
         updated_at=model.updated_at,
         bim_analysis=bim_model_to_domain(model.bim_analysis) if model.bim_analysis else None,
-        image_analysis=image_model_to_domain(model.image_analysis) if model.image_analysis else None,
+        image_analysis=aggregate_image_analyses(image_analyses),
+        image_analyses=image_analyses,
         comparison_result=
         comparison_model_to_domain(model.comparison_result)
         if model.comparison_result
         else None,
         notes=model.notes,
+        stage_timings_ms=dict(model.stage_timings_ms or {}),
     )
 
 
@@ -56,7 +63,8 @@ def image_model_to_domain(model: models.ImageAnalysisModel | None) -> ImageAnaly
         return None
     return ImageAnalysis(
         id=model.id,
-        image_source_uri=model.project.image_source_uri if model.project else "",
+        image_source_uri=model.source_uri
+        or (model.project.image_source_uri if model.project else ""),
         status=model.status,
         raw_output=model.raw_output,
         summary=model.summary,
@@ -90,23 +98,33 @@ def update_project_model_from_entity(
     model.image_source_uri = entity.image_source_uri
     model.status = entity.status
     model.notes = entity.notes
+    model.stage_timings_ms = dict(entity.stage_timings_ms) or None
 
+    # Filhos são atribuídos pelo lado do pai: desde o SQLAlchemy 2.0 o cascade
+    # de `save-update` não segue backrefs, então `Model(project=model)` não
+    # seria incluído na sessão.
     if entity.bim_analysis:
-        model.bim_analysis = model.bim_analysis or models.BimAnalysisModel(project=model)
+        if model.bim_analysis is None:
+            model.bim_analysis = models.BimAnalysisModel(id=entity.bim_analysis.id)
         update_bim_model_from_entity(entity.bim_analysis, model.bim_analysis)
     elif model.bim_analysis:
         model.bim_analysis = None
 
-    if entity.image_analysis:
-        model.image_analysis = model.image_analysis or models.ImageAnalysisModel(project=model)
-        update_image_model_from_entity(entity.image_analysis, model.image_analysis)
-    elif model.image_analysis:
-        model.image_analysis = None
+    existing_images = {item.id: item for item in model.image_analyses}
+    image_models: list[models.ImageAnalysisModel] = []
+    for position, image in enumerate(entity.image_analyses):
+        image_model = existing_images.get(image.id) or models.ImageAnalysisModel(id=image.id)
+        update_image_model_from_entity(image, image_model)
+        image_model.position = position
+        image_models.append(image_model)
+    if image_models != list(model.image_analyses):
+        model.image_analyses = image_models
 
     if entity.comparison_result:
-        model.comparison_result = (
-            model.comparison_result or models.ComparisonResultModel(project=model)
-        )
+        if model.comparison_result is None:
+            model.comparison_result = models.ComparisonResultModel(
+                id=entity.comparison_result.id
+            )
         update_comparison_model_from_entity(
             entity.comparison_result, model.comparison_result
         )
@@ -122,7 +140,7 @@ def update_bim_model_from_entity(
     model.compliance_notes = getattr(entity, "compliance_notes", None)
     model.issues = _issues_to_json(entity.issues)
     model.status = entity.status
-    model.created_at = entity.created_at
+    model.created_at = model.created_at or entity.created_at
     model.completed_at = entity.completed_at
 
 
@@ -132,9 +150,10 @@ def update_image_model_from_entity(
     model.summary = entity.summary
     model.raw_output = entity.raw_output
     model.observed_conditions = getattr(entity, "observed_conditions", None)
+    model.source_uri = entity.image_source_uri
     model.issues = _issues_to_json(entity.issues)
     model.status = entity.status
-    model.created_at = entity.created_at
+    model.created_at = model.created_at or entity.created_at
     model.completed_at = entity.completed_at
 
 
@@ -145,7 +164,84 @@ def update_comparison_model_from_entity(
     model.similarity_score = entity.similarity_score
     model.completion_percentage = entity.completion_percentage
     model.mismatches = list(entity.mismatches)
-    model.created_at = entity.created_at
+    model.created_at = model.created_at or entity.created_at
+
+
+def job_model_to_domain(model: models.AnalysisJobModel) -> AnalysisJob:
+    return AnalysisJob(
+        id=model.id,
+        analysis_id=model.analysis_id,
+        payload=dict(model.payload or {}),
+        status=model.status,
+        queue=model.queue,
+        attempts=model.attempts,
+        max_attempts=model.max_attempts,
+        locked_by=model.locked_by,
+        lease_expires_at=model.lease_expires_at,
+        last_error=model.last_error,
+        created_at=model.created_at,
+        updated_at=model.updated_at,
+    )
+
+
+def ifc_model_to_domain(model: models.IfcModelModel) -> IfcModel:
+    return IfcModel(
+        id=model.id,
+        project_id=model.project_id,
+        source_uri=model.source_uri,
+        status=model.status,
+        ifc_schema=model.ifc_schema,
+        elements_count=model.elements_count,
+        error=model.error,
+        created_at=model.created_at,
+        updated_at=model.updated_at,
+    )
+
+
+def update_ifc_model_from_entity(entity: IfcModel, model: models.IfcModelModel) -> None:
+    model.project_id = entity.project_id
+    model.source_uri = entity.source_uri
+    model.status = entity.status
+    model.ifc_schema = entity.ifc_schema
+    model.elements_count = entity.elements_count
+    model.error = entity.error
+
+
+def upload_session_to_domain(model: models.UploadSessionModel) -> UploadSession:
+    return UploadSession(
+        id=model.id,
+        filename=model.filename,
+        size=model.size,
+        offset=model.offset_bytes,
+        checksum=model.checksum,
+        status=model.status,
+        sha256=model.sha256,
+        kind=model.kind,
+        source_uri=model.source_uri,
+        expires_at=_as_utc(model.expires_at),
+        created_at=model.created_at,
+        updated_at=model.updated_at,
+    )
+
+
+def update_upload_session_from_entity(
+    entity: UploadSession, model: models.UploadSessionModel
+) -> None:
+    model.filename = entity.filename
+    model.size = entity.size
+    model.offset_bytes = entity.offset
+    model.checksum = entity.checksum
+    model.status = entity.status
+    model.sha256 = entity.sha256
+    model.kind = entity.kind
+    model.source_uri = entity.source_uri
+    model.expires_at = entity.expires_at
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Bancos sem fuso (SQLite, DATETIME do MySQL) devolvem o horário UTC sem `tzinfo`."""
+
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
 
 
 def _issues_to_json(issues: Sequence[DetectedIssue]) -> list[dict]:
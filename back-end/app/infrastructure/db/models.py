@@ -6,10 +6,29 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, Enum, Float, ForeignKey, JSON, String, Text, Uuid, func
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+    Uuid,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.domain.entities import AnalysisStatus
+from app.domain.entities import (
+    AnalysisStatus,
+    IfcModelStatus,
+    JobQueue,
+    JobStatus,
+    UploadStatus,
+)
 from app.infrastructure.db.base import Base
 
 
@@ -20,9 +39,48 @@ analysis_status_enum = Enum(
     native_enum=False,
 )
 
+job_status_enum = Enum(
+    JobStatus,
+    values_callable=lambda enum: [item.value for item in enum],
+    name="job_status",
+    native_enum=False,
+)
+
+job_queue_enum = Enum(
+    JobQueue,
+    values_callable=lambda enum: [item.value for item in enum],
+    name="job_queue",
+    native_enum=False,
+)
+
+ifc_model_status_enum = Enum(
+    IfcModelStatus,
+    values_callable=lambda enum: [item.value for item in enum],
+    name="ifc_model_status",
+    native_enum=False,
+)
+
+upload_status_enum = Enum(
+    UploadStatus,
+    values_callable=lambda enum: [item.value for item in enum],
+    name="upload_status",
+    native_enum=False,
+)
+
 
 class ProjectAnalysisModel(Base):
     __tablename__ = "project_analyses"
+    # Listagem paginada por `(created_at, id)`, sem filtro ou filtrada por uma coluna.
+    __table_args__ = (
+        Index("ix_project_analyses_created_at_id", "created_at", "id"),
+        Index("ix_project_analyses_status_created_at_id", "status", "created_at", "id"),
+        Index(
+            "ix_project_analyses_project_name_created_at_id", "project_name", "created_at", "id"
+        ),
+        Index(
+            "ix_project_analyses_requested_by_created_at_id", "requested_by", "created_at", "id"
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid4)
     project_name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -31,6 +89,7 @@ class ProjectAnalysisModel(Base):
     image_source_uri: Mapped[str] = mapped_column(Text, nullable=False)
     status: Mapped[AnalysisStatus] = mapped_column(analysis_status_enum, nullable=False)
     notes: Mapped[Optional[str]] = mapped_column(Text)
+    stage_timings_ms: Mapped[Optional[dict]] = mapped_column(JSON)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -44,10 +103,10 @@ class ProjectAnalysisModel(Base):
         uselist=False,
         lazy="selectin",
     )
-    image_analysis: Mapped[Optional["ImageAnalysisModel"]] = relationship(
+    image_analyses: Mapped[list["ImageAnalysisModel"]] = relationship(
         back_populates="project",
         cascade="all, delete-orphan",
-        uselist=False,
+        order_by="ImageAnalysisModel.position",
         lazy="selectin",
     )
     comparison_result: Mapped[Optional["ComparisonResultModel"]] = relationship(
@@ -88,6 +147,8 @@ class ImageAnalysisModel(Base):
     summary: Mapped[Optional[str]] = mapped_column(Text)
     raw_output: Mapped[Optional[str]] = mapped_column(Text)
     observed_conditions: Mapped[Optional[str]] = mapped_column(Text)
+    source_uri: Mapped[Optional[str]] = mapped_column(Text)
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     issues: Mapped[list[dict]] = mapped_column(JSON, default=list)
     status: Mapped[AnalysisStatus] = mapped_column(analysis_status_enum, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
@@ -95,7 +156,7 @@ class ImageAnalysisModel(Base):
     )
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
-    project: Mapped[ProjectAnalysisModel] = relationship(back_populates="image_analysis", lazy="selectin")
+    project: Mapped[ProjectAnalysisModel] = relationship(back_populates="image_analyses", lazy="selectin")
 
 
 class ComparisonResultModel(Base):
@@ -115,3 +176,118 @@ class ComparisonResultModel(Base):
 
     project: Mapped[ProjectAnalysisModel] = relationship(back_populates="comparison_result", lazy="selectin")
 
+
+
+class AnalysisJobModel(Base):
+    __tablename__ = "analysis_jobs"
+    __table_args__ = (
+        Index("ix_analysis_jobs_status_created_at", "status", "created_at"),
+        Index("ix_analysis_jobs_status_lease_expires_at", "status", "lease_expires_at"),
+        Index("ix_analysis_jobs_queue_status_created_at", "queue", "status", "created_at"),
+    )
+
+    id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid4)
+    analysis_id: Mapped[UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("project_analyses.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    payload: Mapped[dict] = mapped_column(JSON, default=dict)
+    status: Mapped[JobStatus] = mapped_column(job_status_enum, nullable=False)
+    queue: Mapped[JobQueue] = mapped_column(
+        job_queue_enum, nullable=False, default=JobQueue.INTERACTIVE
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
+    locked_by: Mapped[Optional[str]] = mapped_column(String(255))
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
+class IfcModelModel(Base):
+    __tablename__ = "ifc_models"
+    __table_args__ = (
+        Index("ix_ifc_models_project_id_created_at", "project_id", "created_at"),
+    )
+
+    id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid4)
+    project_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    source_uri: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[IfcModelStatus] = mapped_column(ifc_model_status_enum, nullable=False)
+    ifc_schema: Mapped[Optional[str]] = mapped_column(String(32))
+    elements_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
+class IfcElementModel(Base):
+    """Elementos de um modelo; a chave (model_id, step_id) agrupa as linhas por modelo."""
+
+    __tablename__ = "ifc_elements"
+    __table_args__ = (
+        Index("ix_ifc_elements_model_id_ifc_type_step_id", "model_id", "ifc_type", "step_id"),
+    )
+
+    model_id: Mapped[UUID] = mapped_column(
+        Uuid(as_uuid=True),
+        ForeignKey("ifc_models.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    step_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    ifc_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    global_id: Mapped[Optional[str]] = mapped_column(String(64))
+    name: Mapped[Optional[str]] = mapped_column(Text)
+    tag: Mapped[Optional[str]] = mapped_column(Text)
+
+
+class FileBlobModel(Base):
+    """Arquivos enviados, endereçados pelo sha256, com o número de referências."""
+
+    __tablename__ = "file_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    kind: Mapped[Optional[str]] = mapped_column(String(16))
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
+class UploadSessionModel(Base):
+    """Envios retomáveis; o arquivo parcial fica em disco, fora do banco."""
+
+    __tablename__ = "upload_sessions"
+    __table_args__ = (Index("ix_upload_sessions_expires_at", "expires_at"),)
+
+    id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid4)
+    filename: Mapped[Optional[str]] = mapped_column(String(255))
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    offset_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    checksum: Mapped[Optional[str]] = mapped_column(String(64))
+    status: Mapped[UploadStatus] = mapped_column(upload_status_enum, nullable=False)
+    sha256: Mapped[Optional[str]] = mapped_column(String(64))
+    kind: Mapped[Optional[str]] = mapped_column(String(16))
+    source_uri: Mapped[Optional[str]] = mapped_column(Text)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
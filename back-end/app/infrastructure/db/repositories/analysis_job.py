@@ -0,0 +1,203 @@
+"""Implementação SQLAlchemy da fila durável de análises."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities import AnalysisJob, JobQueue, JobStatus, ProjectAnalysis
+from app.domain.repositories import AnalysisJobRepository
+from app.infrastructure.db import models
+from app.infrastructure.db.mappers import job_model_to_domain
+from app.infrastructure.db.repositories.file_blob import release_blob_references
+from app.infrastructure.db.repositories.project_analysis import new_analysis_model
+
+
+class SQLAlchemyAnalysisJobRepository(AnalysisJobRepository):
+    """Fila baseada em tabela, reservada com `SELECT ... FOR UPDATE SKIP LOCKED`.
+
+    Ao falhar um job em definitivo, as referências aos arquivos listados em
+    `blob_digests` no payload são liberadas na mesma transação. Ao enfileirar,
+    a análise pendente é gravada na transação do job.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def enqueue(
+        self, job: AnalysisJob, *, analysis: ProjectAnalysis | None = None
+    ) -> AnalysisJob:
+        if analysis is not None:
+            self._session.add(new_analysis_model(analysis))
+        model = models.AnalysisJobModel(
+            id=job.id,
+            analysis_id=job.analysis_id,
+            payload=dict(job.payload),
+            status=JobStatus.QUEUED,
+            queue=job.queue,
+            attempts=job.attempts,
+            max_attempts=job.max_attempts,
+        )
+        self._session.add(model)
+        try:
+            await self._session.flush()
+            await self._session.commit()
+        except SQLAlchemyError:
+            # Deixa a sessão utilizável para quem trata a falha (ex.: liberar os blobs).
+            await self._session.rollback()
+            raise
+        await self._session.refresh(model)
+        return job_model_to_domain(model)
+
+    async def claim_next(
+        self,
+        *,
+        worker_id: str,
+        lease_seconds: int,
+        queue: JobQueue = JobQueue.INTERACTIVE,
+    ) -> AnalysisJob | None:
+        claimed = await self.claim_many(
+            worker_id=worker_id, lease_seconds=lease_seconds, limit=1, queue=queue
+        )
+        return claimed[0] if claimed else None
+
+    async def claim_many(
+        self,
+        *,
+        worker_id: str,
+        lease_seconds: int,
+        limit: int,
+        queue: JobQueue = JobQueue.BATCH,
+    ) -> Sequence[AnalysisJob]:
+        job_table = models.AnalysisJobModel
+        now = _utcnow()
+        stmt = (
+            select(job_table)
+            .where(
+                job_table.queue == queue,
+                or_(
+                    job_table.status == JobStatus.QUEUED,
+                    and_(
+                        job_table.status == JobStatus.RUNNING,
+                        job_table.lease_expires_at < now,
+                        job_table.attempts < job_table.max_attempts,
+                    ),
+                ),
+            )
+            .order_by(job_table.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self._session.execute(stmt)
+        claimed = result.scalars().all()
+        if not claimed:
+            await self._session.rollback()
+            return []
+
+        for model in claimed:
+            model.status = JobStatus.RUNNING
+            model.locked_by = worker_id
+            model.lease_expires_at = now + timedelta(seconds=lease_seconds)
+            model.attempts = model.attempts + 1
+        await self._session.flush()
+        await self._session.commit()
+        for model in claimed:
+            await self._session.refresh(model)
+        return [job_model_to_domain(model) for model in claimed]
+
+    async def renew_lease(self, job_id: UUID, *, worker_id: str, lease_seconds: int) -> bool:
+        result = await self._session.execute(
+            self._owned(job_id, worker_id).values(
+                lease_expires_at=_utcnow() + timedelta(seconds=lease_seconds)
+            )
+        )
+        await self._session.commit()
+        return result.rowcount > 0
+
+    async def mark_completed(self, job_id: UUID, *, worker_id: str) -> None:
+        await self._session.execute(
+            self._owned(job_id, worker_id).values(
+                status=JobStatus.COMPLETED,
+                locked_by=None,
+                lease_expires_at=None,
+                last_error=None,
+            )
+        )
+        await self._session.commit()
+
+    async def mark_failed(
+        self, job_id: UUID, *, worker_id: str, error: str, retry: bool
+    ) -> None:
+        result = await self._session.execute(
+            self._owned(job_id, worker_id).values(
+                status=JobStatus.QUEUED if retry else JobStatus.FAILED,
+                locked_by=None,
+                lease_expires_at=None,
+                last_error=error,
+            )
+        )
+        if not retry and result.rowcount > 0:
+            payload = await self._session.scalar(
+                select(models.AnalysisJobModel.payload).where(
+                    models.AnalysisJobModel.id == job_id
+                )
+            )
+            await release_blob_references(self._session, (payload or {}).get("blob_digests", []))
+        await self._session.commit()
+
+    async def release(self, job_id: UUID, *, worker_id: str) -> None:
+        await self._session.execute(
+            self._owned(job_id, worker_id).values(
+                status=JobStatus.QUEUED,
+                locked_by=None,
+                lease_expires_at=None,
+            )
+        )
+        await self._session.commit()
+
+    async def fail_exhausted(self) -> Sequence[UUID]:
+        job_table = models.AnalysisJobModel
+        stmt = (
+            select(job_table)
+            .where(
+                job_table.status == JobStatus.RUNNING,
+                job_table.lease_expires_at < _utcnow(),
+                job_table.attempts >= job_table.max_attempts,
+            )
+            .with_for_update(skip_locked=True)
+        )
+        result = await self._session.execute(stmt)
+        expired = result.scalars().all()
+        for model in expired:
+            model.status = JobStatus.FAILED
+            model.locked_by = None
+            model.lease_expires_at = None
+            model.last_error = "Lease expirado sem tentativas restantes"
+        await release_blob_references(
+            self._session,
+            [digest for model in expired for digest in model.payload.get("blob_digests", [])],
+        )
+        await self._session.commit()
+        return [model.analysis_id for model in expired]
+
+    @staticmethod
+    def _owned(job_id: UUID, worker_id: str):
+        job_table = models.AnalysisJobModel
+        return (
+            update(job_table)
+            .where(
+                job_table.id == job_id,
+                job_table.locked_by == worker_id,
+                job_table.status == JobStatus.RUNNING,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
@@ -0,0 +1,143 @@
+"""Implementação SQLAlchemy da contagem de referências dos blobs."""
+
+from __future__ import annotations
+
+import os
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Sequence
+
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities import AnalysisStatus, FileBlob
+from app.domain.repositories import FileBlobRepository
+from app.infrastructure.db import models
+
+
+class SQLAlchemyFileBlobRepository(FileBlobRepository):
+    """Linhas de `file_blobs` bloqueadas (`FOR UPDATE`) enquanto a contagem muda."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def acquire(self, blobs: Sequence[FileBlob]) -> None:
+        if not blobs:
+            return
+        try:
+            await self._acquire(blobs)
+        except IntegrityError:
+            # Outro envio registrou o mesmo blob ao mesmo tempo: agora ele existe.
+            await self._session.rollback()
+            await self._acquire(blobs)
+
+    async def release(self, digests: Sequence[str]) -> None:
+        await release_blob_references(self._session, digests)
+        await self._session.commit()
+
+    async def claim_unreferenced(
+        self, digests: Sequence[str], *, older_than: datetime
+    ) -> set[str]:
+        table = models.FileBlobModel
+        stale = and_(table.ref_count == 0, table.updated_at < older_than)
+        rows = await self._session.execute(
+            select(table.sha256, stale.label("stale"))
+            .where(table.sha256.in_(digests))
+            .with_for_update()
+        )
+        kept = {digest for digest, is_stale in rows if not is_stale}
+        return set(digests) - kept
+
+    async def forget(self, digests: Sequence[str]) -> None:
+        if digests:
+            table = models.FileBlobModel
+            # Confere a contagem de novo: o registro pode ter sido readquirido.
+            await self._session.execute(
+                delete(table)
+                .where(table.sha256.in_(digests), table.ref_count == 0)
+                .execution_options(synchronize_session=False)
+            )
+        await self._session.commit()
+
+    async def referenced_directories(self, directories: Sequence[str]) -> set[str]:
+        if not directories:
+            return set()
+        prefixes = [directory.rstrip(os.sep) + os.sep for directory in directories]
+        analysis = models.ProjectAnalysisModel
+        model = models.IfcModelModel
+        uris = [
+            *(
+                await self._session.execute(
+                    select(analysis.bim_source_uri).where(
+                        analysis.status != AnalysisStatus.FAILED,
+                        or_(*(analysis.bim_source_uri.startswith(prefix) for prefix in prefixes)),
+                    )
+                )
+            ).scalars(),
+            *(
+                await self._session.execute(
+                    select(model.source_uri).where(
+                        or_(*(model.source_uri.startswith(prefix) for prefix in prefixes))
+                    )
+                )
+            ).scalars(),
+        ]
+        return {
+            directory
+            for directory, prefix in zip(directories, prefixes)
+            if any(uri.startswith(prefix) for uri in uris)
+        }
+
+    async def _acquire(self, blobs: Sequence[FileBlob]) -> None:
+        table = models.FileBlobModel
+        counts = Counter(blob.sha256 for blob in blobs)
+        rows = {
+            row.sha256: row
+            for row in (
+                await self._session.execute(
+                    select(table).where(table.sha256.in_(counts)).with_for_update()
+                )
+            ).scalars()
+        }
+        now = _utcnow()
+        for blob in {blob.sha256: blob for blob in blobs}.values():
+            row = rows.get(blob.sha256)
+            if row is None:
+                self._session.add(
+                    table(
+                        sha256=blob.sha256,
+                        kind=blob.kind,
+                        size=blob.size,
+                        ref_count=counts[blob.sha256],
+                        updated_at=now,
+                    )
+                )
+            else:
+                row.ref_count += counts[blob.sha256]
+                row.updated_at = now
+        await self._session.commit()
+
+
+async def release_blob_references(session: AsyncSession, digests: Sequence[str]) -> None:
+    """Subtrai as referências na transação de `session` (sem commit).
+
+    Usado também pela fila de jobs, que libera os arquivos da análise ao falhá-la.
+    """
+
+    if not digests:
+        return
+    table = models.FileBlobModel
+    counts = Counter(digests)
+    rows = (
+        await session.execute(select(table).where(table.sha256.in_(counts)).with_for_update())
+    ).scalars()
+    now = _utcnow()
+    for row in rows:
+        row.ref_count = max(0, row.ref_count - counts[row.sha256])
+        row.updated_at = now
+    await session.flush()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
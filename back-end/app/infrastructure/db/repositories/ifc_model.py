@@ -0,0 +1,128 @@
+"""Implementação SQLAlchemy do repositório de modelos IFC."""
+
+from __future__ import annotations
+
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities import IfcElement, IfcElementPage, IfcModel
+from app.domain.repositories import IfcModelRepository
+from app.infrastructure.db import models
+from app.infrastructure.db.mappers import ifc_model_to_domain, update_ifc_model_from_entity
+
+
+class SQLAlchemyIfcModelRepository(IfcModelRepository):
+    """Elementos são lidos por colunas (sem ORM) e paginados por `step_id` (keyset)."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def create(self, model: IfcModel) -> IfcModel:
+        row = models.IfcModelModel(id=model.id)
+        update_ifc_model_from_entity(model, row)
+        self._session.add(row)
+        await self._session.flush()
+        await self._session.commit()
+        await self._session.refresh(row)
+        return ifc_model_to_domain(row)
+
+    async def update(self, model: IfcModel) -> IfcModel:
+        row = await self._session.get(models.IfcModelModel, model.id)
+        if row is None:
+            raise ValueError("Modelo IFC não encontrado para atualização")
+        update_ifc_model_from_entity(model, row)
+        await self._session.flush()
+        await self._session.commit()
+        await self._session.refresh(row)
+        return ifc_model_to_domain(row)
+
+    async def get_by_id(self, model_id: UUID) -> IfcModel | None:
+        row = await self._session.get(models.IfcModelModel, model_id)
+        return ifc_model_to_domain(row) if row else None
+
+    async def get_latest_for_project(self, project_id: str) -> IfcModel | None:
+        stmt = (
+            select(models.IfcModelModel)
+            .where(models.IfcModelModel.project_id == project_id)
+            .order_by(models.IfcModelModel.created_at.desc())
+            .limit(1)
+        )
+        row = (await self._session.execute(stmt)).scalar_one_or_none()
+        return ifc_model_to_domain(row) if row else None
+
+    async def add_elements(self, elements: Sequence[IfcElement]) -> None:
+        if not elements:
+            return
+        # Tabela Core + lista de parâmetros: executemany, que os drivers (pymysql/aiomysql,
+        # sqlite) enviam como INSERT de várias linhas, sem instanciar objetos ORM.
+        try:
+            await self._session.execute(
+                insert(models.IfcElementModel.__table__),
+                [
+                    {
+                        "model_id": element.model_id,
+                        "step_id": element.step_id,
+                        "ifc_type": element.ifc_type,
+                        "global_id": element.global_id,
+                        "name": element.name,
+                        "tag": element.tag,
+                    }
+                    for element in elements
+                ],
+            )
+            await self._session.commit()
+        except SQLAlchemyError:
+            # Sessão utilizável para apagar os lotes anteriores e marcar a falha.
+            await self._session.rollback()
+            raise
+
+    async def delete_elements(self, model_id: UUID) -> None:
+        await self._session.execute(
+            delete(models.IfcElementModel).where(models.IfcElementModel.model_id == model_id)
+        )
+        await self._session.commit()
+
+    async def list_elements(
+        self,
+        model_id: UUID,
+        *,
+        ifc_type: str | None = None,
+        after: int | None = None,
+        limit: int = 500,
+    ) -> IfcElementPage:
+        table = models.IfcElementModel.__table__
+        stmt = (
+            select(
+                table.c.step_id,
+                table.c.ifc_type,
+                table.c.global_id,
+                table.c.name,
+                table.c.tag,
+            )
+            .where(table.c.model_id == model_id)
+            .order_by(table.c.step_id)
+            .limit(limit + 1)
+        )
+        if ifc_type is not None:
+            stmt = stmt.where(table.c.ifc_type == ifc_type)
+        if after is not None:
+            stmt = stmt.where(table.c.step_id > after)
+
+        rows = (await self._session.execute(stmt)).all()
+        items = [
+            IfcElement(
+                model_id=model_id,
+                step_id=row.step_id,
+                ifc_type=row.ifc_type,
+                global_id=row.global_id,
+                name=row.name,
+                tag=row.tag,
+            )
+            for row in rows[:limit]
+        ]
+        next_cursor = items[-1].step_id if len(rows) > limit else None
+        return IfcElementPage(items=items, next_cursor=next_cursor)
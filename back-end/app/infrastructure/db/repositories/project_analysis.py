@@ -2,14 +2,21 @@
 
 from __future__ import annotations
 
-from typing import Sequence
+from datetime import datetime, timezone
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Select, inspect, or_, select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.entities import ProjectAnalysis
+from app.domain.entities import (
+    AnalysisCursor,
+    AnalysisListFilter,
+    AnalysisStatus,
+    ProjectAnalysis,
+    ProjectAnalysisPage,
+    ProjectAnalysisSummary,
+)
 from app.domain.repositories import ProjectAnalysisRepository
 from app.infrastructure.db import models
 from app.infrastructure.db.mappers import (
@@ -23,54 +30,170 @@ class SQLAlchemyProjectAnalysisRepository(ProjectAnalysisRepository):
 
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
+        # O identity map da sessão guarda referências fracas: sem estas, o
+        # agregado gravado seria coletado e o próximo `update` o releria.
+        self._aggregates: dict[UUID, models.ProjectAnalysisModel] = {}
 
     async def create(self, analysis: ProjectAnalysis) -> ProjectAnalysis:
-        model = models.ProjectAnalysisModel(id=analysis.id)
-        update_project_model_from_entity(analysis, model)
+        """Grava a análise e as etapas em uma transação, sem relê-las.
+
+        Identificadores e datas vêm da entidade, então nada depende de default
+        do servidor e a entidade recebida já é o estado persistido.
+        """
+
+        model = new_analysis_model(analysis)
         self._session.add(model)
-        await self._session.flush()
         await self._session.commit()
-        await self._session.refresh(model)
-        return project_model_to_domain(model)
+        self._aggregates[analysis.id] = model
+        return analysis
 
     async def update(self, analysis: ProjectAnalysis) -> ProjectAnalysis:
-        model = await self._session.get(models.ProjectAnalysisModel, analysis.id)
+        """Aplica a entidade sobre o agregado já presente na sessão.
+
+        O unit of work compara cada atributo com o valor persistido: só as
+        colunas alteradas das linhas alteradas vão ao `UPDATE`. O agregado só é
+        lido quando ainda não foi carregado por esta sessão.
+        """
+
+        model = await self._loaded_model(analysis.id)
         if model is None:
             raise ValueError("Análise não encontrada para atualização")
+        analysis.updated_at = datetime.now(timezone.utc)
+        model.updated_at = analysis.updated_at
         update_project_model_from_entity(analysis, model)
-        await self._session.flush()
         await self._session.commit()
-        await self._session.refresh(model)
-        return project_model_to_domain(model)
+        return analysis
 
     async def get_by_id(self, analysis_id: UUID) -> ProjectAnalysis | None:
-        stmt = (
+        model = (
+            await self._session.execute(self._aggregate_query(analysis_id))
+        ).scalar_one_or_none()
+        if model is None:
+            return None
+        self._aggregates[analysis_id] = model
+        return project_model_to_domain(model)
+
+    async def _loaded_model(self, analysis_id: UUID) -> models.ProjectAnalysisModel | None:
+        model = self._aggregates.get(analysis_id)
+        if model is not None and not inspect(model).unloaded:
+            return model
+        # Não lido por esta sessão (ou expirado por rollback): o diff precisa do estado atual.
+        stmt = self._aggregate_query(analysis_id).execution_options(populate_existing=True)
+        model = (await self._session.execute(stmt)).scalar_one_or_none()
+        if model is not None:
+            self._aggregates[analysis_id] = model
+        return model
+
+    @staticmethod
+    def _aggregate_query(analysis_id: UUID) -> Select:
+        return (
             select(models.ProjectAnalysisModel)
             .options(
                 selectinload(models.ProjectAnalysisModel.bim_analysis),
-                selectinload(models.ProjectAnalysisModel.image_analysis),
+                selectinload(models.ProjectAnalysisModel.image_analyses),
                 selectinload(models.ProjectAnalysisModel.comparison_result),
             )
             .where(models.ProjectAnalysisModel.id == analysis_id)
         )
-        result = await self._session.execute(stmt)
-        model = result.scalar_one_or_none()
-        if model is None:
-            return None
-        return project_model_to_domain(model)
 
-    async def list_recent(self, limit: int = 20) -> Sequence[ProjectAnalysis]:
+    async def list_recent(
+        self,
+        *,
+        limit: int = 20,
+        filters: AnalysisListFilter | None = None,
+        after: AnalysisCursor | None = None,
+    ) -> ProjectAnalysisPage:
+        """Paginação por chave: cada página continua depois de `(created_at, id)` da anterior.
+
+        Com os índices `(<filtro>, created_at, id)`, o banco lê só as linhas da
+        página, qualquer que seja a profundidade, sem ordenar a tabela. Só as
+        colunas da listagem são lidas, em uma consulta: as etapas (e seus
+        `raw_output` e `issues`) ficam no banco.
+        """
+
+        model = models.ProjectAnalysisModel
+        stmt = (
+            select(
+                model.id,
+                model.project_name,
+                model.status,
+                model.requested_by,
+                model.created_at,
+                model.updated_at,
+            )
+            .order_by(model.created_at.desc(), model.id.desc())
+            .limit(limit + 1)
+        )
+        filters = filters or AnalysisListFilter()
+        if filters.status is not None:
+            stmt = stmt.where(model.status == filters.status)
+        if filters.project_name is not None:
+            stmt = stmt.where(model.project_name == filters.project_name)
+        if filters.requested_by is not None:
+            stmt = stmt.where(model.requested_by == filters.requested_by)
+        if filters.created_from is not None:
+            stmt = stmt.where(model.created_at >= filters.created_from)
+        if filters.created_to is not None:
+            stmt = stmt.where(model.created_at < filters.created_to)
+        if after is not None:
+            # `(created_at, id) < (...)` escrito com um limite simples em `created_at`,
+            # que MySQL e SQLite usam como faixa do índice (a comparação de tuplas não).
+            stmt = stmt.where(
+                model.created_at <= after.created_at,
+                or_(model.created_at < after.created_at, model.id < after.id),
+            )
+
+        rows = (await self._session.execute(stmt)).all()
+        items = [
+            ProjectAnalysisSummary(
+                id=row.id,
+                project_name=row.project_name,
+                status=row.status,
+                requested_by=row.requested_by,
+                created_at=row.created_at,
+                updated_at=row.updated_at,
+            )
+            for row in rows[:limit]
+        ]
+        next_cursor = (
+            AnalysisCursor(created_at=items[-1].created_at, id=items[-1].id)
+            if len(rows) > limit
+            else None
+        )
+        return ProjectAnalysisPage(items=items, next_cursor=next_cursor)
+
+    async def get_latest_completed(
+        self, project_name: str, *, exclude_id: UUID | None = None
+    ) -> ProjectAnalysis | None:
         stmt = (
             select(models.ProjectAnalysisModel)
-            .options(
-                selectinload(models.ProjectAnalysisModel.bim_analysis),
-                selectinload(models.ProjectAnalysisModel.image_analysis),
-                selectinload(models.ProjectAnalysisModel.comparison_result),
+            .options(selectinload(models.ProjectAnalysisModel.bim_analysis))
+            .where(
+                models.ProjectAnalysisModel.project_name == project_name,
+                models.ProjectAnalysisModel.status == AnalysisStatus.COMPLETED,
             )
             .order_by(models.ProjectAnalysisModel.created_at.desc())
-            .limit(limit)
+            .limit(1)
         )
-        result = await self._session.execute(stmt)
-        models_list = result.scalars().all()
-        return [project_model_to_domain(model) for model in models_list]
+        if exclude_id is not None:
+            stmt = stmt.where(models.ProjectAnalysisModel.id != exclude_id)
+        model = (await self._session.execute(stmt)).scalar_one_or_none()
+        if model is None:
+            return None
+        return project_model_to_domain(model)
+
+
+def new_analysis_model(analysis: ProjectAnalysis) -> models.ProjectAnalysisModel:
+    """Modelo pronto para inserção, sem commit (a fila de jobs grava-o com o job)."""
 
+    model = models.ProjectAnalysisModel(
+        id=analysis.id,
+        created_at=analysis.created_at,
+        updated_at=analysis.updated_at,
+        # Relacionamentos explícitos: ficam carregados para os `update` seguintes.
+        bim_analysis=None,
+        image_analyses=[],
+        comparison_result=None,
+    )
+    update_project_model_from_entity(analysis, model)
+    return model
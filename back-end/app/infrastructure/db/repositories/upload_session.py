@@ -0,0 +1,71 @@
+"""Implementação SQLAlchemy do repositório de envios retomáveis."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities import UploadSession
+from app.domain.repositories import UploadSessionRepository
+from app.infrastructure.db import models
+from app.infrastructure.db.mappers import (
+    update_upload_session_from_entity,
+    upload_session_to_domain,
+)
+
+
+class SQLAlchemyUploadSessionRepository(UploadSessionRepository):
+    """`get_by_id` sempre relê a linha: o offset muda em outras requisições."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def create(self, session: UploadSession) -> UploadSession:
+        row = models.UploadSessionModel(id=session.id)
+        update_upload_session_from_entity(session, row)
+        self._session.add(row)
+        await self._session.flush()
+        await self._session.commit()
+        await self._session.refresh(row)
+        return upload_session_to_domain(row)
+
+    async def update(self, session: UploadSession) -> UploadSession:
+        row = await self._session.get(models.UploadSessionModel, session.id)
+        if row is None:
+            raise ValueError("Envio não encontrado para atualização")
+        update_upload_session_from_entity(session, row)
+        await self._session.flush()
+        await self._session.commit()
+        await self._session.refresh(row)
+        return upload_session_to_domain(row)
+
+    async def get_by_id(self, session_id: UUID) -> UploadSession | None:
+        # `populate_existing`: outro processo pode ter avançado o offset desde a última leitura.
+        row = await self._session.get(
+            models.UploadSessionModel, session_id, populate_existing=True
+        )
+        return upload_session_to_domain(row) if row else None
+
+    async def list_expired(self, now: datetime, *, limit: int = 500) -> Sequence[UploadSession]:
+        stmt = (
+            select(models.UploadSessionModel)
+            .where(models.UploadSessionModel.expires_at <= now)
+            .order_by(models.UploadSessionModel.expires_at)
+            .limit(limit)
+        )
+        rows = (await self._session.execute(stmt)).scalars().all()
+        return [upload_session_to_domain(row) for row in rows]
+
+    async def delete(self, session_ids: Sequence[UUID]) -> None:
+        if not session_ids:
+            return
+        await self._session.execute(
+            delete(models.UploadSessionModel)
+            .where(models.UploadSessionModel.id.in_(session_ids))
+            .execution_options(synchronize_session=False)
+        )
+        await self._session.commit()
@@ -1,14 +1,89 @@
 """Serviços externos (OpenAI, storage, etc)."""
 
+from .analysis_cache import (
+    AnalysisCache,
+    InMemoryLRUCache,
+    SQLiteAnalysisCache,
+    get_analysis_cache,
+)
+from .batch import (
+    BatchBackend,
+    BatchRequest,
+    BatchResult,
+    BatchRunner,
+    LocalBatchBackend,
+    OpenAIBatchBackend,
+)
 from .exceptions import ExternalServiceError, OpenAIServiceError
+from .ifc_diff import ElementFingerprint, IfcDiff, diff_fingerprints
+from .ifc_index import IfcEntity, IfcEntityIndex, open_entity_index
+from .ifc_inventory import IfcInventoryService, get_ifc_inventory_service
+from .ifc_parser import IfcInventory, IfcParseError, parse_ifc_inventory
+from .image_preprocessing import (
+    ImagePreprocessingError,
+    ImagePreprocessor,
+    get_image_preprocessor,
+)
+from .openai_client import OpenAIClientManager
 from .openai_service import OpenAIService
-from .storage import FileStorageError, LocalFileStorage
+from .rate_limiter import ModelRateLimiter, get_rate_limiter
+from .resilience import CircuitOpenError, ResilientCaller, get_resilient_caller
+from .storage import (
+    FileStorage,
+    FileStorageError,
+    FileTooLargeError,
+    LocalFileStorage,
+    S3FileStorage,
+    StoredFile,
+    UnsupportedFileTypeError,
+    get_file_storage,
+)
+from .upload_stream import MultipartFormError, ReceivedForm, receive_multipart
 
 __all__ = [
+    "AnalysisCache",
+    "InMemoryLRUCache",
+    "SQLiteAnalysisCache",
+    "get_analysis_cache",
+    "BatchBackend",
+    "BatchRequest",
+    "BatchResult",
+    "BatchRunner",
+    "LocalBatchBackend",
+    "OpenAIBatchBackend",
     "ExternalServiceError",
+    "ElementFingerprint",
+    "IfcDiff",
+    "diff_fingerprints",
+    "IfcEntity",
+    "IfcEntityIndex",
+    "open_entity_index",
+    "IfcInventory",
+    "IfcInventoryService",
+    "IfcParseError",
+    "get_ifc_inventory_service",
+    "parse_ifc_inventory",
+    "ImagePreprocessingError",
+    "ImagePreprocessor",
+    "get_image_preprocessor",
+    "OpenAIClientManager",
     "OpenAIService",
     "OpenAIServiceError",
+    "FileStorage",
     "FileStorageError",
+    "FileTooLargeError",
     "LocalFileStorage",
+    "S3FileStorage",
+    "StoredFile",
+    "UnsupportedFileTypeError",
+    "get_file_storage",
+    "MultipartFormError",
+    "ReceivedForm",
+    "receive_multipart",
+    "CircuitOpenError",
+    "ModelRateLimiter",
+    "ResilientCaller",
+    "get_rate_limiter",
+    "get_resilient_caller",
 ]
 
@@ -0,0 +1,299 @@
+"""Cache de respostas do OpenAI endereçado por conteúdo."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+from pydantic import BaseModel
+
+from app.core.config import Settings, get_settings
+from app.infrastructure.services.blob_codec import open_blob
+
+
+_WHITESPACE = re.compile(r"\s+")
+_CHUNK_SIZE = 1024 * 1024
+# Arquivo ao lado do upload com o sha256 calculado na gravação.
+DIGEST_SUFFIX = ".sha256"
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Contadores de uso do cache."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class AnalysisCache(ABC):
+    """Backend de cache para o texto JSON retornado pelo modelo."""
+
+    def __init__(self, *, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> str | None:
+        value = await self._get(key)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        await self._set(key, value)
+        self.stats.writes += 1
+
+    def describe(self) -> dict[str, object]:
+        return {
+            "backend": type(self).__name__,
+            "max_entries": self._max_entries,
+            "ttl_seconds": self._ttl_seconds,
+            **self.stats.as_dict(),
+        }
+
+    @abstractmethod
+    async def _get(self, key: str) -> str | None:
+        """Lê valor não expirado ou `None`."""
+
+    @abstractmethod
+    async def _set(self, key: str, value: str) -> None:
+        """Grava valor respeitando o limite de entradas."""
+
+
+class InMemoryLRUCache(AnalysisCache):
+    """Cache LRU em memória do processo."""
+
+    def __init__(self, *, max_entries: int = 1024, ttl_seconds: float = 86400) -> None:
+        super().__init__(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._items: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    async def _get(self, key: str) -> str | None:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.time():
+            del self._items[key]
+            self.stats.expirations += 1
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    async def _set(self, key: str, value: str) -> None:
+        self._items[key] = (time.time() + self._ttl_seconds, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self._max_entries:
+            self._items.popitem(last=False)
+            self.stats.evictions += 1
+
+
+class SQLiteAnalysisCache(AnalysisCache):
+    """Cache persistente em SQLite, compartilhável entre processos do mesmo nó."""
+
+    def __init__(
+        self, *, path: Path, max_entries: int = 10000, ttl_seconds: float = 86400
+    ) -> None:
+        super().__init__(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS analysis_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_analysis_cache_last_access"
+            " ON analysis_cache (last_access)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS analysis_cache_stats ("
+            " name TEXT PRIMARY KEY,"
+            " value INTEGER NOT NULL)"
+        )
+
+    def describe(self) -> dict[str, object]:
+        """Inclui contadores agregados de todos os processos que usam o arquivo."""
+
+        with self._lock:
+            (entries,) = self._connection.execute(
+                "SELECT COUNT(*) FROM analysis_cache"
+            ).fetchone()
+            shared = dict(
+                self._connection.execute("SELECT name, value FROM analysis_cache_stats")
+            )
+        return {**super().describe(), "entries": entries, "shared": shared}
+
+    def _increment(self, name: str, amount: int = 1) -> None:
+        """Incrementa contador compartilhado; chamar com `_lock` adquirido."""
+
+        self._connection.execute(
+            "INSERT INTO analysis_cache_stats (name, value) VALUES (?, ?)"
+            " ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    async def _get(self, key: str) -> str | None:
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def _set(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self._set_sync, key, value)
+
+    def _get_sync(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._increment("misses")
+                return None
+            value, expires_at = row
+            if expires_at < now:
+                self._connection.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+                self.stats.expirations += 1
+                self._increment("misses")
+                return None
+            self._connection.execute(
+                "UPDATE analysis_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._increment("hits")
+            return value
+
+    def _set_sync(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO analysis_cache (key, value, expires_at, last_access)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, now + self._ttl_seconds, now),
+            )
+            self._connection.execute("DELETE FROM analysis_cache WHERE expires_at < ?", (now,))
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()
+            overflow = count - self._max_entries
+            if overflow > 0:
+                self._connection.execute(
+                    "DELETE FROM analysis_cache WHERE key IN ("
+                    " SELECT key FROM analysis_cache ORDER BY last_access LIMIT ?)",
+                    (overflow,),
+                )
+                self.stats.evictions += overflow
+                self._increment("evictions", overflow)
+            self._increment("writes")
+
+
+def build_cache_key(
+    *,
+    model: str,
+    prompt: str,
+    schema: type[BaseModel],
+    file_digests: Iterable[str] = (),
+) -> str:
+    """Gera a chave a partir do conteúdo dos arquivos, modelo, prompt e schema."""
+
+    schema_version = hashlib.sha256(
+        json.dumps(schema.model_json_schema(), sort_keys=True).encode()
+    ).hexdigest()
+    material = json.dumps(
+        {
+            "files": list(file_digests),
+            "model": model,
+            "prompt": normalize_prompt(prompt),
+            "schema": schema_version,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def normalize_prompt(prompt: str) -> str:
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+async def file_sha256(path: str | Path) -> str:
+    """Calcula o sha256 do arquivo em thread separada."""
+
+    return await asyncio.to_thread(_file_sha256_sync, Path(path))
+
+
+def _file_sha256_sync(path: Path) -> str:
+    recorded = _recorded_digest(path)
+    if recorded is not None:
+        return recorded
+    digest = hashlib.sha256()
+    with open_blob(path) as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def record_file_digest(path: str | Path, digest: str | None) -> None:
+    """Registra o sha256 já conhecido do arquivo (ou remove o registro, com `None`).
+
+    O registro guarda tamanho e data de modificação: se o arquivo mudar, o hash
+    volta a ser calculado lendo o conteúdo.
+    """
+
+    path = Path(path)
+    sidecar = path.with_name(path.name + DIGEST_SUFFIX)
+    try:
+        if digest is None:
+            sidecar.unlink(missing_ok=True)
+            return
+        stat = path.stat()
+        sidecar.write_text(f"{digest} {stat.st_size} {stat.st_mtime_ns}\n")
+    except OSError:  # pragma: no cover - o hash só deixa de ser reaproveitado
+        pass
+
+
+def _recorded_digest(path: Path) -> str | None:
+    try:
+        digest, size, mtime = path.with_name(path.name + DIGEST_SUFFIX).read_text().split()
+        stat = path.stat()
+    except (OSError, ValueError):
+        return None
+    if (int(size), int(mtime)) != (stat.st_size, stat.st_mtime_ns):
+        return None
+    return digest
+
+
+def build_analysis_cache(settings: Settings) -> AnalysisCache | None:
+    config = settings.cache
+    if config.backend == "memory":
+        return InMemoryLRUCache(max_entries=config.max_entries, ttl_seconds=config.ttl_seconds)
+    if config.backend == "sqlite":
+        return SQLiteAnalysisCache(
+            path=Path(config.sqlite_path),
+            max_entries=config.max_entries,
+            ttl_seconds=config.ttl_seconds,
+        )
+    return None
+
+
+@lru_cache(maxsize=1)
+def get_analysis_cache() -> AnalysisCache | None:
+    """Instância compartilhada pelo processo (API ou worker)."""
+
+    return build_analysis_cache(get_settings())
@@ -0,0 +1,287 @@
+"""Execução de prompts em lote (Batch API) com alternativa local baseada em arquivos."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from openai import AsyncOpenAI
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/responses"
+
+TERMINAL_STATES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+@dataclass(frozen=True, slots=True)
+class BatchRequest:
+    """Uma linha do arquivo JSONL enviado à Batch API."""
+
+    custom_id: str
+    body: Mapping[str, Any]
+
+    def to_line(self) -> str:
+        return json.dumps(
+            {
+                "custom_id": self.custom_id,
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": dict(self.body),
+            },
+            ensure_ascii=False,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class BatchResult:
+    """Texto devolvido pelo modelo ou erro da linha correspondente."""
+
+    custom_id: str
+    text: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and bool(self.text)
+
+
+@dataclass(frozen=True, slots=True)
+class BatchHandle:
+    id: str
+    status: str
+    output_file_id: str | None = None
+    error_file_id: str | None = None
+
+
+class BatchBackend(ABC):
+    """Interface mínima da Batch API usada por `BatchRunner`."""
+
+    @abstractmethod
+    async def submit(self, input_path: Path, *, metadata: Mapping[str, str]) -> str:
+        """Envia o arquivo JSONL e devolve o identificador do lote."""
+
+    @abstractmethod
+    async def retrieve(self, batch_id: str) -> BatchHandle:
+        """Consulta o estado atual do lote."""
+
+    @abstractmethod
+    async def read_file(self, file_id: str) -> str:
+        """Lê o conteúdo JSONL de um arquivo de saída ou de erros."""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """Lotes processados pela OpenAI (janela de até 24h, custo reduzido)."""
+
+    def __init__(self, client: AsyncOpenAI, *, completion_window: str = "24h") -> None:
+        self._client = client
+        self._completion_window = completion_window
+
+    async def submit(self, input_path: Path, *, metadata: Mapping[str, str]) -> str:
+        with input_path.open("rb") as handle:
+            uploaded = await self._client.files.create(file=handle, purpose="batch")
+        batch = await self._client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self._completion_window,
+            metadata=dict(metadata),
+        )
+        return batch.id
+
+    async def retrieve(self, batch_id: str) -> BatchHandle:
+        batch = await self._client.batches.retrieve(batch_id)
+        return BatchHandle(
+            id=batch.id,
+            status=batch.status,
+            output_file_id=batch.output_file_id,
+            error_file_id=batch.error_file_id,
+        )
+
+    async def read_file(self, file_id: str) -> str:
+        content = await self._client.files.content(file_id)
+        return content.text
+
+
+Responder = Callable[[str, Mapping[str, Any]], str]
+
+
+class LocalBatchBackend(BatchBackend):
+    """Processa o JSONL localmente com `responder`, gravando saídas no formato da OpenAI.
+
+    Permite exercitar o fluxo em lote sem rede (desenvolvimento e testes).
+    """
+
+    def __init__(self, directory: Path, *, responder: Responder) -> None:
+        self._directory = directory
+        self._responder = responder
+
+    async def submit(self, input_path: Path, *, metadata: Mapping[str, str]) -> str:
+        return await asyncio.to_thread(self._process, input_path, dict(metadata))
+
+    async def retrieve(self, batch_id: str) -> BatchHandle:
+        data = json.loads((self._directory / f"{batch_id}.json").read_text())
+        return BatchHandle(
+            id=batch_id,
+            status=data["status"],
+            output_file_id=data.get("output_file_id"),
+            error_file_id=data.get("error_file_id"),
+        )
+
+    async def read_file(self, file_id: str) -> str:
+        return (self._directory / file_id).read_text()
+
+    def _process(self, input_path: Path, metadata: dict[str, str]) -> str:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        batch_id = f"batch_local_{uuid4().hex}"
+        outputs: list[str] = []
+        errors: list[str] = []
+        for line in input_path.read_text().splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            custom_id = request["custom_id"]
+            try:
+                text = self._responder(custom_id, request["body"])
+            except Exception as exc:
+                errors.append(
+                    json.dumps(
+                        {
+                            "custom_id": custom_id,
+                            "response": None,
+                            "error": {"code": "local_error", "message": str(exc)},
+                        }
+                    )
+                )
+                continue
+            outputs.append(
+                json.dumps(
+                    {
+                        "custom_id": custom_id,
+                        "response": {
+                            "status_code": 200,
+                            "body": {
+                                "output": [
+                                    {
+                                        "type": "message",
+                                        "content": [{"type": "output_text", "text": text}],
+                                    }
+                                ]
+                            },
+                        },
+                        "error": None,
+                    },
+                    ensure_ascii=False,
+                )
+            )
+
+        state: dict[str, Any] = {"status": "completed", "metadata": metadata}
+        for key, lines in (("output_file_id", outputs), ("error_file_id", errors)):
+            if lines:
+                file_id = f"{batch_id}_{key.split('_')[0]}.jsonl"
+                (self._directory / file_id).write_text("\n".join(lines) + "\n")
+                state[key] = file_id
+        (self._directory / f"{batch_id}.json").write_text(json.dumps(state))
+        return batch_id
+
+
+class BatchRunner:
+    """Grava o JSONL, submete o lote, acompanha até o fim e devolve resultados por `custom_id`."""
+
+    def __init__(self, backend: BatchBackend, *, work_dir: Path, poll_interval: float) -> None:
+        self._backend = backend
+        self._work_dir = work_dir
+        self._poll_interval = poll_interval
+
+    async def run(
+        self,
+        requests: Sequence[BatchRequest],
+        *,
+        metadata: Mapping[str, str] | None = None,
+        on_poll: Callable[[], Awaitable[None]] | None = None,
+    ) -> dict[str, BatchResult]:
+        if not requests:
+            return {}
+
+        self._work_dir.mkdir(parents=True, exist_ok=True)
+        input_path = self._work_dir / f"input_{uuid4().hex}.jsonl"
+        input_path.write_text("\n".join(request.to_line() for request in requests) + "\n")
+        try:
+            batch_id = await self._backend.submit(input_path, metadata=metadata or {})
+        finally:
+            input_path.unlink(missing_ok=True)
+
+        started = time.monotonic()
+        logger.info("Lote %s submetido com %s requisição(ões)", batch_id, len(requests))
+        while True:
+            handle = await self._backend.retrieve(batch_id)
+            if handle.status in TERMINAL_STATES:
+                break
+            if on_poll is not None:
+                await on_poll()
+            await asyncio.sleep(self._poll_interval)
+        logger.info(
+            "Lote %s finalizado com status %s em %.0fs",
+            batch_id,
+            handle.status,
+            time.monotonic() - started,
+        )
+
+        results: dict[str, BatchResult] = {}
+        for file_id in (handle.output_file_id, handle.error_file_id):
+            if file_id:
+                for line in (await self._backend.read_file(file_id)).splitlines():
+                    if line.strip():
+                        result = parse_output_line(line)
+                        results[result.custom_id] = result
+        for request in requests:
+            results.setdefault(
+                request.custom_id,
+                BatchResult(
+                    request.custom_id,
+                    error=f"Lote {batch_id} terminou com status {handle.status} sem resultado",
+                ),
+            )
+        return results
+
+
+def parse_output_line(line: str) -> BatchResult:
+    """Converte uma linha do arquivo de saída (ou de erros) da Batch API."""
+
+    data = json.loads(line)
+    custom_id = data["custom_id"]
+    error = data.get("error")
+    if error:
+        return BatchResult(custom_id, error=error.get("message") or str(error))
+
+    response = data.get("response") or {}
+    body = response.get("body") or {}
+    status_code = response.get("status_code")
+    if status_code != 200:
+        message = (body.get("error") or {}).get("message") or f"HTTP {status_code}"
+        return BatchResult(custom_id, error=message)
+
+    text = extract_output_text(body)
+    if not text:
+        return BatchResult(custom_id, error="Resposta vazia no lote")
+    return BatchResult(custom_id, text=text)
+
+
+def extract_output_text(body: Mapping[str, Any]) -> str:
+    """Extrai o primeiro texto de uma resposta serializada da Responses API."""
+
+    for output in body.get("output") or []:
+        if output.get("type") != "message":
+            continue
+        for item in output.get("content") or []:
+            if item.get("type") in {"output_text", "text"} and item.get("text"):
+                return item["text"]
+    return ""
@@ -0,0 +1,276 @@
+"""Blobs comprimidos com zstd em quadros independentes, legíveis como arquivo comum.
+
+O conteúdo é dividido em quadros de `FRAME_SIZE` bytes (descomprimidos), cada um
+um quadro zstd completo, seguidos de uma tabela de busca em um quadro
+"skippable" — o formato *seekable* do zstd (`contrib/seekable_format`). Qualquer
+`zstd -d` lê o arquivo; com a tabela, uma leitura em um offset qualquer
+descomprime só o quadro que o contém.
+
+`open_blob` devolve um leitor binário com `seek` para blobs `.zst` e o arquivo
+original para os demais, então o parser e os índices IFC não distinguem os dois.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - extra opcional `compression`
+    zstandard = None
+
+
+COMPRESSED_SUFFIX = ".zst"
+# Formatos em texto (STEP, XML); `ifczip` e imagens já vêm comprimidos.
+COMPRESSIBLE_KINDS = frozenset({"ifc", "ifcxml"})
+# Quadros menores aceleram o acesso aleatório (menos bytes descomprimidos por
+# consulta) e pioram pouco a taxa: 256 KiB fica a ~5% da taxa com quadros de 1 MiB.
+FRAME_SIZE = 256 * 1024
+
+_SKIPPABLE_MAGIC = 0x184D2A5E
+_SEEKABLE_MAGIC = 0x8F92EAB1
+_CHECKSUM_FLAG = 0x80
+_FRAME_HEADER = struct.Struct("<II")
+_FOOTER = struct.Struct("<IBI")
+_ENTRY = struct.Struct("<II")
+
+
+class CompressedBlobError(OSError):
+    """Blob comprimido ilegível (sem tabela de busca, truncado ou sem `zstandard`)."""
+
+
+def compression_available() -> bool:
+    return zstandard is not None
+
+
+def is_compressed(path: str | Path) -> bool:
+    return str(path).endswith(COMPRESSED_SUFFIX)
+
+
+class SeekableZstdWriter:
+    """Grava o conteúdo em quadros independentes e, ao fechar, a tabela de busca.
+
+    Se o contexto terminar com erro, o arquivo é fechado sem a tabela (o
+    chamador descarta o temporário).
+    """
+
+    def __init__(self, path: Path, *, level: int = 3, frame_size: int = FRAME_SIZE) -> None:
+        if zstandard is None:
+            raise CompressedBlobError("zstandard não está instalado")
+        self._handle = path.open("wb")
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._frame_size = frame_size
+        self._pending = bytearray()
+        self._entries: list[tuple[int, int]] = []
+        self.closed = False
+
+    def __enter__(self) -> SeekableZstdWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.closed = True
+            self._handle.close()
+
+    def write(self, data: bytes | bytearray | memoryview) -> int:
+        view = memoryview(data).cast("B")
+        while view:
+            take = min(len(view), self._frame_size - len(self._pending))
+            self._pending += view[:take]
+            view = view[take:]
+            if len(self._pending) == self._frame_size:
+                self._flush_frame()
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            if self._pending:
+                self._flush_frame()
+            table = b"".join(_ENTRY.pack(*entry) for entry in self._entries)
+            table += _FOOTER.pack(len(self._entries), 0, _SEEKABLE_MAGIC)
+            self._handle.write(_FRAME_HEADER.pack(_SKIPPABLE_MAGIC, len(table)))
+            self._handle.write(table)
+        finally:
+            self._handle.close()
+
+    def _flush_frame(self) -> None:
+        frame = self._compressor.compress(self._pending)
+        self._handle.write(frame)
+        self._entries.append((len(frame), len(self._pending)))
+        self._pending.clear()
+
+
+class SeekableZstdReader(io.RawIOBase):
+    """Leitura com `seek` sobre um blob comprimido, quadro a quadro.
+
+    Os últimos `cache_frames` quadros descomprimidos ficam em memória; `read_at`
+    não altera a posição e pode ser chamado de várias threads.
+    """
+
+    def __init__(self, path: str | Path, *, cache_frames: int = 4) -> None:
+        super().__init__()
+        if zstandard is None:
+            raise CompressedBlobError("zstandard não está instalado")
+        self._cache: OrderedDict[int, bytes] = OrderedDict()
+        self._cache_frames = max(1, cache_frames)
+        self._lock = threading.Lock()
+        self._position = 0
+        self._file = Path(path).open("rb")
+        self._fd = self._file.fileno()
+        try:
+            self._load_table()
+        except (OSError, struct.error) as exc:
+            self.close()
+            if isinstance(exc, CompressedBlobError):
+                raise
+            raise CompressedBlobError(f"Blob comprimido ilegível: {path}") from exc
+
+    @property
+    def size(self) -> int:
+        """Tamanho do conteúdo descomprimido."""
+
+        return self._starts[-1]
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        elif whence != os.SEEK_SET:
+            raise ValueError(f"whence inválido: {whence}")
+        if offset < 0:
+            raise ValueError("posição negativa")
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        count = self._read_into(self._position, memoryview(buffer).cast("B"))
+        self._position += count
+        return count
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        """`size` bytes a partir de `offset` (menos no fim do conteúdo)."""
+
+        buffer = bytearray(max(0, min(size, self.size - offset)))
+        view = memoryview(buffer)
+        filled = 0
+        while filled < len(buffer):
+            filled += self._read_into(offset + filled, view[filled:])
+        return bytes(buffer)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+            self._cache.clear()
+        super().close()
+
+    def _read_into(self, position: int, view: memoryview) -> int:
+        if position >= self.size or not view:
+            return 0
+        frame = bisect_right(self._starts, position) - 1
+        data = self._frame(frame)
+        start = position - self._starts[frame]
+        count = min(len(view), len(data) - start)
+        view[:count] = data[start : start + count]
+        return count
+
+    def _frame(self, frame: int) -> bytes:
+        with self._lock:
+            data = self._cache.get(frame)
+            if data is not None:
+                self._cache.move_to_end(frame)
+                return data
+        offset = self._offsets[frame]
+        compressed = os.pread(self._fd, self._offsets[frame + 1] - offset, offset)
+        expected = self._starts[frame + 1] - self._starts[frame]
+        try:
+            # Um descompressor por quadro: instâncias não podem ser usadas por duas threads.
+            data = zstandard.ZstdDecompressor().decompress(
+                compressed, max_output_size=expected
+            )
+        except zstandard.ZstdError as exc:
+            raise CompressedBlobError(f"Quadro {frame} corrompido: {exc}") from exc
+        if len(data) != expected:
+            raise CompressedBlobError(f"Quadro {frame} com tamanho inesperado")
+        with self._lock:
+            self._cache[frame] = data
+            while len(self._cache) > self._cache_frames:
+                self._cache.popitem(last=False)
+        return data
+
+    def _load_table(self) -> None:
+        total = self._file.seek(0, os.SEEK_END)
+        if total < _FRAME_HEADER.size + _FOOTER.size:
+            raise CompressedBlobError("Blob comprimido sem tabela de busca")
+        self._file.seek(total - _FOOTER.size)
+        count, descriptor, magic = _FOOTER.unpack(self._file.read(_FOOTER.size))
+        if magic != _SEEKABLE_MAGIC:
+            raise CompressedBlobError("Blob comprimido sem tabela de busca")
+        entry_size = _ENTRY.size + (4 if descriptor & _CHECKSUM_FLAG else 0)
+        table_size = count * entry_size + _FOOTER.size
+        table_start = total - table_size - _FRAME_HEADER.size
+        if table_start < 0:
+            raise CompressedBlobError("Tabela de busca truncada")
+        self._file.seek(table_start)
+        skippable, declared = _FRAME_HEADER.unpack(self._file.read(_FRAME_HEADER.size))
+        if skippable != _SKIPPABLE_MAGIC or declared != table_size:
+            raise CompressedBlobError("Tabela de busca inválida")
+        entries = self._file.read(count * entry_size)
+
+        self._offsets = array("Q", [0])
+        self._starts = array("Q", [0])
+        for position in range(0, len(entries), entry_size):
+            compressed, decompressed = _ENTRY.unpack_from(entries, position)
+            self._offsets.append(self._offsets[-1] + compressed)
+            self._starts.append(self._starts[-1] + decompressed)
+        if self._offsets[-1] != table_start:
+            raise CompressedBlobError("Tabela de busca não confere com os quadros")
+
+
+def open_blob(path: str | Path, *, buffering: int = -1) -> BinaryIO:
+    """Abre o blob para leitura binária, descomprimindo na hora se for `.zst`."""
+
+    path = Path(path)
+    if not is_compressed(path):
+        return path.open("rb", buffering=buffering)
+    return io.BufferedReader(
+        SeekableZstdReader(path),
+        buffer_size=buffering if buffering > 1 else io.DEFAULT_BUFFER_SIZE,
+    )
+
+
+def content_size(path: str | Path) -> int:
+    """Tamanho do conteúdo (descomprimido, para blobs `.zst`)."""
+
+    if not is_compressed(path):
+        return os.stat(path).st_size
+    with SeekableZstdReader(path, cache_frames=1) as reader:
+        return reader.size
@@ -0,0 +1,657 @@
+"""Cache colunar dos elementos de um modelo IFC para agregações sem reler o arquivo.
+
+Cada coluna é um `.npy` mapeado em memória na leitura: código do tipo,
+pavimento, espaço, quantidades (comprimento, área, volume, contagem, massa) e
+caixa envolvente alinhada aos eixos. Tipos, relações e quantidades vêm de uma
+leitura em streaming; posições e dimensões são resolvidas depois pelo índice
+de entidades, só para as entidades referenciadas pelos elementos.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import shutil
+import time
+from collections.abc import Sequence
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.domain.entities import IfcAggregate
+from app.infrastructure.services.blob_codec import open_blob
+from app.infrastructure.services.ifc_index import IfcEntityIndex
+from app.infrastructure.services.ifc_parser import (
+    DISPLAY_NAMES,
+    PRODUCT_TYPES,
+    EntityRef,
+    IfcParseError,
+    StepEnum,
+    fit_to_token_budget,
+    iter_statements,
+    locate_data_section,
+    map_data_ranges,
+    parse_step_arguments,
+    split_entity,
+)
+
+try:  # NumPy é opcional (`pip install .[analytics]`).
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+
+COLUMNS_VERSION = 1
+QUANTITY_COLUMNS = ("length", "area", "volume", "count", "weight")
+GROUP_KEYS = ("type", "storey", "space")
+MEASURES = ("count", *QUANTITY_COLUMNS)
+
+_QUANTITY_INDEX = {
+    b"IFCQUANTITYLENGTH": 0,
+    b"IFCQUANTITYAREA": 1,
+    b"IFCQUANTITYVOLUME": 2,
+    b"IFCQUANTITYCOUNT": 3,
+    b"IFCQUANTITYWEIGHT": 4,
+}
+_PRODUCTS = frozenset(name.encode("ascii") for name in PRODUCT_TYPES)
+_STOREY = b"IFCBUILDINGSTOREY"
+_SPACE = b"IFCSPACE"
+_CONTAINMENT = b"IFCRELCONTAINEDINSPATIALSTRUCTURE"
+_AGGREGATES = b"IFCRELAGGREGATES"
+_DEFINES = b"IFCRELDEFINESBYPROPERTIES"
+_ELEMENT_QUANTITY = b"IFCELEMENTQUANTITY"
+_SCANNED = _PRODUCTS | {
+    _STOREY,
+    _CONTAINMENT,
+    _AGGREGATES,
+    _DEFINES,
+    _ELEMENT_QUANTITY,
+    *_QUANTITY_INDEX,
+}
+_READ_BUFFER = 1024 * 1024
+_FILES = ("step_id", "type", "storey", "space", "quantities", "bbox")
+
+
+def columns_available() -> bool:
+    return np is not None
+
+
+class ColumnScan:
+    """Acumula elementos, relações e quantidades de um intervalo da seção DATA."""
+
+    def __init__(self) -> None:
+        # (id, tipo, #placement, #representation)
+        self.products: list[tuple[int, bytes, int | None, int | None]] = []
+        self.container: dict[int, int] = {}
+        self.parent: dict[int, int] = {}
+        self.definitions: dict[int, list[int]] = {}
+        self.element_quantities: dict[int, list[int]] = {}
+        self.quantities: dict[int, tuple[int, str, float]] = {}
+        self.storeys: dict[int, tuple[str | None, float | None]] = {}
+        self.spaces: dict[int, str | None] = {}
+
+    def add_statement(self, statement: bytes) -> None:
+        entity = split_entity(statement)
+        if entity is None or entity[1] not in _SCANNED:
+            return
+        entity_id, ifc_type, body = entity
+        try:
+            values = parse_step_arguments(body.decode("utf-8", "replace"), limit=10)
+        except IfcParseError:
+            return
+
+        if ifc_type in _PRODUCTS:
+            self.products.append(
+                (entity_id, ifc_type, _ref(_get(values, 5)), _ref(_get(values, 6)))
+            )
+            if ifc_type == _SPACE:
+                self.spaces[entity_id] = _text(_get(values, 7)) or _text(_get(values, 2))
+        elif ifc_type in _QUANTITY_INDEX:
+            name, value = _get(values, 0), _get(values, 3)
+            if isinstance(value, (int, float)):
+                self.quantities[entity_id] = (
+                    _QUANTITY_INDEX[ifc_type],
+                    name if isinstance(name, str) else "",
+                    float(value),
+                )
+        elif ifc_type == _ELEMENT_QUANTITY:
+            self.element_quantities[entity_id] = _refs(_get(values, 5))
+        elif ifc_type == _DEFINES:
+            definition = _ref(_get(values, 5))
+            if definition is not None:
+                self.definitions.setdefault(definition, []).extend(_refs(_get(values, 4)))
+        elif ifc_type == _CONTAINMENT:
+            structure = _ref(_get(values, 5))
+            if structure is not None:
+                self.container.update(dict.fromkeys(_refs(_get(values, 4)), structure))
+        elif ifc_type == _AGGREGATES:
+            whole = _ref(_get(values, 4))
+            if whole is not None:
+                self.parent.update(dict.fromkeys(_refs(_get(values, 5)), whole))
+        elif ifc_type == _STOREY:
+            elevation = _get(values, 9)
+            self.storeys[entity_id] = (
+                _text(_get(values, 2)),
+                float(elevation) if isinstance(elevation, (int, float)) else None,
+            )
+
+    def merge(self, other: ColumnScan) -> None:
+        self.products.extend(other.products)
+        self.container.update(other.container)
+        self.parent.update(other.parent)
+        for definition, elements in other.definitions.items():
+            self.definitions.setdefault(definition, []).extend(elements)
+        self.element_quantities.update(other.element_quantities)
+        self.quantities.update(other.quantities)
+        self.storeys.update(other.storeys)
+        self.spaces.update(other.spaces)
+
+
+def scan_columns_range(path: Path, start: int, end: int) -> ColumnScan:
+    scan = ColumnScan()
+    with open_blob(path, buffering=_READ_BUFFER) as handle:
+        add_statement = scan.add_statement
+        for _, statement in iter_statements(handle, start=start, end=end):
+            add_statement(statement)
+    return scan
+
+
+@dataclass(slots=True)
+class IfcColumns:
+    """Colunas por elemento (mesma ordem do arquivo) e as tabelas de rótulos."""
+
+    step_ids: Any
+    type_codes: Any
+    storeys: Any
+    spaces: Any
+    quantities: Any
+    bboxes: Any
+    type_names: list[str] = field(default_factory=list)
+    storey_table: list[tuple[int, str | None, float | None]] = field(default_factory=list)
+    space_table: list[tuple[int, str | None]] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.step_ids)
+
+    def save(self, directory: Path) -> None:
+        """Grava em diretório temporário e renomeia: leitores nunca veem colunas parciais."""
+
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        temporary = directory.with_name(f"{directory.name}.{os.getpid()}.tmp")
+        shutil.rmtree(temporary, ignore_errors=True)
+        temporary.mkdir()
+        arrays = (
+            self.step_ids,
+            self.type_codes,
+            self.storeys,
+            self.spaces,
+            self.quantities,
+            self.bboxes,
+        )
+        for name, values in zip(_FILES, arrays):
+            np.save(temporary / f"{name}.npy", values)
+        (temporary / "meta.json").write_text(
+            json.dumps(
+                {
+                    "types": self.type_names,
+                    "storeys": self.storey_table,
+                    "spaces": self.space_table,
+                    "elapsed_seconds": self.elapsed_seconds,
+                },
+                ensure_ascii=False,
+            )
+        )
+        try:
+            temporary.rename(directory)
+        except OSError:
+            # Outro processo gravou o mesmo conteúdo antes.
+            shutil.rmtree(temporary, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: Path) -> IfcColumns:
+        meta = json.loads((directory / "meta.json").read_text())
+        arrays = [np.load(directory / f"{name}.npy", mmap_mode="r") for name in _FILES]
+        return cls(
+            *arrays,
+            type_names=list(meta["types"]),
+            storey_table=[tuple(item) for item in meta["storeys"]],
+            space_table=[tuple(item) for item in meta["spaces"]],
+            elapsed_seconds=meta.get("elapsed_seconds", 0.0),
+        )
+
+    def aggregate(
+        self,
+        *,
+        by: Sequence[str] = ("type",),
+        measure: str = "count",
+        ifc_type: str | None = None,
+    ) -> list[IfcAggregate]:
+        """Group-by vetorizado: contagem e soma de `measure` por combinação de `by`.
+
+        Linhas ordenadas pelo total (ou contagem) decrescente.
+        """
+
+        if any(key not in GROUP_KEYS for key in by):
+            raise ValueError(f"Agrupamento inválido: {', '.join(by)}")
+        if measure not in MEASURES:
+            raise ValueError(f"Medida inválida: {measure}")
+
+        mask = slice(None)
+        if ifc_type is not None:
+            name = DISPLAY_NAMES.get(ifc_type.upper(), ifc_type)
+            if name not in self.type_names:
+                return []
+            mask = np.asarray(self.type_codes) == self.type_names.index(name)
+
+        columns = {"type": self.type_codes, "storey": self.storeys, "space": self.spaces}
+        keys = [np.asarray(columns[key], dtype=np.int64)[mask] for key in by]
+        size = len(np.asarray(self.step_ids)[mask])
+        if size == 0:
+            return []
+        # As chaves são códigos pequenos (-1 = sem valor): viram um único inteiro em
+        # base mista, e o `np.unique` 1-D evita a ordenação lexicográfica por linhas.
+        combined = np.zeros(size, dtype=np.int64)
+        radices = []
+        for key in keys:
+            radix = int(key.max()) + 2
+            combined = combined * radix + (key + 1)
+            radices.append(radix)
+        codes, inverse = np.unique(combined, return_inverse=True)
+        groups = np.empty((len(codes), len(keys)), dtype=np.int64)
+        for position in range(len(keys) - 1, -1, -1):
+            codes, digit = np.divmod(codes, radices[position])
+            groups[:, position] = digit - 1
+        counts = np.bincount(inverse, minlength=len(groups))
+
+        totals = measured = None
+        if measure != "count":
+            values = np.asarray(self.quantities)[mask, QUANTITY_COLUMNS.index(measure)]
+            present = ~np.isnan(values)
+            totals = np.bincount(
+                inverse, weights=np.where(present, values, 0.0), minlength=len(groups)
+            )
+            measured = np.bincount(inverse, weights=present, minlength=len(groups))
+
+        rows = [
+            IfcAggregate(
+                group={key: self.label(key, int(code)) for key, code in zip(by, groups[row])},
+                count=int(counts[row]),
+                total=float(totals[row]) if totals is not None else None,
+                measured=int(measured[row]) if measured is not None else int(counts[row]),
+            )
+            for row in range(len(groups))
+        ]
+        rows.sort(key=lambda row: -(row.total if row.total is not None else row.count))
+        return rows
+
+    def render(self, *, token_budget: int) -> str:
+        """Agregados por pavimento e por tipo para os prompts."""
+
+        return fit_to_token_budget(self._render, 40, token_budget)
+
+    def _render(self, limit: int) -> str:
+        lines = [f"Agregados dos {len(self)} elementos do modelo IFC."]
+        by_storey = {
+            row.group["storey"]: [row.count] for row in self.aggregate(by=("storey",))
+        }
+        for measure in ("area", "volume"):
+            for row in self.aggregate(by=("storey",), measure=measure):
+                by_storey[row.group["storey"]].append(row.total if row.measured else None)
+        if by_storey:
+            items = [
+                f"{storey or 'sem pavimento'}: {count} elem."
+                + (f", área {area:.6g}" if area else "")
+                + (f", volume {volume:.6g}" if volume else "")
+                for storey, (count, area, volume) in by_storey.items()
+            ]
+            lines.append("Por pavimento: " + _clip(items, limit))
+        for measure, title in (("area", "Área por tipo"), ("volume", "Volume por tipo")):
+            rows = [row for row in self.aggregate(measure=measure) if row.measured]
+            if rows:
+                lines.append(
+                    f"{title}: "
+                    + _clip(
+                        [f"{row.group['type']}={row.total:.6g} ({row.measured})" for row in rows],
+                        limit,
+                    )
+                )
+        return "\n".join(lines)
+
+    def label(self, key: str, code: int) -> str | None:
+        if key == "type":
+            return self.type_names[code]
+        if code < 0:
+            return None
+        if key == "storey":
+            storey_id, name, _ = self.storey_table[code]
+            return name or f"#{storey_id}"
+        space_id, name = self.space_table[code]
+        return name or f"#{space_id}"
+
+
+def extract_columns(
+    path: str | Path,
+    index: IfcEntityIndex,
+    *,
+    workers: int = 1,
+    executor: Executor | None = None,
+    min_chunk_bytes: int = 32 * 1024 * 1024,
+) -> IfcColumns:
+    """Lê o arquivo e monta as colunas; `index` resolve posicionamento e geometria."""
+
+    if np is None:
+        raise RuntimeError("NumPy não está instalado")
+    path = Path(path)
+    started = time.perf_counter()
+    scan = ColumnScan()
+    for partial in map_data_ranges(
+        scan_columns_range,
+        path,
+        locate_data_section(path),
+        workers=workers,
+        executor=executor,
+        min_chunk_bytes=min_chunk_bytes,
+    ):
+        scan.merge(partial)
+
+    count = len(scan.products)
+    type_names = sorted(
+        {DISPLAY_NAMES[ifc_type.decode("ascii")] for _, ifc_type, _, _ in scan.products}
+    )
+    type_codes = {name.upper().encode("ascii"): code for code, name in enumerate(type_names)}
+    storey_ids = sorted(scan.storeys)
+    storey_codes = {storey_id: code for code, storey_id in enumerate(storey_ids)}
+    space_ids = sorted(scan.spaces)
+    space_codes = {space_id: code for code, space_id in enumerate(space_ids)}
+
+    step_ids = np.empty(count, dtype=np.int64)
+    types = np.empty(count, dtype=np.uint16)
+    storeys = np.full(count, -1, dtype=np.int32)
+    spaces = np.full(count, -1, dtype=np.int32)
+    quantities = np.full((count, len(QUANTITY_COLUMNS)), np.nan)
+    bboxes = np.full((count, 6), np.nan)
+    rows = {}
+    geometry = _Geometry(index)
+    for row, (entity_id, ifc_type, placement, representation) in enumerate(scan.products):
+        rows[entity_id] = row
+        step_ids[row] = entity_id
+        types[row] = type_codes[ifc_type]
+        storey, space = _location(entity_id, scan, storey_codes, space_codes)
+        storeys[row], spaces[row] = storey, space
+        box = geometry.bbox(placement, representation)
+        if box is not None:
+            bboxes[row] = box
+
+    # A primeira quantidade de cada tipo por elemento, preferindo as `Net*`.
+    for definition, elements in scan.definitions.items():
+        members = scan.element_quantities.get(definition)
+        if not members:
+            continue
+        for quantity_id in members:
+            quantity = scan.quantities.get(quantity_id)
+            if quantity is None:
+                continue
+            column, name, value = quantity
+            for element in elements:
+                row = rows.get(element)
+                if row is None:
+                    continue
+                if math.isnan(quantities[row, column]) or name.startswith("Net"):
+                    quantities[row, column] = value
+
+    return IfcColumns(
+        step_ids=step_ids,
+        type_codes=types,
+        storeys=storeys,
+        spaces=spaces,
+        quantities=quantities,
+        bboxes=bboxes,
+        type_names=type_names,
+        storey_table=[(storey_id, *scan.storeys[storey_id]) for storey_id in storey_ids],
+        space_table=[(space_id, scan.spaces[space_id]) for space_id in space_ids],
+        elapsed_seconds=time.perf_counter() - started,
+    )
+
+
+def _location(
+    entity_id: int,
+    scan: ColumnScan,
+    storey_codes: dict[int, int],
+    space_codes: dict[int, int],
+) -> tuple[int, int]:
+    """(pavimento, espaço) do elemento, subindo contenção e agregação até um pavimento."""
+
+    storey = space = -1
+    current = scan.container.get(entity_id, scan.parent.get(entity_id))
+    for _ in range(16):  # proteção contra ciclos em arquivos malformados
+        if current is None:
+            break
+        if space < 0 and current in space_codes:
+            space = space_codes[current]
+        if current in storey_codes:
+            storey = storey_codes[current]
+            break
+        current = scan.parent.get(current, scan.container.get(current))
+    return storey, space
+
+
+Vector = tuple[float, float, float]
+
+
+@dataclass(frozen=True, slots=True)
+class _Transform:
+    origin: Vector
+    axes: tuple[Vector, Vector, Vector]
+
+    def apply(self, point: Vector) -> Vector:
+        x, y, z = self.axes
+        return (
+            self.origin[0] + x[0] * point[0] + y[0] * point[1] + z[0] * point[2],
+            self.origin[1] + x[1] * point[0] + y[1] * point[1] + z[1] * point[2],
+            self.origin[2] + x[2] * point[0] + y[2] * point[1] + z[2] * point[2],
+        )
+
+    def rotate(self, vector: Vector) -> Vector:
+        return _subtract(self.apply(vector), self.origin)
+
+    def then(self, local: _Transform) -> _Transform:
+        return _Transform(
+            self.apply(local.origin), tuple(self.rotate(axis) for axis in local.axes)
+        )
+
+
+_IDENTITY = _Transform((0.0, 0.0, 0.0), ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)))
+
+
+class _Geometry:
+    """Caixas envolventes aproximadas a partir do posicionamento e da representação.
+
+    Considera `Box` (IfcBoundingBox) e sólidos extrudados de perfis retangulares,
+    circulares ou poligonais; sem geometria reconhecida, a caixa é o ponto de
+    inserção do elemento.
+    """
+
+    def __init__(self, index: IfcEntityIndex) -> None:
+        self._index = index
+        self._placements: dict[int, _Transform] = {}
+
+    def bbox(self, placement: int | None, representation: int | None) -> list[float] | None:
+        if placement is None:
+            return None
+        try:
+            world = self._placement(placement, depth=0)
+            points = [world.apply(point) for point in self._local_points(representation)]
+        except (KeyError, IfcParseError, TypeError, ValueError, IndexError):
+            return None
+        if not points:
+            points = [world.origin]
+        xs, ys, zs = zip(*points)
+        return [min(xs), min(ys), min(zs), max(xs), max(ys), max(zs)]
+
+    def _entity(self, ref: Any) -> tuple[str, list[Any]] | None:
+        if not isinstance(ref, EntityRef) or ref not in self._index:
+            return None
+        entity = self._index.entity(ref)
+        return entity.ifc_type, entity.arguments
+
+    def _placement(self, ref: int, *, depth: int) -> _Transform:
+        cached = self._placements.get(ref)
+        if cached is not None:
+            return cached
+        entity = self._entity(EntityRef(ref))
+        transform = _IDENTITY
+        if entity is not None and entity[0] == "IFCLOCALPLACEMENT" and depth < 32:
+            relative_to, relative = _get(entity[1], 0), _get(entity[1], 1)
+            transform = self._axis_placement(relative)
+            if isinstance(relative_to, EntityRef):
+                transform = self._placement(relative_to, depth=depth + 1).then(transform)
+        self._placements[ref] = transform
+        return transform
+
+    def _axis_placement(self, ref: Any) -> _Transform:
+        entity = self._entity(ref)
+        if entity is None:
+            return _IDENTITY
+        ifc_type, values = entity
+        origin = self._point(_get(values, 0))
+        if ifc_type == "IFCAXIS2PLACEMENT2D":
+            x_axis = self._direction(_get(values, 1)) or (1.0, 0.0, 0.0)
+            return _Transform(origin, _axes((0.0, 0.0, 1.0), x_axis))
+        z_axis = self._direction(_get(values, 1)) or (0.0, 0.0, 1.0)
+        x_axis = self._direction(_get(values, 2)) or (1.0, 0.0, 0.0)
+        return _Transform(origin, _axes(z_axis, x_axis))
+
+    def _point(self, ref: Any) -> Vector:
+        entity = self._entity(ref)
+        if entity is None or entity[0] != "IFCCARTESIANPOINT":
+            return (0.0, 0.0, 0.0)
+        return _vector(_get(entity[1], 0))
+
+    def _direction(self, ref: Any) -> Vector | None:
+        entity = self._entity(ref)
+        if entity is None or entity[0] != "IFCDIRECTION":
+            return None
+        return _vector(_get(entity[1], 0))
+
+    def _local_points(self, representation: int | None) -> list[Vector]:
+        shape = self._entity(EntityRef(representation)) if representation else None
+        if shape is None or shape[0] != "IFCPRODUCTDEFINITIONSHAPE":
+            return []
+        items: list[Any] = []
+        for ref in _get(shape[1], 2) or []:
+            entity = self._entity(ref)
+            if entity is None or entity[0] != "IFCSHAPEREPRESENTATION":
+                continue
+            if _get(entity[1], 1) == "Box":
+                items = list(_get(entity[1], 3) or [])
+                break
+            items.extend(_get(entity[1], 3) or [])
+
+        points: list[Vector] = []
+        for ref in items:
+            entity = self._entity(ref)
+            if entity is None:
+                continue
+            ifc_type, values = entity
+            if ifc_type == "IFCBOUNDINGBOX":
+                corner = self._point(_get(values, 0))
+                size = tuple(float(value) for value in values[1:4])
+                points += _box_corners(corner, _add(corner, size))
+            elif ifc_type == "IFCEXTRUDEDAREASOLID":
+                points += self._extrusion(values)
+        return points
+
+    def _extrusion(self, values: list[Any]) -> list[Vector]:
+        profile = self._profile(_get(values, 0))
+        if not profile:
+            return []
+        position = self._axis_placement(_get(values, 1))
+        direction = self._direction(_get(values, 2)) or (0.0, 0.0, 1.0)
+        depth = float(_get(values, 3) or 0.0)
+        offset = tuple(component * depth for component in direction)
+        return [
+            position.apply(point) for base in profile for point in (base, _add(base, offset))
+        ]
+
+    def _profile(self, ref: Any) -> list[Vector]:
+        entity = self._entity(ref)
+        if entity is None:
+            return []
+        ifc_type, values = entity
+        if ifc_type == "IFCRECTANGLEPROFILEDEF":
+            half_x, half_y = float(values[3]) / 2, float(values[4]) / 2
+            corners = [(-half_x, -half_y), (half_x, -half_y), (half_x, half_y), (-half_x, half_y)]
+        elif ifc_type == "IFCCIRCLEPROFILEDEF":
+            radius = float(values[3])
+            corners = [(-radius, -radius), (radius, -radius), (radius, radius), (-radius, radius)]
+        elif ifc_type == "IFCARBITRARYCLOSEDPROFILEDEF":
+            curve = self._entity(_get(values, 2))
+            if curve is None or curve[0] != "IFCPOLYLINE":
+                return []
+            return [self._point(point) for point in _get(curve[1], 0) or []]
+        else:
+            return []
+        position = self._axis_placement(_get(values, 2))
+        return [position.apply((x, y, 0.0)) for x, y in corners]
+
+
+def _axes(z_axis: Vector, x_axis: Vector) -> tuple[Vector, Vector, Vector]:
+    z = _normalize(z_axis)
+    projection = sum(a * b for a, b in zip(x_axis, z))
+    x = _normalize(_subtract(x_axis, tuple(component * projection for component in z)))
+    y = (z[1] * x[2] - z[2] * x[1], z[2] * x[0] - z[0] * x[2], z[0] * x[1] - z[1] * x[0])
+    return x, y, z
+
+
+def _box_corners(low: Vector, high: Vector) -> list[Vector]:
+    return [
+        (x, y, z)
+        for x in (low[0], high[0])
+        for y in (low[1], high[1])
+        for z in (low[2], high[2])
+    ]
+
+
+def _vector(values: Any) -> Vector:
+    coordinates = [float(value) for value in (values or [])][:3]
+    return tuple(coordinates + [0.0] * (3 - len(coordinates)))
+
+
+def _normalize(vector: Vector) -> Vector:
+    length = math.sqrt(sum(component * component for component in vector)) or 1.0
+    return tuple(component / length for component in vector)
+
+
+def _add(a: Vector, b: Vector) -> Vector:
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+
+def _subtract(a: Vector, b: Vector) -> Vector:
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def _clip(items: list[str], limit: int) -> str:
+    shown = items[:limit]
+    suffix = f"; +{len(items) - len(shown)}" if len(items) > len(shown) else ""
+    return "; ".join(shown) + suffix
+
+
+def _get(values: list[Any], index: int) -> Any:
+    return values[index] if index < len(values) else None
+
+
+def _ref(value: Any) -> int | None:
+    return int(value) if isinstance(value, EntityRef) else None
+
+
+def _refs(value: Any) -> list[int]:
+    if not isinstance(value, list):
+        return []
+    return [int(item) for item in value if isinstance(item, EntityRef)]
+
+
+def _text(value: Any) -> str | None:
+    return value if isinstance(value, str) and not isinstance(value, StepEnum) else None
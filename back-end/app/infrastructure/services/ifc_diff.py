@@ -0,0 +1,326 @@
+"""Diferença estrutural entre duas versões de um modelo IFC.
+
+Cada elemento construtivo vira uma impressão digital (GlobalId, tipo, nome e
+hash dos atributos). Referências `#id` são normalizadas antes do hash, pois
+os identificadores STEP mudam a cada exportação mesmo sem alteração real.
+
+Com o índice de entidades, o hash inclui também o que o elemento referencia
+(posicionamento e representação) e os conjuntos de propriedades que o
+descrevem: cada `#id` desses grafos é trocado pelo hash da entidade apontada,
+então mover, remodelar ou mudar uma propriedade conta como modificação.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections.abc import Iterable
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any
+
+from app.infrastructure.services.blob_codec import open_blob
+from app.infrastructure.services.ifc_index import IfcEntityIndex
+from app.infrastructure.services.ifc_parser import (
+    DISPLAY_NAMES,
+    PRODUCT_TYPES,
+    EntityRef,
+    decode_step_string,
+    fit_to_token_budget,
+    iter_statements,
+    locate_data_section,
+    map_data_ranges,
+    split_entity,
+)
+
+
+_BLOCK_SIZE = 4 * 1024 * 1024
+_PRODUCTS = frozenset(name.encode("ascii") for name in PRODUCT_TYPES)
+# Só as linhas que começam um elemento construtivo interessam: em vez de separar
+# todas as instruções, os blocos são varridos por esta expressão (nomes de tipo
+# em maiúsculas, como exige a ISO 10303-21).
+_PRODUCT_LINE = re.compile(
+    rb"^[ \t]*#(\d+)[ \t]*=[ \t]*("
+    + b"|".join(sorted(_PRODUCTS, key=len, reverse=True))
+    + rb")[ \t]*\(([^\n]*)",
+    re.MULTILINE,
+)
+_DISPLAY = {name: DISPLAY_NAMES[name.decode("ascii")] for name in _PRODUCTS}
+_REFERENCE = re.compile(rb"#\d+")
+# GlobalId e Name (1º e 3º atributos de IfcRoot).
+_ATTRIBUTES = re.compile(rb"\s*'([^']*)'(?:\s*,\s*(?:#\d+|\$)\s*,\s*('(?:[^']|'')*'))?")
+# Strings inteiras (um `#` dentro delas não é referência) ou referências.
+_STRING_OR_REFERENCE = re.compile(rb"'(?:[^']|'')*'|#(\d+)")
+# GlobalId e OwnerHistory de IfcRoot: mudam entre exportações sem mudança no modelo.
+_ROOT_PREFIX = re.compile(rb"\s*'[^']*'\s*,\s*(?:#\d+|\$)\s*,")
+# ObjectPlacement e Representation (6º e 7º atributos de IfcProduct).
+_PLACEMENT, _REPRESENTATION = 5, 6
+_PROPERTY_DEFINITIONS = frozenset({b"IFCPROPERTYSET", b"IFCELEMENTQUANTITY"})
+_OWNER_HISTORY = b"IFCOWNERHISTORY"
+
+
+@dataclass(slots=True)
+class ElementFingerprint:
+    key: str
+    step_id: int
+    ifc_type: str
+    name: str | None
+    digest: bytes
+
+    def label(self) -> str:
+        name = f" '{self.name}'" if self.name else ""
+        return f"{self.ifc_type}{name} [{self.key}]"
+
+
+def fingerprint_statement(statement: bytes) -> ElementFingerprint | None:
+    """Impressão digital de uma instrução, ou `None` se não for elemento construtivo."""
+
+    entity = split_entity(statement)
+    if entity is None or entity[1] not in _PRODUCTS:
+        return None
+    step_id, ifc_type, body = entity
+    return _fingerprint(step_id, ifc_type, body)
+
+
+def _fingerprint(step_id: int, ifc_type: bytes, body: bytes) -> ElementFingerprint:
+    digest = blake2b(ifc_type + b"(" + _REFERENCE.sub(b"#", body), digest_size=8).digest()
+    attributes = _ATTRIBUTES.match(body)
+    if attributes is None:
+        return ElementFingerprint(f"#{step_id}", step_id, _DISPLAY[ifc_type], None, digest)
+    global_id, name = attributes.groups()
+    return ElementFingerprint(
+        global_id.decode("ascii", "replace"),
+        step_id,
+        _DISPLAY[ifc_type],
+        decode_step_string(name.decode("utf-8", "replace")) if name else None,
+        digest,
+    )
+
+
+def fingerprint_range(path: Path, start: int, end: int) -> list[ElementFingerprint]:
+    """Impressões dos elementos cujas instruções começam em `[start, end)`.
+
+    O intervalo é lido em blocos terminados em quebra de linha. Instruções de
+    uma linha são tratadas direto no bloco; as que continuam nas linhas
+    seguintes (strings com quebra de linha) são relidas com `iter_statements`.
+    """
+
+    fingerprints: list[ElementFingerprint] = []
+    with open_blob(path) as handle, open_blob(path) as statements:
+        position = start
+        handle.seek(start)
+        carry = b""
+        while position < end:
+            chunk = handle.read(min(_BLOCK_SIZE, end - position))
+            if not chunk:
+                break
+            position += len(chunk)
+            block = carry + chunk
+            cut = block.rfind(b"\n") + 1 if position < end else len(block)
+            block, carry = block[:cut], block[cut:]
+            block_offset = position - len(carry) - len(block)
+            for match in _PRODUCT_LINE.finditer(block):
+                rest = match.group(3).rstrip()
+                if rest.endswith(b";") and not rest.count(b"'") % 2:
+                    body = rest[:-1].rstrip()
+                    fingerprints.append(
+                        _fingerprint(
+                            int(match.group(1)),
+                            match.group(2),
+                            body[:-1] if body.endswith(b")") else body,
+                        )
+                    )
+                    continue
+                _, statement = next(
+                    iter_statements(statements, start=block_offset + match.start())
+                )
+                fingerprint = fingerprint_statement(statement)
+                if fingerprint is not None:
+                    fingerprints.append(fingerprint)
+    return fingerprints
+
+
+def fingerprint_elements(
+    path: str | Path,
+    *,
+    workers: int = 1,
+    executor: Executor | None = None,
+    min_chunk_bytes: int = 32 * 1024 * 1024,
+    index: IfcEntityIndex | None = None,
+) -> dict[str, ElementFingerprint]:
+    """Impressões de todos os elementos do arquivo, por GlobalId.
+
+    Divide a seção DATA como `parse_ifc_inventory` quando há mais de um worker.
+    Com `index`, as dependências de cada elemento entram no hash.
+    """
+
+    path = Path(path)
+    result: dict[str, ElementFingerprint] = {}
+    for partial in map_data_ranges(
+        fingerprint_range,
+        path,
+        locate_data_section(path),
+        workers=workers,
+        executor=executor,
+        min_chunk_bytes=min_chunk_bytes,
+    ):
+        result.update(_by_key(partial))
+    if index is not None:
+        include_dependencies(result, index)
+    return result
+
+
+def include_dependencies(
+    fingerprints: dict[str, ElementFingerprint], index: IfcEntityIndex
+) -> None:
+    """Mistura ao hash de cada elemento o posicionamento, a geometria e as propriedades."""
+
+    hasher = _DependencyHasher(index)
+    properties: dict[int, list[bytes]] = {}
+    for relation_id in index.ids_of_type("IFCRELDEFINESBYPROPERTIES"):
+        arguments = index.entity(relation_id).arguments
+        if len(arguments) < 6 or not isinstance(arguments[5], EntityRef):
+            continue
+        digest = hasher.digest(arguments[5])
+        for related in arguments[4] or ():
+            properties.setdefault(related, []).append(digest)
+
+    for fingerprint in fingerprints.values():
+        if fingerprint.step_id not in index:
+            continue
+        arguments = index.entity(fingerprint.step_id).arguments
+        parts = [fingerprint.digest]
+        for position in (_PLACEMENT, _REPRESENTATION):
+            target = arguments[position] if len(arguments) > position else None
+            parts.append(hasher.digest(target) if isinstance(target, EntityRef) else b"$")
+        parts += sorted(properties.get(fingerprint.step_id, ()))
+        fingerprint.digest = blake2b(b"".join(parts), digest_size=8).digest()
+
+
+class _DependencyHasher:
+    """Hash de Merkle: cada `#id` do corpo vira o hash da entidade referenciada."""
+
+    def __init__(self, index: IfcEntityIndex) -> None:
+        self._index = index
+        self._digests: dict[int, bytes] = {}
+
+    def digest(self, entity_id: int) -> bytes:
+        cached = self._digests.get(entity_id)
+        if cached is not None:
+            return cached
+        if entity_id not in self._index:
+            return b"?"
+        entity = split_entity(bytes(self._index.raw(entity_id)))
+        if entity is None or entity[1] == _OWNER_HISTORY:
+            return b""
+        _, ifc_type, body = entity
+        # Marca antes de descer: um ciclo (inválido em IFC) não recursa para sempre.
+        self._digests[entity_id] = b"~"
+        if ifc_type in _PROPERTY_DEFINITIONS:
+            prefix = _ROOT_PREFIX.match(body)
+            body = body[prefix.end() :] if prefix else body
+        resolved = _STRING_OR_REFERENCE.sub(self._resolve, body)
+        digest = blake2b(ifc_type + b"(" + resolved, digest_size=8).digest()
+        self._digests[entity_id] = digest
+        return digest
+
+    def _resolve(self, match: re.Match[bytes]) -> bytes:
+        if match.group(1) is None:
+            return match.group(0)
+        return b"#" + self.digest(int(match.group(1))).hex().encode("ascii")
+
+
+def _by_key(fingerprints: Iterable[ElementFingerprint]) -> dict[str, ElementFingerprint]:
+    return {fingerprint.key: fingerprint for fingerprint in fingerprints}
+
+
+def fingerprints_to_rows(fingerprints: dict[str, ElementFingerprint]) -> list[list[Any]]:
+    return [
+        [item.key, item.step_id, item.ifc_type, item.name, item.digest.hex()]
+        for item in fingerprints.values()
+    ]
+
+
+def fingerprints_from_rows(rows: Iterable[list[Any]]) -> dict[str, ElementFingerprint]:
+    return _by_key(
+        ElementFingerprint(key, step_id, ifc_type, name, bytes.fromhex(digest))
+        for key, step_id, ifc_type, name, digest in rows
+    )
+
+
+@dataclass(slots=True)
+class IfcDiff:
+    """Elementos adicionados, removidos e modificados entre duas versões."""
+
+    added: list[ElementFingerprint] = field(default_factory=list)
+    removed: list[ElementFingerprint] = field(default_factory=list)
+    # Pares (versão anterior, versão atual).
+    modified: list[tuple[ElementFingerprint, ElementFingerprint]] = field(default_factory=list)
+    unchanged: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def changed(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.modified)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.changed == 0
+
+    @property
+    def changed_ratio(self) -> float:
+        total = self.changed + self.unchanged
+        return self.changed / total if total else 0.0
+
+    def changed_terms(self) -> set[str]:
+        """GlobalIds e nomes (antigos e novos) dos elementos alterados, em minúsculas."""
+
+        terms: set[str] = set()
+        modified = (item for pair in self.modified for item in pair)
+        for item in (*self.added, *self.removed, *modified):
+            terms.add(item.key.lower())
+            if item.name:
+                terms.add(item.name.lower())
+        return terms
+
+    def render(self, *, token_budget: int) -> str:
+        """Texto para o prompt; as listas encolhem até caber no orçamento."""
+
+        return fit_to_token_budget(self._render, 200, token_budget)
+
+    def _render(self, limit: int) -> str:
+        lines = [
+            f"Alterações desde a versão anterior: {len(self.added)} adicionados, "
+            f"{len(self.removed)} removidos, {len(self.modified)} modificados, "
+            f"{self.unchanged} inalterados."
+        ]
+        for title, items in (
+            ("Adicionados", self.added),
+            ("Removidos", self.removed),
+            ("Modificados", [current for _, current in self.modified]),
+        ):
+            if items:
+                shown = "; ".join(item.label() for item in items[:limit])
+                suffix = f"; +{len(items) - limit}" if len(items) > limit else ""
+                lines.append(f"{title}: {shown}{suffix}")
+        return "\n".join(lines)
+
+
+def diff_fingerprints(
+    previous: dict[str, ElementFingerprint], current: dict[str, ElementFingerprint]
+) -> IfcDiff:
+    started = time.perf_counter()
+    diff = IfcDiff()
+    for key, fingerprint in current.items():
+        before = previous.get(key)
+        if before is None:
+            diff.added.append(fingerprint)
+        elif before.digest != fingerprint.digest:
+            diff.modified.append((before, fingerprint))
+        else:
+            diff.unchanged += 1
+    diff.removed = [item for key, item in previous.items() if key not in current]
+    diff.elapsed_seconds = time.perf_counter() - started
+    return diff
@@ -0,0 +1,347 @@
+"""Índice de offsets das entidades de um IFC, persistido ao lado do arquivo enviado.
+
+O índice (`<arquivo>.ifcidx`) guarda, em arrays contíguos, `#id → (offset, tamanho)`
+e `IfcType → ids`. Arquivo e índice são abertos com `mmap`, então resolver uma
+entidade é uma consulta O(1) seguida de uma fatia sem cópia do arquivo original.
+Para blobs comprimidos (`.zst`), os offsets são do conteúdo descomprimido e a
+instrução é lida pela tabela de busca, descomprimindo só o quadro que a contém.
+
+Layout (little-endian, blocos alinhados em 8 bytes):
+    cabeçalho | metadados JSON | ids (u32) | offsets (u64) | tamanhos (u32)
+    | tipos (u16) | ids por tipo (u32) | inícios por tipo (u64) | slots (u32)
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import struct
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from app.infrastructure.services.blob_codec import (
+    SeekableZstdReader,
+    content_size,
+    is_compressed,
+    open_blob,
+)
+from app.infrastructure.services.ifc_parser import (
+    IfcParseError,
+    iter_statements,
+    locate_data_section,
+    parse_step_arguments,
+    split_entity,
+)
+
+INDEX_MAGIC = b"IFCIDX01"
+INDEX_SUFFIX = ".ifcidx"
+
+# magic, sha256, tamanho do IFC, entidades, tipos, slots, tamanho dos metadados
+_HEADER = struct.Struct("<8s32sQQIQI")
+
+# Tabela direta `id → posição` só quando os ids são razoavelmente densos.
+_DENSE_FACTOR = 4
+
+_REFERENCE = re.compile(rb"#(\d+)")
+_STRING = re.compile(rb"'(?:[^']|'')*'")
+
+
+@dataclass(frozen=True, slots=True)
+class IfcEntity:
+    id: int
+    ifc_type: str
+    arguments: list[Any]
+
+
+def sidecar_path(source: str | Path) -> Path:
+    source = Path(source)
+    return source.with_name(source.name + INDEX_SUFFIX)
+
+
+def build_entity_index(source: str | Path, *, digest: str, target: Path | None = None) -> Path:
+    """Percorre o IFC uma vez e grava o índice (rename atômico ao final)."""
+
+    source = Path(source)
+    target = target or sidecar_path(source)
+    section = locate_data_section(source)
+
+    ids = array("I")
+    offsets = array("Q")
+    lengths = array("I")
+    type_codes = array("H")
+    type_names: dict[bytes, int] = {}
+    with open_blob(source, buffering=1024 * 1024) as handle:
+        source_size = handle.seek(0, os.SEEK_END)
+        for offset, statement in iter_statements(handle, start=section.start, end=section.end):
+            entity = split_entity(statement)
+            if entity is None:
+                continue
+            entity_id, ifc_type, _ = entity
+            code = type_names.setdefault(ifc_type, len(type_names))
+            ids.append(entity_id)
+            offsets.append(offset)
+            lengths.append(len(statement))
+            type_codes.append(code)
+
+    count = len(ids)
+    if any(ids[position] >= ids[position + 1] for position in range(count - 1)):
+        order = sorted(range(count), key=ids.__getitem__)
+        ids = array("I", (ids[position] for position in order))
+        offsets = array("Q", (offsets[position] for position in order))
+        lengths = array("I", (lengths[position] for position in order))
+        type_codes = array("H", (type_codes[position] for position in order))
+
+    # Ids agrupados por tipo (ordenação estável mantém a ordem crescente de id).
+    buckets: list[array] = [array("I") for _ in type_names]
+    for entity_id, code in zip(ids, type_codes):
+        buckets[code].append(entity_id)
+    type_starts = array("Q", [0])
+    type_members = array("I")
+    for bucket in buckets:
+        type_members.extend(bucket)
+        type_starts.append(len(type_members))
+
+    max_id = ids[-1] if count else 0
+    slots = array("I")
+    if count and max_id < _DENSE_FACTOR * count:
+        slots = array("I", bytes(4 * (max_id + 1)))
+        for position, entity_id in enumerate(ids):
+            slots[entity_id] = position + 1
+
+    metadata = json.dumps(
+        {
+            "schema": section.schema,
+            "types": [name.decode("ascii", "replace") for name in type_names],
+        }
+    ).encode("utf-8")
+    header = _HEADER.pack(
+        INDEX_MAGIC,
+        bytes.fromhex(digest),
+        source_size,
+        count,
+        len(type_names),
+        len(slots),
+        len(metadata),
+    )
+
+    temporary = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with temporary.open("wb") as handle:
+        for block in (
+            header,
+            metadata,
+            ids,
+            offsets,
+            lengths,
+            type_codes,
+            type_members,
+            type_starts,
+            slots,
+        ):
+            data = block.tobytes() if isinstance(block, array) else block
+            handle.write(data)
+            handle.write(b"\0" * (-len(data) % 8))
+    temporary.replace(target)
+    return target
+
+
+class IfcEntityIndex:
+    """Acesso direto às entidades de um IFC através do índice mapeado em memória."""
+
+    def __init__(self, source: Path, sidecar: Path) -> None:
+        self._source: mmap.mmap | SeekableZstdReader | None = None
+        self._index_file = sidecar.open("rb")
+        try:
+            if is_compressed(source):
+                self._source = SeekableZstdReader(source)
+            else:
+                self._source_file = source.open("rb")
+                self._source = mmap.mmap(self._source_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._load()
+        except (ValueError, OSError, struct.error) as exc:
+            self.close()
+            raise IfcParseError(f"Índice IFC inválido: {sidecar}") from exc
+
+    def _load(self) -> None:
+        view = memoryview(self._index)
+        (
+            magic,
+            digest,
+            self.source_size,
+            count,
+            type_count,
+            slot_count,
+            metadata_size,
+        ) = _HEADER.unpack_from(view)
+        if magic != INDEX_MAGIC:
+            raise ValueError("assinatura desconhecida")
+        self.digest = digest.hex()
+        position = _HEADER.size
+
+        def block(size: int, fmt: str | None = None) -> memoryview:
+            nonlocal position
+            data = view[position : position + size]
+            if len(data) != size:
+                raise ValueError("índice truncado")
+            position += size + (-size % 8)
+            return data.cast(fmt) if fmt else data
+
+        metadata = json.loads(bytes(block(metadata_size)))
+        self.schema: str | None = metadata.get("schema")
+        self._type_names: list[str] = metadata["types"]
+        self._type_codes = {name: code for code, name in enumerate(self._type_names)}
+        self._ids = block(4 * count, "I")
+        self._offsets = block(8 * count, "Q")
+        self._lengths = block(4 * count, "I")
+        self._types = block(2 * count, "H")
+        self._type_members = block(4 * count, "I")
+        self._type_starts = block(8 * (type_count + 1), "Q")
+        self._slots = block(4 * slot_count, "I")
+
+    def __enter__(self) -> IfcEntityIndex:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for name in (
+            "_ids",
+            "_offsets",
+            "_lengths",
+            "_types",
+            "_type_members",
+            "_type_starts",
+            "_slots",
+        ):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        for name in ("_source", "_index", "_source_file", "_index_file"):
+            resource = getattr(self, name, None)
+            if resource is not None:
+                try:
+                    resource.close()
+                except BufferError:  # pragma: no cover - fatias ainda referenciadas
+                    pass
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, entity_id: int) -> bool:
+        return self._position(entity_id) is not None
+
+    @property
+    def type_counts(self) -> dict[str, int]:
+        return {
+            name: self._type_starts[code + 1] - self._type_starts[code]
+            for code, name in enumerate(self._type_names)
+        }
+
+    def raw(self, entity_id: int) -> memoryview:
+        """Bytes da instrução `#id=...;` sem cópia (fatia do arquivo mapeado).
+
+        Em blobs comprimidos, a instrução é lida do quadro que a contém.
+        """
+
+        position = self._require(entity_id)
+        offset = self._offsets[position]
+        if isinstance(self._source, SeekableZstdReader):
+            return memoryview(self._source.read_at(offset, self._lengths[position]))
+        return memoryview(self._source)[offset : offset + self._lengths[position]]
+
+    def type_of(self, entity_id: int) -> str:
+        return self._type_names[self._types[self._require(entity_id)]]
+
+    def ids_of_type(self, ifc_type: str) -> memoryview:
+        """Ids (em ordem crescente) das entidades de um tipo, sem cópia."""
+
+        code = self._type_codes.get(ifc_type.upper())
+        if code is None:
+            return memoryview(array("I"))
+        return self._type_members[self._type_starts[code] : self._type_starts[code + 1]]
+
+    def entity(self, entity_id: int) -> IfcEntity:
+        parsed = split_entity(bytes(self.raw(entity_id)))
+        if parsed is None:  # pragma: no cover - offsets vieram de entidades válidas
+            raise IfcParseError(f"Entidade #{entity_id} ilegível")
+        _, ifc_type, arguments = parsed
+        return IfcEntity(
+            id=entity_id,
+            ifc_type=ifc_type.decode("ascii", "replace"),
+            arguments=parse_step_arguments(arguments.decode("utf-8", "replace")),
+        )
+
+    def references(self, entity_id: int) -> list[int]:
+        """Ids referenciados (`#n`) pelos argumentos da entidade, fora de strings."""
+
+        statement = bytes(self.raw(entity_id))
+        arguments = statement[statement.index(b"(") :]
+        return [int(match) for match in _REFERENCE.findall(_STRING.sub(b"''", arguments))]
+
+    def _position(self, entity_id: int) -> int | None:
+        if entity_id < 0:
+            return None
+        if len(self._slots):
+            if entity_id >= len(self._slots):
+                return None
+            slot = self._slots[entity_id]
+            return slot - 1 if slot else None
+        low, high = 0, len(self._ids)
+        while low < high:
+            middle = (low + high) // 2
+            if self._ids[middle] < entity_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self._ids) and self._ids[low] == entity_id:
+            return low
+        return None
+
+    def _require(self, entity_id: int) -> int:
+        position = self._position(entity_id)
+        if position is None:
+            raise KeyError(entity_id)
+        return position
+
+
+def read_index_digest(sidecar: Path) -> tuple[str, int] | None:
+    """(sha256, tamanho do IFC) registrados no índice, ou `None` se ausente ou inválido."""
+
+    try:
+        with sidecar.open("rb") as handle:
+            header = handle.read(_HEADER.size)
+        magic, digest, source_size, *_ = _HEADER.unpack(header)
+    except (OSError, struct.error):
+        return None
+    if magic != INDEX_MAGIC:
+        return None
+    return digest.hex(), source_size
+
+
+def ensure_entity_index(source: str | Path, *, digest: str) -> bool:
+    """Constrói o índice se faltar ou for de outro conteúdo; `True` se foi construído."""
+
+    source = Path(source)
+    sidecar = sidecar_path(source)
+    if read_index_digest(sidecar) == (digest, content_size(source)):
+        return False
+    build_entity_index(source, digest=digest, target=sidecar)
+    return True
+
+
+def open_entity_index(source: str | Path, *, digest: str) -> IfcEntityIndex:
+    """Abre o índice do arquivo, (re)construindo-o quando necessário."""
+
+    source = Path(source)
+    sidecar = sidecar_path(source)
+    if not ensure_entity_index(source, digest=digest):
+        try:
+            return IfcEntityIndex(source, sidecar)
+        except IfcParseError:
+            build_entity_index(source, digest=digest, target=sidecar)  # índice corrompido
+    return IfcEntityIndex(source, sidecar)
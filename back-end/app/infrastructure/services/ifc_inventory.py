@@ -0,0 +1,442 @@
+"""Inventário e índice de entidades IFC, reutilizados entre análises do mesmo arquivo."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import Settings, get_settings
+from app.infrastructure.services.analysis_cache import file_sha256
+from app.infrastructure.services.ifc_columns import (
+    COLUMNS_VERSION,
+    IfcColumns,
+    columns_available,
+    extract_columns,
+)
+from app.infrastructure.services.ifc_diff import (
+    ElementFingerprint,
+    IfcDiff,
+    diff_fingerprints,
+    fingerprint_elements,
+    fingerprints_from_rows,
+    fingerprints_to_rows,
+)
+from app.infrastructure.services.ifc_index import (
+    IfcEntityIndex,
+    ensure_entity_index,
+    open_entity_index,
+)
+from app.infrastructure.services.ifc_parser import (
+    IfcInventory,
+    IfcParseError,
+    is_step_file,
+    parse_ifc_inventory,
+)
+from app.infrastructure.services.ifc_spatial import (
+    SPATIAL_VERSION,
+    IfcSpatialIndex,
+    SpatialGrid,
+    build_grid,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Incrementar quando o formato ou o conteúdo do inventário mudar.
+INVENTORY_VERSION = 1
+FINGERPRINT_VERSION = 2
+
+
+class IfcInventoryService:
+    """Extrai (uma vez por conteúdo) e renderiza o inventário de arquivos IFC.
+
+    Com `build_index`, também garante o índice de offsets ao lado do arquivo,
+    usado depois para resolver entidades sem reler o modelo inteiro.
+    """
+
+    def __init__(
+        self,
+        *,
+        cache_dir: Path,
+        token_budget: int,
+        build_index: bool = True,
+        workers: int | None = 1,
+        min_chunk_bytes: int = 32 * 1024 * 1024,
+        columns: bool = False,
+        aggregates_token_budget: int = 600,
+        spatial_cache_size: int = 8,
+    ) -> None:
+        self._cache_dir = cache_dir
+        self._token_budget = token_budget
+        self._build_index = build_index
+        self._columns = columns and columns_available()
+        self._aggregates_token_budget = aggregates_token_budget
+        self._workers = workers or max(1, min(4, os.cpu_count() or 1))
+        self._min_chunk_bytes = min_chunk_bytes
+        self._executor: ProcessPoolExecutor | None = None
+        # caminho -> ((tamanho, mtime), índice)
+        self._spatial: OrderedDict[str, tuple[tuple[int, int], IfcSpatialIndex]] = OrderedDict()
+        self._spatial_cache_size = spatial_cache_size
+        self.parses_total = 0
+        self.cache_hits = 0
+        self.diffs_total = 0
+
+    @property
+    def variant(self) -> str:
+        return f"ifc-v{INVENTORY_VERSION}-b{self._token_budget}"
+
+    async def inventory(self, path: str, *, digest: str | None = None) -> IfcInventory | None:
+        """Inventário do arquivo ou `None` se não for STEP ou não puder ser lido."""
+
+        if not await asyncio.to_thread(is_step_file, path):
+            return None
+        try:
+            digest = digest or await file_sha256(path)
+            if self._build_index:
+                await self._ensure_index(path, digest)
+            cache_path = self._cache_dir / f"{digest}.inventory.v{INVENTORY_VERSION}.json"
+            cached = await asyncio.to_thread(_read_inventory, cache_path)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+
+            inventory = await asyncio.to_thread(
+                parse_ifc_inventory,
+                path,
+                workers=self._workers,
+                executor=self._pool() if self._workers > 1 else None,
+                min_chunk_bytes=self._min_chunk_bytes,
+            )
+            self.parses_total += 1
+        except (OSError, IfcParseError) as exc:
+            logger.warning("Inventário IFC indisponível para %s: %s", path, exc)
+            return None
+
+        logger.info(
+            "Inventário IFC de %s: %s entidades, %.1f MB em %.2fs (%.1f MB/s, %s worker(s))",
+            path,
+            inventory.entity_count,
+            inventory.bytes_read / 1_000_000,
+            inventory.elapsed_seconds,
+            inventory.throughput_mb_s,
+            self._workers,
+        )
+        try:
+            await asyncio.to_thread(_write_inventory, cache_path, inventory)
+        except OSError as exc:  # pragma: no cover - erro de IO difícil de reproduzir
+            logger.warning("Falha ao gravar inventário IFC em cache: %s", exc)
+        return inventory
+
+    async def render(self, path: str, *, digest: str | None = None) -> str | None:
+        inventory = await self.inventory(path, digest=digest)
+        if inventory is None:
+            return None
+        return inventory.render(token_budget=self._token_budget)
+
+    def render_diff(self, diff: IfcDiff) -> str:
+        return diff.render(token_budget=self._token_budget)
+
+    async def columns(self, path: str, *, digest: str | None = None) -> IfcColumns | None:
+        """Colunas por elemento (tipo, pavimento, espaço, quantidades, caixa envolvente).
+
+        Extraídas uma vez por conteúdo e mapeadas em memória nas leituras seguintes.
+        """
+
+        if not self._columns or not await asyncio.to_thread(is_step_file, path):
+            return None
+        try:
+            digest = digest or await file_sha256(path)
+            directory = self._cache_dir / f"{digest}.columns.v{COLUMNS_VERSION}"
+            cached = await asyncio.to_thread(_read_columns, directory)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+            index = await asyncio.to_thread(open_entity_index, path, digest=digest)
+            try:
+                columns = await asyncio.to_thread(
+                    extract_columns,
+                    path,
+                    index,
+                    workers=self._workers,
+                    executor=self._pool() if self._workers > 1 else None,
+                    min_chunk_bytes=self._min_chunk_bytes,
+                )
+            finally:
+                index.close()
+            self.parses_total += 1
+        except (OSError, IfcParseError) as exc:
+            logger.warning("Colunas IFC indisponíveis para %s: %s", path, exc)
+            return None
+
+        logger.info(
+            "Colunas IFC de %s: %s elementos em %.2fs",
+            path,
+            len(columns),
+            columns.elapsed_seconds,
+        )
+        try:
+            await asyncio.to_thread(columns.save, directory)
+        except OSError as exc:  # pragma: no cover - erro de IO difícil de reproduzir
+            logger.warning("Falha ao gravar colunas IFC em cache: %s", exc)
+        return columns
+
+    async def render_aggregates(self, path: str, *, digest: str | None = None) -> str | None:
+        columns = await self.columns(path, digest=digest)
+        if columns is None or not len(columns):
+            return None
+        return columns.render(token_budget=self._aggregates_token_budget)
+
+    async def spatial(self, path: str, *, digest: str | None = None) -> IfcSpatialIndex | None:
+        """Índice espacial e de nomes do modelo, mantido em memória para consultas rápidas.
+
+        A grade é gravada ao lado das colunas; em memória, o arquivo é
+        reconhecido por tamanho e data de modificação, sem recalcular o hash.
+        """
+
+        if not self._columns:
+            return None
+        try:
+            stat = await asyncio.to_thread(os.stat, path)
+        except OSError:
+            return None
+        version = (stat.st_size, stat.st_mtime_ns)
+        cached = self._spatial.get(path)
+        if cached is not None and cached[0] == version:
+            self._spatial.move_to_end(path)
+            self.cache_hits += 1
+            return cached[1]
+
+        try:
+            digest = digest or await file_sha256(path)
+        except OSError as exc:
+            logger.warning("Índice espacial IFC indisponível para %s: %s", path, exc)
+            return None
+        columns = await self.columns(path, digest=digest)
+        if columns is None:
+            return None
+        directory = self._cache_dir / f"{digest}.spatial.v{SPATIAL_VERSION}"
+        grid = await asyncio.to_thread(_read_grid, directory)
+        if grid is None:
+            started = time.perf_counter()
+            grid = await asyncio.to_thread(build_grid, columns.bboxes)
+            logger.info(
+                "Grade espacial IFC de %s: %sx%s células em %.3fs",
+                path,
+                *grid.shape,
+                time.perf_counter() - started,
+            )
+            try:
+                await asyncio.to_thread(grid.save, directory)
+            except OSError as exc:  # pragma: no cover - erro de IO difícil de reproduzir
+                logger.warning("Falha ao gravar grade espacial IFC em cache: %s", exc)
+        index = await asyncio.to_thread(IfcSpatialIndex, columns, grid)
+        if self._spatial_cache_size:
+            self._spatial[path] = (version, index)
+            while len(self._spatial) > self._spatial_cache_size:
+                self._spatial.popitem(last=False)
+        return index
+
+    async def fingerprints(
+        self, path: str, *, digest: str | None = None
+    ) -> dict[str, ElementFingerprint] | None:
+        """Impressões digitais dos elementos (com dependências), calculadas uma vez por conteúdo."""
+
+        if not await asyncio.to_thread(is_step_file, path):
+            return None
+        try:
+            digest = digest or await file_sha256(path)
+            cache_path = self._cache_dir / f"{digest}.fingerprints.v{FINGERPRINT_VERSION}.json.gz"
+            cached = await asyncio.to_thread(_read_fingerprints, cache_path)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+            fingerprints = await asyncio.to_thread(
+                _fingerprint_with_dependencies,
+                path,
+                digest=digest,
+                workers=self._workers,
+                executor=self._pool() if self._workers > 1 else None,
+                min_chunk_bytes=self._min_chunk_bytes,
+            )
+            self.parses_total += 1
+        except (OSError, IfcParseError) as exc:
+            logger.warning("Impressões IFC indisponíveis para %s: %s", path, exc)
+            return None
+        try:
+            await asyncio.to_thread(_write_fingerprints, cache_path, fingerprints)
+        except OSError as exc:  # pragma: no cover - erro de IO difícil de reproduzir
+            logger.warning("Falha ao gravar impressões IFC em cache: %s", exc)
+        return fingerprints
+
+    async def diff(
+        self, previous_path: str, path: str, *, digest: str | None = None
+    ) -> IfcDiff | None:
+        """Diferença entre a versão anterior e a atual (`None` se alguma não puder ser lida)."""
+
+        started = time.perf_counter()
+        previous, current = await asyncio.gather(
+            self.fingerprints(previous_path), self.fingerprints(path, digest=digest)
+        )
+        if previous is None or current is None:
+            return None
+        diff = diff_fingerprints(previous, current)
+        self.diffs_total += 1
+        logger.info(
+            "Diff IFC %s -> %s: +%s -%s ~%s (=%s) em %.2fs",
+            previous_path,
+            path,
+            len(diff.added),
+            len(diff.removed),
+            len(diff.modified),
+            diff.unchanged,
+            time.perf_counter() - started,
+        )
+        return diff
+
+    async def entity_index(self, path: str, *, digest: str | None = None) -> IfcEntityIndex | None:
+        """Índice mapeado em memória do arquivo (o chamador deve fechá-lo)."""
+
+        if not await asyncio.to_thread(is_step_file, path):
+            return None
+        try:
+            digest = digest or await file_sha256(path)
+            return await asyncio.to_thread(open_entity_index, path, digest=digest)
+        except (OSError, IfcParseError) as exc:
+            logger.warning("Índice IFC indisponível para %s: %s", path, exc)
+            return None
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "workers": self._workers,
+            "parses_total": self.parses_total,
+            "cache_hits": self.cache_hits,
+            "diffs_total": self.diffs_total,
+        }
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # `spawn`, como no pré-processamento de imagens: o processo pai tem threads.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _ensure_index(self, path: str, digest: str) -> None:
+        started = time.perf_counter()
+        try:
+            built = await asyncio.to_thread(ensure_entity_index, path, digest=digest)
+        except (OSError, IfcParseError) as exc:
+            logger.warning("Falha ao indexar entidades IFC de %s: %s", path, exc)
+            return
+        if built:
+            logger.info(
+                "Índice de entidades IFC de %s construído em %.2fs",
+                path,
+                time.perf_counter() - started,
+            )
+
+
+def _read_inventory(path: Path) -> IfcInventory | None:
+    try:
+        return IfcInventory.from_dict(json.loads(path.read_text()))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError) as exc:
+        logger.warning("Inventário IFC em cache inválido (%s): %s", path, exc)
+        return None
+
+
+def _write_inventory(path: Path, inventory: IfcInventory) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    temporary.write_text(json.dumps(inventory.to_dict(), ensure_ascii=False))
+    temporary.replace(path)
+
+
+def _read_columns(directory: Path) -> IfcColumns | None:
+    if not directory.is_dir():
+        return None
+    try:
+        return IfcColumns.load(directory)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning("Colunas IFC em cache inválidas (%s): %s", directory, exc)
+        shutil.rmtree(directory, ignore_errors=True)
+        return None
+
+
+def _read_grid(directory: Path) -> SpatialGrid | None:
+    if not directory.is_dir():
+        return None
+    try:
+        return SpatialGrid.load(directory)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning("Grade espacial IFC em cache inválida (%s): %s", directory, exc)
+        shutil.rmtree(directory, ignore_errors=True)
+        return None
+
+
+def _fingerprint_with_dependencies(
+    path: str, *, digest: str, **options
+) -> dict[str, ElementFingerprint]:
+    with open_entity_index(path, digest=digest) as index:
+        return fingerprint_elements(path, index=index, **options)
+
+
+def _read_fingerprints(path: Path) -> dict[str, ElementFingerprint] | None:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            return fingerprints_from_rows(json.load(handle))
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError) as exc:
+        logger.warning("Impressões IFC em cache inválidas (%s): %s", path, exc)
+        return None
+
+
+def _write_fingerprints(path: Path, fingerprints: dict[str, ElementFingerprint]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    with gzip.open(temporary, "wt", encoding="utf-8", compresslevel=1) as handle:
+        json.dump(fingerprints_to_rows(fingerprints), handle, ensure_ascii=False)
+    temporary.replace(path)
+
+
+def build_ifc_inventory_service(settings: Settings) -> IfcInventoryService | None:
+    config = settings.ifc
+    if not config.enabled:
+        return None
+    if config.columns_enabled and not columns_available():
+        logger.warning("Pacote `numpy` ausente; agregados IFC ficam desativados.")
+    return IfcInventoryService(
+        cache_dir=Path(config.cache_dir),
+        token_budget=config.inventory_token_budget,
+        build_index=config.build_index,
+        workers=config.workers,
+        min_chunk_bytes=config.parallel_min_chunk_mb * 1024 * 1024,
+        columns=config.columns_enabled,
+        aggregates_token_budget=config.aggregates_token_budget,
+        spatial_cache_size=config.spatial_cache_size,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_ifc_inventory_service() -> IfcInventoryService | None:
+    """Instância compartilhada pelo processo (worker)."""
+
+    return build_ifc_inventory_service(get_settings())
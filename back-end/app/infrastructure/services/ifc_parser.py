@@ -0,0 +1,813 @@
+"""Leitura em streaming de arquivos IFC (STEP, ISO 10303-21) com memória limitada.
+
+O arquivo é lido linha a linha; só as entidades relevantes para o inventário
+(pavimentos, espaços, quantidades, conjuntos de propriedades e relações de
+contenção) têm os argumentos decodificados. As demais são apenas contadas.
+Arquivos grandes podem ser divididos em intervalos processados em paralelo.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import re
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from pathlib import Path
+from typing import Any, BinaryIO, TypeVar
+
+from app.infrastructure.services.blob_codec import open_blob
+from app.infrastructure.services.rate_limiter import CHARS_PER_TOKEN, estimate_tokens
+
+
+STEP_MAGIC = b"ISO-10303-21;"
+
+T = TypeVar("T")
+
+_READ_BUFFER = 1024 * 1024
+_HEADER_PROBE = 64 * 1024
+
+# Subtipos de IfcProduct usados para destacar elementos construtivos no inventário.
+_PRODUCT_NAMES = (
+    "IfcBeam",
+    "IfcBuildingElementPart",
+    "IfcBuildingElementProxy",
+    "IfcCableCarrierSegment",
+    "IfcCableSegment",
+    "IfcChimney",
+    "IfcColumn",
+    "IfcCovering",
+    "IfcCurtainWall",
+    "IfcDiscreteAccessory",
+    "IfcDoor",
+    "IfcDuctFitting",
+    "IfcDuctSegment",
+    "IfcFlowFitting",
+    "IfcFlowSegment",
+    "IfcFlowTerminal",
+    "IfcFooting",
+    "IfcFurnishingElement",
+    "IfcFurniture",
+    "IfcLightFixture",
+    "IfcMember",
+    "IfcOpeningElement",
+    "IfcPile",
+    "IfcPipeFitting",
+    "IfcPipeSegment",
+    "IfcPlate",
+    "IfcRailing",
+    "IfcRamp",
+    "IfcRampFlight",
+    "IfcReinforcingBar",
+    "IfcRoof",
+    "IfcShadingDevice",
+    "IfcSlab",
+    "IfcSpace",
+    "IfcStair",
+    "IfcStairFlight",
+    "IfcTransportElement",
+    "IfcWall",
+    "IfcWallStandardCase",
+    "IfcWindow",
+)
+DISPLAY_NAMES = {name.upper(): name for name in _PRODUCT_NAMES}
+PRODUCT_TYPES = frozenset(DISPLAY_NAMES)
+_PRODUCT_TYPE_BYTES = frozenset(name.encode("ascii") for name in PRODUCT_TYPES)
+
+QUANTITY_KINDS = {
+    b"IFCQUANTITYLENGTH": "comprimento",
+    b"IFCQUANTITYAREA": "área",
+    b"IFCQUANTITYVOLUME": "volume",
+    b"IFCQUANTITYCOUNT": "contagem",
+    b"IFCQUANTITYWEIGHT": "massa",
+}
+
+_STOREY = b"IFCBUILDINGSTOREY"
+_SPACE = b"IFCSPACE"
+_PROJECT = b"IFCPROJECT"
+_PROPERTY_SETS = frozenset({b"IFCPROPERTYSET", b"IFCELEMENTQUANTITY"})
+_CONTAINMENT = b"IFCRELCONTAINEDINSPATIALSTRUCTURE"
+# Quantos argumentos iniciais cada tipo decodificado precisa (o resto é ignorado).
+_ARGUMENT_PREFIX = {
+    **dict.fromkeys(QUANTITY_KINDS, 4),
+    **dict.fromkeys(_PROPERTY_SETS, 3),
+    _CONTAINMENT: 6,
+    _STOREY: 10,
+    _SPACE: 8,
+    _PROJECT: 3,
+}
+_DECODED_TYPES = frozenset(_ARGUMENT_PREFIX)
+
+_STATEMENT_START = re.compile(rb"\s*#\d+\s*=")
+_ENTITY_HEAD = re.compile(rb"\s*#(\d+)\s*=\s*([A-Za-z0-9_]+)\s*\(")
+
+# Atalhos para os tipos mais frequentes: evitam o tokenizador genérico.
+_STRING_BYTES = rb"'(?:[^']|'')*'"
+_QUANTITY_FAST = re.compile(
+    rb"\s*(" + _STRING_BYTES + rb")\s*,\s*(?:" + _STRING_BYTES + rb"|\$)\s*,"
+    rb"\s*(?:#\d+|\$)\s*,\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*[,)]?"
+)
+_PROPERTY_SET_FAST = re.compile(
+    rb"\s*" + _STRING_BYTES + rb"\s*,\s*(?:#\d+|\$)\s*,\s*(" + _STRING_BYTES + rb")"
+)
+
+
+class IfcParseError(ValueError):
+    """Arquivo não é um STEP/IFC válido."""
+
+
+class EntityRef(int):
+    """Referência `#id` para outra entidade."""
+
+
+class StepEnum(str):
+    """Valor enumerado (`.ELEMENT.`)."""
+
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>'(?:[^']|'')*')
+      | (?P<ref>\#\d+)
+      | (?P<enum>\.[A-Za-z0-9_]+\.)
+      | (?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+      | (?P<null>[$*])
+      | (?P<typed>[A-Za-z][A-Za-z0-9_]*)\s*\(
+      | (?P<open>\()
+      | (?P<close>\))
+      | (?P<comma>,)
+    )""",
+    re.VERBOSE,
+)
+
+_STRING_ESCAPE = re.compile(
+    r"\\X2\\((?:[0-9A-Fa-f]{4})+)\\X0\\|\\X\\([0-9A-Fa-f]{2})|\\S\\(.)|\\\\"
+)
+
+
+def decode_step_string(raw: str) -> str:
+    """Remove aspas e decodifica os escapes de caracteres do STEP (`\\X2\\`, `\\X\\`, `\\S\\`)."""
+
+    text = raw[1:-1].replace("''", "'")
+    if "\\" not in text:
+        return text
+
+    def replace(match: re.Match[str]) -> str:
+        if match.group(1):
+            hex_digits = match.group(1)
+            return "".join(
+                chr(int(hex_digits[index : index + 4], 16))
+                for index in range(0, len(hex_digits), 4)
+            )
+        if match.group(2):
+            return bytes([int(match.group(2), 16)]).decode("latin-1")
+        if match.group(3):
+            return chr(ord(match.group(3)) + 128)
+        return "\\"
+
+    return _STRING_ESCAPE.sub(replace, text)
+
+
+def parse_step_arguments(text: str, *, limit: int | None = None) -> list[Any]:
+    """Converte a lista de argumentos de uma entidade em valores Python.
+
+    Strings viram `str`, `#id` vira `EntityRef`, `$`/`*` viram `None`, listas
+    viram `list` e valores tipados (`IFCLABEL('x')`) viram o próprio valor.
+    Com `limit`, para assim que os `limit` primeiros argumentos forem lidos.
+    """
+
+    stack: list[tuple[list[Any], bool]] = [([], False)]
+    position = 0
+    length = len(text)
+    while position < length:
+        match = _TOKEN.match(text, position)
+        if match is None:
+            if text[position:].strip():
+                snippet = text[position : position + 30]
+                raise IfcParseError(f"Argumento inválido próximo a: {snippet!r}")
+            break
+        position = match.end()
+        kind = match.lastgroup
+        if kind == "comma":
+            continue
+        if kind in {"open", "typed"}:
+            stack.append(([], kind == "typed"))
+            continue
+        if kind == "close":
+            items, typed = stack.pop()
+            stack[-1][0].append(items[0] if typed and len(items) == 1 else items)
+            if limit is not None and len(stack) == 1 and len(stack[0][0]) >= limit:
+                break
+            continue
+
+        token = match.group(kind)
+        if kind == "string":
+            value: Any = decode_step_string(token)
+        elif kind == "ref":
+            value = EntityRef(int(token[1:]))
+        elif kind == "enum":
+            value = StepEnum(token[1:-1])
+        elif kind == "number":
+            value = float(token) if any(char in token for char in ".eE") else int(token)
+        else:
+            value = None
+        stack[-1][0].append(value)
+        if limit is not None and len(stack) == 1 and len(stack[0][0]) >= limit:
+            break
+    return stack[0][0]
+
+
+def split_entity(statement: bytes) -> tuple[int, bytes, bytes] | None:
+    """Separa `#id=TIPO(args);` em (id, tipo em maiúsculas, bytes dos argumentos)."""
+
+    head = _ENTITY_HEAD.match(statement)
+    if head is None:
+        return None
+    return int(head.group(1)), head.group(2).upper(), _entity_body(statement, head.end())
+
+
+def _entity_body(statement: bytes, start: int) -> bytes:
+    body = statement[start:].rstrip().rstrip(b";").rstrip()
+    return body[:-1] if body.endswith(b")") else body
+
+
+def iter_statements(
+    handle: BinaryIO, *, start: int, end: int | None = None
+) -> Iterator[tuple[int, bytes]]:
+    """Percorre as instruções da seção DATA a partir de `start`, com seus offsets.
+
+    Instruções podem ocupar várias linhas; um `;` só encerra a instrução
+    quando está fora de uma string (número par de aspas acumuladas).
+    Para ao encontrar `ENDSEC;` ou a primeira instrução iniciada em `end`.
+    """
+
+    handle.seek(start)
+    offset = start
+    pending: list[bytes] = []
+    pending_offset = start
+    for line in handle:
+        line_offset = offset
+        offset += len(line)
+        if not pending:
+            stripped = line.strip()
+            if not stripped or stripped.startswith(b"/*"):
+                continue
+            if end is not None and line_offset >= end:
+                return
+            if stripped == b"ENDSEC;":
+                return
+            if stripped.endswith(b";") and stripped.count(b"'") % 2 == 0:
+                yield line_offset, line
+                continue
+            pending_offset = line_offset
+        pending.append(line)
+        statement = b"".join(pending)
+        stripped = statement.rstrip()
+        if stripped.endswith(b";") and statement.count(b"'") % 2 == 0:
+            pending.clear()
+            yield pending_offset, statement
+    if pending:
+        raise IfcParseError("Arquivo IFC truncado: instrução sem terminador")
+
+
+@dataclass(frozen=True, slots=True)
+class DataSection:
+    schema: str | None
+    start: int
+    end: int
+
+
+def locate_data_section(path: Path) -> DataSection:
+    """Encontra o esquema (FILE_SCHEMA) e os limites em bytes da seção DATA."""
+
+    with open_blob(path) as handle:
+        head = handle.read(_HEADER_PROBE)
+        if not head.lstrip().startswith(STEP_MAGIC):
+            raise IfcParseError("Arquivo não está no formato STEP (ISO-10303-21)")
+        schema_match = re.search(rb"FILE_SCHEMA\s*\(\s*\(\s*'([^']*)'", head)
+        data_match = re.search(rb"(?m)^\s*DATA\s*;[^\n]*\n", head)
+        if data_match is None:
+            raise IfcParseError("Seção DATA não encontrada no cabeçalho")
+
+        size = handle.seek(0, os.SEEK_END)
+        handle.seek(max(0, size - _HEADER_PROBE))
+        tail = handle.read()
+        tail_start = max(0, size - _HEADER_PROBE)
+        end_positions = [match.start() for match in re.finditer(rb"(?m)^\s*ENDSEC\s*;", tail)]
+        end = tail_start + end_positions[-1] if end_positions else size
+
+    return DataSection(
+        schema=schema_match.group(1).decode("ascii", "replace") if schema_match else None,
+        start=data_match.end(),
+        end=end,
+    )
+
+
+def fit_to_token_budget(render: Callable[[int], str], start_limit: int, budget: int) -> str:
+    """Texto de `render(limite)`, reduzindo o limite à metade até caber em `budget` tokens.
+
+    Se nem com limite 1 couber, o texto é cortado no orçamento.
+    """
+
+    limit = start_limit
+    while True:
+        text = render(limit)
+        if estimate_tokens(text, expected_output=0) <= budget:
+            return text
+        if limit <= 1:
+            return text[: budget * CHARS_PER_TOKEN]
+        limit //= 2
+
+
+@dataclass(slots=True)
+class IfcStorey:
+    id: int
+    name: str | None
+    elevation: float | None
+    element_count: int = 0
+
+
+@dataclass(slots=True)
+class IfcSpaceInfo:
+    id: int
+    name: str | None
+    long_name: str | None
+
+
+@dataclass(slots=True)
+class QuantityTotal:
+    kind: str
+    total: float = 0.0
+    count: int = 0
+
+
+@dataclass(slots=True)
+class IfcInventory:
+    """Resumo compacto de um modelo IFC, pronto para compor o prompt BIM."""
+
+    schema: str | None = None
+    project_name: str | None = None
+    entity_count: int = 0
+    counts_by_type: dict[str, int] = field(default_factory=dict)
+    storeys: list[IfcStorey] = field(default_factory=list)
+    spaces: list[IfcSpaceInfo] = field(default_factory=list)
+    space_count: int = 0
+    quantities: dict[str, QuantityTotal] = field(default_factory=dict)
+    property_sets: dict[str, int] = field(default_factory=dict)
+    bytes_read: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def throughput_mb_s(self) -> float:
+        if not self.elapsed_seconds:
+            return 0.0
+        return self.bytes_read / 1_000_000 / self.elapsed_seconds
+
+    @property
+    def element_counts(self) -> dict[str, int]:
+        return {
+            ifc_type: count
+            for ifc_type, count in self.counts_by_type.items()
+            if ifc_type in PRODUCT_TYPES
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "schema": self.schema,
+            "project_name": self.project_name,
+            "entity_count": self.entity_count,
+            "counts_by_type": self.counts_by_type,
+            "storeys": [
+                [storey.id, storey.name, storey.elevation, storey.element_count]
+                for storey in self.storeys
+            ],
+            "spaces": [[space.id, space.name, space.long_name] for space in self.spaces],
+            "space_count": self.space_count,
+            "quantities": {
+                name: [quantity.kind, quantity.total, quantity.count]
+                for name, quantity in self.quantities.items()
+            },
+            "property_sets": self.property_sets,
+            "bytes_read": self.bytes_read,
+            "elapsed_seconds": self.elapsed_seconds,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> IfcInventory:
+        return cls(
+            schema=data.get("schema"),
+            project_name=data.get("project_name"),
+            entity_count=data.get("entity_count", 0),
+            counts_by_type=dict(data.get("counts_by_type") or {}),
+            storeys=[IfcStorey(*item) for item in data.get("storeys") or []],
+            spaces=[IfcSpaceInfo(*item) for item in data.get("spaces") or []],
+            space_count=data.get("space_count", 0),
+            quantities={
+                name: QuantityTotal(*item) for name, item in (data.get("quantities") or {}).items()
+            },
+            property_sets=dict(data.get("property_sets") or {}),
+            bytes_read=data.get("bytes_read", 0),
+            elapsed_seconds=data.get("elapsed_seconds", 0.0),
+        )
+
+    def render(self, *, token_budget: int) -> str:
+        """Texto compacto para o prompt, reduzindo as listas até caber no orçamento."""
+
+        return fit_to_token_budget(self._render, 40, token_budget)
+
+    def _render(self, limit: int) -> str:
+        def clip(items: list[str], total: int) -> str:
+            shown = items[:limit]
+            suffix = f"; +{total - len(shown)}" if total > len(shown) else ""
+            return "; ".join(shown) + suffix
+
+        elements = sorted(self.element_counts.items(), key=lambda item: (-item[1], item[0]))
+        lines = [
+            f"Inventário IFC ({self.schema or 'esquema desconhecido'}, "
+            f"{self.entity_count} entidades"
+            + (f", projeto {self.project_name}" if self.project_name else "")
+            + ").",
+        ]
+        if elements:
+            lines.append(
+                "Elementos: "
+                + clip(
+                    [f"{DISPLAY_NAMES.get(name, name)}={count}" for name, count in elements],
+                    len(elements),
+                )
+            )
+        if self.storeys:
+            storeys = sorted(
+                self.storeys, key=lambda storey: (storey.elevation is None, storey.elevation or 0)
+            )
+            lines.append(
+                "Pavimentos: "
+                + clip(
+                    [
+                        f"{storey.name or f'#{storey.id}'}"
+                        + (f" ({storey.elevation:g})" if storey.elevation is not None else "")
+                        + f" {storey.element_count} elem."
+                        for storey in storeys
+                    ],
+                    len(storeys),
+                )
+            )
+        if self.space_count:
+            lines.append(
+                f"Espaços ({self.space_count}): "
+                + clip(
+                    [
+                        " - ".join(filter(None, (space.name, space.long_name))) or f"#{space.id}"
+                        for space in self.spaces
+                    ],
+                    self.space_count,
+                )
+            )
+        if self.quantities:
+            quantities = sorted(self.quantities.items(), key=lambda item: -item[1].count)
+            lines.append(
+                "Quantidades: "
+                + clip(
+                    [
+                        f"{name} ({quantity.kind}) total={quantity.total:.6g} em {quantity.count}"
+                        for name, quantity in quantities
+                    ],
+                    len(quantities),
+                )
+            )
+        if self.property_sets:
+            psets = sorted(self.property_sets.items(), key=lambda item: (-item[1], item[0]))
+            lines.append(
+                "Conjuntos de propriedades: "
+                + clip([f"{name}={count}" for name, count in psets], len(psets))
+            )
+        return "\n".join(lines)
+
+
+class InventoryBuilder:
+    """Acumula contadores do inventário; instâncias parciais podem ser combinadas."""
+
+    # Espaços com nome guardados para o prompt; o total continua sendo contado.
+    MAX_SPACES = 500
+
+    def __init__(self) -> None:
+        self.counts: Counter[bytes] = Counter()
+        self.storeys: dict[int, tuple[str | None, float | None]] = {}
+        self.spaces: list[IfcSpaceInfo] = []
+        self.space_count = 0
+        self.contained: Counter[int] = Counter()
+        self.quantities: dict[str, QuantityTotal] = {}
+        self.property_sets: Counter[str] = Counter()
+        self.project_name: str | None = None
+        self.bytes_read = 0
+
+    def add(self, entity_id: int, ifc_type: bytes, args: bytes) -> None:
+        self.counts[ifc_type] += 1
+        if ifc_type in _DECODED_TYPES:
+            self._add_arguments(entity_id, ifc_type, args)
+
+    def add_statement(self, statement: bytes) -> None:
+        """Como `add`, mas só recorta os argumentos dos tipos decodificados."""
+
+        head = _ENTITY_HEAD.match(statement)
+        if head is None:
+            return
+        ifc_type = head.group(2).upper()
+        self.counts[ifc_type] += 1
+        if ifc_type in _DECODED_TYPES:
+            self._add_arguments(
+                int(head.group(1)), ifc_type, _entity_body(statement, head.end())
+            )
+
+    def _add_arguments(self, entity_id: int, ifc_type: bytes, args: bytes) -> None:
+        if ifc_type in QUANTITY_KINDS:
+            match = _QUANTITY_FAST.match(args)
+            if match is not None:
+                name = decode_step_string(match.group(1).decode("utf-8", "replace"))
+                self._add_quantity(ifc_type, name, float(match.group(2)))
+                return
+        elif ifc_type in _PROPERTY_SETS:
+            match = _PROPERTY_SET_FAST.match(args)
+            if match is not None:
+                name = decode_step_string(match.group(1).decode("utf-8", "replace"))
+                self.property_sets[name] += 1
+                return
+        try:
+            values = parse_step_arguments(
+                args.decode("utf-8", "replace"), limit=_ARGUMENT_PREFIX[ifc_type]
+            )
+        except IfcParseError:
+            return
+        self._add_decoded(entity_id, ifc_type, values)
+
+    def _add_decoded(self, entity_id: int, ifc_type: bytes, values: list[Any]) -> None:
+        if ifc_type in QUANTITY_KINDS:
+            name, value = _get(values, 0), _get(values, 3)
+            if isinstance(name, str) and isinstance(value, (int, float)):
+                self._add_quantity(ifc_type, name, float(value))
+        elif ifc_type in _PROPERTY_SETS:
+            name = _get(values, 2)
+            if isinstance(name, str):
+                self.property_sets[name] += 1
+        elif ifc_type == _CONTAINMENT:
+            related, structure = _get(values, 4), _get(values, 5)
+            if isinstance(structure, EntityRef) and isinstance(related, list):
+                self.contained[int(structure)] += len(related)
+        elif ifc_type == _STOREY:
+            elevation = _get(values, 9)
+            self.storeys[entity_id] = (
+                _as_text(_get(values, 2)),
+                float(elevation) if isinstance(elevation, (int, float)) else None,
+            )
+        elif ifc_type == _SPACE:
+            self.space_count += 1
+            if len(self.spaces) < self.MAX_SPACES:
+                self.spaces.append(
+                    IfcSpaceInfo(entity_id, _as_text(_get(values, 2)), _as_text(_get(values, 7)))
+                )
+        elif ifc_type == _PROJECT:
+            self.project_name = self.project_name or _as_text(_get(values, 2))
+
+    def _add_quantity(self, ifc_type: bytes, name: str, value: float) -> None:
+        total = self.quantities.get(name)
+        if total is None:
+            total = self.quantities[name] = QuantityTotal(QUANTITY_KINDS[ifc_type])
+        total.total += value
+        total.count += 1
+
+    def merge(self, other: InventoryBuilder) -> None:
+        self.counts.update(other.counts)
+        self.storeys.update(other.storeys)
+        room = self.MAX_SPACES - len(self.spaces)
+        self.spaces.extend(other.spaces[: max(0, room)])
+        self.space_count += other.space_count
+        self.contained.update(other.contained)
+        for name, quantity in other.quantities.items():
+            total = self.quantities.setdefault(name, QuantityTotal(quantity.kind))
+            total.total += quantity.total
+            total.count += quantity.count
+        self.property_sets.update(other.property_sets)
+        self.project_name = self.project_name or other.project_name
+        self.bytes_read += other.bytes_read
+
+    def build(self, *, schema: str | None, elapsed_seconds: float) -> IfcInventory:
+        return IfcInventory(
+            schema=schema,
+            project_name=self.project_name,
+            entity_count=sum(self.counts.values()),
+            counts_by_type={
+                ifc_type.decode("ascii", "replace"): count
+                for ifc_type, count in self.counts.most_common()
+            },
+            storeys=[
+                IfcStorey(storey_id, name, elevation, self.contained.get(storey_id, 0))
+                for storey_id, (name, elevation) in self.storeys.items()
+            ],
+            spaces=sorted(self.spaces, key=lambda space: space.id),
+            space_count=self.space_count,
+            quantities=self.quantities,
+            property_sets=dict(self.property_sets.most_common()),
+            bytes_read=self.bytes_read,
+            elapsed_seconds=elapsed_seconds,
+        )
+
+
+def scan_range(path: Path, start: int, end: int | None) -> InventoryBuilder:
+    """Processa as instruções iniciadas no intervalo `[start, end)` da seção DATA."""
+
+    builder = InventoryBuilder()
+    last_offset = start
+    with open_blob(path, buffering=_READ_BUFFER) as handle:
+        add_statement = builder.add_statement
+        for offset, statement in iter_statements(handle, start=start, end=end):
+            add_statement(statement)
+            last_offset = offset + len(statement)
+    builder.bytes_read = last_offset - start
+    return builder
+
+
+def split_data_section(path: Path, section: DataSection, parts: int) -> list[tuple[int, int]]:
+    """Divide a seção DATA em até `parts` intervalos que começam no início de uma instrução.
+
+    Cada fronteira é procurada a partir da anterior, que é início de instrução:
+    as aspas contadas no caminho dizem se a posição está dentro de uma string,
+    onde `;` seguido de `#id=` não separa instruções.
+    """
+
+    boundaries = [section.start]
+    with open_blob(path, buffering=_READ_BUFFER) as handle:
+        for part in range(1, parts):
+            approximate = section.start + (section.end - section.start) * part // parts
+            boundary = _next_statement_start(
+                handle, boundaries[-1], max(approximate, boundaries[-1]), section.end
+            )
+            if boundaries[-1] < boundary < section.end:
+                boundaries.append(boundary)
+    boundaries.append(section.end)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def _next_statement_start(handle: BinaryIO, origin: int, position: int, limit: int) -> int:
+    """Offset da primeira instrução iniciada após `position`, sabendo que uma começa em `origin`.
+
+    Uma linha `#id=` só inicia instrução se a anterior termina em `;` fora de
+    string, isto é, com número par de aspas desde `origin` (como em `iter_statements`).
+    """
+
+    handle.seek(origin)
+    quotes = 0
+    remaining = position - origin
+    while remaining > 0:
+        block = handle.read(min(remaining, _READ_BUFFER))
+        if not block:
+            return limit
+        quotes += block.count(b"'")
+        remaining -= len(block)
+    previous = handle.readline()
+    quotes += previous.count(b"'")
+    offset = position + len(previous)
+    ended = quotes % 2 == 0 and previous.rstrip().endswith(b";")
+    while offset < limit:
+        line = handle.readline()
+        if not line:
+            break
+        if ended and _STATEMENT_START.match(line):
+            return offset
+        if line.strip():
+            quotes += line.count(b"'")
+            ended = quotes % 2 == 0 and line.rstrip().endswith(b";")
+        offset += len(line)
+    return limit
+
+
+def parse_ifc_inventory(
+    path: str | Path,
+    *,
+    workers: int = 1,
+    executor: Executor | None = None,
+    min_chunk_bytes: int = 32 * 1024 * 1024,
+) -> IfcInventory:
+    """Extrai o inventário de um arquivo IFC.
+
+    Com `workers > 1` e arquivo grande o bastante, a seção DATA é dividida em
+    intervalos (alguns por worker, para equilibrar a carga) processados em
+    paralelo; os acumuladores parciais são combinados na ordem do arquivo.
+    """
+
+    path = Path(path)
+    started = time.perf_counter()
+    section = locate_data_section(path)
+    builder = InventoryBuilder()
+    for partial in map_data_ranges(
+        scan_range,
+        path,
+        section,
+        workers=workers,
+        executor=executor,
+        min_chunk_bytes=min_chunk_bytes,
+    ):
+        builder.merge(partial)
+    return builder.build(schema=section.schema, elapsed_seconds=time.perf_counter() - started)
+
+
+def map_data_ranges(
+    function: Callable[[Path, int, int], T],
+    path: Path,
+    section: DataSection,
+    *,
+    workers: int = 1,
+    executor: Executor | None = None,
+    min_chunk_bytes: int = 32 * 1024 * 1024,
+) -> list[T]:
+    """Aplica `function(path, start, end)` aos intervalos da seção DATA, na ordem do arquivo.
+
+    Sem paralelismo (ou em arquivos pequenos) há um único intervalo, no próprio processo.
+    """
+
+    chunks = min(workers * 4, (section.end - section.start) // min_chunk_bytes)
+    if workers <= 1 or chunks <= 1:
+        return [function(path, section.start, section.end)]
+
+    own_executor = executor is None
+    if executor is None:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    try:
+        starts, ends = zip(*split_data_section(path, section, chunks))
+        return list(executor.map(function, repeat(path), starts, ends))
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True)
+
+
+@dataclass(frozen=True, slots=True)
+class IfcElementRecord:
+    """Elemento construtivo (subtipo de IfcProduct) lido do arquivo."""
+
+    step_id: int
+    ifc_type: str
+    global_id: str | None
+    name: str | None
+    tag: str | None
+
+
+def iter_elements(path: str | Path) -> Iterator[IfcElementRecord]:
+    """Percorre os elementos do modelo em streaming, na ordem do arquivo."""
+
+    path = Path(path)
+    section = locate_data_section(path)
+    with open_blob(path, buffering=_READ_BUFFER) as handle:
+        for _, statement in iter_statements(handle, start=section.start, end=section.end):
+            head = _ENTITY_HEAD.match(statement)
+            if head is None:
+                continue
+            ifc_type = head.group(2).upper()
+            if ifc_type not in _PRODUCT_TYPE_BYTES:
+                continue
+            try:
+                # GlobalId, OwnerHistory, Name, Description, ObjectType, Placement,
+                # Representation, Tag (em IfcSpace o 8º argumento é LongName).
+                values = parse_step_arguments(
+                    _entity_body(statement, head.end()).decode("utf-8", "replace"), limit=8
+                )
+            except IfcParseError:
+                continue
+            display = DISPLAY_NAMES[ifc_type.decode("ascii")]
+            yield IfcElementRecord(
+                step_id=int(head.group(1)),
+                ifc_type=display,
+                global_id=_as_text(_get(values, 0)),
+                name=_as_text(_get(values, 2)),
+                tag=None if ifc_type == _SPACE else _as_text(_get(values, 7)),
+            )
+
+
+def iter_element_batches(path: str | Path, size: int) -> Iterator[list[IfcElementRecord]]:
+    batch: list[IfcElementRecord] = []
+    for record in iter_elements(path):
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def is_step_file(path: str | Path) -> bool:
+    try:
+        with open_blob(path) as handle:
+            return handle.read(len(STEP_MAGIC) + 16).lstrip().startswith(STEP_MAGIC)
+    except OSError:
+        return False
+
+
+def _get(values: list[Any], index: int) -> Any:
+    return values[index] if index < len(values) else None
+
+
+def _as_text(value: Any) -> str | None:
+    return value if isinstance(value, str) and not isinstance(value, StepEnum) else None
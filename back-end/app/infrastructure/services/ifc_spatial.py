@@ -0,0 +1,358 @@
+"""Índice espacial e de nomes sobre as colunas de um modelo IFC.
+
+As caixas envolventes são distribuídas numa grade uniforme no plano XY, guardada
+como CSR (deslocamento por célula + linhas das colunas); caixas que cobririam
+células demais (lajes, coberturas) ficam numa lista à parte, sempre verificada.
+Os nomes de pavimentos e espaços formam um índice invertido de palavras
+normalizadas, usado para resolver os `location_hint` das análises.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import shutil
+import unicodedata
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from app.domain.entities import IfcElementBox, IfcLocation, IfcLocationMatch
+from app.infrastructure.services.ifc_columns import IfcColumns
+from app.infrastructure.services.ifc_parser import DISPLAY_NAMES
+
+try:  # NumPy é opcional (`pip install .[analytics]`).
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+
+SPATIAL_VERSION = 1
+
+# Elementos por célula desejados e limites da grade.
+_TARGET_PER_CELL = 4
+_MAX_CELLS_PER_AXIS = 1024
+_LARGE_SPAN = 64
+# Locais de mesma pontuação considerados numa indicação.
+_MAX_MATCHES = 20
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    {"a", "as", "o", "os", "e", "de", "da", "das", "do", "dos", "em", "na", "no"}
+)
+_FILES = ("offsets", "items", "large")
+
+
+def normalize_words(text: str) -> list[str]:
+    """Palavras em minúsculas e sem acento, sem artigos e preposições."""
+
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    plain = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return [word for word in _WORD.findall(plain) if word not in _STOPWORDS]
+
+
+@dataclass(slots=True)
+class SpatialGrid:
+    """Grade XY: `items[offsets[c]:offsets[c + 1]]` são as linhas da célula `c`."""
+
+    origin: tuple[float, float]
+    cell_size: float
+    shape: tuple[int, int]
+    offsets: Any
+    items: Any
+    large: Any
+
+    def candidates(self, minimum: Sequence[float], maximum: Sequence[float]) -> Any:
+        """Linhas cujas células cruzam o retângulo XY (ainda sem o teste exato)."""
+
+        nx, ny = self.shape
+        x0, y0 = self._cell(minimum)
+        x1, y1 = self._cell(maximum)
+        # Cada linha da grade é contígua no CSR: uma fatia por linha.
+        parts = [
+            self.items[self.offsets[row * nx + x0] : self.offsets[row * nx + x1 + 1]]
+            for row in range(y0, y1 + 1)
+        ]
+        parts.append(self.large)
+        return np.unique(np.concatenate(parts))
+
+    def _cell(self, point: Sequence[float]) -> tuple[int, int]:
+        nx, ny = self.shape
+        x = math.floor((point[0] - self.origin[0]) / self.cell_size)
+        y = math.floor((point[1] - self.origin[1]) / self.cell_size)
+        return min(max(x, 0), nx - 1), min(max(y, 0), ny - 1)
+
+    def save(self, directory: Path) -> None:
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        temporary = directory.with_name(f"{directory.name}.{os.getpid()}.tmp")
+        shutil.rmtree(temporary, ignore_errors=True)
+        temporary.mkdir()
+        for name, values in zip(_FILES, (self.offsets, self.items, self.large)):
+            np.save(temporary / f"{name}.npy", values)
+        (temporary / "meta.json").write_text(
+            json.dumps(
+                {"origin": self.origin, "cell_size": self.cell_size, "shape": self.shape}
+            )
+        )
+        try:
+            temporary.rename(directory)
+        except OSError:
+            shutil.rmtree(temporary, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: Path) -> SpatialGrid:
+        meta = json.loads((directory / "meta.json").read_text())
+        arrays = [np.load(directory / f"{name}.npy", mmap_mode="r") for name in _FILES]
+        return cls(
+            tuple(meta["origin"]),
+            float(meta["cell_size"]),
+            tuple(meta["shape"]),
+            *arrays,
+        )
+
+
+def build_grid(bboxes: Any) -> SpatialGrid:
+    """Distribui as caixas válidas (sem NaN) pelas células que cobrem."""
+
+    boxes = np.asarray(bboxes)
+    rows = np.flatnonzero(~np.isnan(boxes).any(axis=1)) if len(boxes) else np.empty(0, np.int64)
+    if not len(rows):
+        empty = np.empty(0, dtype=np.int32)
+        return SpatialGrid((0.0, 0.0), 1.0, (1, 1), np.zeros(2, dtype=np.int64), empty, empty)
+
+    low, high = boxes[rows, 0:2], boxes[rows, 3:5]
+    origin = low.min(axis=0)
+    extent = np.maximum(high.max(axis=0) - origin, 1e-9)
+    # Pela densidade, mas nunca menor que o elemento típico: cada caixa deve
+    # ocupar poucas células, senão o CSR se multiplica.
+    cell_size = max(
+        math.sqrt(float(extent[0] * extent[1]) * _TARGET_PER_CELL / len(rows)),
+        float(np.median((high - low).max(axis=1))),
+        float(extent.max()) / _MAX_CELLS_PER_AXIS,
+        1e-6,
+    )
+    shape = np.minimum(extent // cell_size + 1, _MAX_CELLS_PER_AXIS).astype(np.int64)
+    first = np.clip((low - origin) // cell_size, 0, shape - 1).astype(np.int64)
+    last = np.clip((high - origin) // cell_size, 0, shape - 1).astype(np.int64)
+    widths = last[:, 0] - first[:, 0] + 1
+    spans = widths * (last[:, 1] - first[:, 1] + 1)
+
+    small = spans <= _LARGE_SPAN
+    large = rows[~small].astype(np.int32)
+    rows, first, widths, spans = rows[small], first[small], widths[small], spans[small]
+    # Uma entrada por (elemento, célula coberta), sem laço em Python.
+    owner = np.repeat(np.arange(len(rows)), spans)
+    step = np.arange(len(owner)) - np.repeat(np.cumsum(spans) - spans, spans)
+    x = first[owner, 0] + step % widths[owner]
+    y = first[owner, 1] + step // widths[owner]
+    cells = y * shape[0] + x
+    order = np.argsort(cells, kind="stable")
+    offsets = np.zeros(int(shape[0] * shape[1]) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(cells, minlength=len(offsets) - 1), out=offsets[1:])
+    return SpatialGrid(
+        (float(origin[0]), float(origin[1])),
+        cell_size,
+        (int(shape[0]), int(shape[1])),
+        offsets,
+        rows[owner[order]].astype(np.int32),
+        large,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _Place:
+    kind: str
+    code: int
+    step_id: int
+    name: str | None
+    words: frozenset[str]
+
+
+class IfcSpatialIndex:
+    """Consultas por região e por nome de local sobre as colunas de um modelo."""
+
+    def __init__(self, columns: IfcColumns, grid: SpatialGrid) -> None:
+        self._columns = columns
+        self._grid = grid
+        self._boxes = np.asarray(columns.bboxes)
+        step_ids = np.asarray(columns.step_ids)
+        self._step_ids = step_ids
+        self._by_step = np.argsort(step_ids, kind="stable")
+        self._sorted_steps = step_ids[self._by_step]
+        self._members = {
+            "storey": _group_rows(columns.storeys, len(columns.storey_table)),
+            "space": _group_rows(columns.spaces, len(columns.space_table)),
+        }
+        self._places: list[_Place] = [
+            _Place("storey", code, storey_id, name, frozenset(normalize_words(name or "")))
+            for code, (storey_id, name, _) in enumerate(columns.storey_table)
+        ] + [
+            _Place("space", code, space_id, name, frozenset(normalize_words(name or "")))
+            for code, (space_id, name) in enumerate(columns.space_table)
+        ]
+        self._words: dict[str, list[int]] = {}
+        for position, place in enumerate(self._places):
+            for word in place.words:
+                self._words.setdefault(word, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self._step_ids)
+
+    def row(self, step_id: int) -> int | None:
+        position = int(np.searchsorted(self._sorted_steps, step_id))
+        if position < len(self._sorted_steps) and self._sorted_steps[position] == step_id:
+            return int(self._by_step[position])
+        return None
+
+    def query_rows(self, minimum: Sequence[float], maximum: Sequence[float]) -> Any:
+        """Linhas cujas caixas cruzam a caixa `[minimum, maximum]` (3D, limites inclusos)."""
+
+        candidates = self._grid.candidates(minimum, maximum)
+        boxes = self._boxes[candidates]
+        hit = (boxes[:, 0:3] <= np.asarray(maximum)).all(axis=1) & (
+            boxes[:, 3:6] >= np.asarray(minimum)
+        ).all(axis=1)
+        return candidates[hit]
+
+    def query_box(
+        self,
+        minimum: Sequence[float],
+        maximum: Sequence[float],
+        *,
+        ifc_type: str | None = None,
+        limit: int = 500,
+    ) -> list[IfcElementBox]:
+        rows = self._filter_type(self.query_rows(minimum, maximum), ifc_type)
+        return self._elements(rows[:limit])
+
+    def near(
+        self,
+        step_id: int,
+        radius: float,
+        *,
+        ifc_type: str | None = None,
+        limit: int = 500,
+    ) -> list[IfcElementBox] | None:
+        """Elementos a até `radius` da caixa do elemento, do mais próximo ao mais distante.
+
+        `None` se o elemento não existir ou não tiver caixa envolvente.
+        """
+
+        row = self.row(step_id)
+        if row is None or np.isnan(self._boxes[row]).any():
+            return None
+        box = self._boxes[row]
+        rows = self.query_rows(box[0:3] - radius, box[3:6] + radius)
+        rows = self._filter_type(rows[rows != row], ifc_type)
+        centres = (self._boxes[rows, 0:3] + self._boxes[rows, 3:6]) / 2
+        distance = np.linalg.norm(centres - (box[0:3] + box[3:6]) / 2, axis=1)
+        nearest = rows[np.argsort(distance, kind="stable")[:limit]]
+        return self._elements(nearest)
+
+    def resolve(self, hint: str, *, limit: int = 200) -> IfcLocation:
+        """Pavimentos/espaços cujo nome aparece em `hint` e os elementos que contêm.
+
+        A pontuação é a fração das palavras do nome presentes na indicação; vencem
+        os espaços de maior pontuação (filtrados pelo pavimento, se também
+        citado) e, sem espaço, os pavimentos de maior pontuação. Espaços com caixa envolvente
+        também trazem os elementos que a cruzam.
+        """
+
+        hits: dict[int, int] = {}
+        for word in set(normalize_words(hint)):
+            for position in self._words.get(word, ()):
+                hits[position] = hits.get(position, 0) + 1
+        # Só os de maior pontuação de cada tipo: palavras comuns ("sala")
+        # coincidem com muitos nomes e não devem virar candidatos.
+        top: dict[str, float] = {}
+        best: dict[str, list[_Place]] = {}
+        for position, count in hits.items():
+            place = self._places[position]
+            score = count / len(place.words)
+            if score > top.get(place.kind, 0.0):
+                top[place.kind] = score
+                best[place.kind] = [place]
+            elif score == top[place.kind]:
+                best[place.kind].append(place)
+        for kind, places in best.items():
+            places.sort(key=lambda place: place.step_id)
+            del places[_MAX_MATCHES:]
+
+        rows = np.empty(0, dtype=np.int64)
+        if "space" in best:
+            for place in best["space"]:
+                rows = np.union1d(rows, self._place_rows(place))
+            if "storey" in best:
+                storeys = [place.code for place in best["storey"]]
+                rows = rows[np.isin(np.asarray(self._columns.storeys)[rows], storeys)]
+        elif "storey" in best:
+            for place in best["storey"]:
+                rows = np.union1d(rows, self._place_rows(place))
+
+        return IfcLocation(
+            hint=hint,
+            matches=[
+                IfcLocationMatch(
+                    kind=place.kind, step_id=place.step_id, name=place.name, score=top[kind]
+                )
+                for kind in ("space", "storey")
+                for place in best.get(kind, ())
+            ],
+            element_ids=[int(step) for step in self._step_ids[rows[:limit]]],
+            total=len(rows),
+        )
+
+    def _place_rows(self, place: _Place) -> Any:
+        offsets, order = self._members[place.kind]
+        rows = order[offsets[place.code] : offsets[place.code + 1]]
+        if place.kind == "space":
+            own = self.row(place.step_id)
+            if own is not None and not np.isnan(self._boxes[own]).any():
+                box = self._boxes[own]
+                inside = self.query_rows(box[0:3], box[3:6])
+                rows = np.union1d(rows, inside[inside != own])
+        return rows
+
+    def _filter_type(self, rows: Any, ifc_type: str | None) -> Any:
+        if ifc_type is None:
+            return rows
+        name = DISPLAY_NAMES.get(ifc_type.upper(), ifc_type)
+        if name not in self._columns.type_names:
+            return rows[:0]
+        code = self._columns.type_names.index(name)
+        return rows[np.asarray(self._columns.type_codes)[rows] == code]
+
+    def _elements(self, rows: Any) -> list[IfcElementBox]:
+        # Colunas convertidas de uma vez (`tolist`), não elemento a elemento.
+        columns = self._columns
+        types = columns.type_names
+        return [
+            IfcElementBox(
+                step_id=step_id,
+                ifc_type=types[type_code],
+                bbox=bbox,
+                storey=columns.label("storey", storey),
+                space=columns.label("space", space),
+            )
+            for step_id, type_code, bbox, storey, space in zip(
+                self._step_ids[rows].tolist(),
+                np.asarray(columns.type_codes)[rows].tolist(),
+                self._boxes[rows].tolist(),
+                np.asarray(columns.storeys)[rows].tolist(),
+                np.asarray(columns.spaces)[rows].tolist(),
+            )
+        ]
+
+
+def _group_rows(codes: Any, size: int) -> tuple[Any, Any]:
+    """CSR das linhas por código (-1 = sem local): `order[offsets[c]:offsets[c + 1]]`."""
+
+    codes = np.asarray(codes)
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes[codes >= 0], minlength=size)
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    # As linhas sem local (-1) vêm primeiro na ordenação.
+    return offsets, order[int((codes < 0).sum()) :]
@@ -0,0 +1,268 @@
+"""Derivados compactos das fotos da obra (sem EXIF, reduzidos e recodificados).
+
+O processamento roda em um `ProcessPoolExecutor` para não disputar a GIL com o
+loop de eventos; os derivados ficam em cache no disco pelo hash do conteúdo.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import io
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import Settings, get_settings
+from app.infrastructure.services.analysis_cache import file_sha256
+
+try:  # Pillow é opcional (`pip install .[images]`).
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - depende do ambiente
+    Image = None
+    ImageOps = None
+
+
+logger = logging.getLogger(__name__)
+
+_MEDIA_TYPES = {"jpeg": "image/jpeg", "webp": "image/webp"}
+
+
+class ImagePreprocessingError(RuntimeError):
+    """Imagem ilegível ou impossível de converter."""
+
+
+@dataclass(frozen=True, slots=True)
+class PreprocessOptions:
+    max_edge: int
+    format: str
+    quality: int
+    tile_threshold: int = 0
+    tile_grid: int = 2
+
+    @property
+    def variant(self) -> str:
+        """Identifica os parâmetros; entra no caminho do cache e na chave de análise."""
+
+        tiles = f"t{self.tile_threshold}x{self.tile_grid}" if self.tile_threshold else "t0"
+        return f"{self.format}-q{self.quality}-e{self.max_edge}-{tiles}"
+
+
+@dataclass(frozen=True, slots=True)
+class ImageDerivative:
+    label: str
+    media_type: str
+    width: int
+    height: int
+    data: bytes
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.media_type};base64,{base64.b64encode(self.data).decode('ascii')}"
+
+
+def render_derivatives(source: str, options: PreprocessOptions) -> list[ImageDerivative]:
+    """Gera a visão geral (e os blocos, se for o caso) de uma imagem.
+
+    Executada nos processos do pool; precisa ser uma função de módulo.
+    """
+
+    if Image is None:
+        raise ImagePreprocessingError("Pillow não está instalado")
+    try:
+        with Image.open(source) as image:
+            tiled = bool(options.tile_threshold) and max(image.size) > options.tile_threshold
+            if not tiled and image.format == "JPEG":
+                # Decodifica já reduzido (1/2, 1/4, 1/8): bem mais rápido em fotos grandes.
+                image.draft("RGB", (options.max_edge, options.max_edge))
+            oriented = ImageOps.exif_transpose(image).convert("RGB")
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        raise ImagePreprocessingError(f"Imagem inválida: {source}") from exc
+
+    derivatives = [_encode(oriented.copy() if tiled else oriented, "overview", options)]
+    if tiled:
+        width, height = oriented.size
+        grid = options.tile_grid
+        for row in range(grid):
+            for column in range(grid):
+                box = (
+                    width * column // grid,
+                    height * row // grid,
+                    width * (column + 1) // grid,
+                    height * (row + 1) // grid,
+                )
+                derivatives.append(_encode(oriented.crop(box), f"tile-{row}-{column}", options))
+    return derivatives
+
+
+def _encode(image, label: str, options: PreprocessOptions) -> ImageDerivative:
+    image.thumbnail((options.max_edge, options.max_edge), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    # Sem `exif=`: metadados (GPS, aparelho) não seguem para o derivado.
+    if options.format == "webp":
+        image.save(buffer, format="WEBP", quality=options.quality, method=4)
+    else:
+        image.save(
+            buffer, format="JPEG", quality=options.quality, optimize=True, progressive=True
+        )
+    return ImageDerivative(
+        label=label,
+        media_type=_MEDIA_TYPES[options.format],
+        width=image.width,
+        height=image.height,
+        data=buffer.getvalue(),
+    )
+
+
+class ImagePreprocessor:
+    """Prepara derivados em processos separados, reutilizando os já gerados."""
+
+    def __init__(
+        self,
+        *,
+        options: PreprocessOptions,
+        cache_dir: Path,
+        max_workers: int | None = None,
+    ) -> None:
+        self._options = options
+        self._cache_dir = cache_dir
+        self._max_workers = max_workers or max(1, min(4, os.cpu_count() or 1))
+        self._executor: ProcessPoolExecutor | None = None
+        self.renders_total = 0
+        self.cache_hits = 0
+
+    @property
+    def variant(self) -> str:
+        return self._options.variant
+
+    async def prepare(self, path: str, *, digest: str | None = None) -> list[ImageDerivative]:
+        digest = digest or await file_sha256(path)
+        directory = self._cache_dir / digest[:2] / digest / self.variant
+        cached = await asyncio.to_thread(_read_cached, directory)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        derivatives = await self._render(path)
+        self.renders_total += 1
+        try:
+            await asyncio.to_thread(_write_cached, directory, derivatives)
+        except OSError as exc:  # pragma: no cover - erro de IO difícil de reproduzir
+            logger.warning("Falha ao gravar derivados de %s em cache: %s", path, exc)
+        return derivatives
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "variant": self.variant,
+            "workers": self._max_workers,
+            "renders_total": self.renders_total,
+            "cache_hits": self.cache_hits,
+        }
+
+    async def _render(self, path: str) -> list[ImageDerivative]:
+        """Renderiza no pool; se um processo morrer (OOM, imagem-bomba), recria o pool uma vez."""
+
+        try:
+            return await self._render_in_pool(path)
+        except BrokenProcessPool as exc:
+            logger.warning("Pool de pré-processamento quebrado; recriando: %s", exc)
+        try:
+            return await self._render_in_pool(path)
+        except BrokenProcessPool as exc:
+            raise ImagePreprocessingError(
+                f"Processo de conversão encerrado ao processar {path}"
+            ) from exc
+
+    async def _render_in_pool(self, path: str) -> list[ImageDerivative]:
+        pool = self._pool()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                pool, render_derivatives, path, self._options
+            )
+        except BrokenProcessPool:
+            # Um pool quebrado recusa todo envio seguinte: é descartado (se outra
+            # chamada ainda não o fez) e o próximo `_pool()` cria um novo.
+            if self._executor is pool:
+                self._executor = None
+                pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # `spawn`: o processo pai tem threads (loop, `to_thread`); `fork` não é seguro.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+
+def _read_cached(directory: Path) -> list[ImageDerivative] | None:
+    manifest = directory / "manifest.json"
+    if not manifest.is_file():
+        return None
+    try:
+        entries = json.loads(manifest.read_text())
+        return [
+            ImageDerivative(**entry, data=(directory / entry["label"]).read_bytes())
+            for entry in entries
+        ]
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _write_cached(directory: Path, derivatives: list[ImageDerivative]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for derivative in derivatives:
+        (directory / derivative.label).write_bytes(derivative.data)
+    entries = [
+        {
+            "label": derivative.label,
+            "media_type": derivative.media_type,
+            "width": derivative.width,
+            "height": derivative.height,
+        }
+        for derivative in derivatives
+    ]
+    # O manifesto é gravado por último (rename atômico): marca o cache como completo.
+    temporary = directory / f"manifest.{os.getpid()}.tmp"
+    temporary.write_text(json.dumps(entries))
+    temporary.replace(directory / "manifest.json")
+
+
+def build_image_preprocessor(settings: Settings) -> ImagePreprocessor | None:
+    config = settings.images
+    if not config.enabled:
+        return None
+    if Image is None:
+        logger.warning("Pacote `Pillow` ausente; imagens serão enviadas sem derivados.")
+        return None
+    return ImagePreprocessor(
+        options=PreprocessOptions(
+            max_edge=config.max_edge,
+            format=config.format,
+            quality=config.quality,
+            tile_threshold=config.tile_threshold,
+            tile_grid=config.tile_grid,
+        ),
+        cache_dir=Path(config.cache_dir),
+        max_workers=config.workers,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_image_preprocessor() -> ImagePreprocessor | None:
+    """Instância compartilhada pelo processo (worker)."""
+
+    return build_image_preprocessor(get_settings())
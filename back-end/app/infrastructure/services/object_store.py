@@ -0,0 +1,279 @@
+"""Cliente mínimo para object stores compatíveis com S3 (AWS S3, MinIO, Ceph RGW).
+
+Só o que o armazenamento de blobs usa: objetos inteiros ou por faixa (`Range`),
+upload multipart, listagem (ListObjectsV2), cópia e remoção. As requisições são
+assinadas com AWS Signature V4 e compartilham o pool de conexões de um
+`httpx.Client`, seguro para uso por várias threads.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import quote
+from xml.etree import ElementTree
+
+import httpx
+
+
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+_ALGORITHM = "AWS4-HMAC-SHA256"
+# Cabeçalhos incluídos na assinatura, além de `host` e dos `x-amz-*`.
+_SIGNED_HEADERS = frozenset({"content-md5", "content-type", "range"})
+
+
+class ObjectStoreError(OSError):
+    """Resposta de erro do object store (ou falha de rede ao chamá-lo)."""
+
+    def __init__(self, message: str, *, status_code: int | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass(frozen=True, slots=True)
+class ObjectInfo:
+    key: str
+    size: int
+    last_modified: float
+
+
+def encode_query(query: Mapping[str, str]) -> str:
+    """Query string canônica: chaves em ordem, valores codificados como o SigV4 exige."""
+
+    return "&".join(
+        f"{quote(key, safe='-_.~')}={quote(value, safe='-_.~')}"
+        for key, value in sorted(query.items())
+    )
+
+
+def sign_request(
+    method: str,
+    host: str,
+    path: str,
+    query: Mapping[str, str],
+    headers: Mapping[str, str],
+    *,
+    payload_hash: str,
+    access_key: str,
+    secret_key: str,
+    region: str,
+    now: datetime,
+) -> dict[str, str]:
+    """Cabeçalhos da requisição com `x-amz-date`, `x-amz-content-sha256` e `Authorization`.
+
+    `path` já deve estar codificado (cada segmento com `quote`), como vai na URL.
+    """
+
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    scope = f"{amz_date[:8]}/{region}/s3/aws4_request"
+    signed = {key.lower(): value.strip() for key, value in headers.items()}
+    signed.update({"host": host, "x-amz-content-sha256": payload_hash, "x-amz-date": amz_date})
+    names = sorted(
+        name
+        for name in signed
+        if name == "host" or name.startswith("x-amz-") or name in _SIGNED_HEADERS
+    )
+    canonical = "\n".join(
+        [
+            method,
+            path,
+            encode_query(query),
+            "".join(f"{name}:{signed[name]}\n" for name in names),
+            ";".join(names),
+            payload_hash,
+        ]
+    )
+    string_to_sign = "\n".join(
+        [_ALGORITHM, amz_date, scope, hashlib.sha256(canonical.encode()).hexdigest()]
+    )
+    key = f"AWS4{secret_key}".encode()
+    for part in (amz_date[:8], region, "s3", "aws4_request"):
+        key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+    signature = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+    signed["authorization"] = (
+        f"{_ALGORITHM} Credential={access_key}/{scope}, "
+        f"SignedHeaders={';'.join(names)}, Signature={signature}"
+    )
+    return signed
+
+
+class S3Client:
+    """Operações sobre um bucket, com endereçamento por caminho (MinIO) ou por host (AWS)."""
+
+    def __init__(
+        self,
+        *,
+        endpoint: str,
+        bucket: str,
+        access_key: str,
+        secret_key: str,
+        region: str = "us-east-1",
+        path_style: bool = True,
+        max_connections: int = 32,
+        timeout: float = 60.0,
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        self._endpoint = httpx.URL(endpoint)
+        self._bucket = bucket
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._region = region
+        self._path_style = path_style
+        self._client = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            transport=transport,
+        )
+
+    def close(self) -> None:
+        self._client.close()
+
+    def head_object(self, key: str) -> ObjectInfo | None:
+        response = self._request("HEAD", key, allow={404})
+        if response.status_code == 404:
+            return None
+        return ObjectInfo(
+            key=key,
+            size=int(response.headers["content-length"]),
+            last_modified=parsedate_to_datetime(response.headers["last-modified"]).timestamp(),
+        )
+
+    def get_object(self, key: str, start: int | None = None, end: int | None = None) -> bytes:
+        """Conteúdo do objeto, ou só os bytes `[start, end)` com `start` informado."""
+
+        headers = {}
+        if start is not None:
+            headers["range"] = f"bytes={start}-{'' if end is None else end - 1}"
+        return self._request("GET", key, headers=headers).content
+
+    def put_object(self, key: str, data: bytes) -> None:
+        self._request("PUT", key, content=data)
+
+    def copy_object(self, source_key: str, key: str) -> None:
+        """Copia o objeto; sobre ele mesmo, apenas renova a data de modificação."""
+
+        self._request(
+            "PUT",
+            key,
+            headers={
+                "x-amz-copy-source": f"/{self._bucket}/{quote(source_key, safe='/~')}",
+                "x-amz-metadata-directive": "REPLACE",
+            },
+        )
+
+    def delete_object(self, key: str) -> None:
+        self._request("DELETE", key)
+
+    def create_multipart_upload(self, key: str) -> str:
+        response = self._request("POST", key, query={"uploads": ""})
+        return _find_text(ElementTree.fromstring(response.content), "UploadId")
+
+    def upload_part(self, key: str, upload_id: str, number: int, data: bytes) -> str:
+        response = self._request(
+            "PUT", key, query={"partNumber": str(number), "uploadId": upload_id}, content=data
+        )
+        return response.headers["etag"]
+
+    def complete_multipart_upload(self, key: str, upload_id: str, etags: Sequence[str]) -> None:
+        body = "".join(
+            f"<Part><PartNumber>{number}</PartNumber><ETag>{etag}</ETag></Part>"
+            for number, etag in enumerate(etags, start=1)
+        )
+        response = self._request(
+            "POST",
+            key,
+            query={"uploadId": upload_id},
+            content=f"<CompleteMultipartUpload>{body}</CompleteMultipartUpload>".encode(),
+        )
+        # O S3 pode responder 200 e reportar o erro no corpo.
+        if b"<Error>" in response.content:
+            raise ObjectStoreError(f"Falha ao concluir upload multipart de {key}")
+
+    def abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        self._request("DELETE", key, query={"uploadId": upload_id}, allow={404})
+
+    def list_objects(self, prefix: str) -> Iterator[ObjectInfo]:
+        token: str | None = None
+        while True:
+            query = {"list-type": "2", "prefix": prefix}
+            if token:
+                query["continuation-token"] = token
+            root = ElementTree.fromstring(self._request("GET", "", query=query).content)
+            for item in _children(root, "Contents"):
+                yield ObjectInfo(
+                    key=_find_text(item, "Key"),
+                    size=int(_find_text(item, "Size")),
+                    last_modified=datetime.fromisoformat(_find_text(item, "LastModified"))
+                    .replace(tzinfo=timezone.utc)
+                    .timestamp(),
+                )
+            if _find_text(root, "IsTruncated", "false") != "true":
+                return
+            token = _find_text(root, "NextContinuationToken")
+
+    def _request(
+        self,
+        method: str,
+        key: str,
+        *,
+        query: Mapping[str, str] | None = None,
+        headers: Mapping[str, str] | None = None,
+        content: bytes = b"",
+        allow: frozenset[int] | set[int] = frozenset(),
+    ) -> httpx.Response:
+        query = dict(query or {})
+        encoded_key = quote(key, safe="/~")
+        if self._path_style:
+            host = self._endpoint.netloc.decode("ascii")
+            path = f"/{self._bucket}/{encoded_key}" if key else f"/{self._bucket}"
+        else:
+            host = f"{self._bucket}.{self._endpoint.netloc.decode('ascii')}"
+            path = f"/{encoded_key}"
+        signed = sign_request(
+            method,
+            host,
+            path,
+            query,
+            headers or {},
+            payload_hash=hashlib.sha256(content).hexdigest() if content else EMPTY_SHA256,
+            access_key=self._access_key,
+            secret_key=self._secret_key,
+            region=self._region,
+            now=datetime.now(timezone.utc),
+        )
+        url = f"{self._endpoint.scheme}://{host}{path}"
+        if query:
+            url += f"?{encode_query(query)}"
+        try:
+            response = self._client.request(method, url, headers=signed, content=content)
+        except httpx.HTTPError as exc:
+            raise ObjectStoreError(f"{method} {key or self._bucket}: {exc}") from exc
+        if response.status_code >= 400 and response.status_code not in allow:
+            raise ObjectStoreError(
+                f"{method} {key or self._bucket}: HTTP {response.status_code} "
+                f"{response.text[:200]}",
+                status_code=response.status_code,
+            )
+        return response
+
+
+def _children(element: ElementTree.Element, name: str) -> Iterator[ElementTree.Element]:
+    """Filhos com a tag `name`, com ou sem o namespace do S3."""
+
+    for child in element:
+        if child.tag.rsplit("}", 1)[-1] == name:
+            yield child
+
+
+def _find_text(element: ElementTree.Element, name: str, default: str | None = None) -> str:
+    for child in _children(element, name):
+        return child.text or ""
+    if default is None:
+        raise ObjectStoreError(f"Resposta do object store sem <{name}>")
+    return default
@@ -0,0 +1,112 @@
+"""Cliente OpenAI compartilhado durante todo o ciclo de vida do processo."""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.config import Settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """Transporte httpx que contabiliza requisições para expor métricas do pool."""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests_total = 0
+        self.errors_total = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.requests_total += 1
+        try:
+            return await super().handle_async_request(request)
+        except Exception:
+            self.errors_total += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> dict[str, int]:
+        # `httpcore` não expõe contadores públicos; a lista de conexões é a
+        # única forma de saber quantas estão ociosas (keep-alive) ou em uso.
+        connections = list(getattr(self._pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "requests_total": self.requests_total,
+            "errors_total": self.errors_total,
+            "connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle,
+        }
+
+
+class OpenAIClientManager:
+    """Cria um único `AsyncOpenAI` (e pool httpx) por processo e o fecha ao final."""
+
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+        self._transport: InstrumentedTransport | None = None
+        self._http_client: httpx.AsyncClient | None = None
+        self._client: AsyncOpenAI | None = None
+        self._http2 = False
+
+    @property
+    def client(self) -> AsyncOpenAI | None:
+        return self._client
+
+    def start(self) -> None:
+        config = self._settings.openai
+        if self._client is not None or not config.api_key:
+            return
+
+        self._http2 = config.http2 and importlib.util.find_spec("h2") is not None
+        if config.http2 and not self._http2:
+            logger.warning("Pacote `h2` ausente; cliente OpenAI usará HTTP/1.1.")
+
+        limits = httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        )
+        self._transport = InstrumentedTransport(limits=limits, http2=self._http2)
+        self._http_client = httpx.AsyncClient(
+            transport=self._transport,
+            timeout=httpx.Timeout(config.timeout, connect=10.0),
+        )
+        self._client = AsyncOpenAI(
+            api_key=config.api_key,
+            timeout=config.timeout,
+            # Retentativas ficam a cargo de `ResilientCaller`.
+            max_retries=0,
+            http_client=self._http_client,
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        self._client = None
+        self._http_client = None
+        self._transport = None
+
+    def stats(self) -> dict[str, object]:
+        config = self._settings.openai
+        return {
+            "max_connections": config.max_connections,
+            "max_keepalive_connections": config.max_keepalive_connections,
+            "http2": self._http2,
+            **(self._transport.stats() if self._transport else {}),
+        }
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from collections.abc import Sequence
+import re
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from pathlib import Path
+from typing import Any, TypeVar
 
 from openai import AsyncOpenAI
 from openai.types.responses import Response
+from pydantic import BaseModel
 
 from app.core.config import Settings, get_settings
 from app.domain.entities import (
@@ -17,14 +22,38 @@ from app.domain.entities import (
     ImageAnalysis,
     IssueSeverity,
 )
+from app.infrastructure.services.analysis_cache import (
+    AnalysisCache,
+    build_cache_key,
+    file_sha256,
+)
+from app.infrastructure.services.batch import (
+    BatchBackend,
+    BatchRequest,
+    BatchResult,
+    BatchRunner,
+    LocalBatchBackend,
+    OpenAIBatchBackend,
+)
 from app.infrastructure.services.exceptions import OpenAIServiceError
+from app.infrastructure.services.ifc_diff import IfcDiff
+from app.infrastructure.services.ifc_inventory import IfcInventoryService
+from app.infrastructure.services.image_preprocessing import ImageDerivative, ImagePreprocessor
 from app.infrastructure.services.openai_schemas import (
     IssuePayload,
     BimAnalysisPayload,
     ComparisonPayload,
     ImageAnalysisPayload,
 )
+from app.infrastructure.services.rate_limiter import ModelRateLimiter, estimate_tokens
+from app.infrastructure.services.resilience import CircuitOpenError, ResilientCaller
+
+
+# Estimativa por derivado anexado (imagem ~1568px em detalhe alto).
+IMAGE_TOKEN_ESTIMATE = 1500
 
+# `raw_output` das análises BIM simuladas (sem chave ou com a OpenAI indisponível).
+MOCK_BIM_OUTPUT = "mock_bim_analysis"
 
 SYSTEM_PROMPT = (
     "Você é um assistente especializado em engenharia civil. Sempre responda em JSON válido conforme o schema fornecido."
@@ -33,17 +62,36 @@ SYSTEM_PROMPT = (
 
 logger = logging.getLogger(__name__)
 
+PayloadT = TypeVar("PayloadT", bound=BaseModel)
+
 
 class OpenAIService:
     """Serviço de alto nível para lidar com prompts específicos."""
 
+    # Prefixos de `custom_id` no modo em lote (Batch API).
+    BATCH_BIM = "bim"
+    BATCH_IMAGE = "image"
+    BATCH_COMPARISON = "comparison"
+
     def __init__(
         self,
         *,
         client: AsyncOpenAI | None = None,
         settings: Settings | None = None,
+        cache: AnalysisCache | None = None,
+        rate_limiter: ModelRateLimiter | None = None,
+        resilience: ResilientCaller | None = None,
+        batch_backend: BatchBackend | None = None,
+        image_preprocessor: ImagePreprocessor | None = None,
+        ifc_inventory: IfcInventoryService | None = None,
     ) -> None:
         self._settings = settings or get_settings()
+        self._batch_backend = batch_backend
+        self._image_preprocessor = image_preprocessor
+        self._ifc_inventory = ifc_inventory
+        self._cache = cache
+        self._rate_limiter = rate_limiter or ModelRateLimiter(settings=self._settings)
+        self._resilience = resilience or ResilientCaller(self._settings.resilience)
         self._use_mock = False
         api_key = self._settings.openai.api_key
         self._client = client
@@ -51,7 +99,9 @@ class OpenAIService:
         if self._client is None:
             if api_key:
                 try:
-                    self._client = AsyncOpenAI(api_key=api_key, timeout=self._settings.openai.timeout)
+                    self._client = AsyncOpenAI(
+                        api_key=api_key, timeout=self._settings.openai.timeout, max_retries=0
+                    )
                 except Exception as exc:  # pragma: no cover - erro de inicialização
                     logger.warning("Falha ao inicializar cliente OpenAI, usando fallback mock. Detalhe: %s", exc)
                     self._use_mock = True
@@ -63,38 +113,178 @@ class OpenAIService:
             self._use_mock = True
 
     async def analyze_bim(
-        self, *, bim_source: str, project_context: str | None = None
+        self,
+        *,
+        bim_source: str,
+        project_context: str | None = None,
+        use_cache: bool = True,
+        previous: BimAnalysis | None = None,
     ) -> BimAnalysis:
-        """Executa prompt para análise de arquivo BIM."""
+        """Executa prompt para análise de arquivo BIM.
+
+        Com a análise da versão anterior (`previous`), só os elementos alterados
+        vão ao modelo e os apontamentos dos demais são mantidos.
+        """
 
         if self._use_mock:
             return self._mock_bim_analysis(source_uri=bim_source)
 
+        model = self._settings.openai.model_bim
         try:
-            payload = await self._ask_openai(
-                model=self._settings.openai.model_bim,
-                user_prompt=self._bim_prompt(source=bim_source, context=project_context),
+            cache_key = None
+            digest = await self._file_digest(bim_source) if use_cache else None
+            diff = await self._bim_diff(previous, bim_source, digest=digest)
+            if diff is not None and previous is not None:
+                if diff.is_empty:
+                    return self._carry_over_bim(previous, source_uri=bim_source)
+                return await self._analyze_bim_changes(
+                    previous,
+                    diff,
+                    bim_source=bim_source,
+                    project_context=project_context,
+                    digest=digest,
+                )
+
+            inventory = await self._bim_inventory(bim_source, digest=digest)
+            if digest is not None:
+                cache_key = build_cache_key(
+                    model=model,
+                    prompt=self._bim_prompt(
+                        source=digest, context=project_context, inventory=inventory
+                    ),
+                    schema=BimAnalysisPayload,
+                    file_digests=(digest,),
+                )
+            # As impressões desta versão são calculadas durante a chamada ao modelo:
+            # a próxima revisão do projeto só precisará ler o arquivo novo.
+            parsed, _ = await asyncio.gather(
+                self._request_structured(
+                    model=model,
+                    user_prompt=self._bim_prompt(
+                        source=bim_source, context=project_context, inventory=inventory
+                    ),
+                    schema=BimAnalysisPayload,
+                    cache_key=cache_key,
+                ),
+                self._bim_fingerprints(bim_source, digest=digest),
             )
-            parsed = BimAnalysisPayload.model_validate_json(payload)
             return self._to_bim_entity(parsed, source_uri=bim_source)
         except OpenAIServiceError as exc:
             logger.warning("OpenAI indisponível para análise BIM. Utilizando fallback mock. Detalhe: %s", exc)
             return self._mock_bim_analysis(source_uri=bim_source)
 
+    async def _analyze_bim_changes(
+        self,
+        previous: BimAnalysis,
+        diff: IfcDiff,
+        *,
+        bim_source: str,
+        project_context: str | None,
+        digest: str | None,
+    ) -> BimAnalysis:
+        """Envia só o diff ao modelo e junta os apontamentos não afetados da versão anterior."""
+
+        model = self._settings.openai.model_bim
+        changes = self._ifc_inventory.render_diff(diff)
+        cache_key = None
+        if digest is not None:
+            cache_key = build_cache_key(
+                model=model,
+                prompt=self._bim_changes_prompt(
+                    source=digest,
+                    context=project_context,
+                    changes=changes,
+                    previous_summary=previous.summary,
+                ),
+                schema=BimAnalysisPayload,
+                file_digests=(digest,),
+            )
+        parsed = await self._request_structured(
+            model=model,
+            user_prompt=self._bim_changes_prompt(
+                source=bim_source,
+                context=project_context,
+                changes=changes,
+                previous_summary=previous.summary,
+            ),
+            schema=BimAnalysisPayload,
+            cache_key=cache_key,
+        )
+        result = self._to_bim_entity(parsed, source_uri=bim_source)
+        changed = _terms_pattern(diff.changed_terms())
+        carried = tuple(issue for issue in previous.issues if not _mentions(issue, changed))
+        logger.info(
+            "Análise BIM incremental de %s: %s elementos alterados, %s apontamentos mantidos",
+            bim_source,
+            diff.changed,
+            len(carried),
+        )
+        result.issues = carried + tuple(result.issues)
+        return result
+
+    async def _bim_diff(
+        self, previous: BimAnalysis | None, path: str, *, digest: str | None
+    ) -> IfcDiff | None:
+        """Diff contra a versão anterior, se for pequeno o bastante para valer a análise parcial."""
+
+        if previous is None or self._ifc_inventory is None:
+            return None
+        # Um fallback simulado não descreve o modelo: seus apontamentos não podem
+        # ser herdados pelas versões seguintes.
+        if (
+            previous.status is not AnalysisStatus.COMPLETED
+            or previous.raw_output == MOCK_BIM_OUTPUT
+        ):
+            return None
+        diff = await self._ifc_inventory.diff(previous.bim_source_uri, path, digest=digest)
+        if diff is None or diff.changed_ratio > self._settings.ifc.diff_max_changed_ratio:
+            return None
+        return diff
+
+    async def _bim_fingerprints(self, path: str, *, digest: str | None) -> None:
+        if self._ifc_inventory is not None:
+            await self._ifc_inventory.fingerprints(path, digest=digest)
+
+    @staticmethod
+    def _carry_over_bim(previous: BimAnalysis, *, source_uri: str) -> BimAnalysis:
+        return BimAnalysis(
+            bim_source_uri=source_uri,
+            status=AnalysisStatus.COMPLETED,
+            raw_output=previous.raw_output,
+            summary=previous.summary,
+            issues=tuple(previous.issues),
+        )
+
     async def analyze_image(
-        self, *, image_source: str, project_context: str | None = None
+        self,
+        *,
+        image_source: str,
+        project_context: str | None = None,
+        use_cache: bool = True,
     ) -> ImageAnalysis:
         """Executa prompt para análise de imagem."""
 
         if self._use_mock:
             return self._mock_image_analysis(source_uri=image_source)
 
+        model = self._settings.openai.model_image
         try:
-            payload = await self._ask_openai(
-                model=self._settings.openai.model_image,
+            cache_key = None
+            digest = await self._file_digest(image_source) if use_cache else None
+            if digest is not None:
+                cache_key = build_cache_key(
+                    model=model,
+                    prompt=self._image_prompt(source=digest, context=project_context),
+                    schema=ImageAnalysisPayload,
+                    file_digests=(digest, *self._image_variant()),
+                )
+            parsed = await self._request_structured(
+                model=model,
                 user_prompt=self._image_prompt(source=image_source, context=project_context),
+                schema=ImageAnalysisPayload,
+                cache_key=cache_key,
+                images=lambda: self._image_derivatives(image_source, digest=digest),
             )
-            parsed = ImageAnalysisPayload.model_validate_json(payload)
             return self._to_image_entity(parsed, source_uri=image_source)
         except OpenAIServiceError as exc:
             logger.warning("OpenAI indisponível para análise de imagem. Utilizando fallback mock. Detalhe: %s", exc)
@@ -106,22 +296,32 @@ class OpenAIService:
         project_name: str,
         bim_analysis: BimAnalysis,
         image_analysis: ImageAnalysis,
+        use_cache: bool = True,
     ) -> ComparisonResult:
         """Compara os outputs consolidados."""
 
         if self._use_mock:
             return self._mock_comparison(project_name=project_name)
 
+        model = self._settings.openai.model_comparison
+        user_prompt = self._comparison_prompt(
+            project_name=project_name,
+            bim_summary=bim_analysis.summary or "",
+            image_summary=image_analysis.summary or "",
+            bim_quantities=await self._bim_aggregates(bim_analysis.bim_source_uri),
+        )
         try:
-            payload = await self._ask_openai(
-                model=self._settings.openai.model_comparison,
-                user_prompt=self._comparison_prompt(
-                    project_name=project_name,
-                    bim_summary=bim_analysis.summary or "",
-                    image_summary=image_analysis.summary or "",
-                ),
+            cache_key = None
+            if use_cache and self._cache is not None:
+                cache_key = build_cache_key(
+                    model=model, prompt=user_prompt, schema=ComparisonPayload
+                )
+            parsed = await self._request_structured(
+                model=model,
+                user_prompt=user_prompt,
+                schema=ComparisonPayload,
+                cache_key=cache_key,
             )
-            parsed = ComparisonPayload.model_validate_json(payload)
             return ComparisonResult(
                 summary=parsed.summary,
                 similarity_score=parsed.similarity_score,
@@ -132,16 +332,221 @@ class OpenAIService:
             logger.warning("OpenAI indisponível para comparação. Utilizando fallback mock. Detalhe: %s", exc)
             return self._mock_comparison(project_name=project_name)
 
-    async def _ask_openai(self, *, model: str, user_prompt: str) -> str:
+    async def bim_batch_request(
+        self, key: str, *, bim_source: str, project_context: str | None = None
+    ) -> BatchRequest:
+        return BatchRequest(
+            f"{self.BATCH_BIM}:{key}",
+            self._request_body(
+                model=self._settings.openai.model_bim,
+                user_prompt=self._bim_prompt(
+                    source=bim_source,
+                    context=project_context,
+                    inventory=await self._bim_inventory(bim_source),
+                ),
+            ),
+        )
+
+    async def image_batch_request(
+        self, key: str, *, image_source: str, project_context: str | None = None
+    ) -> BatchRequest:
+        return BatchRequest(
+            f"{self.BATCH_IMAGE}:{key}",
+            self._request_body(
+                model=self._settings.openai.model_image,
+                user_prompt=self._image_prompt(source=image_source, context=project_context),
+                images=await self._image_derivatives(image_source),
+            ),
+        )
+
+    async def comparison_batch_request(
+        self,
+        key: str,
+        *,
+        project_name: str,
+        bim_analysis: BimAnalysis,
+        image_analysis: ImageAnalysis,
+    ) -> BatchRequest:
+        return BatchRequest(
+            f"{self.BATCH_COMPARISON}:{key}",
+            self._request_body(
+                model=self._settings.openai.model_comparison,
+                user_prompt=self._comparison_prompt(
+                    project_name=project_name,
+                    bim_summary=bim_analysis.summary or "",
+                    image_summary=image_analysis.summary or "",
+                    bim_quantities=await self._bim_aggregates(bim_analysis.bim_source_uri),
+                ),
+            ),
+        )
+
+    async def run_batch(
+        self,
+        requests: Sequence[BatchRequest],
+        *,
+        metadata: Mapping[str, str] | None = None,
+        on_poll: Callable[[], Awaitable[None]] | None = None,
+    ) -> dict[str, BatchResult]:
+        """Submete as requisições num único lote e aguarda os resultados."""
+
+        config = self._settings.batch
+        runner = BatchRunner(
+            self._resolve_batch_backend(),
+            work_dir=Path(config.work_dir),
+            poll_interval=config.poll_interval,
+        )
+        return await runner.run(requests, metadata=metadata, on_poll=on_poll)
+
+    def bim_from_batch(self, result: BatchResult, *, source_uri: str) -> BimAnalysis:
+        return self._to_bim_entity(
+            self._parse_batch_result(result, BimAnalysisPayload), source_uri=source_uri
+        )
+
+    def image_from_batch(self, result: BatchResult, *, source_uri: str) -> ImageAnalysis:
+        return self._to_image_entity(
+            self._parse_batch_result(result, ImageAnalysisPayload), source_uri=source_uri
+        )
+
+    def comparison_from_batch(self, result: BatchResult) -> ComparisonResult:
+        parsed = self._parse_batch_result(result, ComparisonPayload)
+        return ComparisonResult(
+            summary=parsed.summary,
+            similarity_score=parsed.similarity_score,
+            completion_percentage=parsed.completion_percentage,
+            mismatches=tuple(parsed.mismatches),
+        )
+
+    def _resolve_batch_backend(self) -> BatchBackend:
+        if self._batch_backend is None:
+            config = self._settings.batch
+            if self._use_mock or config.backend == "local":
+                self._batch_backend = LocalBatchBackend(
+                    Path(config.work_dir) / "local", responder=self._mock_batch_response
+                )
+            else:
+                self._batch_backend = OpenAIBatchBackend(
+                    self._client, completion_window=config.completion_window
+                )
+        return self._batch_backend
+
+    @staticmethod
+    def _parse_batch_result(result: BatchResult, schema: type[PayloadT]) -> PayloadT:
+        if not result.ok:
+            raise OpenAIServiceError(result.error or "Resultado ausente no lote")
         try:
-            response: Response = await self._client.responses.create(
-                model=model,
-                input=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt},
-                ],
-                response_format={"type": "json_object"},
+            return schema.model_validate_json(result.text)
+        except ValueError as exc:
+            raise OpenAIServiceError(
+                "Resposta inválida no lote", raw_output=result.text
+            ) from exc
+
+    @classmethod
+    def _mock_batch_response(cls, custom_id: str, body: Mapping[str, Any]) -> str:
+        """Responde linhas do lote local com os mesmos dados dos fallbacks mock."""
+
+        kind = custom_id.split(":", 1)[0]
+        if kind == cls.BATCH_COMPARISON:
+            comparison = cls._mock_comparison(project_name="em lote")
+            return ComparisonPayload(
+                summary=comparison.summary,
+                similarity_score=comparison.similarity_score,
+                completion_percentage=comparison.completion_percentage,
+                mismatches=list(comparison.mismatches),
+            ).model_dump_json()
+
+        if kind == cls.BATCH_BIM:
+            entity, schema = cls._mock_bim_analysis(source_uri=""), BimAnalysisPayload
+        else:
+            entity, schema = cls._mock_image_analysis(source_uri=""), ImageAnalysisPayload
+        return schema(
+            summary=entity.summary or "",
+            raw_output=entity.raw_output,
+            issues=[
+                IssuePayload(
+                    description=issue.description,
+                    severity=issue.severity,
+                    confidence=issue.confidence,
+                    location_hint=issue.location_hint,
+                )
+                for issue in entity.issues
+            ],
+        ).model_dump_json()
+
+    async def _request_structured(
+        self,
+        *,
+        model: str,
+        user_prompt: str,
+        schema: type[PayloadT],
+        cache_key: str | None,
+        images: Callable[[], Awaitable[Sequence[ImageDerivative]]] | None = None,
+    ) -> PayloadT:
+        """Consulta o cache antes do modelo; só respostas válidas são armazenadas.
+
+        `images` só é avaliado em cache miss, evitando gerar derivados à toa.
+        """
+
+        if cache_key is not None:
+            cached = await self._cache.get(cache_key)
+            if cached is not None:
+                try:
+                    return schema.model_validate_json(cached)
+                except ValueError:
+                    logger.warning("Entrada de cache inválida descartada: %s", cache_key)
+
+        payload = await self._ask_openai(
+            model=model,
+            user_prompt=user_prompt,
+            images=await images() if images is not None else (),
+        )
+        parsed = schema.model_validate_json(payload)
+        if cache_key is not None:
+            await self._cache.set(cache_key, payload)
+        return parsed
+
+    async def _file_digest(self, path: str) -> str | None:
+        if self._cache is None:
+            return None
+        try:
+            return await file_sha256(path)
+        except OSError as exc:
+            logger.warning("Não foi possível calcular hash de %s; cache ignorado: %s", path, exc)
+            return None
+
+    async def _bim_inventory(self, path: str, *, digest: str | None = None) -> str | None:
+        if self._ifc_inventory is None:
+            return None
+        inventory = await self._ifc_inventory.render(path, digest=digest)
+        aggregates = await self._ifc_inventory.render_aggregates(path, digest=digest)
+        return "\n".join(filter(None, (inventory, aggregates))) or None
+
+    async def _bim_aggregates(self, path: str) -> str | None:
+        if self._ifc_inventory is None or not path:
+            return None
+        return await self._ifc_inventory.render_aggregates(path)
+
+    async def _image_derivatives(
+        self, path: str, *, digest: str | None = None
+    ) -> Sequence[ImageDerivative]:
+        if self._image_preprocessor is None:
+            return ()
+        return await self._image_preprocessor.prepare(path, digest=digest)
+
+    def _image_variant(self) -> tuple[str, ...]:
+        """Parâmetros dos derivados: mudam o que o modelo vê, logo entram na chave."""
+
+        return (self._image_preprocessor.variant,) if self._image_preprocessor else ()
+
+    async def _ask_openai(
+        self, *, model: str, user_prompt: str, images: Sequence[ImageDerivative] = ()
+    ) -> str:
+        try:
+            response = await self._resilience.call(
+                model,
+                lambda: self._send_request(model=model, user_prompt=user_prompt, images=images),
             )
+        except CircuitOpenError as exc:
+            raise OpenAIServiceError(f"Circuito aberto para o modelo {model}") from exc
         except Exception as exc:  # pragma: no cover - erros de rede
             raise OpenAIServiceError("Falha na requisição ao OpenAI") from exc
 
@@ -150,6 +555,51 @@ class OpenAIService:
             raise OpenAIServiceError("Resposta vazia do OpenAI", raw_output=str(response))
         return text
 
+    async def _send_request(
+        self, *, model: str, user_prompt: str, images: Sequence[ImageDerivative] = ()
+    ) -> Response:
+        estimated_tokens = (
+            estimate_tokens(SYSTEM_PROMPT, user_prompt) + IMAGE_TOKEN_ESTIMATE * len(images)
+        )
+        # Um 429 sobe para o `ResilientCaller`, que repete a chamada sem contá-la
+        # como falha: o limitador já pausou o orçamento e a nova tentativa espera aqui.
+        async with self._rate_limiter.acquire(model, estimated_tokens=estimated_tokens) as slot:
+            response: Response = await self._client.responses.create(
+                **self._request_body(model=model, user_prompt=user_prompt, images=images)
+            )
+            slot.record_usage(self._usage_tokens(response))
+            return response
+
+    @staticmethod
+    def _request_body(
+        *, model: str, user_prompt: str, images: Sequence[ImageDerivative] = ()
+    ) -> dict[str, Any]:
+        """Corpo da chamada, compartilhado entre o modo interativo e o lote.
+
+        Derivados de imagem seguem como data URLs junto ao texto do prompt.
+        """
+
+        content: str | list[dict[str, str]] = user_prompt
+        if images:
+            content = [
+                {"type": "input_text", "text": user_prompt},
+                *({"type": "input_image", "image_url": image.data_url} for image in images),
+            ]
+        return {
+            "model": model,
+            "input": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": content},
+            ],
+            "response_format": {"type": "json_object"},
+        }
+
+    @staticmethod
+    def _usage_tokens(response: Response) -> int | None:
+        usage = getattr(response, "usage", None)
+        total = getattr(usage, "total_tokens", None)
+        return total if isinstance(total, int) else None
+
     @staticmethod
     def _extract_text(response: Response) -> str:
         """Extrai conteúdo textual da resposta."""
@@ -192,14 +642,34 @@ class OpenAIService:
         )
 
     @staticmethod
-    def _bim_prompt(*, source: str, context: str | None) -> str:
-        return (
+    def _bim_prompt(*, source: str, context: str | None, inventory: str | None = None) -> str:
+        prompt = (
             "Analise o arquivo BIM disponível em: {source}. "
             "{context_msg}\nRetorne resumo e incongruências."
         ).format(
             source=source,
             context_msg=f"Contexto do projeto: {context}." if context else "",
         )
+        if inventory:
+            prompt += f"\n\nInventário extraído do modelo IFC:\n{inventory}"
+        return prompt
+
+    @staticmethod
+    def _bim_changes_prompt(
+        *, source: str, context: str | None, changes: str, previous_summary: str | None
+    ) -> str:
+        prompt = (
+            "O arquivo BIM em {source} é uma nova versão de um modelo já analisado. "
+            "{context_msg}\nAnalise apenas os elementos alterados abaixo e retorne resumo "
+            "das mudanças e incongruências introduzidas.\n\n{changes}"
+        ).format(
+            source=source,
+            context_msg=f"Contexto do projeto: {context}." if context else "",
+            changes=changes,
+        )
+        if previous_summary:
+            prompt += f"\n\nResumo da versão anterior: {previous_summary}"
+        return prompt
 
     @staticmethod
     def _image_prompt(*, source: str, context: str | None) -> str:
@@ -212,11 +682,20 @@ class OpenAIService:
         )
 
     @staticmethod
-    def _comparison_prompt(*, project_name: str, bim_summary: str, image_summary: str) -> str:
-        return (
+    def _comparison_prompt(
+        *,
+        project_name: str,
+        bim_summary: str,
+        image_summary: str,
+        bim_quantities: str | None = None,
+    ) -> str:
+        prompt = (
             "Projeto: {project}.\nResumo BIM: {bim}.\nResumo imagem: {image}.\n"
             "Compare e informe similaridade (0-1), porcentagem de conclusão (0-1) e divergências."
         ).format(project=project_name, bim=bim_summary, image=image_summary)
+        if bim_quantities:
+            prompt += f"\n\nQuantitativos previstos no modelo BIM:\n{bim_quantities}"
+        return prompt
 
     @staticmethod
     def _mock_bim_analysis(*, source_uri: str) -> BimAnalysis:
@@ -224,7 +703,7 @@ class OpenAIService:
             bim_source_uri=source_uri,
             status=AnalysisStatus.COMPLETED,
             summary="Análise simulada: estrutura principal em conformidade, atenção a pequenos ajustes de acabamento.",
-            raw_output="mock_bim_analysis",
+            raw_output=MOCK_BIM_OUTPUT,
             issues=(
                 DetectedIssue(
                     description="Necessário reforço de guarda-corpo na plataforma central.",
@@ -267,3 +746,17 @@ class OpenAIService:
             ),
         )
 
+
+def _terms_pattern(terms: set[str]) -> re.Pattern[str] | None:
+    if not terms:
+        return None
+    alternatives = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)")
+
+
+def _mentions(issue: DetectedIssue, pattern: re.Pattern[str] | None) -> bool:
+    """Se o apontamento cita algum elemento alterado (por nome ou GlobalId)."""
+
+    if pattern is None:
+        return False
+    return pattern.search(f"{issue.description} {issue.location_hint or ''}".lower()) is not None
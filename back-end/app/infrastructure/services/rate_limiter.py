@@ -0,0 +1,313 @@
+"""Limitador de taxa por modelo (RPM/TPM) com concorrência adaptativa."""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import Settings, get_settings
+
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True, slots=True)
+class BucketRequest:
+    """Quantidade a retirar de um balde com a taxa de reposição informada."""
+
+    key: str
+    amount: float
+    capacity: float
+
+    @property
+    def rate_per_second(self) -> float:
+        return self.capacity / 60.0
+
+
+class BucketStore(ABC):
+    """Estado dos token buckets, possivelmente compartilhado entre processos."""
+
+    @abstractmethod
+    async def take(self, requests: Sequence[BucketRequest]) -> float:
+        """Retira atomicamente de todos os baldes ou devolve a espera necessária (s)."""
+
+    @abstractmethod
+    async def refund(self, request: BucketRequest) -> None:
+        """Devolve (ou cobra, se negativo) tokens após conhecer o consumo real."""
+
+    @abstractmethod
+    async def pause(self, keys: Sequence[str], until: float) -> None:
+        """Bloqueia os baldes até o instante informado (ex.: `retry-after`)."""
+
+
+def _apply_take(
+    state: dict[str, dict[str, float]], requests: Sequence[BucketRequest], now: float
+) -> float:
+    wait = 0.0
+    buckets = []
+    for request in requests:
+        bucket = state.setdefault(
+            request.key, {"tokens": request.capacity, "updated_at": now, "paused_until": 0.0}
+        )
+        elapsed = max(0.0, now - bucket["updated_at"])
+        bucket["tokens"] = min(
+            request.capacity, bucket["tokens"] + elapsed * request.rate_per_second
+        )
+        bucket["updated_at"] = now
+        amount = min(request.amount, request.capacity)
+        wait = max(wait, bucket["paused_until"] - now)
+        if bucket["tokens"] < amount:
+            wait = max(wait, (amount - bucket["tokens"]) / request.rate_per_second)
+        buckets.append((bucket, amount))
+
+    if wait <= 0:
+        for bucket, amount in buckets:
+            bucket["tokens"] -= amount
+        return 0.0
+    return wait
+
+
+def _apply_refund(state: dict[str, dict[str, float]], request: BucketRequest) -> None:
+    bucket = state.get(request.key)
+    if bucket is not None:
+        bucket["tokens"] = min(request.capacity, bucket["tokens"] + request.amount)
+
+
+def _apply_pause(state: dict[str, dict[str, float]], keys: Sequence[str], until: float) -> None:
+    for key in keys:
+        bucket = state.get(key)
+        if bucket is not None:
+            bucket["paused_until"] = max(bucket["paused_until"], until)
+
+
+class InMemoryBucketStore(BucketStore):
+    """Estado local ao processo."""
+
+    def __init__(self) -> None:
+        self._state: dict[str, dict[str, float]] = {}
+
+    async def take(self, requests: Sequence[BucketRequest]) -> float:
+        return _apply_take(self._state, requests, time.time())
+
+    async def refund(self, request: BucketRequest) -> None:
+        _apply_refund(self._state, request)
+
+    async def pause(self, keys: Sequence[str], until: float) -> None:
+        _apply_pause(self._state, keys, until)
+
+
+class FileBucketStore(BucketStore):
+    """Estado em arquivo JSON protegido por `flock`, compartilhado pelos processos do nó."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._path.touch(exist_ok=True)
+
+    async def take(self, requests: Sequence[BucketRequest]) -> float:
+        return await asyncio.to_thread(
+            self._locked, lambda state: _apply_take(state, requests, time.time())
+        )
+
+    async def refund(self, request: BucketRequest) -> None:
+        await asyncio.to_thread(self._locked, lambda state: _apply_refund(state, request))
+
+    async def pause(self, keys: Sequence[str], until: float) -> None:
+        await asyncio.to_thread(self._locked, lambda state: _apply_pause(state, keys, until))
+
+    def _locked(self, operation):
+        with self._path.open("r+") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                raw = handle.read()
+                state = json.loads(raw) if raw else {}
+                result = operation(state)
+                handle.seek(0)
+                handle.truncate()
+                handle.write(json.dumps(state))
+                handle.flush()
+                return result
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class AdaptiveConcurrency:
+    """Limite de concorrência AIMD: cresce 1 por janela, cai pela metade em 429/lentidão."""
+
+    def __init__(
+        self, *, initial: int, minimum: int, maximum: int, latency_target: float
+    ) -> None:
+        self._minimum = max(1, minimum)
+        self._maximum = max(self._minimum, maximum)
+        self.limit = float(min(max(initial, self._minimum), self._maximum))
+        self._latency_target = latency_target
+        self._condition = asyncio.Condition()
+        self.in_use = 0
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_use < int(self.limit))
+            self.in_use += 1
+
+    async def release(self, *, latency: float, overloaded: bool) -> None:
+        async with self._condition:
+            self.in_use -= 1
+            if overloaded or latency > self._latency_target:
+                self.limit = max(float(self._minimum), self.limit / 2)
+            else:
+                self.limit = min(float(self._maximum), self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+@dataclass(slots=True)
+class RateLimitSlot:
+    """Reserva concedida a uma chamada; `record_usage` ajusta o balde de tokens."""
+
+    estimated_tokens: int
+    tokens_used: int | None = None
+
+    def record_usage(self, tokens: int | None) -> None:
+        self.tokens_used = tokens
+
+
+@dataclass(slots=True)
+class _ModelState:
+    concurrency: AdaptiveConcurrency
+    queue: asyncio.Lock = field(default_factory=asyncio.Lock)
+    waiting: int = 0
+    requests_total: int = 0
+    rate_limited_total: int = 0
+
+
+class ModelRateLimiter:
+    """Aplica orçamentos de requisições e tokens por minuto para cada modelo.
+
+    Chamadores excedentes aguardam em fila (FIFO por modelo) em vez de falhar.
+    """
+
+    def __init__(self, *, settings: Settings, store: BucketStore | None = None) -> None:
+        self._config = settings.rate_limit
+        self._store = store or InMemoryBucketStore()
+        self._models: dict[str, _ModelState] = {}
+
+    @asynccontextmanager
+    async def acquire(self, model: str, *, estimated_tokens: int) -> AsyncIterator[RateLimitSlot]:
+        state = self._state(model)
+        requests_budget, tokens_budget = self._budget(model)
+        buckets = [
+            BucketRequest(f"{model}:requests", 1, requests_budget),
+            BucketRequest(f"{model}:tokens", estimated_tokens, tokens_budget),
+        ]
+
+        state.waiting += 1
+        try:
+            async with state.queue:
+                while (wait := await self._store.take(buckets)) > 0:
+                    await asyncio.sleep(wait)
+                await state.concurrency.acquire()
+        finally:
+            state.waiting -= 1
+
+        state.requests_total += 1
+        slot = RateLimitSlot(estimated_tokens=estimated_tokens)
+        started = time.monotonic()
+        overloaded = False
+        try:
+            yield slot
+        except Exception as exc:
+            if getattr(exc, "status_code", None) == 429:
+                overloaded = True
+                state.rate_limited_total += 1
+                retry_after = _retry_after_seconds(exc) or self._config.default_retry_after
+                logger.warning("429 recebido para %s; pausando %.1fs", model, retry_after)
+                await self._store.pause(
+                    [bucket.key for bucket in buckets], time.time() + retry_after
+                )
+            raise
+        finally:
+            await state.concurrency.release(
+                latency=time.monotonic() - started, overloaded=overloaded
+            )
+            if slot.tokens_used is not None:
+                await self._store.refund(
+                    BucketRequest(
+                        f"{model}:tokens", estimated_tokens - slot.tokens_used, tokens_budget
+                    )
+                )
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        return {
+            model: {
+                "concurrency_limit": round(state.concurrency.limit, 2),
+                "in_flight": state.concurrency.in_use,
+                "waiting": state.waiting,
+                "requests_total": state.requests_total,
+                "rate_limited_total": state.rate_limited_total,
+            }
+            for model, state in self._models.items()
+        }
+
+    def _state(self, model: str) -> _ModelState:
+        state = self._models.get(model)
+        if state is None:
+            state = _ModelState(
+                concurrency=AdaptiveConcurrency(
+                    initial=self._config.initial_concurrency,
+                    minimum=self._config.min_concurrency,
+                    maximum=self._config.max_concurrency,
+                    latency_target=self._config.latency_target_seconds,
+                )
+            )
+            self._models[model] = state
+        return state
+
+    def _budget(self, model: str) -> tuple[int, int]:
+        override = self._config.model_budgets.get(model, {})
+        return (
+            override.get("requests_per_minute", self._config.requests_per_minute),
+            override.get("tokens_per_minute", self._config.tokens_per_minute),
+        )
+
+
+def estimate_tokens(*texts: str, expected_output: int = 1024) -> int:
+    """Estimativa conservadora (~4 caracteres por token) usada antes da resposta."""
+
+    return sum(len(text) for text in texts) // CHARS_PER_TOKEN + expected_output
+
+
+def _retry_after_seconds(exc: Exception) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def build_rate_limiter(settings: Settings) -> ModelRateLimiter:
+    config = settings.rate_limit
+    store: BucketStore
+    if config.backend == "file":
+        store = FileBucketStore(Path(config.coordination_path))
+    else:
+        store = InMemoryBucketStore()
+    return ModelRateLimiter(settings=settings, store=store)
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> ModelRateLimiter:
+    """Instância compartilhada pelo processo (API ou worker)."""
+
+    return build_rate_limiter(get_settings())
@@ -0,0 +1,273 @@
+"""Retentativas com backoff, requisições hedge e circuit breaker por modelo."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import TypeVar
+
+import httpx
+
+from app.core.config import ResilienceSettings, get_settings
+from app.infrastructure.services.exceptions import ExternalServiceError
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+TRANSIENT_STATUS_CODES = frozenset({408, 409, 500, 502, 503, 504})
+
+
+class CircuitOpenError(ExternalServiceError):
+    """Chamada recusada porque o circuito do modelo está aberto."""
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Erros de rede, timeout e 5xx merecem nova tentativa; 4xx (exceto 408/409) não."""
+
+    if isinstance(exc, (httpx.TransportError, asyncio.TimeoutError, TimeoutError)):
+        return True
+    # `openai.APIConnectionError`/`APITimeoutError` não têm `status_code`.
+    if type(exc).__name__ in {"APIConnectionError", "APITimeoutError"}:
+        return True
+    return getattr(exc, "status_code", None) in TRANSIENT_STATUS_CODES
+
+
+def is_throttled(exc: BaseException) -> bool:
+    """429: o modelo está saudável, só pediu para esperar."""
+
+    return getattr(exc, "status_code", None) == 429
+
+
+class CircuitBreaker:
+    """Abre após `failure_threshold` falhas seguidas; testa com uma chamada após o timeout."""
+
+    def __init__(self, *, failure_threshold: int, reset_timeout: float) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    def before_call(self) -> None:
+        if self.state is CircuitState.OPEN:
+            if time.monotonic() - (self.opened_at or 0) < self._reset_timeout:
+                raise CircuitOpenError("Circuito aberto para o modelo")
+            self.state = CircuitState.HALF_OPEN
+        if self.state is CircuitState.HALF_OPEN:
+            if self._probe_in_flight:
+                raise CircuitOpenError("Circuito em teste para o modelo")
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if (
+            self.state is CircuitState.HALF_OPEN
+            or self.consecutive_failures >= self._failure_threshold
+        ):
+            if self.state is not CircuitState.OPEN:
+                self.times_opened += 1
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Libera a sonda do half-open quando a chamada falha por erro não transitório."""
+
+        self._probe_in_flight = False
+
+
+class LatencyWindow:
+    """Janela deslizante de latências para estimar o p95."""
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, fraction: float) -> float | None:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return ordered[index]
+
+
+@dataclass(slots=True)
+class _ModelResilience:
+    breaker: CircuitBreaker
+    latency: LatencyWindow
+    calls_total: int = 0
+    failures_total: int = 0
+    retries_total: int = 0
+    hedges_total: int = 0
+    hedge_wins: int = 0
+    rejected_total: int = 0
+    throttled_total: int = 0
+
+
+class ResilientCaller:
+    """Aplica retentativas, hedging e circuit breaker às chamadas de um modelo."""
+
+    def __init__(self, config: ResilienceSettings) -> None:
+        self._config = config
+        self._models: dict[str, _ModelResilience] = {}
+
+    async def call(self, model: str, factory: Callable[[], Awaitable[T]]) -> T:
+        state = self._state(model)
+        state.calls_total += 1
+        attempt = 1
+        while True:
+            try:
+                state.breaker.before_call()
+            except CircuitOpenError:
+                state.rejected_total += 1
+                raise
+
+            started = time.monotonic()
+            try:
+                result = await self._maybe_hedged(state, factory)
+            except Exception as exc:
+                if is_throttled(exc):
+                    # O limitador já pausou o orçamento do modelo: a nova tentativa
+                    # espera em `acquire`, sem contar como falha nem gastar tentativas.
+                    state.breaker.release_probe()
+                    state.throttled_total += 1
+                    continue
+                if not is_transient(exc):
+                    state.breaker.release_probe()
+                    state.failures_total += 1
+                    raise
+                state.breaker.record_failure()
+                if attempt >= self._config.max_attempts or state.breaker.state is CircuitState.OPEN:
+                    state.failures_total += 1
+                    raise
+                delay = self._backoff(attempt)
+                logger.info(
+                    "Erro transitório em %s (tentativa %s/%s); nova tentativa em %.2fs: %s",
+                    model,
+                    attempt,
+                    self._config.max_attempts,
+                    delay,
+                    exc,
+                )
+                state.retries_total += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelada (cliente desconectou, hedge, desligamento): sem liberar
+                # a sonda, o half-open recusaria todas as chamadas seguintes.
+                state.breaker.release_probe()
+                raise
+
+            state.breaker.record_success()
+            state.latency.add(time.monotonic() - started)
+            return result
+
+    def stats(self) -> dict[str, dict[str, object]]:
+        return {
+            model: {
+                "circuit": state.breaker.state.value,
+                "consecutive_failures": state.breaker.consecutive_failures,
+                "times_opened": state.breaker.times_opened,
+                "calls_total": state.calls_total,
+                "failures_total": state.failures_total,
+                "retries_total": state.retries_total,
+                "rejected_total": state.rejected_total,
+                "throttled_total": state.throttled_total,
+                "hedges_total": state.hedges_total,
+                "hedge_wins": state.hedge_wins,
+                "latency_p95_seconds": state.latency.percentile(0.95),
+            }
+            for model, state in self._models.items()
+        }
+
+    async def _maybe_hedged(
+        self, state: _ModelResilience, factory: Callable[[], Awaitable[T]]
+    ) -> T:
+        delay = self._hedge_delay(state)
+        if delay is None:
+            return await factory()
+
+        primary = asyncio.ensure_future(factory())
+        pending = {primary}
+        error: BaseException | None = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            state.hedges_total += 1
+            hedge = asyncio.ensure_future(factory())
+            pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            state.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            # Também quando quem chamou é cancelado: nada continua em segundo plano.
+            for task in pending:
+                task.cancel()
+
+    def _hedge_delay(self, state: _ModelResilience) -> float | None:
+        if not self._config.hedging_enabled or len(state.latency) < self._config.hedge_min_samples:
+            return None
+        p95 = state.latency.percentile(0.95)
+        return max(self._config.hedge_min_delay, p95 or 0.0)
+
+    def _backoff(self, attempt: int) -> float:
+        ceiling = min(self._config.max_delay, self._config.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling) if self._config.jitter else ceiling
+
+    def _state(self, model: str) -> _ModelResilience:
+        state = self._models.get(model)
+        if state is None:
+            state = _ModelResilience(
+                breaker=CircuitBreaker(
+                    failure_threshold=self._config.breaker_failure_threshold,
+                    reset_timeout=self._config.breaker_reset_timeout,
+                ),
+                latency=LatencyWindow(),
+            )
+            self._models[model] = state
+        return state
+
+
+@lru_cache(maxsize=1)
+def get_resilient_caller() -> ResilientCaller:
+    """Instância compartilhada pelo processo (API ou worker)."""
+
+    return ResilientCaller(get_settings().resilience)
@@ -0,0 +1,128 @@
+"""Arquivos parciais dos envios retomáveis, gravados parte a parte por offset.
+
+Cada envio tem um arquivo de staging protegido por `flock`: uma parte por vez,
+mesmo entre processos. Uma parte que falha (checksum, tamanho, conexão
+interrompida) é descartada com `truncate`, voltando o arquivo ao offset anterior.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import hashlib
+import os
+from collections.abc import AsyncIterable
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO
+from uuid import UUID
+
+from app.infrastructure.services.storage import (
+    FileStorage,
+    FileStorageError,
+    FileTooLargeError,
+)
+from app.infrastructure.services.upload_stream import feed_stream
+
+
+class ChunkChecksumError(FileStorageError):
+    """Parte recebida não confere com o sha256 informado pelo cliente."""
+
+
+class UploadBusyError(FileStorageError):
+    """Outra parte do mesmo envio está sendo gravada."""
+
+
+def staging_path(storage: FileStorage, upload_id: UUID) -> Path:
+    return storage.staging_root / f"{upload_id}.part"
+
+
+class StagingFile:
+    """Arquivo parcial aberto com lock exclusivo enquanto o contexto estiver ativo."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._handle: BinaryIO | None = None
+
+    async def __aenter__(self) -> StagingFile:
+        await asyncio.to_thread(self._open)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await asyncio.to_thread(self._close)
+
+    async def append(
+        self,
+        storage: FileStorage,
+        offset: int,
+        stream: AsyncIterable[bytes],
+        *,
+        sha256: str,
+        max_bytes: int,
+    ) -> int:
+        """Grava a parte a partir de `offset` e devolve o número de bytes recebidos.
+
+        O que houver no arquivo depois de `offset` (parte anterior não confirmada)
+        é descartado antes da gravação.
+        """
+
+        handle = self._handle
+        if await asyncio.to_thread(self._size) < offset:
+            raise FileStorageError("Arquivo parcial menor que o offset registrado")
+        await asyncio.to_thread(self._truncate, offset)
+        digest = hashlib.sha256()
+        written = 0
+
+        def write(buffer: bytearray) -> None:
+            nonlocal written
+            written += len(buffer)
+            if written > max_bytes:
+                raise FileTooLargeError("Parte excede o tamanho restante do envio")
+            digest.update(buffer)
+            handle.write(buffer)
+
+        try:
+            await feed_stream(stream, lambda buffer: storage.run_write(write, buffer))
+            if digest.hexdigest() != sha256.lower():
+                raise ChunkChecksumError("sha256 da parte não confere com o informado")
+            await asyncio.to_thread(self._sync)
+        except BaseException:
+            await asyncio.to_thread(self._truncate, offset)
+            raise
+        return written
+
+    def _open(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        handle = os.fdopen(os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644), "r+b")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError as exc:
+            handle.close()
+            raise UploadBusyError("Outra parte deste envio está em gravação") from exc
+        self._handle = handle
+
+    def _close(self) -> None:
+        if self._handle is None:
+            return
+        try:
+            fcntl.flock(self._handle, fcntl.LOCK_UN)
+        finally:
+            self._handle.close()
+            self._handle = None
+
+    def _size(self) -> int:
+        return os.fstat(self._handle.fileno()).st_size
+
+    def _truncate(self, offset: int) -> None:
+        self._handle.flush()
+        self._handle.truncate(offset)
+        self._handle.seek(offset)
+
+    def _sync(self) -> None:
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
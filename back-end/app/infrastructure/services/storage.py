@@ -1,57 +1,804 @@
-"""Serviço simples para persistir arquivos enviados via API."""
+"""Serviço simples para persistir arquivos enviados via API.
+
+Os arquivos são guardados uma única vez, pelo sha256 do conteúdo
+(`<raiz>/blobs/<ab>/<sha256>.<tipo>`); análises e modelos referenciam o blob
+compartilhado e a coleta de lixo remove os que ficam sem referência. Formatos
+em texto (IFC, ifcXML) são comprimidos com zstd na mesma passada do hash
+(`<sha256>.<tipo>.zst`) e lidos com `blob_codec.open_blob`.
+
+`FileStorage` é o contrato usado pelas rotas, casos de uso e worker. Com
+`STORAGE_BACKEND=s3`, `S3FileStorage` guarda os blobs em um object store
+compatível com S3 e usa o diretório local só como área de gravação e cache de
+leitura, para que vários nós de API e worker compartilhem os arquivos.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import os
 import shutil
+import threading
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import count
 from pathlib import Path
-from typing import Iterable
-from uuid import uuid4
+from typing import BinaryIO, Protocol, TypeVar
+from uuid import UUID, uuid4
 
 from fastapi import UploadFile
 
+from app.core.config import Settings, get_settings
+from app.infrastructure.services.analysis_cache import DIGEST_SUFFIX, record_file_digest
+from app.infrastructure.services.blob_codec import (
+    COMPRESSED_SUFFIX,
+    COMPRESSIBLE_KINDS,
+    SeekableZstdWriter,
+    compression_available,
+)
+from app.infrastructure.services.ifc_index import INDEX_SUFFIX, sidecar_path
+from app.infrastructure.services.object_store import ObjectStoreError, S3Client
+
+
+T = TypeVar("T")
+
+_CHUNK_SIZE = 1024 * 1024
+_HEADER_SIZE = 64 * 1024
+_TEMPORARY_DIR = "tmp"
+
+BIM_KINDS = frozenset({"ifc", "ifczip", "ifcxml"})
+IMAGE_KINDS = frozenset({"jpeg", "png", "webp", "gif", "bmp", "tiff"})
+
 
 class FileStorageError(RuntimeError):
     """Erro ao salvar arquivo em disco."""
 
 
+class FileTooLargeError(FileStorageError):
+    """Arquivo (ou o conjunto enviado na requisição) acima do limite."""
+
+
+class UnsupportedFileTypeError(FileStorageError):
+    """Conteúdo do arquivo não corresponde a nenhum dos tipos aceitos."""
+
+
+@dataclass(frozen=True, slots=True)
+class StoredFile:
+    """Arquivo gravado, com o sha256 calculado durante a cópia."""
+
+    path: str
+    sha256: str
+    size: int
+    kind: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class PackedFile:
+    """Arquivo pronto para `commit_blob`: o original ou sua cópia comprimida."""
+
+    path: Path
+    sha256: str
+    size: int
+    kind: str | None
+    compressed: bool = False
+
+
+def blob_path(root: Path, digest: str, kind: str | None, *, compressed: bool = False) -> Path:
+    """Endereço do conteúdo: dois primeiros caracteres do hash como subdiretório."""
+
+    name = f"{digest}.{kind}" if kind else digest
+    return root / digest[:2] / (name + COMPRESSED_SUFFIX if compressed else name)
+
+
+def detect_file_kind(header: bytes) -> str | None:
+    """Tipo do arquivo pelos bytes iniciais (assinatura), ou `None` se desconhecido."""
+
+    stripped = header.lstrip(b"\xef\xbb\xbf \t\r\n")
+    if stripped.startswith(b"ISO-10303-21;"):
+        return "ifc"
+    if stripped.startswith(b"<?xml") and b"ifc" in stripped[:4096].lower():
+        return "ifcxml"
+    if header.startswith(b"PK\x03\x04"):
+        return "ifczip"
+    if header.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if header.startswith(b"BM"):
+        return "bmp"
+    if header[:4] in (b"II*\x00", b"MM\x00*"):
+        return "tiff"
+    return None
+
+
+class FileStorage(Protocol):
+    """Operações de armazenamento usadas pela aplicação.
+
+    Os blobs são sempre lidos por caminho local: quem vai abri-los chama antes
+    `fetch`, que no armazenamento local não faz nada e, no remoto, baixa as
+    cópias ausentes.
+    """
+
+    @property
+    def blob_root(self) -> Path: ...
+
+    @property
+    def staging_root(self) -> Path: ...
+
+    @property
+    def max_file_bytes(self) -> int | None: ...
+
+    @property
+    def max_request_bytes(self) -> int | None: ...
+
+    async def run_write(self, function: Callable[..., T], *args: object) -> T: ...
+
+    async def save_upload_file(
+        self, upload: UploadFile, *, kinds: Collection[str] | None = None
+    ) -> StoredFile: ...
+
+    async def save_upload_files(
+        self, uploads: Sequence[UploadFile], *, kinds: Collection[str] | None = None
+    ) -> list[StoredFile]: ...
+
+    async def save_upload_groups(
+        self, groups: Mapping[str, tuple[Sequence[UploadFile], Collection[str] | None]]
+    ) -> dict[str, list[StoredFile]]: ...
+
+    async def fetch(self, paths: Iterable[str | Path], *, missing_ok: bool = False) -> None: ...
+
+    def new_temporary(self) -> Path: ...
+
+    def compresses(self, kind: str | None) -> bool: ...
+
+    def open_writer(self, temporary: Path, kind: str | None) -> BinaryIO | SeekableZstdWriter: ...
+
+    def pack_file(self, source: Path) -> PackedFile: ...
+
+    def commit_blob(
+        self,
+        temporary: Path,
+        digest: str,
+        size: int,
+        kind: str | None,
+        *,
+        compressed: bool = False,
+    ) -> StoredFile: ...
+
+    def iter_blobs(self, older_than: float) -> Iterator[tuple[str, Path]]: ...
+
+    def iter_run_directories(self, older_than: float) -> Iterator[Path]: ...
+
+    def remove_blob(self, path: Path, older_than: float) -> int: ...
+
+    def remove_stale_temporaries(self, older_than: float) -> int: ...
+
+    def evict_local_copies(self, older_than: float) -> int: ...
+
+    def remove_tree(self, path: Path) -> int: ...
+
+    def close(self) -> None: ...
+
+
+class _UploadCancelledError(FileStorageError):
+    """Cópia interrompida porque outra do mesmo envio falhou."""
+
+
+class _ByteBudget:
+    """Limite de bytes compartilhado pelas cópias de uma mesma requisição."""
+
+    def __init__(self, limit: int | None) -> None:
+        self._remaining = limit
+        self._lock = threading.Lock()
+        self.cancelled = threading.Event()
+
+    def consume(self, size: int) -> None:
+        if self._remaining is None:
+            return
+        with self._lock:
+            self._remaining -= size
+            exceeded = self._remaining < 0
+        if exceeded:
+            self.cancelled.set()
+            raise FileTooLargeError("Arquivos enviados excedem o limite da requisição")
+
+
 class LocalFileStorage:
-    """Armazena arquivos em um diretório local da aplicação."""
+    """Armazena arquivos em um diretório local da aplicação.
+
+    As cópias rodam em threads, no máximo `max_concurrency` ao mesmo tempo por
+    instância; o sha256 e os limites de tamanho são aplicados durante a cópia, e
+    o tipo é conferido pelos primeiros bytes antes de criar o arquivo. Tipos em
+    `compress_kinds` são gravados comprimidos; tamanhos e hashes são sempre os
+    do conteúdo original.
+    """
 
-    def __init__(self, *, base_path: Path) -> None:
+    def __init__(
+        self,
+        *,
+        base_path: Path,
+        max_file_bytes: int | None = None,
+        max_request_bytes: int | None = None,
+        max_concurrency: int = 4,
+        compress_kinds: Collection[str] = frozenset(),
+        compression_level: int = 3,
+    ) -> None:
         self._base_path = base_path
         self._base_path.mkdir(parents=True, exist_ok=True)
+        self._max_file_bytes = max_file_bytes
+        self._max_request_bytes = max_request_bytes
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._compress_kinds = frozenset(compress_kinds)
+        self._compression_level = compression_level
 
-    async def save_upload_file(self, upload: UploadFile, *, subdir: str | None = None) -> str:
-        """Persiste um arquivo individual e retorna o caminho absoluto."""
+    def close(self) -> None:
+        """Nada a liberar no disco local; o armazenamento remoto fecha suas conexões."""
 
-        target_dir = self._base_path / subdir if subdir else self._base_path
-        target_dir.mkdir(parents=True, exist_ok=True)
-        suffix = Path(upload.filename or "").suffix
-        filename = f"{uuid4()}{suffix}"
-        destination = target_dir / filename
+    @property
+    def blob_root(self) -> Path:
+        """Arquivos endereçados pelo conteúdo (`<ab>/<sha256>.<tipo>`)."""
 
-        try:
-            await asyncio.to_thread(self._write_file, upload, destination)
-        except OSError as exc:  # pragma: no cover - erro de IO difícil de reproduzir
-            raise FileStorageError("Falha ao armazenar arquivo enviado") from exc
+        return self._base_path / "blobs"
+
+    @property
+    def staging_root(self) -> Path:
+        """Arquivos parciais dos envios retomáveis, no mesmo sistema de arquivos dos blobs."""
+
+        return self._base_path / "sessions"
+
+    @property
+    def max_file_bytes(self) -> int | None:
+        return self._max_file_bytes
+
+    @property
+    def max_request_bytes(self) -> int | None:
+        return self._max_request_bytes
+
+    async def run_write(self, function: Callable[..., T], *args: object) -> T:
+        """Executa uma gravação em thread, dentro do limite de gravações simultâneas."""
+
+        async with self._semaphore:
+            return await asyncio.to_thread(function, *args)
 
-        return str(destination.resolve())
+    async def save_upload_file(
+        self,
+        upload: UploadFile,
+        *,
+        kinds: Collection[str] | None = None,
+    ) -> StoredFile:
+        """Persiste um arquivo individual; `kinds` restringe os tipos aceitos."""
+
+        return (await self.save_upload_files([upload], kinds=kinds))[0]
 
     async def save_upload_files(
-        self, uploads: Iterable[UploadFile], *, subdir: str | None = None
-    ) -> list[str]:
-        """Salva múltiplos arquivos em sequência."""
+        self,
+        uploads: Sequence[UploadFile],
+        *,
+        kinds: Collection[str] | None = None,
+    ) -> list[StoredFile]:
+        """Salva múltiplos arquivos em paralelo; se um falhar, o envio inteiro falha."""
+
+        return (await self.save_upload_groups({"": (uploads, kinds)}))[""]
+
+    async def save_upload_groups(
+        self, groups: Mapping[str, tuple[Sequence[UploadFile], Collection[str] | None]]
+    ) -> dict[str, list[StoredFile]]:
+        """Salva grupos de arquivos (nome -> arquivos e tipos aceitos) de uma vez.
+
+        O limite por requisição vale para a soma de todos os grupos. Em caso de
+        erro os temporários são apagados; blobs já concluídos podem ser de outros
+        envios e ficam para a coleta de lixo.
+        """
+
+        jobs = [
+            (name, upload, kinds)
+            for name, (uploads, kinds) in groups.items()
+            for upload in uploads
+        ]
+        declared = sum(upload.size or 0 for _, upload, _ in jobs)
+        if self._max_request_bytes is not None and declared > self._max_request_bytes:
+            raise FileTooLargeError("Arquivos enviados excedem o limite da requisição")
+        budget = _ByteBudget(self._max_request_bytes)
+        results = await asyncio.gather(
+            *(self._save(upload, budget=budget, kinds=kinds) for _, upload, kinds in jobs),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            # A causa, não as cópias interrompidas por ela.
+            error = next(
+                (error for error in errors if not isinstance(error, _UploadCancelledError)),
+                errors[0],
+            )
+            if isinstance(error, OSError):
+                raise FileStorageError("Falha ao armazenar arquivo enviado") from error
+            raise error
+
+        saved: dict[str, list[StoredFile]] = {name: [] for name in groups}
+        for (name, *_), stored in zip(jobs, results):
+            saved[name].append(stored)
+        return saved
+
+    async def fetch(self, paths: Iterable[str | Path], *, missing_ok: bool = False) -> None:
+        """Garante as cópias locais dos arquivos; aqui elas já são os próprios arquivos."""
+
+    def new_temporary(self) -> Path:
+        """Caminho para um arquivo em gravação, no mesmo sistema de arquivos dos blobs."""
 
-        paths: list[str] = []
-        for upload in uploads:
-            paths.append(await self.save_upload_file(upload, subdir=subdir))
-        return paths
+        directory = self.blob_root / _TEMPORARY_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / f"{uuid4()}.part"
+
+    def compresses(self, kind: str | None) -> bool:
+        return kind in self._compress_kinds
+
+    def open_writer(self, temporary: Path, kind: str | None) -> BinaryIO | SeekableZstdWriter:
+        """Abre o temporário para gravação, comprimindo se o tipo for comprimível."""
+
+        if self.compresses(kind):
+            return SeekableZstdWriter(temporary, level=self._compression_level)
+        return temporary.open("wb")
+
+    def pack_file(self, source: Path) -> PackedFile:
+        """Calcula sha256 e tipo de um arquivo já gravado, comprimindo-o na mesma leitura.
+
+        Sem compressão, o resultado aponta para o próprio `source`; com ela, para
+        um temporário que o chamador passa a `commit_blob` (ou apaga).
+        """
+
+        digest = hashlib.sha256()
+        size = 0
+        with source.open("rb") as handle:
+            chunk = handle.read(_HEADER_SIZE)
+            kind = detect_file_kind(chunk)
+            if not self.compresses(kind):
+                while chunk:
+                    size += len(chunk)
+                    digest.update(chunk)
+                    chunk = handle.read(_CHUNK_SIZE)
+                return PackedFile(source, digest.hexdigest(), size, kind)
+
+            temporary = self.new_temporary()
+            try:
+                with self.open_writer(temporary, kind) as buffer:
+                    while chunk:
+                        size += len(chunk)
+                        digest.update(chunk)
+                        buffer.write(chunk)
+                        chunk = handle.read(_CHUNK_SIZE)
+            except BaseException:
+                temporary.unlink(missing_ok=True)
+                raise
+        return PackedFile(temporary, digest.hexdigest(), size, kind, compressed=True)
+
+    def commit_blob(
+        self,
+        temporary: Path,
+        digest: str,
+        size: int,
+        kind: str | None,
+        *,
+        compressed: bool = False,
+    ) -> StoredFile:
+        """Move o temporário para o endereço do conteúdo, ou o descarta se o blob já existe.
+
+        Um blob já gravado na outra forma (comprimido ou não) também é reaproveitado.
+        """
+
+        destination = blob_path(self.blob_root, digest, kind, compressed=compressed)
+        alternative = blob_path(self.blob_root, digest, kind, compressed=not compressed)
+        if not destination.exists() and alternative.exists():
+            destination = alternative
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        if destination.exists():
+            try:
+                # Renova a carência da coleta de lixo (e o registro do hash, que usa o mtime).
+                os.utime(destination)
+            except FileNotFoundError:
+                # Apagado pela coleta entre as duas chamadas: grava de novo.
+                temporary.replace(destination)
+            else:
+                temporary.unlink()
+        else:
+            temporary.replace(destination)
+        record_file_digest(destination, digest)
+        return StoredFile(str(destination.resolve()), digest, size, kind)
+
+    def iter_blobs(self, older_than: float) -> Iterator[tuple[str, Path]]:
+        """Blobs `(sha256, caminho)` sem modificação desde o timestamp `older_than`."""
+
+        if not self.blob_root.is_dir():
+            return
+        for directory in self.blob_root.iterdir():
+            if directory.name == _TEMPORARY_DIR or not directory.is_dir():
+                continue
+            for path in directory.iterdir():
+                if _is_sidecar(path) or _mtime(path) >= older_than:
+                    continue
+                yield path.name.partition(".")[0], path
+
+    def iter_run_directories(self, older_than: float) -> Iterator[Path]:
+        """Diretórios `<run_id>/` do layout anterior aos blobs, parados desde `older_than`."""
+
+        for path in self._base_path.iterdir():
+            if not path.is_dir() or _mtime(path) >= older_than:
+                continue
+            try:
+                UUID(path.name)
+            except ValueError:
+                continue
+            yield path.resolve()
+
+    def remove_blob(self, path: Path, older_than: float) -> int:
+        """Apaga o blob e devolve os bytes liberados (0 se foi reaproveitado nesse meio tempo)."""
+
+        # Renomeia antes de conferir o mtime: um `commit_blob` simultâneo ou
+        # renovou o arquivo antes (e ele volta ao lugar) ou não o encontra mais
+        # (e grava de novo); entre `stat` e `unlink` ele não teria como saber.
+        tombstone = self.blob_root / _TEMPORARY_DIR / f"{path.name}.{uuid4().hex}.gc"
+        tombstone.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            path.rename(tombstone)
+        except FileNotFoundError:
+            return 0
+        stat = tombstone.stat()
+        if stat.st_mtime >= older_than:
+            tombstone.replace(path)
+            return 0
+        tombstone.unlink()
+        record_file_digest(path, None)
+        return stat.st_size + _remove_index(path)
+
+    def remove_stale_temporaries(self, older_than: float) -> int:
+        """Apaga gravações interrompidas (ex.: processo encerrado no meio do envio)."""
+
+        directory = self.blob_root / _TEMPORARY_DIR
+        if not directory.is_dir():
+            return 0
+        removed = 0
+        for path in directory.iterdir():
+            if _mtime(path) < older_than:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def evict_local_copies(self, older_than: float) -> int:
+        """Apaga cópias locais de blobs guardados em outro lugar; aqui não há nenhuma."""
+
+        return 0
 
     @staticmethod
-    def _write_file(upload: UploadFile, destination: Path) -> None:
-        upload.file.seek(0)
-        with destination.open("wb") as buffer:
-            shutil.copyfileobj(upload.file, buffer)
-        upload.file.seek(0)
+    def remove_tree(path: Path) -> int:
+        """Apaga um diretório inteiro e devolve os bytes liberados."""
+
+        size = sum(_size(item) for item in path.rglob("*"))
+        shutil.rmtree(path, ignore_errors=True)
+        return size
+
+    async def _save(
+        self,
+        upload: UploadFile,
+        *,
+        budget: _ByteBudget,
+        kinds: Collection[str] | None,
+    ) -> StoredFile:
+        if self._max_file_bytes is not None and (upload.size or 0) > self._max_file_bytes:
+            raise FileTooLargeError(f"Arquivo {upload.filename!r} excede o limite de tamanho")
+        try:
+            return await self.run_write(self._write_file, upload, budget, kinds)
+        except BaseException:
+            budget.cancelled.set()
+            raise
+
+    def _write_file(
+        self,
+        upload: UploadFile,
+        budget: _ByteBudget,
+        kinds: Collection[str] | None,
+    ) -> StoredFile:
+        if budget.cancelled.is_set():
+            raise _UploadCancelledError("Envio cancelado")
+        source = upload.file
+        source.seek(0)
+        chunk = source.read(_HEADER_SIZE)
+        kind = detect_file_kind(chunk)
+        if kinds is not None and kind not in kinds:
+            raise UnsupportedFileTypeError(
+                f"Tipo de arquivo não aceito em {upload.filename!r}: {kind or 'desconhecido'}"
+            )
+
+        digest = hashlib.sha256()
+        size = 0
+        temporary = self.new_temporary()
+        try:
+            with self.open_writer(temporary, kind) as buffer:
+                while chunk:
+                    if budget.cancelled.is_set():
+                        raise _UploadCancelledError("Envio cancelado")
+                    size += len(chunk)
+                    if self._max_file_bytes is not None and size > self._max_file_bytes:
+                        raise FileTooLargeError(
+                            f"Arquivo {upload.filename!r} excede o limite de tamanho"
+                        )
+                    budget.consume(len(chunk))
+                    digest.update(chunk)
+                    buffer.write(chunk)
+                    chunk = source.read(_CHUNK_SIZE)
+            return self.commit_blob(
+                temporary, digest.hexdigest(), size, kind, compressed=self.compresses(kind)
+            )
+        except BaseException:
+            temporary.unlink(missing_ok=True)
+            raise
+        finally:
+            source.seek(0)
+
+
+class S3FileStorage(LocalFileStorage):
+    """Blobs em um object store compatível com S3, com o disco local como cache.
+
+    Uploads são gravados e comprimidos localmente como no `LocalFileStorage`;
+    `commit_blob` envia o blob (multipart em partes paralelas acima de
+    `multipart_threshold`) e `fetch` baixa os ausentes com leituras por faixa em
+    paralelo. A chave do objeto é o caminho relativo a `base_path` (mais
+    `prefix`), então todos os nós precisam do mesmo `uploads_dir`: é por esse
+    caminho que análises e modelos referenciam os arquivos.
+
+    A carência da coleta de lixo passa a valer pela data de modificação do
+    objeto remoto, renovada a cada reaproveitamento; as cópias locais sem uso
+    são descartadas por `evict_local_copies`. Envios retomáveis em andamento
+    continuam no disco do nó que os recebe.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: S3Client,
+        prefix: str = "",
+        multipart_threshold: int = 64 * 1024 * 1024,
+        part_size: int = 16 * 1024 * 1024,
+        transfer_concurrency: int = 8,
+        **options,
+    ) -> None:
+        super().__init__(**options)
+        self._client = client
+        self._prefix = f"{prefix.strip('/')}/" if prefix.strip("/") else ""
+        self._root = self._base_path.resolve()
+        self._multipart_threshold = max(multipart_threshold, part_size)
+        self._part_size = part_size
+        # Partes de todos os envios e downloads dividem as mesmas conexões.
+        self._transfers = ThreadPoolExecutor(
+            max_workers=transfer_concurrency, thread_name_prefix="s3-transfer"
+        )
+
+    def close(self) -> None:
+        self._transfers.shutdown(wait=True)
+        self._client.close()
+
+    def commit_blob(
+        self,
+        temporary: Path,
+        digest: str,
+        size: int,
+        kind: str | None,
+        *,
+        compressed: bool = False,
+    ) -> StoredFile:
+        """Grava o blob localmente e no object store, ou renova o objeto se já existir."""
+
+        stored = super().commit_blob(temporary, digest, size, kind, compressed=compressed)
+        path = Path(stored.path)
+        key = self._key(path)
+        if self._client.head_object(key) is not None:
+            try:
+                self._client.copy_object(key, key)
+                return stored
+            except ObjectStoreError as exc:
+                # Apagado pela coleta entre as duas chamadas: envia de novo.
+                if exc.status_code != 404:
+                    raise
+        self._upload(path, key)
+        return stored
+
+    async def fetch(self, paths: Iterable[str | Path], *, missing_ok: bool = False) -> None:
+        """Baixa os arquivos sem cópia local; com `missing_ok`, ignora os que não existem."""
+
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(self._fetch, Path(path), missing_ok)
+                for path in {str(path) for path in paths}
+            )
+        )
+
+    def iter_blobs(self, older_than: float) -> Iterator[tuple[str, Path]]:
+        for info in self._client.list_objects(f"{self._prefix}blobs/"):
+            if info.last_modified >= older_than:
+                continue
+            path = self._root / info.key[len(self._prefix) :]
+            if path.parent.name == _TEMPORARY_DIR or _is_sidecar(path):
+                continue
+            yield path.name.partition(".")[0], path
+
+    def remove_blob(self, path: Path, older_than: float) -> int:
+        key = self._key(path)
+        info = self._client.head_object(key)
+        if info is not None and info.last_modified >= older_than:
+            return 0
+        if info is not None:
+            self._client.delete_object(key)
+        path.unlink(missing_ok=True)
+        record_file_digest(path, None)
+        _remove_index(path)
+        return info.size if info is not None else 0
+
+    def evict_local_copies(self, older_than: float) -> int:
+        """Apaga cópias locais sem acesso desde `older_than`; o original fica no object store."""
+
+        removed = 0
+        for _, path in LocalFileStorage.iter_blobs(self, older_than):
+            path.unlink(missing_ok=True)
+            record_file_digest(path, None)
+            removed += 1
+        return removed
+
+    def _key(self, path: Path) -> str:
+        try:
+            relative = Path(path).resolve().relative_to(self._root)
+        except ValueError as exc:
+            raise FileStorageError(f"Arquivo fora do armazenamento: {path}") from exc
+        return self._prefix + relative.as_posix()
+
+    def _upload(self, path: Path, key: str) -> None:
+        size = path.stat().st_size
+        if size < self._multipart_threshold:
+            self._client.put_object(key, path.read_bytes())
+            return
+
+        upload_id = self._client.create_multipart_upload(key)
+        try:
+            with path.open("rb") as handle:
+                descriptor = handle.fileno()
+
+                def send(number: int, offset: int) -> str:
+                    data = os.pread(descriptor, self._part_size, offset)
+                    return self._client.upload_part(key, upload_id, number, data)
+
+                etags = list(
+                    self._transfers.map(send, count(1), range(0, size, self._part_size))
+                )
+            self._client.complete_multipart_upload(key, upload_id, etags)
+        except BaseException:
+            self._client.abort_multipart_upload(key, upload_id)
+            raise
+
+    def _fetch(self, path: Path, missing_ok: bool) -> None:
+        if path.exists():
+            if path.parent.parent == self._root / "blobs":
+                # Marca o uso da cópia para `evict_local_copies`.
+                os.utime(path)
+                record_file_digest(path, path.name.partition(".")[0])
+            return
+        key = self._key(path)
+        info = self._client.head_object(key)
+        if info is None:
+            if missing_ok:
+                return
+            raise FileNotFoundError(f"Arquivo ausente no armazenamento: {path}")
+
+        temporary = self.new_temporary()
+        try:
+            with temporary.open("wb") as handle:
+                if info.size < self._multipart_threshold:
+                    handle.write(self._expect(self._client.get_object(key), info.size))
+                else:
+                    handle.truncate(info.size)
+                    descriptor = handle.fileno()
+
+                    def receive(offset: int) -> None:
+                        end = min(offset + self._part_size, info.size)
+                        data = self._client.get_object(key, offset, end)
+                        os.pwrite(descriptor, self._expect(data, end - offset), offset)
+
+                    list(self._transfers.map(receive, range(0, info.size, self._part_size)))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary.replace(path)
+        except BaseException:
+            temporary.unlink(missing_ok=True)
+            raise
+        if path.parent.parent == self._root / "blobs":
+            record_file_digest(path, path.name.partition(".")[0])
+
+    @staticmethod
+    def _expect(data: bytes, size: int) -> bytes:
+        if len(data) != size:
+            raise ObjectStoreError(f"Resposta com {len(data)} bytes, esperados {size}")
+        return data
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return float("inf")
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size if path.is_file() else 0
+    except FileNotFoundError:
+        return 0
+
+
+def _is_sidecar(path: Path) -> bool:
+    """Registro do hash ou índice IFC (inclusive o temporário da sua gravação)."""
+
+    return path.name.endswith(DIGEST_SUFFIX) or INDEX_SUFFIX in path.name
+
+
+def _remove_index(path: Path) -> int:
+    """Apaga o índice IFC do blob, se houver, e devolve os bytes liberados."""
+
+    index = sidecar_path(path)
+    size = _size(index)
+    index.unlink(missing_ok=True)
+    return size
+
+
+def build_file_storage(settings: Settings) -> FileStorage:
+    config = settings.app
+    options = dict(
+        base_path=config.uploads_path,
+        max_file_bytes=config.upload_max_file_mb * 1024 * 1024,
+        max_request_bytes=config.upload_max_request_mb * 1024 * 1024,
+        max_concurrency=config.upload_concurrency,
+        compress_kinds=(
+            COMPRESSIBLE_KINDS
+            if config.upload_compression and compression_available()
+            else frozenset()
+        ),
+        compression_level=config.upload_compression_level,
+    )
+    storage = settings.storage
+    if storage.backend == "local":
+        return LocalFileStorage(**options)
+    if not (
+        storage.s3_endpoint
+        and storage.s3_bucket
+        and storage.s3_access_key
+        and storage.s3_secret_key
+    ):
+        raise FileStorageError(
+            "STORAGE_S3_ENDPOINT, STORAGE_S3_BUCKET, STORAGE_S3_ACCESS_KEY e "
+            "STORAGE_S3_SECRET_KEY são obrigatórios com STORAGE_BACKEND=s3"
+        )
+    client = S3Client(
+        endpoint=storage.s3_endpoint,
+        bucket=storage.s3_bucket,
+        access_key=storage.s3_access_key,
+        secret_key=storage.s3_secret_key,
+        region=storage.s3_region,
+        path_style=storage.s3_path_style,
+        max_connections=storage.s3_max_connections,
+        timeout=storage.s3_timeout,
+    )
+    return S3FileStorage(
+        client=client,
+        prefix=storage.s3_prefix,
+        multipart_threshold=storage.multipart_threshold_mb * 1024 * 1024,
+        part_size=storage.part_size_mb * 1024 * 1024,
+        transfer_concurrency=storage.transfer_concurrency,
+        **options,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_file_storage() -> FileStorage:
+    """Instância compartilhada: o limite de gravações simultâneas vale para o processo."""
 
+    return build_file_storage(get_settings())
@@ -0,0 +1,46 @@
+"""Snapshots de métricas publicados pelos workers para a API expor."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+
+def publish_snapshot(directory: Path, worker_id: str, payload: dict[str, Any]) -> None:
+    """Grava atomicamente o snapshot do worker (rename sobre arquivo temporário)."""
+
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / f"{_safe_name(worker_id)}.json"
+    temporary = target.with_suffix(f".{os.getpid()}.tmp")
+    temporary.write_text(
+        json.dumps({"worker_id": worker_id, "published_at": time.time(), **payload}, default=str)
+    )
+    temporary.replace(target)
+
+
+def read_snapshots(directory: Path, *, max_age: float) -> dict[str, dict[str, Any]]:
+    """Lê snapshots recentes; arquivos mais antigos que `max_age` são ignorados."""
+
+    if not directory.is_dir():
+        return {}
+    now = time.time()
+    snapshots: dict[str, dict[str, Any]] = {}
+    for path in directory.glob("*.json"):
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        if now - float(data.get("published_at", 0)) <= max_age:
+            snapshots[str(data.get("worker_id", path.stem))] = data
+    return snapshots
+
+
+def remove_snapshot(directory: Path, worker_id: str) -> None:
+    (directory / f"{_safe_name(worker_id)}.json").unlink(missing_ok=True)
+
+
+def _safe_name(worker_id: str) -> str:
+    return "".join(char if char.isalnum() or char in "-_." else "_" for char in worker_id)
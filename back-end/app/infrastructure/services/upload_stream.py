@@ -0,0 +1,283 @@
+"""Recepção de formulários multipart em streaming, direto para o destino final.
+
+O corpo é copiado da rede para dois buffers de tamanho fixo, reutilizados: um é
+analisado em thread enquanto o outro recebe os próximos bytes. Cada parte de
+arquivo sai do buffer para um temporário no mesmo diretório dos blobs, com
+sha256 e limites calculados no caminho (e comprimida, se o tipo for texto), e ao
+final é renomeada para o endereço do conteúdo (`FileStorage.commit_blob`).
+Não há spool intermediário nem segunda cópia: cada byte é gravado uma vez.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections.abc import AsyncIterable, Awaitable, Callable, Collection, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from app.infrastructure.services.blob_codec import SeekableZstdWriter
+from app.infrastructure.services.storage import (
+    FileStorage,
+    FileStorageError,
+    FileTooLargeError,
+    StoredFile,
+    UnsupportedFileTypeError,
+    detect_file_kind,
+)
+
+try:
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # pragma: no cover - python-multipart < 0.0.13
+    from multipart.exceptions import MultipartParseError
+    from multipart.multipart import MultipartParser, parse_options_header
+
+
+BUFFER_SIZE = 1024 * 1024
+# Bytes retidos em memória para identificar o tipo antes de criar o arquivo.
+_SNIFF_SIZE = 4096
+_MAX_FIELD_BYTES = 64 * 1024
+_MAX_FIELDS = 64
+
+
+class MultipartFormError(FileStorageError):
+    """Corpo multipart malformado ou com campos inesperados."""
+
+
+@dataclass(slots=True)
+class ReceivedForm:
+    """Campos de texto e arquivos (já gravados) de um formulário recebido em streaming."""
+
+    fields: dict[str, str] = field(default_factory=dict)
+    files: dict[str, list[StoredFile]] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _Part:
+    name: str = ""
+    filename: str | None = None
+    disposition: bytes = b""
+    data: bytearray = field(default_factory=bytearray)
+    handle: BinaryIO | SeekableZstdWriter | None = None
+    temporary: Path | None = None
+    digest: Any = None
+    size: int = 0
+    kind: str | None = None
+    compressed: bool = False
+
+
+class MultipartReceiver:
+    """Callbacks do `python-multipart` que gravam as partes de arquivo à medida que chegam.
+
+    Os métodos são síncronos e chamados na thread que alimenta o parser.
+    """
+
+    def __init__(
+        self,
+        storage: FileStorage,
+        file_kinds: Mapping[str, Collection[str] | None],
+    ) -> None:
+        self._storage = storage
+        self._file_kinds = file_kinds
+        self._max_file_bytes = storage.max_file_bytes
+        self._remaining = storage.max_request_bytes
+        self._part = _Part()
+        self._header_field = b""
+        self._header_value = b""
+        self._temporaries: list[Path] = []
+        self.form = ReceivedForm()
+        self.complete = False
+
+    def parser(self, content_type: str) -> MultipartParser:
+        kind, options = parse_options_header(content_type)
+        boundary = options.get(b"boundary")
+        if kind != b"multipart/form-data" or not boundary:
+            raise MultipartFormError("Envie o formulário como multipart/form-data")
+        return MultipartParser(
+            boundary,
+            {
+                "on_part_begin": self._on_part_begin,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+                "on_end": self._on_end,
+            },
+        )
+
+    def abort(self) -> None:
+        """Fecha o arquivo em andamento e apaga os temporários (os blobs concluídos ficam)."""
+
+        if self._part.handle is not None:
+            self._part.handle.close()
+        for temporary in self._temporaries:
+            temporary.unlink(missing_ok=True)
+
+    def _on_end(self) -> None:
+        self.complete = True
+
+    def _on_part_begin(self) -> None:
+        self._part = _Part()
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        if self._header_field.lower() == b"content-disposition":
+            self._part.disposition = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        part = self._part
+        _, options = parse_options_header(part.disposition)
+        if b"name" not in options:
+            raise MultipartFormError("Parte sem `name` no Content-Disposition")
+        part.name = options[b"name"].decode("utf-8", "replace")
+        if b"filename" not in options:
+            if len(self.form.fields) >= _MAX_FIELDS:
+                raise MultipartFormError("Campos demais no formulário")
+            return
+        if part.name not in self._file_kinds:
+            raise MultipartFormError(f"Campo de arquivo inesperado: {part.name}")
+        part.filename = options[b"filename"].decode("utf-8", "replace")
+        part.digest = hashlib.sha256()
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        part = self._part
+        if part.digest is None:
+            if len(part.data) + end - start > _MAX_FIELD_BYTES:
+                raise MultipartFormError(f"Campo {part.name!r} excede {_MAX_FIELD_BYTES} bytes")
+            part.data += data[start:end]
+            return
+
+        chunk = memoryview(data)[start:end]
+        part.size += len(chunk)
+        if self._max_file_bytes is not None and part.size > self._max_file_bytes:
+            raise FileTooLargeError(f"Arquivo {part.filename!r} excede o limite de tamanho")
+        if self._remaining is not None:
+            self._remaining -= len(chunk)
+            if self._remaining < 0:
+                raise FileTooLargeError("Arquivos enviados excedem o limite da requisição")
+        part.digest.update(chunk)
+        if part.handle is not None:
+            part.handle.write(chunk)
+            return
+        part.data += chunk
+        if len(part.data) >= _SNIFF_SIZE:
+            self._open(part)
+
+    def _on_part_end(self) -> None:
+        part = self._part
+        if part.digest is None:
+            self.form.fields[part.name] = part.data.decode("utf-8", "replace")
+            return
+        if part.handle is None:
+            self._open(part)
+        part.handle.close()
+        part.handle = None
+        stored = self._storage.commit_blob(
+            part.temporary,
+            part.digest.hexdigest(),
+            part.size,
+            part.kind,
+            compressed=part.compressed,
+        )
+        self._temporaries.remove(part.temporary)
+        self.form.files.setdefault(part.name, []).append(stored)
+
+    def _open(self, part: _Part) -> None:
+        """Confere o tipo pelos bytes retidos e só então cria o arquivo temporário."""
+
+        part.kind = detect_file_kind(bytes(part.data))
+        kinds = self._file_kinds[part.name]
+        if kinds is not None and part.kind not in kinds:
+            raise UnsupportedFileTypeError(
+                f"Tipo de arquivo não aceito em {part.filename!r}: "
+                f"{part.kind or 'desconhecido'}"
+            )
+        part.temporary = self._storage.new_temporary()
+        self._temporaries.append(part.temporary)
+        part.handle = self._storage.open_writer(part.temporary, part.kind)
+        part.compressed = self._storage.compresses(part.kind)
+        part.handle.write(part.data)
+        part.data = bytearray()
+
+
+async def feed_stream(
+    stream: AsyncIterable[bytes],
+    write: Callable[[bytearray], Awaitable[None]],
+    *,
+    buffer_size: int = BUFFER_SIZE,
+) -> None:
+    """Repassa o corpo a `write` em blocos de `buffer_size`, alternando dois buffers.
+
+    `write` recebe sempre um dos dois `bytearray` (ou uma cópia do último bloco
+    parcial) e deve terminar de usá-lo antes de retornar.
+    """
+
+    buffers = (bytearray(buffer_size), bytearray(buffer_size))
+    current = filled = 0
+    pending: asyncio.Future[None] | None = None
+    try:
+        async for chunk in stream:
+            view = memoryview(chunk)
+            while view:
+                take = min(len(view), buffer_size - filled)
+                buffers[current][filled : filled + take] = view[:take]
+                filled += take
+                view = view[take:]
+                if filled == buffer_size:
+                    if pending is not None:
+                        await pending
+                    pending = asyncio.ensure_future(write(buffers[current]))
+                    current ^= 1
+                    filled = 0
+        if pending is not None:
+            await pending
+            pending = None
+        if filled:
+            await write(buffers[current][:filled])
+    except BaseException:
+        if pending is not None:
+            await asyncio.gather(pending, return_exceptions=True)
+        raise
+
+
+async def receive_multipart(
+    storage: FileStorage,
+    stream: AsyncIterable[bytes],
+    content_type: str,
+    *,
+    files: Mapping[str, Collection[str] | None],
+) -> ReceivedForm:
+    """Lê o formulário de `stream`, gravando os campos de arquivo listados em `files`.
+
+    `files` mapeia o nome do campo aos tipos aceitos. Os limites e o número de
+    gravações simultâneas são os do `storage`; em caso de erro, os temporários
+    são apagados.
+    """
+
+    receiver = MultipartReceiver(storage, files)
+    parser = receiver.parser(content_type)
+
+    async def write(buffer: bytearray) -> None:
+        await storage.run_write(parser.write, buffer)
+
+    try:
+        await feed_stream(stream, write)
+        parser.finalize()
+        if not receiver.complete:
+            raise MultipartFormError("Corpo multipart incompleto")
+    except BaseException as exc:
+        await asyncio.to_thread(receiver.abort)
+        if isinstance(exc, MultipartParseError):
+            raise MultipartFormError(f"Corpo multipart inválido: {exc}") from exc
+        raise
+    return receiver.form
@@ -2,25 +2,102 @@
 
 from __future__ import annotations
 
-from uuid import UUID, uuid4
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Literal
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
 
+from app.core.config import Settings, SettingsDep
+from app.domain.entities import AnalysisStatus, FileBlob, JobQueue
 from app.interfaces.http.dependencies import (
-    get_file_storage,
-    get_openai_service,
+    get_blob_repository,
+    get_ifc_inventory,
+    get_ifc_repository,
+    get_job_repository,
+    get_openai_clients,
     get_repository,
+    get_upload_repository,
+)
+from app.infrastructure import (
+    FileStorageError,
+    FileTooLargeError,
+    SQLAlchemyIfcModelRepository,
+    UnsupportedFileTypeError,
+    get_analysis_cache,
+    get_file_storage,
+    get_ifc_inventory_service,
+    get_rate_limiter,
+    get_resilient_caller,
+)
+from app.infrastructure.db.session import get_session
+from app.infrastructure.services.resumable_upload import ChunkChecksumError, UploadBusyError
+from app.infrastructure.services.storage import BIM_KINDS, IMAGE_KINDS, StoredFile
+from app.infrastructure.services.telemetry import read_snapshots
+from app.infrastructure.services.upload_stream import MultipartFormError, receive_multipart
+from app.interfaces.http.schemas import (
+    IfcAggregateSchema,
+    IfcElementBoxSchema,
+    IfcElementSchema,
+    IfcLocationSchema,
+    IfcModelResponse,
+    ProjectAnalysisListResponse,
+    ProjectAnalysisResponse,
+    UploadSessionCreateRequest,
+    UploadSessionResponse,
 )
-from app.infrastructure import FileStorageError
-from app.interfaces.http.schemas import ProjectAnalysisListResponse, ProjectAnalysisResponse
 from app.use_cases import (
+    AggregateIfcElementsInput,
+    AggregateIfcElementsUseCase,
     AnalyzeProjectInput,
-    AnalyzeProjectUseCase,
     AnalysisExecutionError,
+    AppendUploadChunkInput,
+    AppendUploadChunkUseCase,
+    CreateUploadInput,
+    CreateUploadUseCase,
+    FinalizeUploadUseCase,
     GetAnalysisInput,
     GetAnalysisUseCase,
+    GetCompletedUploadUseCase,
+    GetProjectIfcUseCase,
+    GetUploadUseCase,
+    IfcAggregatesUnavailableError,
+    IfcElementNotFoundError,
+    IfcSpatialIndexUnavailableError,
+    ImportIfcElementsUseCase,
+    InvalidCursorError,
     ListAnalysesInput,
     ListAnalysesUseCase,
+    ListIfcElementsInput,
+    ListIfcElementsUseCase,
+    ListNearbyIfcElementsInput,
+    ListNearbyIfcElementsUseCase,
+    QueryIfcRegionInput,
+    QueryIfcRegionUseCase,
+    RegisterIfcModelInput,
+    RegisterIfcModelUseCase,
+    ResolveIfcLocationInput,
+    ResolveIfcLocationUseCase,
+    SubmitAnalysisUseCase,
+    UploadChecksumMismatchError,
+    UploadIncompleteError,
+    UploadOffsetMismatchError,
+    UploadSessionExpiredError,
+    UseCaseError,
 )
 
 
@@ -28,52 +105,364 @@ router = APIRouter()
 
 
 @router.get("/health", summary="Verifica se o serviço está operacional")
-async def healthcheck() -> dict[str, str]:
-    """Endpoint simples para monitoramento."""
+async def healthcheck(settings: SettingsDep) -> dict[str, object]:
+    """Endpoint simples para monitoramento, com o estado dos circuitos por modelo.
+
+    Inclui os snapshots publicados pelos workers, que são quem chama o modelo.
+    """
 
-    return {"status": "ok"}
+    models = get_resilient_caller().stats()
+    workers = {
+        worker_id: snapshot.get("openai", {})
+        for worker_id, snapshot in _worker_snapshots(settings).items()
+    }
+    circuits = [item["circuit"] for item in models.values()] + [
+        item["circuit"] for worker in workers.values() for item in worker.values()
+    ]
+    degraded = any(circuit != "closed" for circuit in circuits)
+    return {"status": "degraded" if degraded else "ok", "openai": models, "workers": workers}
+
+
+@router.get("/metrics", summary="Expõe contadores internos do serviço")
+async def metrics(request: Request, settings: SettingsDep) -> dict[str, object]:
+    cache = get_analysis_cache()
+    clients = get_openai_clients(request)
+    return {
+        "analysis_cache": cache.describe() if cache else None,
+        "openai_http_pool": clients.stats() if clients else None,
+        "rate_limiter": get_rate_limiter().stats(),
+        "workers": _worker_snapshots(settings),
+    }
+
+
+def _worker_snapshots(settings: Settings) -> dict[str, dict[str, object]]:
+    config = settings.worker
+    return read_snapshots(
+        Path(config.telemetry_dir), max_age=config.telemetry_interval * 3
+    )
 
 
 @router.post(
     "/analyses",
     response_model=ProjectAnalysisResponse,
-    status_code=status.HTTP_201_CREATED,
-    summary="Executa a análise completa de BIM e imagem",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Enfileira a análise completa de BIM e imagem",
 )
 async def run_analysis(
+    settings: SettingsDep,
     project_name: str = Form(...),
     requested_by: str | None = Form(default=None),
     context: str | None = Form(default=None),
-    bim_file: UploadFile = File(...),
+    bypass_cache: bool = Form(default=False),
+    queue: JobQueue = Form(default=JobQueue.INTERACTIVE),
+    bim_file: UploadFile | None = File(default=None),
+    bim_upload_id: UUID | None = Form(default=None),
     image_files: list[UploadFile] = File(...),
-    repository=Depends(get_repository),
-    ai_service=Depends(get_openai_service),
+    job_repository=Depends(get_job_repository),
+    blob_repository=Depends(get_blob_repository),
+    upload_repository=Depends(get_upload_repository),
     storage=Depends(get_file_storage),
 ):
+    """Armazena os arquivos e devolve a análise `pending` para o worker processar.
+
+    `queue=batch` envia reinspeções sem urgência para o processamento em lote.
+    Modelos grandes podem ir antes por `/uploads` (retomável) e ser referenciados
+    aqui em `bim_upload_id`, no lugar de `bim_file`.
+    """
+
     if not image_files:
         raise HTTPException(status_code=422, detail="Ao menos uma imagem deve ser enviada")
+    if (bim_file is None) == (bim_upload_id is None):
+        raise HTTPException(status_code=422, detail="Envie `bim_file` ou `bim_upload_id`")
+
+    groups = {"images": (image_files, IMAGE_KINDS)}
+    if bim_file is not None:
+        groups["bim"] = ([bim_file], BIM_KINDS)
+    else:
+        uploaded = await _completed_upload(bim_upload_id, upload_repository)
+    try:
+        saved = await storage.save_upload_groups(groups)
+    except FileStorageError as exc:
+        raise _storage_http_error(exc) from exc
+    if bim_file is None:
+        saved["bim"] = [uploaded]
+
+    return await _submit_analysis(
+        settings,
+        job_repository,
+        blob_repository,
+        AnalyzeProjectInput(
+            project_name=project_name,
+            requested_by=requested_by,
+            context=context,
+            bim_file_path=saved["bim"][0].path,
+            image_file_paths=tuple(image.path for image in saved["images"]),
+            bypass_cache=bypass_cache,
+        ),
+        queue=queue,
+        files=[*saved["bim"], *saved["images"]],
+    )
+
+
+@router.post(
+    "/analyses/stream",
+    response_model=ProjectAnalysisResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Como `POST /analyses`, gravando os arquivos direto do corpo da requisição",
+)
+async def run_analysis_streaming(
+    request: Request,
+    settings: SettingsDep,
+    job_repository=Depends(get_job_repository),
+    blob_repository=Depends(get_blob_repository),
+    upload_repository=Depends(get_upload_repository),
+    storage=Depends(get_file_storage),
+):
+    """Mesmo formulário de `POST /analyses`, sem spool: indicado para modelos grandes.
+
+    Os arquivos vão para o armazenamento endereçado por conteúdo à medida que chegam.
+    """
 
-    run_id = str(uuid4())
     try:
-        bim_path = await storage.save_upload_file(bim_file, subdir=f"{run_id}/bim")
-        image_paths = await storage.save_upload_files(image_files, subdir=f"{run_id}/images")
+        form = await receive_multipart(
+            storage,
+            request.stream(),
+            request.headers.get("content-type", ""),
+            files={"bim_file": BIM_KINDS, "image_files": IMAGE_KINDS},
+        )
     except FileStorageError as exc:
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+        raise _storage_http_error(exc) from exc
 
-    use_case = AnalyzeProjectUseCase(repository=repository, ai_service=ai_service)
+    bim_files = form.files.get("bim_file", [])
+    images = form.files.get("image_files", [])
+    project_name = form.fields.get("project_name", "").strip()
+    bim_upload_id = form.fields.get("bim_upload_id")
+    if len(bim_files) != (0 if bim_upload_id else 1) or not images or not project_name:
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                "Envie `project_name`, um `bim_file` (ou `bim_upload_id`) "
+                "e ao menos uma imagem em `image_files`"
+            ),
+        )
+    try:
+        queue = JobQueue(form.fields.get("queue", JobQueue.INTERACTIVE.value))
+        if bim_upload_id:
+            upload_id = UUID(bim_upload_id)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=422, detail="`queue` ou `bim_upload_id` inválido"
+        ) from exc
+    if bim_upload_id:
+        bim_files = [await _completed_upload(upload_id, upload_repository)]
+
+    return await _submit_analysis(
+        settings,
+        job_repository,
+        blob_repository,
+        AnalyzeProjectInput(
+            project_name=project_name,
+            requested_by=form.fields.get("requested_by"),
+            context=form.fields.get("context"),
+            bim_file_path=bim_files[0].path,
+            image_file_paths=tuple(image.path for image in images),
+            bypass_cache=form.fields.get("bypass_cache", "").lower() in {"1", "true", "on"},
+        ),
+        queue=queue,
+        files=[*bim_files, *images],
+    )
+
+
+async def _submit_analysis(
+    settings: Settings,
+    job_repository,
+    blob_repository,
+    payload: AnalyzeProjectInput,
+    *,
+    queue: JobQueue,
+    files: list[StoredFile],
+) -> ProjectAnalysisResponse:
+    use_case = SubmitAnalysisUseCase(
+        job_repository=job_repository,
+        blob_repository=blob_repository,
+        max_attempts=settings.worker.max_attempts,
+    )
     try:
         result = await use_case.execute(
-            AnalyzeProjectInput(
-                project_name=project_name,
-                requested_by=requested_by,
-                context=context,
-                bim_file_path=bim_path,
-                image_file_paths=tuple(image_paths),
-            )
+            payload, queue=queue, blobs=[_file_blob(stored) for stored in files]
         )
-        return ProjectAnalysisResponse.from_entity(result)
     except AnalysisExecutionError as exc:
-        raise HTTPException(status_code=502, detail=str(exc)) from exc
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    return ProjectAnalysisResponse.from_entity(result)
+
+
+async def _completed_upload(upload_id: UUID, repository) -> StoredFile:
+    try:
+        upload = await GetCompletedUploadUseCase(repository).execute(upload_id, kinds=BIM_KINDS)
+    except FileStorageError as exc:
+        raise _storage_http_error(exc) from exc
+    except UseCaseError as exc:
+        raise _upload_http_error(exc) from exc
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Envio não encontrado")
+    return StoredFile(upload.source_uri, upload.sha256, upload.size, upload.kind)
+
+
+def _file_blob(stored: StoredFile) -> FileBlob:
+    return FileBlob(sha256=stored.sha256, size=stored.size, kind=stored.kind)
+
+
+def _storage_http_error(exc: FileStorageError) -> HTTPException:
+    if isinstance(exc, FileTooLargeError):
+        return HTTPException(status_code=413, detail=str(exc))
+    if isinstance(exc, UnsupportedFileTypeError):
+        return HTTPException(status_code=415, detail=str(exc))
+    if isinstance(exc, MultipartFormError):
+        return HTTPException(status_code=400, detail=str(exc))
+    if isinstance(exc, ChunkChecksumError):
+        return HTTPException(status_code=422, detail=str(exc))
+    if isinstance(exc, UploadBusyError):
+        return HTTPException(status_code=409, detail=str(exc))
+    return HTTPException(status_code=500, detail=str(exc))
+
+
+def _upload_http_error(exc: UseCaseError) -> HTTPException:
+    if isinstance(exc, UploadOffsetMismatchError):
+        return HTTPException(
+            status_code=409, detail=str(exc), headers={"Upload-Offset": str(exc.offset)}
+        )
+    if isinstance(exc, UploadSessionExpiredError):
+        return HTTPException(status_code=410, detail=str(exc))
+    if isinstance(exc, UploadIncompleteError):
+        return HTTPException(status_code=409, detail=str(exc))
+    if isinstance(exc, UploadChecksumMismatchError):
+        return HTTPException(status_code=422, detail=str(exc))
+    return HTTPException(status_code=500, detail=str(exc))
+
+
+@router.post(
+    "/uploads",
+    response_model=UploadSessionResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Abre um envio retomável, recebido em partes por offset",
+)
+async def create_upload(
+    payload: UploadSessionCreateRequest,
+    response: Response,
+    settings: SettingsDep,
+    repository=Depends(get_upload_repository),
+    storage=Depends(get_file_storage),
+):
+    """Para arquivos grandes em conexões instáveis.
+
+    Cada parte vai em `PUT /uploads/{id}?offset=...` com o sha256 da parte em
+    `X-Chunk-SHA256`; uma parte interrompida é reenviada do offset devolvido por
+    `GET /uploads/{id}`. Ao final, `POST /uploads/{id}/finalize` e o `id` vai em
+    `bim_upload_id` de `POST /analyses`.
+    """
+
+    use_case = CreateUploadUseCase(
+        repository, ttl=_upload_ttl(settings), max_file_bytes=storage.max_file_bytes
+    )
+    try:
+        upload = await use_case.execute(
+            CreateUploadInput(size=payload.size, filename=payload.filename, checksum=payload.sha256)
+        )
+    except FileStorageError as exc:
+        raise _storage_http_error(exc) from exc
+    return _upload_response(upload, response)
+
+
+@router.get(
+    "/uploads/{upload_id}",
+    response_model=UploadSessionResponse,
+    summary="Estado de um envio retomável e o offset para a próxima parte",
+)
+async def get_upload(
+    upload_id: UUID,
+    response: Response,
+    repository=Depends(get_upload_repository),
+):
+    upload = await GetUploadUseCase(repository).execute(upload_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Envio não encontrado")
+    return _upload_response(upload, response)
+
+
+@router.put(
+    "/uploads/{upload_id}",
+    response_model=UploadSessionResponse,
+    summary="Grava uma parte do envio a partir de `offset`",
+)
+async def put_upload_chunk(
+    upload_id: UUID,
+    request: Request,
+    response: Response,
+    settings: SettingsDep,
+    offset: int = Query(..., ge=0),
+    chunk_sha256: str = Header(..., alias="X-Chunk-SHA256", pattern="^[0-9a-fA-F]{64}$"),
+    repository=Depends(get_upload_repository),
+    storage=Depends(get_file_storage),
+):
+    """O corpo é a parte, em bytes. Offset divergente devolve 409 com `Upload-Offset`."""
+
+    use_case = AppendUploadChunkUseCase(
+        repository,
+        storage,
+        ttl=_upload_ttl(settings),
+        max_chunk_bytes=settings.app.upload_chunk_max_mb * 1024 * 1024,
+    )
+    try:
+        upload = await use_case.execute(
+            AppendUploadChunkInput(
+                upload_id=upload_id,
+                offset=offset,
+                sha256=chunk_sha256,
+                stream=request.stream(),
+            )
+        )
+    except FileStorageError as exc:
+        raise _storage_http_error(exc) from exc
+    except UseCaseError as exc:
+        raise _upload_http_error(exc) from exc
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Envio não encontrado")
+    return _upload_response(upload, response)
+
+
+@router.post(
+    "/uploads/{upload_id}/finalize",
+    response_model=UploadSessionResponse,
+    summary="Confere o arquivo completo e o disponibiliza para análises",
+)
+async def finalize_upload(
+    upload_id: UUID,
+    response: Response,
+    repository=Depends(get_upload_repository),
+    blob_repository=Depends(get_blob_repository),
+    storage=Depends(get_file_storage),
+):
+    use_case = FinalizeUploadUseCase(
+        repository, blob_repository, storage, kinds=BIM_KINDS | IMAGE_KINDS
+    )
+    try:
+        upload = await use_case.execute(upload_id)
+    except FileStorageError as exc:
+        raise _storage_http_error(exc) from exc
+    except UseCaseError as exc:
+        raise _upload_http_error(exc) from exc
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Envio não encontrado")
+    return _upload_response(upload, response)
+
+
+def _upload_ttl(settings: Settings) -> timedelta:
+    return timedelta(hours=settings.app.upload_session_ttl_hours)
+
+
+def _upload_response(upload, response: Response) -> UploadSessionResponse:
+    response.headers["Upload-Offset"] = str(upload.offset)
+    return UploadSessionResponse.from_entity(upload)
 
 
 @router.get(
@@ -104,9 +493,297 @@ async def get_analysis(
 )
 async def list_analyses(
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None, max_length=256),
+    status_filter: AnalysisStatus | None = Query(default=None, alias="status"),
+    project_name: str | None = Query(default=None, max_length=255),
+    requested_by: str | None = Query(default=None, max_length=255),
+    created_from: datetime | None = Query(default=None),
+    created_to: datetime | None = Query(default=None),
     repository=Depends(get_repository),
 ):
+    """Mais recentes primeiro; `next_cursor` da resposta, em `cursor`, traz a página seguinte.
+
+    O cursor vale para os mesmos filtros com que foi gerado.
+    """
+
     use_case = ListAnalysesUseCase(repository=repository)
-    result = await use_case.execute(ListAnalysesInput(limit=limit))
-    return ProjectAnalysisListResponse.from_entities(result)
+    try:
+        page = await use_case.execute(
+            ListAnalysesInput(
+                limit=limit,
+                cursor=cursor,
+                status=status_filter,
+                project_name=project_name,
+                requested_by=requested_by,
+                created_from=created_from,
+                created_to=created_to,
+            )
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return ProjectAnalysisListResponse.from_page(page)
+
+
+@router.post(
+    "/projects/{project_id}/ifc",
+    response_model=IfcModelResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Envia o modelo IFC do projeto e importa os elementos em segundo plano",
+)
+async def upload_ifc(
+    project_id: str,
+    background_tasks: BackgroundTasks,
+    settings: SettingsDep,
+    file: UploadFile = File(...),
+    repository=Depends(get_ifc_repository),
+    blob_repository=Depends(get_blob_repository),
+    storage=Depends(get_file_storage),
+):
+    try:
+        stored = await storage.save_upload_file(file, kinds={"ifc"})
+    except FileStorageError as exc:
+        raise _storage_http_error(exc) from exc
+
+    return await _register_ifc(
+        project_id,
+        stored,
+        background_tasks,
+        settings=settings,
+        repository=repository,
+        blob_repository=blob_repository,
+    )
+
+
+@router.post(
+    "/projects/{project_id}/ifc/stream",
+    response_model=IfcModelResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Como `POST /projects/{project_id}/ifc`, gravando o arquivo direto do corpo",
+)
+async def upload_ifc_streaming(
+    project_id: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    settings: SettingsDep,
+    repository=Depends(get_ifc_repository),
+    blob_repository=Depends(get_blob_repository),
+    storage=Depends(get_file_storage),
+):
+    try:
+        form = await receive_multipart(
+            storage,
+            request.stream(),
+            request.headers.get("content-type", ""),
+            files={"file": {"ifc"}},
+        )
+    except FileStorageError as exc:
+        raise _storage_http_error(exc) from exc
+    files = form.files.get("file", [])
+    if len(files) != 1:
+        raise HTTPException(status_code=422, detail="Envie um arquivo IFC no campo `file`")
+    return await _register_ifc(
+        project_id,
+        files[0],
+        background_tasks,
+        settings=settings,
+        repository=repository,
+        blob_repository=blob_repository,
+    )
+
+
+async def _register_ifc(
+    project_id: str,
+    stored: StoredFile,
+    background_tasks: BackgroundTasks,
+    *,
+    settings: Settings,
+    repository,
+    blob_repository,
+) -> IfcModelResponse:
+    model = await RegisterIfcModelUseCase(
+        repository=repository, blob_repository=blob_repository
+    ).execute(
+        RegisterIfcModelInput(
+            project_id=project_id, file_path=stored.path, blob=_file_blob(stored)
+        )
+    )
+    background_tasks.add_task(
+        _import_ifc_elements, model.id, chunk_size=settings.ifc.element_insert_chunk
+    )
+    return IfcModelResponse.from_entity(model)
+
+
+async def _import_ifc_elements(model_id: UUID, *, chunk_size: int) -> None:
+    # Roda depois da resposta: a sessão da requisição já foi encerrada.
+    async with get_session() as session:
+        await ImportIfcElementsUseCase(
+            SQLAlchemyIfcModelRepository(session=session),
+            chunk_size=chunk_size,
+            inventory=get_ifc_inventory_service(),
+            storage=get_file_storage(),
+        ).execute(model_id)
+
+
+@router.get(
+    "/projects/{project_id}/ifc",
+    response_model=IfcModelResponse,
+    summary="Recupera o modelo IFC mais recente do projeto",
+)
+async def get_project_ifc(project_id: str, repository=Depends(get_ifc_repository)):
+    model = await GetProjectIfcUseCase(repository=repository).execute(project_id)
+    if model is None:
+        raise HTTPException(status_code=404, detail="Modelo IFC não encontrado")
+    return IfcModelResponse.from_entity(model)
+
+
+@router.get(
+    "/ifc/{ifc_id}/elements",
+    response_model=list[IfcElementSchema],
+    summary="Lista elementos do modelo IFC (paginação por cursor)",
+)
+async def list_ifc_elements(
+    ifc_id: UUID,
+    response: Response,
+    ifc_type: str | None = Query(default=None, alias="type", max_length=64),
+    cursor: int | None = Query(default=None, ge=0),
+    limit: int = Query(default=500, ge=1, le=5000),
+    repository=Depends(get_ifc_repository),
+):
+    """Elementos em ordem de `#id`; o cursor da próxima página vem em `X-Next-Cursor`."""
 
+    page = await ListIfcElementsUseCase(repository=repository).execute(
+        ListIfcElementsInput(model_id=ifc_id, ifc_type=ifc_type, after=cursor, limit=limit)
+    )
+    if page is None:
+        raise HTTPException(status_code=404, detail="Modelo IFC não encontrado")
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(page.next_cursor)
+    return [IfcElementSchema.from_entity(element) for element in page.items]
+
+
+@router.get(
+    "/ifc/{ifc_id}/aggregates",
+    response_model=list[IfcAggregateSchema],
+    summary="Agrega elementos do modelo IFC por tipo, pavimento e/ou espaço",
+)
+async def aggregate_ifc_elements(
+    ifc_id: UUID,
+    by: str = Query(
+        default="type", pattern=r"^(type|storey|space)(,(type|storey|space))*$"
+    ),
+    measure: Literal["count", "length", "area", "volume", "weight"] = Query(default="count"),
+    ifc_type: str | None = Query(default=None, alias="type", max_length=64),
+    repository=Depends(get_ifc_repository),
+    inventory=Depends(get_ifc_inventory),
+    storage=Depends(get_file_storage),
+):
+    """Ex.: `?by=storey&measure=area&type=IfcSlab` (área de lajes por pavimento)."""
+
+    try:
+        rows = await AggregateIfcElementsUseCase(repository, inventory, storage=storage).execute(
+            AggregateIfcElementsInput(
+                model_id=ifc_id, by=tuple(by.split(",")), measure=measure, ifc_type=ifc_type
+            )
+        )
+    except IfcAggregatesUnavailableError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    if rows is None:
+        raise HTTPException(status_code=404, detail="Modelo IFC não encontrado")
+    return [IfcAggregateSchema.from_entity(row) for row in rows]
+
+
+def _point(value: str, name: str) -> tuple[float, float, float]:
+    try:
+        x, y, z = (float(part) for part in value.split(","))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=f"`{name}` deve ser `x,y,z`") from exc
+    return x, y, z
+
+
+@router.get(
+    "/ifc/{ifc_id}/spatial",
+    response_model=list[IfcElementBoxSchema],
+    summary="Elementos do modelo IFC cujas caixas envolventes cruzam uma região",
+)
+async def query_ifc_region(
+    ifc_id: UUID,
+    minimum: str = Query(alias="min", max_length=100),
+    maximum: str = Query(alias="max", max_length=100),
+    ifc_type: str | None = Query(default=None, alias="type", max_length=64),
+    limit: int = Query(default=500, ge=1, le=5000),
+    repository=Depends(get_ifc_repository),
+    inventory=Depends(get_ifc_inventory),
+    storage=Depends(get_file_storage),
+):
+    """Ex.: `?min=0,0,0&max=10,5,3&type=IfcWall` (coordenadas do modelo)."""
+
+    try:
+        elements = await QueryIfcRegionUseCase(repository, inventory, storage=storage).execute(
+            QueryIfcRegionInput(
+                model_id=ifc_id,
+                minimum=_point(minimum, "min"),
+                maximum=_point(maximum, "max"),
+                ifc_type=ifc_type,
+                limit=limit,
+            )
+        )
+    except IfcSpatialIndexUnavailableError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    if elements is None:
+        raise HTTPException(status_code=404, detail="Modelo IFC não encontrado")
+    return [IfcElementBoxSchema.from_entity(element) for element in elements]
+
+
+@router.get(
+    "/ifc/{ifc_id}/elements/{step_id}/nearby",
+    response_model=list[IfcElementBoxSchema],
+    summary="Elementos próximos de um elemento do modelo IFC",
+)
+async def list_nearby_ifc_elements(
+    ifc_id: UUID,
+    step_id: int,
+    radius: float = Query(default=1.0, ge=0),
+    ifc_type: str | None = Query(default=None, alias="type", max_length=64),
+    limit: int = Query(default=100, ge=1, le=5000),
+    repository=Depends(get_ifc_repository),
+    inventory=Depends(get_ifc_inventory),
+    storage=Depends(get_file_storage),
+):
+    use_case = ListNearbyIfcElementsUseCase(repository, inventory, storage=storage)
+    try:
+        elements = await use_case.execute(
+            ListNearbyIfcElementsInput(
+                model_id=ifc_id, step_id=step_id, radius=radius, ifc_type=ifc_type, limit=limit
+            )
+        )
+    except IfcSpatialIndexUnavailableError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except IfcElementNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    if elements is None:
+        raise HTTPException(status_code=404, detail="Modelo IFC não encontrado")
+    return [IfcElementBoxSchema.from_entity(element) for element in elements]
+
+
+@router.get(
+    "/ifc/{ifc_id}/locate",
+    response_model=IfcLocationSchema,
+    summary="Resolve uma indicação de local (`location_hint`) em elementos do modelo IFC",
+)
+async def locate_in_ifc(
+    ifc_id: UUID,
+    hint: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=200, ge=1, le=5000),
+    repository=Depends(get_ifc_repository),
+    inventory=Depends(get_ifc_inventory),
+    storage=Depends(get_file_storage),
+):
+    try:
+        location = await ResolveIfcLocationUseCase(repository, inventory, storage=storage).execute(
+            ResolveIfcLocationInput(model_id=ifc_id, hint=hint, limit=limit)
+        )
+    except IfcSpatialIndexUnavailableError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    if location is None:
+        raise HTTPException(status_code=404, detail="Modelo IFC não encontrado")
+    return IfcLocationSchema.from_entity(location)
@@ -4,15 +4,18 @@ from __future__ import annotations
 
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import SettingsDep
 from app.infrastructure import (
-    LocalFileStorage,
-    OpenAIService,
-    OpenAIServiceError,
+    IfcInventoryService,
+    OpenAIClientManager,
+    SQLAlchemyAnalysisJobRepository,
+    SQLAlchemyFileBlobRepository,
+    SQLAlchemyIfcModelRepository,
     SQLAlchemyProjectAnalysisRepository,
+    SQLAlchemyUploadSessionRepository,
+    get_ifc_inventory_service,
 )
 from app.infrastructure.db.session import get_session
 
@@ -28,13 +31,39 @@ def get_repository(
     return SQLAlchemyProjectAnalysisRepository(session=session)
 
 
-def get_openai_service(settings: SettingsDep) -> OpenAIService:
-    try:
-        return OpenAIService(settings=settings)
-    except OpenAIServiceError as exc:
-        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+def get_job_repository(
+    session: Annotated[AsyncSession, Depends(get_db_session)]
+) -> SQLAlchemyAnalysisJobRepository:
+    return SQLAlchemyAnalysisJobRepository(session=session)
+
+
+def get_ifc_repository(
+    session: Annotated[AsyncSession, Depends(get_db_session)]
+) -> SQLAlchemyIfcModelRepository:
+    return SQLAlchemyIfcModelRepository(session=session)
+
+
+def get_blob_repository(
+    session: Annotated[AsyncSession, Depends(get_db_session)]
+) -> SQLAlchemyFileBlobRepository:
+    return SQLAlchemyFileBlobRepository(session=session)
+
+
+def get_upload_repository(
+    session: Annotated[AsyncSession, Depends(get_db_session)]
+) -> SQLAlchemyUploadSessionRepository:
+    return SQLAlchemyUploadSessionRepository(session=session)
+
+
+def get_ifc_inventory() -> IfcInventoryService:
+    inventory = get_ifc_inventory_service()
+    if inventory is None:
+        raise HTTPException(
+            status.HTTP_503_SERVICE_UNAVAILABLE, detail="Processamento IFC desativado"
+        )
+    return inventory
 
 
-def get_file_storage(settings: SettingsDep) -> LocalFileStorage:
-    return LocalFileStorage(base_path=settings.app.uploads_path)
+def get_openai_clients(request: Request) -> OpenAIClientManager | None:
+    return getattr(request.app.state, "openai_clients", None)
 
@@ -3,19 +3,29 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Iterable, Optional
+from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.domain.entities import (
     AnalysisStatus,
     BimAnalysis,
     ComparisonResult,
     DetectedIssue,
+    IfcAggregate,
+    IfcElement,
+    IfcElementBox,
+    IfcLocation,
+    IfcModel,
+    IfcModelStatus,
     ImageAnalysis,
     IssueSeverity,
     ProjectAnalysis,
+    ProjectAnalysisPage,
+    ProjectAnalysisSummary,
+    UploadSession,
+    UploadStatus,
 )
 
 
@@ -104,13 +114,17 @@ class ProjectAnalysisResponse(BaseModel):
     project_name: str
     requested_by: Optional[str]
     bim_source_uri: str
-    image_source_uri: str
+    image_source_uri: str = Field(
+        description="Primeira imagem enviada; todas estão em `image_analyses[].source_uri`"
+    )
     status: AnalysisStatus
     created_at: datetime
     updated_at: datetime
     notes: Optional[str]
+    stage_timings_ms: dict[str, float] = Field(default_factory=dict)
     bim_analysis: Optional[BimAnalysisSchema]
     image_analysis: Optional[ImageAnalysisSchema]
+    image_analyses: list[ImageAnalysisSchema] = Field(default_factory=list)
     comparison_result: Optional[ComparisonResultSchema]
 
     @classmethod
@@ -125,6 +139,7 @@ class ProjectAnalysisResponse(BaseModel):
             created_at=entity.created_at,
             updated_at=entity.updated_at,
             notes=entity.notes,
+            stage_timings_ms=dict(entity.stage_timings_ms),
             bim_analysis=
             BimAnalysisSchema.from_entity(entity.bim_analysis)
             if entity.bim_analysis
@@ -133,6 +148,9 @@ class ProjectAnalysisResponse(BaseModel):
             ImageAnalysisSchema.from_entity(entity.image_analysis)
             if entity.image_analysis
             else None,
+            image_analyses=[
+                ImageAnalysisSchema.from_entity(item) for item in entity.image_analyses
+            ],
             comparison_result=
             ComparisonResultSchema.from_entity(entity.comparison_result)
             if entity.comparison_result
@@ -149,22 +167,163 @@ class ProjectAnalysisListItem(BaseModel):
     updated_at: datetime
 
     @classmethod
-    def from_entity(cls, entity: ProjectAnalysis) -> "ProjectAnalysisListItem":
+    def from_summary(cls, summary: ProjectAnalysisSummary) -> "ProjectAnalysisListItem":
+        return cls(
+            id=summary.id,
+            project_name=summary.project_name,
+            status=summary.status,
+            requested_by=summary.requested_by,
+            created_at=summary.created_at,
+            updated_at=summary.updated_at,
+        )
+
+
+class ProjectAnalysisListResponse(BaseModel):
+    items: list[ProjectAnalysisListItem]
+    # Repassado em `cursor` para buscar a próxima página; ausente na última.
+    next_cursor: Optional[str] = None
+
+    @classmethod
+    def from_page(cls, page: ProjectAnalysisPage) -> "ProjectAnalysisListResponse":
+        return cls(
+            items=[ProjectAnalysisListItem.from_summary(item) for item in page.items],
+            next_cursor=page.next_cursor.encode() if page.next_cursor else None,
+        )
+
+
+class IfcModelResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: UUID
+    project_id: str
+    status: IfcModelStatus
+    ifc_schema: Optional[str] = Field(default=None, serialization_alias="schema")
+    elements_count: int
+    error: Optional[str] = None
+    created_at: datetime
+
+    @classmethod
+    def from_entity(cls, entity: IfcModel) -> "IfcModelResponse":
         return cls(
             id=entity.id,
-            project_name=entity.project_name,
+            project_id=entity.project_id,
             status=entity.status,
-            requested_by=entity.requested_by,
+            ifc_schema=entity.ifc_schema,
+            elements_count=entity.elements_count,
+            error=entity.error,
             created_at=entity.created_at,
-            updated_at=entity.updated_at,
         )
 
 
-class ProjectAnalysisListResponse(BaseModel):
-    items: list[ProjectAnalysisListItem]
+class IfcElementSchema(BaseModel):
+    id: str
+    step_id: int
+    name: Optional[str]
+    category: str
+    code: Optional[str] = None
 
     @classmethod
-    def from_entities(cls, entities: Iterable[ProjectAnalysis]) -> "ProjectAnalysisListResponse":
-        return cls(items=[ProjectAnalysisListItem.from_entity(item) for item in entities])
+    def from_entity(cls, entity: IfcElement) -> "IfcElementSchema":
+        return cls(
+            id=entity.global_id or f"#{entity.step_id}",
+            step_id=entity.step_id,
+            name=entity.name,
+            category=entity.ifc_type,
+            code=entity.tag,
+        )
 
 
+class IfcAggregateSchema(BaseModel):
+    group: dict[str, Optional[str]]
+    count: int
+    total: Optional[float] = None
+    measured: int
+
+    @classmethod
+    def from_entity(cls, entity: IfcAggregate) -> "IfcAggregateSchema":
+        return cls(
+            group=dict(entity.group),
+            count=entity.count,
+            total=entity.total,
+            measured=entity.measured,
+        )
+
+
+class IfcElementBoxSchema(BaseModel):
+    step_id: int
+    ifc_type: str
+    bbox: list[float] = Field(description="min x, y, z, max x, y, z")
+    storey: Optional[str] = None
+    space: Optional[str] = None
+
+    @classmethod
+    def from_entity(cls, entity: IfcElementBox) -> "IfcElementBoxSchema":
+        return cls(
+            step_id=entity.step_id,
+            ifc_type=entity.ifc_type,
+            bbox=list(entity.bbox),
+            storey=entity.storey,
+            space=entity.space,
+        )
+
+
+class IfcLocationMatchSchema(BaseModel):
+    kind: str
+    step_id: int
+    name: Optional[str] = None
+    score: float
+
+
+class IfcLocationSchema(BaseModel):
+    hint: str
+    matches: list[IfcLocationMatchSchema]
+    element_ids: list[int]
+    total: int
+
+    @classmethod
+    def from_entity(cls, entity: IfcLocation) -> "IfcLocationSchema":
+        return cls(
+            hint=entity.hint,
+            matches=[
+                IfcLocationMatchSchema(
+                    kind=match.kind, step_id=match.step_id, name=match.name, score=match.score
+                )
+                for match in entity.matches
+            ],
+            element_ids=list(entity.element_ids),
+            total=entity.total,
+        )
+
+
+class UploadSessionCreateRequest(BaseModel):
+    size: int = Field(gt=0, description="Tamanho total do arquivo, em bytes")
+    filename: Optional[str] = Field(default=None, max_length=255)
+    sha256: Optional[str] = Field(
+        default=None,
+        pattern="^[0-9a-fA-F]{64}$",
+        description="sha256 do arquivo inteiro, conferido ao finalizar",
+    )
+
+
+class UploadSessionResponse(BaseModel):
+    id: UUID
+    status: UploadStatus
+    size: int
+    offset: int
+    filename: Optional[str] = None
+    sha256: Optional[str] = None
+    kind: Optional[str] = None
+    expires_at: datetime
+
+    @classmethod
+    def from_entity(cls, entity: UploadSession) -> "UploadSessionResponse":
+        return cls(
+            id=entity.id,
+            status=entity.status,
+            size=entity.size,
+            offset=entity.offset,
+            filename=entity.filename,
+            sha256=entity.sha256,
+            kind=entity.kind,
+            expires_at=entity.expires_at,
+        )
@@ -1,19 +1,51 @@
 """Ponto de entrada da aplicação FastAPI."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from app.core.config import get_settings
+from app.infrastructure import (
+    OpenAIClientManager,
+    get_file_storage,
+    get_ifc_inventory_service,
+    get_image_preprocessor,
+)
 from app.interfaces.http.api import router as api_router
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Mantém recursos compartilhados (ex.: pool do cliente OpenAI) durante a vida do app.
+
+    No encerramento, libera também os pools de processos e o cliente do
+    armazenamento remoto criados sob demanda pelas rotas.
+    """
+
+    openai_clients = OpenAIClientManager(get_settings())
+    openai_clients.start()
+    app.state.openai_clients = openai_clients
+    try:
+        yield
+    finally:
+        preprocessor = get_image_preprocessor()
+        if preprocessor is not None:
+            preprocessor.close()
+        ifc_inventory = get_ifc_inventory_service()
+        if ifc_inventory is not None:
+            ifc_inventory.close()
+        get_file_storage().close()
+        await openai_clients.aclose()
+
+
 def create_app() -> FastAPI:
     """Cria instância configurada da aplicação."""
 
     settings = get_settings()
-    app = FastAPI(title="Metro BIM Analyzer", version="0.1.0")
+    app = FastAPI(title="Metro BIM Analyzer", version="0.1.0", lifespan=lifespan)
     app.include_router(api_router, prefix=settings.app.api_v1_prefix)
     return app
 
 
 app = create_app()
-
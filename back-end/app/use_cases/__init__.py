@@ -1,22 +1,100 @@
 """Casos de uso da aplicação."""
 
 from .analyze_project import AnalyzeProjectInput, AnalyzeProjectUseCase
-from .exceptions import AnalysisExecutionError, UseCaseError
+from .batch_analysis import BatchAnalyzeProjectsUseCase, BatchOutcome
+from .exceptions import (
+    AnalysisExecutionError,
+    IfcAggregatesUnavailableError,
+    IfcElementNotFoundError,
+    IfcSpatialIndexUnavailableError,
+    InvalidCursorError,
+    UploadChecksumMismatchError,
+    UploadIncompleteError,
+    UploadOffsetMismatchError,
+    UploadSessionExpiredError,
+    UseCaseError,
+)
+from .ifc_models import (
+    AggregateIfcElementsInput,
+    AggregateIfcElementsUseCase,
+    GetProjectIfcUseCase,
+    ImportIfcElementsUseCase,
+    ListIfcElementsInput,
+    ListIfcElementsUseCase,
+    ListNearbyIfcElementsInput,
+    ListNearbyIfcElementsUseCase,
+    QueryIfcRegionInput,
+    QueryIfcRegionUseCase,
+    RegisterIfcModelInput,
+    RegisterIfcModelUseCase,
+    ResolveIfcLocationInput,
+    ResolveIfcLocationUseCase,
+)
 from .query_analyses import (
     GetAnalysisInput,
     GetAnalysisUseCase,
     ListAnalysesInput,
     ListAnalysesUseCase,
 )
+from .stage_graph import Stage, StageExecutionError, StageGraph, StageGraphError
+from .storage_gc import CollectStorageGarbageUseCase, StorageGarbageReport
+from .submit_analysis import SubmitAnalysisUseCase
+from .uploads import (
+    AppendUploadChunkInput,
+    AppendUploadChunkUseCase,
+    CreateUploadInput,
+    CreateUploadUseCase,
+    FinalizeUploadUseCase,
+    GetCompletedUploadUseCase,
+    GetUploadUseCase,
+)
 
 __all__ = [
     "AnalyzeProjectInput",
     "AnalyzeProjectUseCase",
     "AnalysisExecutionError",
+    "BatchAnalyzeProjectsUseCase",
+    "BatchOutcome",
+    "CollectStorageGarbageUseCase",
+    "StorageGarbageReport",
     "UseCaseError",
+    "AggregateIfcElementsInput",
+    "AggregateIfcElementsUseCase",
+    "GetProjectIfcUseCase",
+    "IfcAggregatesUnavailableError",
+    "IfcElementNotFoundError",
+    "IfcSpatialIndexUnavailableError",
+    "ImportIfcElementsUseCase",
+    "ListIfcElementsInput",
+    "ListIfcElementsUseCase",
+    "ListNearbyIfcElementsInput",
+    "ListNearbyIfcElementsUseCase",
+    "QueryIfcRegionInput",
+    "QueryIfcRegionUseCase",
+    "RegisterIfcModelInput",
+    "RegisterIfcModelUseCase",
+    "ResolveIfcLocationInput",
+    "ResolveIfcLocationUseCase",
     "GetAnalysisInput",
     "GetAnalysisUseCase",
     "ListAnalysesInput",
     "ListAnalysesUseCase",
+    "InvalidCursorError",
+    "Stage",
+    "StageExecutionError",
+    "StageGraph",
+    "StageGraphError",
+    "SubmitAnalysisUseCase",
+    "AppendUploadChunkInput",
+    "AppendUploadChunkUseCase",
+    "CreateUploadInput",
+    "CreateUploadUseCase",
+    "FinalizeUploadUseCase",
+    "GetCompletedUploadUseCase",
+    "GetUploadUseCase",
+    "UploadChecksumMismatchError",
+    "UploadIncompleteError",
+    "UploadOffsetMismatchError",
+    "UploadSessionExpiredError",
 ]
 
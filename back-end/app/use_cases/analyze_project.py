@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Optional, Sequence
+from typing import Any, Optional, Sequence
+from uuid import UUID
 
 from app.domain.entities import (
     AnalysisStatus,
@@ -11,10 +15,15 @@ from app.domain.entities import (
     ComparisonResult,
     ImageAnalysis,
     ProjectAnalysis,
+    aggregate_image_analyses,
 )
 from app.domain.repositories import ProjectAnalysisRepository
-from app.infrastructure import OpenAIService, OpenAIServiceError
+from app.infrastructure import FileStorage, OpenAIService, OpenAIServiceError
 from app.use_cases.exceptions import AnalysisExecutionError
+from app.use_cases.stage_graph import Stage, StageGraph
+
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(slots=True)
@@ -24,89 +33,234 @@ class AnalyzeProjectInput:
     image_file_paths: Sequence[str]
     requested_by: Optional[str] = None
     context: Optional[str] = None
+    analysis_id: Optional[UUID] = None
+    bypass_cache: bool = False
+    final_attempt: bool = True
+
+    def to_job_payload(self) -> dict[str, Any]:
+        """Serializa a entrada para armazenamento na fila de jobs."""
+
+        return {
+            "project_name": self.project_name,
+            "bim_file_path": self.bim_file_path,
+            "image_file_paths": list(self.image_file_paths),
+            "requested_by": self.requested_by,
+            "context": self.context,
+            "bypass_cache": self.bypass_cache,
+        }
+
+    @classmethod
+    def from_job_payload(
+        cls, analysis_id: UUID, data: dict[str, Any], *, final_attempt: bool = True
+    ) -> "AnalyzeProjectInput":
+        return cls(
+            project_name=data["project_name"],
+            bim_file_path=data["bim_file_path"],
+            image_file_paths=tuple(data.get("image_file_paths") or ()),
+            requested_by=data.get("requested_by"),
+            context=data.get("context"),
+            analysis_id=analysis_id,
+            bypass_cache=bool(data.get("bypass_cache", False)),
+            final_attempt=final_attempt,
+        )
 
 
 class AnalyzeProjectUseCase:
     """Orquestra os passos de análise BIM + imagem + comparação."""
 
+    BIM_STAGE = "bim"
+    IMAGE_STAGE = "image"
+    COMPARISON_STAGE = "comparison"
+
     def __init__(
         self,
         *,
         repository: ProjectAnalysisRepository,
         ai_service: OpenAIService,
+        image_concurrency: int = 4,
+        storage: FileStorage | None = None,
     ) -> None:
         self._repository = repository
         self._ai_service = ai_service
+        self._image_concurrency = max(1, image_concurrency)
+        self._storage = storage
 
     async def execute(self, payload: AnalyzeProjectInput) -> ProjectAnalysis:
         if not payload.image_file_paths:
             raise AnalysisExecutionError("Nenhuma imagem fornecida para análise")
 
-        analysis = ProjectAnalysis(
-            project_name=payload.project_name,
-            requested_by=payload.requested_by,
-            bim_source_uri=payload.bim_file_path,
-            image_source_uri=payload.image_file_paths[0],
-            status=AnalysisStatus.RUNNING,
-        )
-
-        analysis = await self._repository.create(analysis)
+        analysis = await self._start_analysis(payload)
 
+        graph = self._build_stage_graph(analysis, payload)
         try:
-            bim_result = await self._perform_bim_analysis(analysis, payload)
-            image_result = await self._perform_image_analysis(analysis, payload)
-            comparison = await self._ai_service.compare_results(
-                project_name=analysis.project_name,
+            if self._storage is not None:
+                # Com armazenamento remoto, o nó que executa pode não ter os arquivos.
+                await self._storage.fetch([payload.bim_file_path, *payload.image_file_paths])
+            results = await graph.run()
+            bim_result: BimAnalysis = results[self.BIM_STAGE]
+            image_results: list[ImageAnalysis] = results[self.IMAGE_STAGE]
+            comparison: ComparisonResult = results[self.COMPARISON_STAGE]
+            analysis.stage_timings_ms = dict(graph.timings_ms)
+            analysis.mark_completed(bim_result, image_results, comparison)
+            analysis.notes = compose_summary_message(
                 bim_analysis=bim_result,
-                image_analysis=image_result,
-            )
-            analysis.notes = self._compose_summary_message(
-                bim_analysis=bim_result,
-                image_analysis=image_result,
+                image_analysis=analysis.image_analysis,
                 comparison=comparison,
             )
-            analysis.mark_completed(bim_result, image_result, comparison)
             analysis = await self._repository.update(analysis)
             return analysis
         except (OpenAIServiceError, Exception) as exc:
-            analysis.mark_failed(str(exc))
-            await self._repository.update(analysis)
+            analysis.stage_timings_ms = dict(graph.timings_ms)
+            await fail_analysis(self._repository, analysis, payload, str(exc))
             raise AnalysisExecutionError("Falha ao executar análise completa") from exc
 
+    def _build_stage_graph(
+        self, analysis: ProjectAnalysis, payload: AnalyzeProjectInput
+    ) -> StageGraph:
+        """Monta o DAG: BIM e imagem em paralelo, comparação ao final."""
+
+        async def compare(results: Mapping[str, object]) -> ComparisonResult:
+            return await self._ai_service.compare_results(
+                project_name=analysis.project_name,
+                bim_analysis=results[self.BIM_STAGE],
+                image_analysis=aggregate_image_analyses(results[self.IMAGE_STAGE]),
+                use_cache=not payload.bypass_cache,
+            )
+
+        return StageGraph(
+            [
+                Stage(
+                    self.BIM_STAGE,
+                    lambda _: self._perform_bim_analysis(analysis, payload),
+                ),
+                Stage(
+                    self.IMAGE_STAGE,
+                    lambda _: self._perform_image_analysis(analysis, payload),
+                ),
+                Stage(
+                    self.COMPARISON_STAGE,
+                    compare,
+                    depends_on=(self.BIM_STAGE, self.IMAGE_STAGE),
+                ),
+            ]
+        )
+
+    async def _start_analysis(self, payload: AnalyzeProjectInput) -> ProjectAnalysis:
+        analysis = await start_analysis(self._repository, payload)
+        if analysis is None:
+            raise AnalysisExecutionError("Análise não encontrada para execução")
+        return analysis
+
     async def _perform_bim_analysis(
         self, analysis: ProjectAnalysis, payload: AnalyzeProjectInput
     ) -> BimAnalysis:
+        """Analisa o modelo; havendo versão anterior concluída, só o que mudou vai à IA."""
+
+        previous = await self._repository.get_latest_completed(
+            analysis.project_name, exclude_id=analysis.id
+        )
+        if self._storage is not None and previous is not None and previous.bim_analysis:
+            # Sem o modelo anterior, o diff é pulado e o modelo vai inteiro à IA.
+            await self._storage.fetch([previous.bim_analysis.bim_source_uri], missing_ok=True)
         return await self._ai_service.analyze_bim(
             bim_source=payload.bim_file_path,
             project_context=payload.context,
+            use_cache=not payload.bypass_cache,
+            previous=previous.bim_analysis if previous is not None else None,
         )
 
     async def _perform_image_analysis(
         self, analysis: ProjectAnalysis, payload: AnalyzeProjectInput
-    ) -> ImageAnalysis:
-        return await self._ai_service.analyze_image(
-            image_source=payload.image_file_paths[0],
-            project_context=payload.context,
+    ) -> list[ImageAnalysis]:
+        """Analisa todas as imagens com concorrência limitada.
+
+        Falhas individuais viram uma `ImageAnalysis` com status `FAILED`; a
+        etapa só falha se nenhuma imagem puder ser analisada.
+        """
+
+        semaphore = asyncio.Semaphore(self._image_concurrency)
+
+        async def analyze(image_path: str) -> ImageAnalysis:
+            async with semaphore:
+                try:
+                    return await self._ai_service.analyze_image(
+                        image_source=image_path,
+                        project_context=payload.context,
+                        use_cache=not payload.bypass_cache,
+                    )
+                except Exception as exc:
+                    logger.warning("Falha ao analisar imagem %s: %s", image_path, exc)
+                    return ImageAnalysis(
+                        image_source_uri=image_path,
+                        status=AnalysisStatus.FAILED,
+                        raw_output=str(exc),
+                    )
+
+        results = await asyncio.gather(*(analyze(path) for path in payload.image_file_paths))
+        if all(item.status is AnalysisStatus.FAILED for item in results):
+            raise AnalysisExecutionError("Nenhuma imagem pôde ser analisada")
+        return list(results)
+
+
+async def start_analysis(
+    repository: ProjectAnalysisRepository, payload: AnalyzeProjectInput
+) -> ProjectAnalysis | None:
+    """Cria a análise ou retoma uma já registrada como pendente na fila.
+
+    Retorna `None` quando a análise indicada em `payload.analysis_id` não existe.
+    """
+
+    if payload.analysis_id is None:
+        analysis = ProjectAnalysis(
+            project_name=payload.project_name,
+            requested_by=payload.requested_by,
+            bim_source_uri=payload.bim_file_path,
+            image_source_uri=payload.image_file_paths[0],
+            status=AnalysisStatus.RUNNING,
         )
+        return await repository.create(analysis)
+
+    analysis = await repository.get_by_id(payload.analysis_id)
+    if analysis is None:
+        return None
+    analysis.mark_running()
+    return await repository.update(analysis)
+
+
+async def fail_analysis(
+    repository: ProjectAnalysisRepository,
+    analysis: ProjectAnalysis,
+    payload: AnalyzeProjectInput,
+    reason: str,
+) -> None:
+    """Grava a falha; se o job ainda tiver tentativas, a análise volta a `PENDING`.
+
+    Assim quem consulta a análise não vê `FAILED` seguido de `RUNNING`.
+    """
+
+    if payload.final_attempt:
+        analysis.mark_failed(reason)
+    else:
+        analysis.mark_pending()
+    await repository.update(analysis)
 
-    @staticmethod
-    def _compose_summary_message(
-        *,
-        bim_analysis: BimAnalysis,
-        image_analysis: ImageAnalysis,
-        comparison: ComparisonResult,
-    ) -> str:
-        segments: list[str] = []
 
-        if bim_analysis.summary:
-            segments.append(f"BIM: {bim_analysis.summary}")
+def compose_summary_message(
+    *,
+    bim_analysis: BimAnalysis,
+    image_analysis: ImageAnalysis | None,
+    comparison: ComparisonResult,
+) -> str:
+    segments: list[str] = []
 
-        if image_analysis.summary:
-            segments.append(f"Imagem: {image_analysis.summary}")
+    if bim_analysis.summary:
+        segments.append(f"BIM: {bim_analysis.summary}")
 
-        comparison_summary = getattr(comparison, "summary", None)
-        if comparison_summary:
-            segments.append(f"Comparação: {comparison_summary}")
+    if image_analysis and image_analysis.summary:
+        segments.append(f"Imagem: {image_analysis.summary}")
 
-        return " | ".join(segments)
+    comparison_summary = getattr(comparison, "summary", None)
+    if comparison_summary:
+        segments.append(f"Comparação: {comparison_summary}")
 
+    return " | ".join(segments)
@@ -0,0 +1,257 @@
+"""Caso de uso para executar várias análises pela Batch API, sem latência interativa."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+from uuid import UUID
+
+from app.domain.entities import (
+    AnalysisStatus,
+    BimAnalysis,
+    ImageAnalysis,
+    ProjectAnalysis,
+    aggregate_image_analyses,
+)
+from app.domain.repositories import ProjectAnalysisRepository
+from app.infrastructure import (
+    BatchRequest,
+    BatchResult,
+    FileStorage,
+    ImagePreprocessingError,
+    OpenAIService,
+    OpenAIServiceError,
+)
+from app.use_cases.analyze_project import (
+    AnalyzeProjectInput,
+    AnalyzeProjectUseCase,
+    compose_summary_message,
+    fail_analysis,
+    start_analysis,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class BatchOutcome:
+    analysis_id: UUID
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+@dataclass(slots=True)
+class _PendingAnalysis:
+    analysis: ProjectAnalysis
+    payload: AnalyzeProjectInput
+    bim_id: str = ""
+    image_ids: list[str] = field(default_factory=list)
+    skipped: dict[str, BatchResult] = field(default_factory=dict)
+    bim_result: BimAnalysis | None = None
+    image_results: list[ImageAnalysis] | None = None
+    comparison_id: str | None = None
+
+
+class BatchAnalyzeProjectsUseCase:
+    """Analisa projetos em dois lotes: BIM + imagens e, em seguida, as comparações.
+
+    A comparação depende dos resumos da primeira etapa, por isso não cabe no
+    mesmo lote. Falhas são isoladas por análise; o resultado informa quais
+    concluíram para que o chamador finalize os jobs correspondentes.
+    """
+
+    def __init__(
+        self,
+        *,
+        repository: ProjectAnalysisRepository,
+        ai_service: OpenAIService,
+        storage: FileStorage | None = None,
+    ) -> None:
+        self._repository = repository
+        self._ai_service = ai_service
+        self._storage = storage
+
+    async def execute(
+        self,
+        payloads: Sequence[AnalyzeProjectInput],
+        *,
+        on_poll: Callable[[], Awaitable[None]] | None = None,
+    ) -> list[BatchOutcome]:
+        outcomes: dict[UUID, BatchOutcome] = {}
+        pending: list[_PendingAnalysis] = []
+        order: list[UUID] = []
+        for payload in payloads:
+            analysis = await start_analysis(self._repository, payload)
+            if analysis is None:
+                order.append(payload.analysis_id)
+                outcomes[payload.analysis_id] = BatchOutcome(
+                    payload.analysis_id, error="Análise não encontrada para execução"
+                )
+                continue
+            order.append(analysis.id)
+            pending.append(_PendingAnalysis(analysis=analysis, payload=payload))
+
+        try:
+            if self._storage is not None:
+                # Ausentes falham como no disco local, ao montar os pedidos do lote.
+                await self._storage.fetch(
+                    [
+                        path
+                        for item in pending
+                        for path in (item.payload.bim_file_path, *item.payload.image_file_paths)
+                    ],
+                    missing_ok=True,
+                )
+            started = time.monotonic()
+            results = await self._ai_service.run_batch(
+                await self._extraction_requests(pending),
+                metadata={"stage": "extraction"},
+                on_poll=on_poll,
+            )
+            extraction_ms = (time.monotonic() - started) * 1000
+            comparable = [
+                item
+                for item in pending
+                if await self._apply_extraction(item, results, extraction_ms, outcomes)
+            ]
+
+            started = time.monotonic()
+            results = await self._ai_service.run_batch(
+                await self._comparison_requests(comparable),
+                metadata={"stage": "comparison"},
+                on_poll=on_poll,
+            )
+            comparison_ms = (time.monotonic() - started) * 1000
+            for item in comparable:
+                await self._apply_comparison(item, results, comparison_ms, outcomes)
+        except Exception as exc:
+            logger.exception("Falha ao executar lote de análises")
+            for item in pending:
+                if item.analysis.id not in outcomes:
+                    await self._fail(item, f"Falha no lote: {exc}", outcomes)
+
+        return [
+            outcomes.get(analysis_id)
+            or BatchOutcome(analysis_id, error="Análise sem resultado no lote")
+            for analysis_id in order
+        ]
+
+    async def _extraction_requests(
+        self, pending: Sequence[_PendingAnalysis]
+    ) -> list[BatchRequest]:
+        requests: list[BatchRequest] = []
+        for item in pending:
+            key = str(item.analysis.id)
+            context = item.payload.context
+            bim_request = await self._ai_service.bim_batch_request(
+                key, bim_source=item.payload.bim_file_path, project_context=context
+            )
+            item.bim_id = bim_request.custom_id
+            requests.append(bim_request)
+            for position, image_path in enumerate(item.payload.image_file_paths):
+                try:
+                    image_request = await self._ai_service.image_batch_request(
+                        f"{key}:{position}", image_source=image_path, project_context=context
+                    )
+                except ImagePreprocessingError as exc:
+                    custom_id = f"{OpenAIService.BATCH_IMAGE}:{key}:{position}"
+                    item.image_ids.append(custom_id)
+                    item.skipped[custom_id] = BatchResult(custom_id, error=str(exc))
+                    continue
+                item.image_ids.append(image_request.custom_id)
+                requests.append(image_request)
+        return requests
+
+    async def _comparison_requests(
+        self, comparable: Sequence[_PendingAnalysis]
+    ) -> list[BatchRequest]:
+        requests: list[BatchRequest] = []
+        for item in comparable:
+            request = await self._ai_service.comparison_batch_request(
+                str(item.analysis.id),
+                project_name=item.analysis.project_name,
+                bim_analysis=item.bim_result,
+                image_analysis=aggregate_image_analyses(item.image_results),
+            )
+            item.comparison_id = request.custom_id
+            requests.append(request)
+        return requests
+
+    async def _apply_extraction(
+        self,
+        item: _PendingAnalysis,
+        results: dict[str, BatchResult],
+        elapsed_ms: float,
+        outcomes: dict[UUID, BatchOutcome],
+    ) -> bool:
+        item.analysis.stage_timings_ms = {
+            AnalyzeProjectUseCase.BIM_STAGE: elapsed_ms,
+            AnalyzeProjectUseCase.IMAGE_STAGE: elapsed_ms,
+        }
+        try:
+            item.bim_result = self._ai_service.bim_from_batch(
+                results[item.bim_id], source_uri=item.payload.bim_file_path
+            )
+        except OpenAIServiceError as exc:
+            await self._fail(item, f"Análise BIM falhou no lote: {exc}", outcomes)
+            return False
+
+        images: list[ImageAnalysis] = []
+        for custom_id, image_path in zip(item.image_ids, item.payload.image_file_paths):
+            try:
+                images.append(
+                    self._ai_service.image_from_batch(
+                        item.skipped.get(custom_id) or results[custom_id], source_uri=image_path
+                    )
+                )
+            except OpenAIServiceError as exc:
+                logger.warning("Falha ao analisar imagem %s no lote: %s", image_path, exc)
+                images.append(
+                    ImageAnalysis(
+                        image_source_uri=image_path,
+                        status=AnalysisStatus.FAILED,
+                        raw_output=str(exc),
+                    )
+                )
+        if all(image.status is AnalysisStatus.FAILED for image in images):
+            await self._fail(item, "Nenhuma imagem pôde ser analisada", outcomes)
+            return False
+        item.image_results = images
+        return True
+
+    async def _apply_comparison(
+        self,
+        item: _PendingAnalysis,
+        results: dict[str, BatchResult],
+        elapsed_ms: float,
+        outcomes: dict[UUID, BatchOutcome],
+    ) -> None:
+        analysis = item.analysis
+        analysis.stage_timings_ms[AnalyzeProjectUseCase.COMPARISON_STAGE] = elapsed_ms
+        try:
+            comparison = self._ai_service.comparison_from_batch(results[item.comparison_id])
+        except OpenAIServiceError as exc:
+            await self._fail(item, f"Comparação falhou no lote: {exc}", outcomes)
+            return
+
+        analysis.mark_completed(item.bim_result, item.image_results, comparison)
+        analysis.notes = compose_summary_message(
+            bim_analysis=item.bim_result,
+            image_analysis=analysis.image_analysis,
+            comparison=comparison,
+        )
+        await self._repository.update(analysis)
+        outcomes[analysis.id] = BatchOutcome(analysis.id)
+
+    async def _fail(
+        self, item: _PendingAnalysis, reason: str, outcomes: dict[UUID, BatchOutcome]
+    ) -> None:
+        await fail_analysis(self._repository, item.analysis, item.payload, reason)
+        outcomes[item.analysis.id] = BatchOutcome(item.analysis.id, error=reason)
@@ -8,3 +8,38 @@ class UseCaseError(Exception):
 class AnalysisExecutionError(UseCaseError):
     """Falha ao executar fluxos de análise."""
 
+
+class InvalidCursorError(UseCaseError):
+    """Cursor de paginação ilegível ou adulterado."""
+
+
+class IfcAggregatesUnavailableError(UseCaseError):
+    """Modelo IFC sem colunas para agregação (arquivo ilegível ou NumPy ausente)."""
+
+
+class IfcSpatialIndexUnavailableError(UseCaseError):
+    """Modelo IFC sem índice espacial (colunas indisponíveis)."""
+
+
+class IfcElementNotFoundError(UseCaseError):
+    """Elemento inexistente no modelo ou sem caixa envolvente."""
+
+
+class UploadSessionExpiredError(UseCaseError):
+    """Envio retomável com validade vencida; é preciso começar outro."""
+
+
+class UploadIncompleteError(UseCaseError):
+    """Envio ainda sem todos os bytes (ou não finalizado) para a operação pedida."""
+
+
+class UploadChecksumMismatchError(UseCaseError):
+    """sha256 do arquivo completo diferente do informado ao abrir o envio."""
+
+
+class UploadOffsetMismatchError(UseCaseError):
+    """Parte enviada para um offset diferente do já recebido."""
+
+    def __init__(self, offset: int) -> None:
+        super().__init__(f"Offset esperado: {offset}")
+        self.offset = offset
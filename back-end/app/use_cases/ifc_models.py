@@ -0,0 +1,305 @@
+"""Casos de uso para registrar modelos IFC, importar e consultar seus elementos."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import UUID
+
+from app.domain.entities import (
+    FileBlob,
+    IfcAggregate,
+    IfcElement,
+    IfcElementBox,
+    IfcElementPage,
+    IfcLocation,
+    IfcModel,
+)
+from app.domain.repositories import FileBlobRepository, IfcModelRepository
+from app.infrastructure.services.ifc_inventory import IfcInventoryService
+from app.infrastructure.services.ifc_parser import (
+    DISPLAY_NAMES,
+    IfcParseError,
+    iter_element_batches,
+    locate_data_section,
+)
+from app.infrastructure.services.ifc_spatial import IfcSpatialIndex
+from app.infrastructure.services.storage import FileStorage
+from app.use_cases.exceptions import (
+    IfcAggregatesUnavailableError,
+    IfcElementNotFoundError,
+    IfcSpatialIndexUnavailableError,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class RegisterIfcModelInput:
+    project_id: str
+    file_path: str
+    blob: FileBlob | None = None
+
+
+class RegisterIfcModelUseCase:
+    """Registra o arquivo enviado como modelo `processing` do projeto.
+
+    Com `blob_repository`, o modelo passa a referenciar o blob do arquivo.
+    """
+
+    def __init__(
+        self,
+        repository: IfcModelRepository,
+        blob_repository: FileBlobRepository | None = None,
+    ) -> None:
+        self._repository = repository
+        self._blob_repository = blob_repository
+
+    async def execute(self, payload: RegisterIfcModelInput) -> IfcModel:
+        if self._blob_repository is not None and payload.blob is not None:
+            await self._blob_repository.acquire([payload.blob])
+        try:
+            return await self._repository.create(
+                IfcModel(project_id=payload.project_id, source_uri=payload.file_path)
+            )
+        except Exception:
+            if self._blob_repository is not None and payload.blob is not None:
+                await self._blob_repository.release([payload.blob.sha256])
+            raise
+
+
+class ImportIfcElementsUseCase:
+    """Lê os elementos do arquivo em streaming e grava em lotes de `chunk_size` linhas.
+
+    A leitura roda em thread, um lote por vez: a memória fica limitada ao lote
+    atual mesmo em modelos com milhões de elementos. Com `inventory`, as colunas
+    para agregações e o índice espacial também são montados ao final.
+    """
+
+    def __init__(
+        self,
+        repository: IfcModelRepository,
+        *,
+        chunk_size: int = 1000,
+        inventory: IfcInventoryService | None = None,
+        storage: FileStorage | None = None,
+    ) -> None:
+        self._repository = repository
+        self._chunk_size = chunk_size
+        self._inventory = inventory
+        self._storage = storage
+
+    async def execute(self, model_id: UUID) -> IfcModel | None:
+        model = await self._repository.get_by_id(model_id)
+        if model is None:
+            return None
+
+        started = time.perf_counter()
+        path = Path(model.source_uri)
+        count = 0
+        try:
+            if self._storage is not None:
+                await self._storage.fetch([path])
+            section = await asyncio.to_thread(locate_data_section, path)
+            batches = iter_element_batches(path, self._chunk_size)
+            while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+                await self._repository.add_elements(
+                    [
+                        IfcElement(
+                            model_id=model.id,
+                            step_id=record.step_id,
+                            ifc_type=record.ifc_type,
+                            global_id=record.global_id,
+                            name=record.name,
+                            tag=record.tag,
+                        )
+                        for record in batch
+                    ]
+                )
+                count += len(batch)
+        except (OSError, IfcParseError) as exc:
+            logger.warning("Falha ao importar modelo IFC %s: %s", model.id, exc)
+            return await self._fail(model, str(exc))
+        except Exception:
+            # Erro ao gravar um lote: sem limpar, o modelo ficaria em `processing`
+            # com só parte dos elementos.
+            logger.exception("Falha ao gravar os elementos do modelo IFC %s", model.id)
+            return await self._fail(model, "Falha ao gravar os elementos do modelo")
+
+        model.mark_ready(ifc_schema=section.schema, elements_count=count)
+        logger.info(
+            "Modelo IFC %s importado: %s elementos em %.2fs",
+            model.id,
+            count,
+            time.perf_counter() - started,
+        )
+        model = await self._repository.update(model)
+        if self._inventory is not None:
+            await self._inventory.spatial(model.source_uri)
+        return model
+
+    async def _fail(self, model: IfcModel, error: str) -> IfcModel:
+        await self._repository.delete_elements(model.id)
+        model.mark_failed(error)
+        return await self._repository.update(model)
+
+
+class GetProjectIfcUseCase:
+    def __init__(self, repository: IfcModelRepository) -> None:
+        self._repository = repository
+
+    async def execute(self, project_id: str) -> IfcModel | None:
+        return await self._repository.get_latest_for_project(project_id)
+
+
+@dataclass(slots=True)
+class ListIfcElementsInput:
+    model_id: UUID
+    ifc_type: str | None = None
+    after: int | None = None
+    limit: int = 500
+
+
+class ListIfcElementsUseCase:
+    def __init__(self, repository: IfcModelRepository) -> None:
+        self._repository = repository
+
+    async def execute(self, payload: ListIfcElementsInput) -> IfcElementPage | None:
+        if await self._repository.get_by_id(payload.model_id) is None:
+            return None
+        ifc_type = payload.ifc_type
+        if ifc_type is not None:
+            ifc_type = DISPLAY_NAMES.get(ifc_type.upper(), ifc_type)
+        return await self._repository.list_elements(
+            payload.model_id,
+            ifc_type=ifc_type,
+            after=payload.after,
+            limit=payload.limit,
+        )
+
+
+@dataclass(slots=True)
+class AggregateIfcElementsInput:
+    model_id: UUID
+    by: tuple[str, ...] = ("type",)
+    measure: str = "count"
+    ifc_type: str | None = None
+
+
+class AggregateIfcElementsUseCase:
+    """Agrega os elementos pelas colunas em cache, sem reler o arquivo IFC."""
+
+    def __init__(
+        self,
+        repository: IfcModelRepository,
+        inventory: IfcInventoryService,
+        *,
+        storage: FileStorage | None = None,
+    ) -> None:
+        self._repository = repository
+        self._inventory = inventory
+        self._storage = storage
+
+    async def execute(self, payload: AggregateIfcElementsInput) -> list[IfcAggregate] | None:
+        model = await self._repository.get_by_id(payload.model_id)
+        if model is None:
+            return None
+        if self._storage is not None:
+            # O cache das colunas é chaveado pelo hash, calculado sobre a cópia local.
+            await self._storage.fetch([model.source_uri], missing_ok=True)
+        columns = await self._inventory.columns(model.source_uri)
+        if columns is None:
+            raise IfcAggregatesUnavailableError("Agregados indisponíveis para este modelo")
+        return columns.aggregate(
+            by=payload.by, measure=payload.measure, ifc_type=payload.ifc_type
+        )
+
+
+@dataclass(slots=True)
+class QueryIfcRegionInput:
+    model_id: UUID
+    minimum: tuple[float, float, float]
+    maximum: tuple[float, float, float]
+    ifc_type: str | None = None
+    limit: int = 500
+
+
+@dataclass(slots=True)
+class ListNearbyIfcElementsInput:
+    model_id: UUID
+    step_id: int
+    radius: float = 1.0
+    ifc_type: str | None = None
+    limit: int = 500
+
+
+@dataclass(slots=True)
+class ResolveIfcLocationInput:
+    model_id: UUID
+    hint: str
+    limit: int = 200
+
+
+class _SpatialUseCase:
+    def __init__(
+        self,
+        repository: IfcModelRepository,
+        inventory: IfcInventoryService,
+        *,
+        storage: FileStorage | None = None,
+    ) -> None:
+        self._repository = repository
+        self._inventory = inventory
+        self._storage = storage
+
+    async def _index(self, model_id: UUID) -> IfcSpatialIndex | None:
+        model = await self._repository.get_by_id(model_id)
+        if model is None:
+            return None
+        if self._storage is not None:
+            await self._storage.fetch([model.source_uri], missing_ok=True)
+        index = await self._inventory.spatial(model.source_uri)
+        if index is None:
+            raise IfcSpatialIndexUnavailableError("Índice espacial indisponível para este modelo")
+        return index
+
+
+class QueryIfcRegionUseCase(_SpatialUseCase):
+    """Elementos cujas caixas envolventes cruzam a região informada."""
+
+    async def execute(self, payload: QueryIfcRegionInput) -> list[IfcElementBox] | None:
+        index = await self._index(payload.model_id)
+        if index is None:
+            return None
+        return index.query_box(
+            payload.minimum, payload.maximum, ifc_type=payload.ifc_type, limit=payload.limit
+        )
+
+
+class ListNearbyIfcElementsUseCase(_SpatialUseCase):
+    """Elementos próximos de um elemento, do mais perto ao mais longe."""
+
+    async def execute(self, payload: ListNearbyIfcElementsInput) -> list[IfcElementBox] | None:
+        index = await self._index(payload.model_id)
+        if index is None:
+            return None
+        elements = index.near(
+            payload.step_id, payload.radius, ifc_type=payload.ifc_type, limit=payload.limit
+        )
+        if elements is None:
+            raise IfcElementNotFoundError(f"Elemento #{payload.step_id} sem caixa envolvente")
+        return elements
+
+
+class ResolveIfcLocationUseCase(_SpatialUseCase):
+    """Liga um `location_hint` em texto livre aos pavimentos, espaços e elementos do modelo."""
+
+    async def execute(self, payload: ResolveIfcLocationInput) -> IfcLocation | None:
+        index = await self._index(payload.model_id)
+        if index is None:
+            return None
+        return index.resolve(payload.hint, limit=payload.limit)
@@ -3,11 +3,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Sequence
+from datetime import datetime, timezone
 from uuid import UUID
 
-from app.domain.entities import ProjectAnalysis
+from app.domain.entities import (
+    AnalysisCursor,
+    AnalysisListFilter,
+    AnalysisStatus,
+    ProjectAnalysis,
+    ProjectAnalysisPage,
+)
 from app.domain.repositories import ProjectAnalysisRepository
+from app.use_cases.exceptions import InvalidCursorError
 
 
 @dataclass(slots=True)
@@ -26,12 +33,40 @@ class GetAnalysisUseCase:
 @dataclass(slots=True)
 class ListAnalysesInput:
     limit: int = 20
+    cursor: str | None = None
+    status: AnalysisStatus | None = None
+    project_name: str | None = None
+    requested_by: str | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
 
 
 class ListAnalysesUseCase:
     def __init__(self, repository: ProjectAnalysisRepository) -> None:
         self._repository = repository
 
-    async def execute(self, payload: ListAnalysesInput) -> Sequence[ProjectAnalysis]:
-        return await self._repository.list_recent(limit=payload.limit)
+    async def execute(self, payload: ListAnalysesInput) -> ProjectAnalysisPage:
+        try:
+            after = AnalysisCursor.decode(payload.cursor) if payload.cursor else None
+        except ValueError as exc:
+            raise InvalidCursorError("Cursor de paginação inválido") from exc
+        return await self._repository.list_recent(
+            limit=payload.limit,
+            filters=AnalysisListFilter(
+                status=payload.status,
+                project_name=payload.project_name,
+                requested_by=payload.requested_by,
+                created_from=_as_utc(payload.created_from),
+                created_to=_as_utc(payload.created_to),
+            ),
+            after=after,
+        )
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    """Datas com fuso convertidas para UTC, o fuso em que `created_at` é gravado."""
+
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc)
 
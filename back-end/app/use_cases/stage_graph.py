@@ -0,0 +1,113 @@
+"""Executor mínimo de etapas assíncronas organizadas como um DAG."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from app.use_cases.exceptions import UseCaseError
+
+
+StageRunner = Callable[[Mapping[str, Any]], Awaitable[Any]]
+
+
+class StageGraphError(UseCaseError):
+    """Definição inválida do grafo de etapas (ciclo ou dependência ausente)."""
+
+
+class StageExecutionError(UseCaseError):
+    """Falha em uma etapa; as demais etapas em execução são canceladas."""
+
+    def __init__(self, stage: str, error: BaseException) -> None:
+        super().__init__(f"Etapa '{stage}' falhou: {error}")
+        self.stage = stage
+
+
+@dataclass(frozen=True, slots=True)
+class Stage:
+    """Etapa do grafo.
+
+    `run` recebe um mapeamento com os resultados das etapas listadas em
+    `depends_on`, indexados pelo nome da etapa.
+    """
+
+    name: str
+    run: StageRunner
+    depends_on: tuple[str, ...] = ()
+
+
+class StageGraph:
+    """Executa etapas independentes em paralelo respeitando as dependências."""
+
+    def __init__(self, stages: Sequence[Stage]) -> None:
+        self._stages = self._topological_order(stages)
+        self.timings_ms: dict[str, float] = {}
+
+    async def run(self) -> dict[str, Any]:
+        """Executa o grafo e devolve os resultados indexados pelo nome da etapa."""
+
+        self.timings_ms = {}
+        tasks: dict[str, asyncio.Task[Any]] = {}
+
+        async def run_stage(stage: Stage) -> Any:
+            inputs = {name: await tasks[name] for name in stage.depends_on}
+            started = time.perf_counter()
+            try:
+                return await stage.run(inputs)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                raise StageExecutionError(stage.name, exc) from exc
+            finally:
+                self.timings_ms[stage.name] = (time.perf_counter() - started) * 1000
+
+        for stage in self._stages:
+            tasks[stage.name] = asyncio.create_task(run_stage(stage), name=f"stage:{stage.name}")
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        return {name: task.result() for name, task in tasks.items()}
+
+    @staticmethod
+    def _topological_order(stages: Sequence[Stage]) -> list[Stage]:
+        by_name: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in by_name:
+                raise StageGraphError(f"Etapa duplicada: {stage.name}")
+            by_name[stage.name] = stage
+
+        for stage in stages:
+            missing = [name for name in stage.depends_on if name not in by_name]
+            if missing:
+                raise StageGraphError(
+                    f"Etapa '{stage.name}' depende de etapas inexistentes: {', '.join(missing)}"
+                )
+
+        ordered: list[Stage] = []
+        visiting: set[str] = set()
+        visited: set[str] = set()
+
+        def visit(stage: Stage) -> None:
+            if stage.name in visited:
+                return
+            if stage.name in visiting:
+                raise StageGraphError(f"Ciclo detectado envolvendo a etapa '{stage.name}'")
+            visiting.add(stage.name)
+            for name in stage.depends_on:
+                visit(by_name[name])
+            visiting.discard(stage.name)
+            visited.add(stage.name)
+            ordered.append(stage)
+
+        for stage in stages:
+            visit(stage)
+        return ordered
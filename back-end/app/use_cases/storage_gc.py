@@ -0,0 +1,137 @@
+"""Caso de uso para remover do armazenamento os arquivos sem referência."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from app.domain.entities import UploadStatus
+from app.domain.repositories import FileBlobRepository, UploadSessionRepository
+from app.infrastructure.services.resumable_upload import staging_path
+from app.infrastructure.services.storage import FileStorage
+
+
+logger = logging.getLogger(__name__)
+
+_BATCH_SIZE = 500
+
+
+@dataclass(slots=True)
+class StorageGarbageReport:
+    blobs_removed: int = 0
+    run_directories_removed: int = 0
+    temporaries_removed: int = 0
+    upload_sessions_expired: int = 0
+    local_copies_evicted: int = 0
+    bytes_freed: int = 0
+
+
+class CollectStorageGarbageUseCase:
+    """Apaga blobs sem referência, temporários e diretórios de execução órfãos.
+
+    Só é removido o que está parado há mais de `grace`: envios em andamento
+    ainda não registraram as referências, e um blob reaproveitado tem o mtime
+    renovado, o que o tira da coleta. Com `upload_repository`, os envios
+    retomáveis vencidos também são apagados (e liberam os seus blobs). Com
+    armazenamento remoto, as cópias locais sem uso há mais de `grace` são
+    descartadas (o original continua no object store).
+    """
+
+    def __init__(
+        self,
+        *,
+        storage: FileStorage,
+        blob_repository: FileBlobRepository,
+        grace: timedelta,
+        upload_repository: UploadSessionRepository | None = None,
+    ) -> None:
+        self._storage = storage
+        self._blob_repository = blob_repository
+        self._grace = grace
+        self._upload_repository = upload_repository
+
+    async def execute(self) -> StorageGarbageReport:
+        now = datetime.now(timezone.utc)
+        cutoff = now - self._grace
+        older_than = cutoff.timestamp()
+        report = StorageGarbageReport()
+        if self._upload_repository is not None:
+            report.upload_sessions_expired = await self._expire_uploads(now)
+        report.temporaries_removed = await asyncio.to_thread(
+            self._storage.remove_stale_temporaries, older_than
+        )
+
+        candidates = await asyncio.to_thread(
+            lambda: list(self._storage.iter_blobs(older_than))
+        )
+        for start in range(0, len(candidates), _BATCH_SIZE):
+            batch = dict(candidates[start : start + _BATCH_SIZE])
+            removable = await self._blob_repository.claim_unreferenced(
+                list(batch), older_than=cutoff
+            )
+            for digest in removable:
+                freed = await asyncio.to_thread(
+                    self._storage.remove_blob, batch[digest], older_than
+                )
+                if freed:
+                    report.blobs_removed += 1
+                    report.bytes_freed += freed
+            # Só agora libera os registros: até aqui, um envio simultâneo do mesmo
+            # conteúdo espera a remoção (e `forget` mantém o que ele readquiriu).
+            await self._blob_repository.forget(sorted(removable))
+
+        report.local_copies_evicted = await asyncio.to_thread(
+            self._storage.evict_local_copies, older_than
+        )
+
+        directories = await asyncio.to_thread(
+            lambda: [str(path) for path in self._storage.iter_run_directories(older_than)]
+        )
+        referenced = await self._blob_repository.referenced_directories(directories)
+        for directory in directories:
+            if directory in referenced:
+                continue
+            report.bytes_freed += await asyncio.to_thread(
+                self._storage.remove_tree, Path(directory)
+            )
+            report.run_directories_removed += 1
+
+        if (
+            report.blobs_removed
+            or report.run_directories_removed
+            or report.temporaries_removed
+            or report.upload_sessions_expired
+            or report.local_copies_evicted
+        ):
+            logger.info(
+                "Coleta do armazenamento: %s blob(s), %s diretório(s), %s temporário(s) e "
+                "%s envio(s) expirado(s) removidos, %s cópia(s) local(is) descartada(s), "
+                "%.1f MB liberados",
+                report.blobs_removed,
+                report.run_directories_removed,
+                report.temporaries_removed,
+                report.upload_sessions_expired,
+                report.local_copies_evicted,
+                report.bytes_freed / 2**20,
+            )
+        return report
+
+    async def _expire_uploads(self, now: datetime) -> int:
+        expired = await self._upload_repository.list_expired(now)
+        for upload in expired:
+            if upload.status is UploadStatus.OPEN:
+                await asyncio.to_thread(
+                    staging_path(self._storage, upload.id).unlink, missing_ok=True
+                )
+        await self._blob_repository.release(
+            [
+                upload.sha256
+                for upload in expired
+                if upload.status is UploadStatus.COMPLETED and upload.sha256
+            ]
+        )
+        await self._upload_repository.delete([upload.id for upload in expired])
+        return len(expired)
@@ -0,0 +1,77 @@
+"""Caso de uso para enfileirar análises a serem processadas pelo worker."""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from app.domain.entities import AnalysisJob, AnalysisStatus, FileBlob, JobQueue, ProjectAnalysis
+from app.domain.repositories import AnalysisJobRepository, FileBlobRepository
+from app.use_cases.analyze_project import AnalyzeProjectInput
+from app.use_cases.exceptions import AnalysisExecutionError
+
+
+class SubmitAnalysisUseCase:
+    """Registra a análise como pendente e delega a execução à fila de jobs.
+
+    Análise e job são gravados na mesma transação pela fila.
+
+    Com `blob_repository`, a análise passa a referenciar os blobs enviados; as
+    referências são liberadas quando o job falha em definitivo.
+    """
+
+    def __init__(
+        self,
+        *,
+        job_repository: AnalysisJobRepository,
+        blob_repository: FileBlobRepository | None = None,
+        max_attempts: int = 3,
+    ) -> None:
+        self._job_repository = job_repository
+        self._blob_repository = blob_repository
+        self._max_attempts = max_attempts
+
+    async def execute(
+        self,
+        payload: AnalyzeProjectInput,
+        *,
+        queue: JobQueue = JobQueue.INTERACTIVE,
+        blobs: Sequence[FileBlob] = (),
+    ) -> ProjectAnalysis:
+        """Enfileira na fila interativa ou, para reinspeções sem urgência, na de lote."""
+
+        if not payload.image_file_paths:
+            raise AnalysisExecutionError("Nenhuma imagem fornecida para análise")
+
+        job_payload = payload.to_job_payload()
+        if self._blob_repository is not None and blobs:
+            # Referências antes da análise: uma falha no meio vaza uma referência,
+            # mas nunca deixa a análise apontando para um arquivo coletado.
+            await self._blob_repository.acquire(blobs)
+            job_payload["blob_digests"] = [blob.sha256 for blob in blobs]
+
+        analysis = ProjectAnalysis(
+            project_name=payload.project_name,
+            requested_by=payload.requested_by,
+            bim_source_uri=payload.bim_file_path,
+            image_source_uri=payload.image_file_paths[0],
+            status=AnalysisStatus.PENDING,
+        )
+        try:
+            await self._job_repository.enqueue(
+                AnalysisJob(
+                    analysis_id=analysis.id,
+                    payload=job_payload,
+                    queue=queue,
+                    max_attempts=self._max_attempts,
+                ),
+                analysis=analysis,
+            )
+        except Exception as exc:
+            await self._release(job_payload)
+            raise AnalysisExecutionError("Falha ao enfileirar análise") from exc
+
+        return analysis
+
+    async def _release(self, job_payload: dict) -> None:
+        if self._blob_repository is not None and job_payload.get("blob_digests"):
+            await self._blob_repository.release(job_payload["blob_digests"])
@@ -0,0 +1,229 @@
+"""Casos de uso dos envios retomáveis: abrir, enviar partes por offset e finalizar."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, Collection
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from uuid import UUID
+
+from app.domain.entities import FileBlob, UploadSession, UploadStatus
+from app.domain.repositories import FileBlobRepository, UploadSessionRepository
+from app.infrastructure.services.resumable_upload import StagingFile, staging_path
+from app.infrastructure.services.storage import (
+    FileStorage,
+    FileTooLargeError,
+    PackedFile,
+    UnsupportedFileTypeError,
+)
+from app.use_cases.exceptions import (
+    UploadChecksumMismatchError,
+    UploadIncompleteError,
+    UploadOffsetMismatchError,
+    UploadSessionExpiredError,
+)
+
+
+@dataclass(slots=True)
+class CreateUploadInput:
+    size: int
+    filename: str | None = None
+    checksum: str | None = None
+
+
+class CreateUploadUseCase:
+    """Abre um envio com validade de `ttl`, renovada a cada parte recebida."""
+
+    def __init__(
+        self,
+        repository: UploadSessionRepository,
+        *,
+        ttl: timedelta,
+        max_file_bytes: int | None = None,
+    ) -> None:
+        self._repository = repository
+        self._ttl = ttl
+        self._max_file_bytes = max_file_bytes
+
+    async def execute(self, payload: CreateUploadInput) -> UploadSession:
+        if self._max_file_bytes is not None and payload.size > self._max_file_bytes:
+            raise FileTooLargeError("Arquivo excede o limite de tamanho")
+        return await self._repository.create(
+            UploadSession(
+                size=payload.size,
+                filename=payload.filename,
+                checksum=payload.checksum.lower() if payload.checksum else None,
+                expires_at=_utcnow() + self._ttl,
+            )
+        )
+
+
+class GetUploadUseCase:
+    def __init__(self, repository: UploadSessionRepository) -> None:
+        self._repository = repository
+
+    async def execute(self, upload_id: UUID) -> UploadSession | None:
+        return await self._repository.get_by_id(upload_id)
+
+
+class GetCompletedUploadUseCase:
+    """Envio finalizado, dentro da validade e de um dos tipos aceitos, para uso em análises."""
+
+    def __init__(self, repository: UploadSessionRepository) -> None:
+        self._repository = repository
+
+    async def execute(
+        self, upload_id: UUID, *, kinds: Collection[str] | None = None
+    ) -> UploadSession | None:
+        upload = await self._repository.get_by_id(upload_id)
+        if upload is None:
+            return None
+        if upload.is_expired():
+            raise UploadSessionExpiredError("Envio expirado")
+        if upload.status is not UploadStatus.COMPLETED:
+            raise UploadIncompleteError("Envio ainda não finalizado")
+        if kinds is not None and upload.kind not in kinds:
+            raise UnsupportedFileTypeError(
+                f"Tipo de arquivo não aceito: {upload.kind or 'desconhecido'}"
+            )
+        return upload
+
+
+@dataclass(slots=True)
+class AppendUploadChunkInput:
+    upload_id: UUID
+    offset: int
+    sha256: str
+    stream: AsyncIterable[bytes]
+
+
+class AppendUploadChunkUseCase:
+    """Acrescenta uma parte ao arquivo parcial, conferindo offset e sha256 da parte.
+
+    O offset é relido sob o lock do arquivo parcial: duas requisições para o
+    mesmo offset não se sobrepõem, e a segunda recebe o offset atualizado.
+    """
+
+    def __init__(
+        self,
+        repository: UploadSessionRepository,
+        storage: FileStorage,
+        *,
+        ttl: timedelta,
+        max_chunk_bytes: int,
+    ) -> None:
+        self._repository = repository
+        self._storage = storage
+        self._ttl = ttl
+        self._max_chunk_bytes = max_chunk_bytes
+
+    async def execute(self, payload: AppendUploadChunkInput) -> UploadSession | None:
+        upload = await self._repository.get_by_id(payload.upload_id)
+        if upload is None:
+            return None
+        self._check(upload, payload.offset)
+
+        async with StagingFile(staging_path(self._storage, upload.id)) as staging:
+            upload = await self._repository.get_by_id(payload.upload_id)
+            if upload is None:
+                return None
+            self._check(upload, payload.offset)
+            received = await staging.append(
+                self._storage,
+                upload.offset,
+                payload.stream,
+                sha256=payload.sha256,
+                max_bytes=min(self._max_chunk_bytes, upload.size - upload.offset),
+            )
+            upload.advance(received, expires_at=_utcnow() + self._ttl)
+            return await self._repository.update(upload)
+
+    @staticmethod
+    def _check(upload: UploadSession, offset: int) -> None:
+        if upload.is_expired():
+            raise UploadSessionExpiredError("Envio expirado")
+        if upload.status is not UploadStatus.OPEN or offset != upload.offset:
+            raise UploadOffsetMismatchError(upload.offset)
+
+
+class FinalizeUploadUseCase:
+    """Confere o arquivo completo e o move para o armazenamento endereçado por conteúdo.
+
+    O envio passa a referenciar o blob até expirar; análises que o usam tomam
+    referências próprias. Finalizar de novo devolve o mesmo resultado.
+    """
+
+    def __init__(
+        self,
+        repository: UploadSessionRepository,
+        blob_repository: FileBlobRepository,
+        storage: FileStorage,
+        *,
+        kinds: Collection[str] | None = None,
+    ) -> None:
+        self._repository = repository
+        self._blob_repository = blob_repository
+        self._storage = storage
+        self._kinds = kinds
+
+    async def execute(self, upload_id: UUID) -> UploadSession | None:
+        upload = await self._repository.get_by_id(upload_id)
+        if upload is None or upload.status is UploadStatus.COMPLETED:
+            return upload
+        if upload.is_expired():
+            raise UploadSessionExpiredError("Envio expirado")
+        if not upload.is_complete:
+            raise UploadIncompleteError(f"Recebidos {upload.offset} de {upload.size} bytes")
+
+        path = staging_path(self._storage, upload.id)
+        async with StagingFile(path):
+            upload = await self._repository.get_by_id(upload_id)
+            if upload is None or upload.status is UploadStatus.COMPLETED:
+                return upload
+            # Hash e compressão (quando o tipo é comprimível) na mesma leitura.
+            packed = await self._storage.run_write(self._storage.pack_file, path)
+            try:
+                self._check(upload, packed)
+                # Referência antes do blob existir: a coleta nunca o vê sem dono.
+                await self._blob_repository.acquire(
+                    [FileBlob(packed.sha256, packed.size, packed.kind)]
+                )
+            except BaseException:
+                if packed.path != path:
+                    packed.path.unlink(missing_ok=True)
+                raise
+            try:
+                stored = await self._storage.run_write(
+                    partial(self._storage.commit_blob, compressed=packed.compressed),
+                    packed.path,
+                    packed.sha256,
+                    packed.size,
+                    packed.kind,
+                )
+                if packed.path != path:
+                    path.unlink(missing_ok=True)
+                upload.mark_completed(
+                    sha256=stored.sha256, kind=stored.kind, source_uri=stored.path
+                )
+                return await self._repository.update(upload)
+            except Exception:
+                # O envio não passou a referenciar o blob: a coleta pode removê-lo.
+                if packed.path != path:
+                    packed.path.unlink(missing_ok=True)
+                await self._blob_repository.release([packed.sha256])
+                raise
+
+    def _check(self, upload: UploadSession, packed: PackedFile) -> None:
+        if upload.checksum and packed.sha256 != upload.checksum:
+            raise UploadChecksumMismatchError(
+                "sha256 do arquivo recebido difere do informado; inicie outro envio"
+            )
+        if self._kinds is not None and packed.kind not in self._kinds:
+            raise UnsupportedFileTypeError(
+                f"Tipo de arquivo não aceito: {packed.kind or 'desconhecido'}"
+            )
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
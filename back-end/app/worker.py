@@ -0,0 +1,332 @@
+"""Processo consumidor da fila de análises (`python -m app.worker`)."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+from collections.abc import Callable
+from contextlib import suppress
+from datetime import timedelta
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import Settings, get_settings
+from app.domain.entities import AnalysisJob
+from app.infrastructure import (
+    OpenAIClientManager,
+    OpenAIService,
+    SQLAlchemyAnalysisJobRepository,
+    SQLAlchemyFileBlobRepository,
+    SQLAlchemyProjectAnalysisRepository,
+    SQLAlchemyUploadSessionRepository,
+    get_analysis_cache,
+    get_file_storage,
+    get_ifc_inventory_service,
+    get_image_preprocessor,
+    get_rate_limiter,
+    get_resilient_caller,
+)
+from app.infrastructure.db.session import SessionFactory, engine
+from app.infrastructure.services.telemetry import publish_snapshot, remove_snapshot
+from app.use_cases import (
+    AnalysisExecutionError,
+    AnalyzeProjectInput,
+    AnalyzeProjectUseCase,
+    CollectStorageGarbageUseCase,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisWorker:
+    """Reserva jobs da fila, executa as análises e mantém o lease ativo."""
+
+    def __init__(
+        self,
+        *,
+        settings: Settings | None = None,
+        session_factory: async_sessionmaker[AsyncSession] = SessionFactory,
+        ai_service_factory: Callable[[], OpenAIService] | None = None,
+        openai_clients: OpenAIClientManager | None = None,
+    ) -> None:
+        self._settings = settings or get_settings()
+        self._config = self._settings.worker
+        self._session_factory = session_factory
+        self._ai_service_factory = ai_service_factory or (
+            lambda: OpenAIService(
+                client=openai_clients.client if openai_clients else None,
+                settings=self._settings,
+                cache=get_analysis_cache(),
+                rate_limiter=get_rate_limiter(),
+                resilience=get_resilient_caller(),
+                image_preprocessor=get_image_preprocessor(),
+                ifc_inventory=get_ifc_inventory_service(),
+            )
+        )
+        self._worker_id = self._config.worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._openai_clients = openai_clients
+        self._stopping = asyncio.Event()
+        self._in_flight: dict[asyncio.Task[None], AnalysisJob] = {}
+        self._telemetry_dir = Path(self._config.telemetry_dir)
+        self._last_published = 0.0
+        self._last_collected = 0.0
+
+    @property
+    def worker_id(self) -> str:
+        return self._worker_id
+
+    def request_stop(self) -> None:
+        """Interrompe a reserva de novos jobs e inicia o drain."""
+
+        if not self._stopping.is_set():
+            logger.info("Worker %s iniciando desligamento gracioso", self._worker_id)
+            self._stopping.set()
+
+    async def run(self) -> None:
+        ai_service = self._ai_service_factory()
+        logger.info(
+            "Worker %s iniciado (concorrência=%s)", self._worker_id, self._config.concurrency
+        )
+        try:
+            while not self._stopping.is_set():
+                self._publish_telemetry()
+                await self._expire_exhausted_jobs()
+                await self._collect_storage_garbage()
+                claimed = False
+                while len(self._in_flight) < self._config.concurrency:
+                    job = await self._claim()
+                    if job is None:
+                        break
+                    claimed = True
+                    task = asyncio.create_task(self._process(job, ai_service))
+                    self._in_flight[task] = job
+                    task.add_done_callback(self._in_flight.pop)
+
+                if not claimed or len(self._in_flight) >= self._config.concurrency:
+                    await self._wait_for_capacity()
+        finally:
+            await self._drain()
+            with suppress(OSError):
+                remove_snapshot(self._telemetry_dir, self._worker_id)
+
+    def _publish_telemetry(self) -> None:
+        """Publica estado de circuitos, limitador e cache para `/health` e `/metrics`."""
+
+        now = time.monotonic()
+        if now - self._last_published < self._config.telemetry_interval:
+            return
+        self._last_published = now
+        cache = get_analysis_cache()
+        preprocessor = get_image_preprocessor()
+        ifc_inventory = get_ifc_inventory_service()
+        try:
+            publish_snapshot(
+                self._telemetry_dir,
+                self._worker_id,
+                {
+                    "in_flight_jobs": len(self._in_flight),
+                    "openai": get_resilient_caller().stats(),
+                    "rate_limiter": get_rate_limiter().stats(),
+                    "analysis_cache": cache.describe() if cache else None,
+                    "image_preprocessing": preprocessor.stats() if preprocessor else None,
+                    "ifc_inventory": ifc_inventory.stats() if ifc_inventory else None,
+                    "openai_http_pool": (
+                        self._openai_clients.stats() if self._openai_clients else None
+                    ),
+                },
+            )
+        except OSError as exc:  # pragma: no cover - erro de IO difícil de reproduzir
+            logger.warning("Falha ao publicar telemetria do worker: %s", exc)
+
+    async def _wait_for_capacity(self) -> None:
+        waiters: set[asyncio.Future] = {asyncio.ensure_future(self._stopping.wait())}
+        if len(self._in_flight) >= self._config.concurrency:
+            waiters.update(self._in_flight)
+        _, pending = await asyncio.wait(
+            waiters,
+            timeout=self._config.poll_interval,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        for waiter in pending:
+            if waiter not in self._in_flight:
+                waiter.cancel()
+
+    async def _drain(self) -> None:
+        if not self._in_flight:
+            return
+        logger.info(
+            "Aguardando %s job(s) em andamento (timeout=%ss)",
+            len(self._in_flight),
+            self._config.drain_timeout,
+        )
+        _, pending = await asyncio.wait(
+            set(self._in_flight), timeout=self._config.drain_timeout or None
+        )
+        for task in pending:
+            job = self._in_flight.get(task)
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+            if job is not None:
+                await self._with_jobs(
+                    lambda repo, job=job: repo.release(job.id, worker_id=self._worker_id)
+                )
+                logger.warning("Job %s devolvido à fila após timeout de drain", job.id)
+
+    async def _claim(self) -> AnalysisJob | None:
+        try:
+            return await self._with_jobs(
+                lambda repo: repo.claim_next(
+                    worker_id=self._worker_id, lease_seconds=self._config.lease_seconds
+                )
+            )
+        except Exception:  # pragma: no cover - banco indisponível
+            logger.exception("Falha ao reservar job da fila")
+            return None
+
+    async def _expire_exhausted_jobs(self) -> None:
+        try:
+            analysis_ids = await self._with_jobs(lambda repo: repo.fail_exhausted())
+        except Exception:  # pragma: no cover - banco indisponível
+            logger.exception("Falha ao expirar jobs sem tentativas restantes")
+            return
+
+        for analysis_id in analysis_ids:
+            async with self._session_factory() as session:
+                repository = SQLAlchemyProjectAnalysisRepository(session=session)
+                analysis = await repository.get_by_id(analysis_id)
+                if analysis is not None:
+                    analysis.mark_failed("Execução abandonada após expiração do lease")
+                    await repository.update(analysis)
+
+    async def _collect_storage_garbage(self) -> None:
+        """Remove blobs sem referência, uploads órfãos e envios vencidos a cada intervalo."""
+
+        interval = self._config.storage_gc_interval
+        now = time.monotonic()
+        if not interval or now - self._last_collected < interval:
+            return
+        self._last_collected = now
+        try:
+            async with self._session_factory() as session:
+                await CollectStorageGarbageUseCase(
+                    storage=get_file_storage(),
+                    blob_repository=SQLAlchemyFileBlobRepository(session=session),
+                    upload_repository=SQLAlchemyUploadSessionRepository(session=session),
+                    grace=timedelta(hours=self._settings.app.upload_gc_grace_hours),
+                ).execute()
+        except Exception:  # pragma: no cover - banco ou disco indisponível
+            logger.exception("Falha na coleta de lixo do armazenamento")
+
+    async def _process(self, job: AnalysisJob, ai_service: OpenAIService) -> None:
+        work = asyncio.create_task(self._execute(job, ai_service))
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            await asyncio.wait({work, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+            if not work.done():
+                # Lease perdido: outro worker pode reservar o job, e as duas execuções
+                # gravariam a mesma análise. O job já não é deste worker.
+                logger.warning("Job %s interrompido: lease perdido por este worker", job.id)
+                return
+            work.result()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            cause = exc.__cause__ if isinstance(exc, AnalysisExecutionError) else None
+            error = str(cause or exc)
+            logger.warning(
+                "Job %s falhou (tentativa %s/%s): %s",
+                job.id,
+                job.attempts,
+                job.max_attempts,
+                error,
+            )
+            await self._with_jobs(
+                lambda repo: repo.mark_failed(
+                    job.id, worker_id=self._worker_id, error=error, retry=job.can_retry
+                )
+            )
+        else:
+            await self._with_jobs(
+                lambda repo: repo.mark_completed(job.id, worker_id=self._worker_id)
+            )
+        finally:
+            work.cancel()
+            heartbeat.cancel()
+            await asyncio.gather(work, heartbeat, return_exceptions=True)
+
+    async def _execute(self, job: AnalysisJob, ai_service: OpenAIService) -> None:
+        async with self._session_factory() as session:
+            use_case = AnalyzeProjectUseCase(
+                repository=SQLAlchemyProjectAnalysisRepository(session=session),
+                ai_service=ai_service,
+                image_concurrency=self._settings.app.image_analysis_concurrency,
+                storage=get_file_storage(),
+            )
+            await use_case.execute(
+                AnalyzeProjectInput.from_job_payload(
+                    job.analysis_id, job.payload, final_attempt=not job.can_retry
+                )
+            )
+
+    async def _heartbeat(self, job: AnalysisJob) -> None:
+        """Renova o lease periodicamente; retorna quando outro worker assumiu o job."""
+
+        while True:
+            await asyncio.sleep(self._config.heartbeat_interval)
+            try:
+                renewed = await self._with_jobs(
+                    lambda repo: repo.renew_lease(
+                        job.id,
+                        worker_id=self._worker_id,
+                        lease_seconds=self._config.lease_seconds,
+                    )
+                )
+            except Exception:  # pragma: no cover - banco indisponível
+                logger.exception("Falha ao renovar lease do job %s", job.id)
+                continue
+            if not renewed:
+                return
+
+    async def _with_jobs(self, operation):
+        async with self._session_factory() as session:
+            return await operation(SQLAlchemyAnalysisJobRepository(session=session))
+
+
+async def _serve() -> None:
+    openai_clients = OpenAIClientManager(get_settings())
+    openai_clients.start()
+    worker = AnalysisWorker(openai_clients=openai_clients)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with suppress(NotImplementedError):
+            loop.add_signal_handler(sig, worker.request_stop)
+    try:
+        await worker.run()
+    finally:
+        preprocessor = get_image_preprocessor()
+        if preprocessor is not None:
+            preprocessor.close()
+        ifc_inventory = get_ifc_inventory_service()
+        if ifc_inventory is not None:
+            ifc_inventory.close()
+        get_file_storage().close()
+        await openai_clients.aclose()
+        await engine.dispose()
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    asyncio.run(_serve())
+
+
+if __name__ == "__main__":
+    main()
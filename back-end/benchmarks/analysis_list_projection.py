@@ -0,0 +1,204 @@
+"""Listagem de análises: agregados completos (caminho anterior) contra o modelo de leitura.
+
+O caminho anterior carrega `ProjectAnalysisModel` com as três etapas por
+`selectinload`, converte com `project_model_to_domain` e só então monta os
+itens; o atual lê as seis colunas da listagem em uma consulta. Para páginas de
+100 análises com etapas de tamanho realista, mede a latência até o JSON da
+resposta, o pico de memória alocada (`tracemalloc`) e as consultas ao banco.
+
+Uso:
+    python -m benchmarks.analysis_list_projection --analyses 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from app.domain.entities import AnalysisStatus
+from app.infrastructure.db import Base, models
+from app.infrastructure.db.mappers import project_model_to_domain
+from app.infrastructure.db.repositories.project_analysis import (
+    SQLAlchemyProjectAnalysisRepository,
+)
+from app.interfaces.http.schemas import (
+    ProjectAnalysisListItem,
+    ProjectAnalysisListResponse,
+)
+
+
+_BATCH = 500
+_START = datetime(2026, 1, 1)
+
+
+def _issues(rng: random.Random, count: int) -> list[dict]:
+    return [
+        {
+            "title": f"Divergência {index}",
+            "description": "Elemento executado fora da posição prevista no modelo. " * 4,
+            "severity": rng.choice(["low", "medium", "high"]),
+            "recommendation": "Conferir a locação em campo e atualizar o modelo.",
+        }
+        for index in range(count)
+    ]
+
+
+async def populate(engine: AsyncEngine, analyses: int) -> None:
+    rng = random.Random(5)
+    raw_output = "Resposta completa do modelo de IA com a análise detalhada. " * 100
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    for start in range(0, analyses, _BATCH):
+        async with factory() as session:
+            for index in range(start, min(start + _BATCH, analyses)):
+                analysis = models.ProjectAnalysisModel(
+                    project_name=f"Obra {index % 50}",
+                    requested_by="engenharia",
+                    bim_source_uri="storage/uploads/blobs/ab/modelo.ifc",
+                    image_source_uri="storage/uploads/blobs/cd/foto.jpg",
+                    status=AnalysisStatus.COMPLETED,
+                    created_at=_START + timedelta(minutes=index),
+                    updated_at=_START + timedelta(minutes=index),
+                )
+                analysis.bim_analysis = models.BimAnalysisModel(
+                    summary="Resumo do modelo BIM.",
+                    raw_output=raw_output,
+                    issues=_issues(rng, 10),
+                    status=AnalysisStatus.COMPLETED,
+                )
+                analysis.image_analyses = [
+                    models.ImageAnalysisModel(
+                        summary="Resumo da imagem.",
+                        raw_output=raw_output,
+                        source_uri=f"storage/uploads/blobs/cd/foto{position}.jpg",
+                        position=position,
+                        issues=_issues(rng, 5),
+                        status=AnalysisStatus.COMPLETED,
+                    )
+                    for position in range(3)
+                ]
+                analysis.comparison_result = models.ComparisonResultModel(
+                    summary="Comparação entre modelo e obra.",
+                    similarity_score=0.8,
+                    completion_percentage=60.0,
+                    mismatches=[f"Pendência {item}" for item in range(10)],
+                )
+                session.add(analysis)
+            await session.commit()
+
+
+async def aggregate_page(session, limit: int) -> str:
+    model = models.ProjectAnalysisModel
+    stmt = (
+        select(model)
+        .options(
+            selectinload(model.bim_analysis),
+            selectinload(model.image_analyses),
+            selectinload(model.comparison_result),
+        )
+        .order_by(model.created_at.desc(), model.id.desc())
+        .limit(limit + 1)
+    )
+    entities = [
+        project_model_to_domain(row)
+        for row in (await session.execute(stmt)).scalars().all()[:limit]
+    ]
+    items = [
+        ProjectAnalysisListItem(
+            id=entity.id,
+            project_name=entity.project_name,
+            status=entity.status,
+            requested_by=entity.requested_by,
+            created_at=entity.created_at,
+            updated_at=entity.updated_at,
+        )
+        for entity in entities
+    ]
+    return ProjectAnalysisListResponse(items=items).model_dump_json()
+
+
+async def projection_page(session, limit: int) -> str:
+    page = await SQLAlchemyProjectAnalysisRepository(session=session).list_recent(limit=limit)
+    return ProjectAnalysisListResponse.from_page(page).model_dump_json()
+
+
+async def measure(
+    engine: AsyncEngine, page: Callable[..., Awaitable[str]], limit: int, repeats: int
+) -> dict[str, float]:
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    statements = 0
+
+    def count(*_: object) -> None:
+        nonlocal statements
+        statements += 1
+
+    timings = []
+    peaks = []
+    for attempt in range(repeats + 1):
+        # Sessão nova por página, como em uma requisição: nada vem do identity map.
+        async with factory() as session:
+            tracemalloc.start()
+            started = time.perf_counter()
+            body = await page(session, limit)
+            elapsed = time.perf_counter() - started
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        if attempt:
+            timings.append(elapsed)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    async with factory() as session:
+        await page(session, limit)
+    event.remove(engine.sync_engine, "before_cursor_execute", count)
+    return {
+        "ms": statistics.median(timings) * 1000,
+        "peak_kb": max(peaks[1:]) / 1024,
+        "queries": statements,
+        "body_kb": len(body) / 1024,
+    }
+
+
+async def run(analyses: int, limit: int, repeats: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{Path(directory) / 'analises.db'}"
+        )
+        await populate(engine, analyses)
+        results = {
+            "agregados": await measure(engine, aggregate_page, limit, repeats),
+            "projeção": await measure(engine, projection_page, limit, repeats),
+        }
+        await engine.dispose()
+
+    print(f"{analyses} análises, páginas de {limit}")
+    for name, result in results.items():
+        print(
+            f"{name:>10}: {result['ms']:7.2f} ms, pico {result['peak_kb']:8.0f} KB, "
+            f"{result['queries']:.0f} consulta(s), resposta {result['body_kb']:.1f} KB"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--analyses", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.analyses, args.limit, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Latência da listagem de análises com muitas linhas, com e sem os índices compostos.
+
+Mede, pelo repositório, a primeira página, uma página no meio da tabela pelo
+cursor (comparada ao `OFFSET` equivalente) e páginas filtradas por status,
+projeto, solicitante e período. Depois apaga os índices da listagem e repete,
+o que reproduz o esquema anterior (`ORDER BY created_at` sem índice).
+
+Uso:
+    python -m benchmarks.analysis_listing --rows 1000000
+    python -m benchmarks.analysis_listing --database-url mysql+aiomysql://u:s@host/db
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.domain.entities import AnalysisCursor, AnalysisListFilter, AnalysisStatus
+from app.infrastructure.db import Base, models
+from app.infrastructure.db.repositories.project_analysis import (
+    SQLAlchemyProjectAnalysisRepository,
+)
+
+
+_BATCH = 20000
+_PAGE = 20
+_START = datetime(2024, 1, 1)
+_STATUSES = list(AnalysisStatus)
+
+
+async def populate(engine: AsyncEngine, rows: int) -> None:
+    rng = random.Random(11)
+    table = models.ProjectAnalysisModel.__table__
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    for start in range(0, rows, _BATCH):
+        async with engine.begin() as connection:
+            await connection.execute(
+                table.insert(),
+                [
+                    {
+                        "id": UUID(int=rng.getrandbits(128), version=4),
+                        "project_name": f"Obra {rng.randrange(1000)}",
+                        "requested_by": f"usuario{rng.randrange(50)}",
+                        "bim_source_uri": "storage/uploads/blobs/ab/modelo.ifc",
+                        "image_source_uri": "storage/uploads/blobs/cd/foto.jpg",
+                        "status": rng.choice(_STATUSES),
+                        # ~2 anos de histórico, com segundos repetidos entre linhas.
+                        "created_at": _START + timedelta(seconds=rng.randrange(63_000_000)),
+                        "updated_at": _START,
+                    }
+                    for _ in range(min(_BATCH, rows - start))
+                ],
+            )
+
+
+async def measure(call: Callable[[], Awaitable[object]], repeats: int) -> float:
+    await call()  # aquece o cache de páginas do banco e as instruções preparadas
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await call()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+async def run_scenarios(engine: AsyncEngine, rows: int, repeats: int) -> dict[str, float]:
+    model = models.ProjectAnalysisModel
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        repository = SQLAlchemyProjectAnalysisRepository(session=session)
+        middle = (
+            await session.execute(
+                select(model.created_at, model.id)
+                .order_by(model.created_at.desc(), model.id.desc())
+                .offset(rows // 2)
+                .limit(1)
+            )
+        ).one()
+        after = AnalysisCursor(created_at=middle.created_at, id=middle.id)
+
+        async def offset_page() -> None:
+            await session.execute(
+                select(model)
+                .order_by(model.created_at.desc(), model.id.desc())
+                .offset(rows // 2)
+                .limit(_PAGE)
+            )
+
+        def page(**options) -> Callable[[], Awaitable[object]]:
+            return lambda: repository.list_recent(limit=_PAGE, **options)
+
+        scenarios = {
+            "primeira página": page(),
+            "meio da tabela, cursor": page(after=after),
+            "meio da tabela, OFFSET": offset_page,
+            "status": page(filters=AnalysisListFilter(status=AnalysisStatus.FAILED)),
+            "projeto": page(filters=AnalysisListFilter(project_name="Obra 7")),
+            "solicitante + cursor": page(
+                filters=AnalysisListFilter(requested_by="usuario3"), after=after
+            ),
+            "período de 1 semana": page(
+                filters=AnalysisListFilter(
+                    created_from=_START + timedelta(days=300),
+                    created_to=_START + timedelta(days=307),
+                )
+            ),
+        }
+        return {name: await measure(call, repeats) for name, call in scenarios.items()}
+
+
+async def run(database_url: str | None, rows: int, repeats: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        url = database_url or f"sqlite+aiosqlite:///{Path(directory) / 'analises.db'}"
+        engine = create_async_engine(url)
+        started = time.perf_counter()
+        await populate(engine, rows)
+        print(f"{rows} linhas inseridas em {time.perf_counter() - started:.0f}s")
+
+        indexed = await run_scenarios(engine, rows, repeats)
+        async with engine.begin() as connection:
+            for index in models.ProjectAnalysisModel.__table__.indexes:
+                await connection.run_sync(lambda sync, index=index: index.drop(sync))
+            if engine.dialect.name == "sqlite":
+                await connection.execute(text("ANALYZE"))
+        plain = await run_scenarios(engine, rows, repeats)
+        await engine.dispose()
+
+    print(f"{'cenário':<24} {'com índices':>12} {'sem índices':>12}")
+    for name, value in indexed.items():
+        print(f"{name:<24} {value:>9.2f} ms {plain[name]:>9.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--database-url", help="Banco de teste (padrão: SQLite temporário)")
+    args = parser.parse_args()
+    asyncio.run(run(args.database_url, args.rows, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
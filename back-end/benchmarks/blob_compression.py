@@ -0,0 +1,105 @@
+"""Compara blobs IFC gravados sem compressão e com zstd em quadros (`blob_codec`).
+
+Para cada modo mede o espaço em disco, a gravação pelo `LocalFileStorage`, a
+leitura sequencial (bytes crus e pelo inventário IFC) e consultas aleatórias pelo
+índice de offsets (que, comprimido, descomprime só o quadro da entidade).
+
+Uso:
+    python -m benchmarks.blob_compression --size-mb 200
+    python -m benchmarks.blob_compression --file caminho/modelo.ifc --level 6
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import UploadFile
+
+from app.infrastructure.services.blob_codec import COMPRESSIBLE_KINDS, open_blob
+from app.infrastructure.services.ifc_index import build_entity_index, open_entity_index
+from app.infrastructure.services.ifc_parser import parse_ifc_inventory
+from app.infrastructure.services.storage import LocalFileStorage
+from benchmarks.ifc_parser import write_synthetic_ifc
+
+
+_LOOKUPS = 20000
+_READ_SIZE = 1024 * 1024
+
+
+def run_mode(source: Path, root: Path, *, compressed: bool, level: int) -> dict[str, float]:
+    storage = LocalFileStorage(
+        base_path=root,
+        compress_kinds=COMPRESSIBLE_KINDS if compressed else (),
+        compression_level=level,
+    )
+    size = source.stat().st_size
+    with source.open("rb") as handle:
+        started = time.perf_counter()
+        stored = asyncio.run(storage.save_upload_file(UploadFile(handle, filename=source.name)))
+        write_seconds = time.perf_counter() - started
+    path = Path(stored.path)
+
+    started = time.perf_counter()
+    with open_blob(path) as handle:
+        while handle.read(_READ_SIZE):
+            pass
+    read_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    parse_ifc_inventory(path)
+    scan_seconds = time.perf_counter() - started
+
+    build_entity_index(path, digest=stored.sha256)
+    with open_entity_index(path, digest=stored.sha256) as index:
+        ids = list(index.ids_of_type("IFCWALL"))
+        sample = random.Random(7).choices(ids, k=_LOOKUPS)
+        started = time.perf_counter()
+        for entity_id in sample:
+            index.raw(entity_id)
+        lookup_seconds = time.perf_counter() - started
+
+    return {
+        "disk_mb": path.stat().st_size / 1e6,
+        "write_mbps": size / 1e6 / write_seconds,
+        "read_mbps": size / 1e6 / read_seconds,
+        "scan_mbps": size / 1e6 / scan_seconds,
+        "lookup_us": lookup_seconds / _LOOKUPS * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--file", type=Path, help="Arquivo IFC existente (ignora --size-mb)")
+    parser.add_argument("--level", type=int, default=3, help="Nível do zstd")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = args.file
+        if source is None:
+            source = Path(directory) / "sintetico.ifc"
+            write_synthetic_ifc(source, size_mb=args.size_mb)
+        print(f"arquivo: {source.stat().st_size / 1e6:.0f} MB")
+        for compressed in (False, True):
+            result = run_mode(
+                source,
+                Path(directory) / ("zstd" if compressed else "raw"),
+                compressed=compressed,
+                level=args.level,
+            )
+            print(
+                f"{'zstd' if compressed else 'raw':>4}: disco {result['disk_mb']:8.1f} MB, "
+                f"gravação {result['write_mbps']:6.0f} MB/s, "
+                f"leitura {result['read_mbps']:6.0f} MB/s, "
+                f"inventário {result['scan_mbps']:5.0f} MB/s, "
+                f"índice {result['lookup_us']:6.1f} µs/entidade"
+            )
+
+
+if __name__ == "__main__":
+    main()
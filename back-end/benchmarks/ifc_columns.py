@@ -0,0 +1,59 @@
+"""Mede a extração das colunas IFC e o tempo das agregações vetorizadas.
+
+Uso:
+    python -m benchmarks.ifc_columns --size-mb 300
+    python -m benchmarks.ifc_columns --size-mb 300 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import tempfile
+import time
+from pathlib import Path
+
+from app.infrastructure.services.ifc_columns import IfcColumns, extract_columns
+from app.infrastructure.services.ifc_index import open_entity_index
+from benchmarks.ifc_parser import write_synthetic_ifc
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "modelo.ifc"
+        write_synthetic_ifc(path, size_mb=args.size_mb)
+
+        with path.open("rb") as handle:
+            digest = hashlib.file_digest(handle, "sha256").hexdigest()
+        started = time.perf_counter()
+        index = open_entity_index(path, digest=digest)
+        indexed = time.perf_counter() - started
+        columns = extract_columns(path, index, workers=args.workers)
+        index.close()
+        extracted = time.perf_counter() - started - indexed
+
+        columns.save(Path(directory) / "colunas")
+        started = time.perf_counter()
+        loaded = IfcColumns.load(Path(directory) / "colunas")
+        loaded_in = time.perf_counter() - started
+
+        started = time.perf_counter()
+        by_storey = loaded.aggregate(by=("storey",), measure="length")
+        loaded.aggregate(by=("type", "storey"), measure="count")
+        aggregated = time.perf_counter() - started
+
+    print(
+        f"{args.size_mb} MB, workers={args.workers}: índice em {indexed:.2f}s, "
+        f"colunas de {len(loaded.step_ids)} elementos em {extracted:.2f}s "
+        f"({args.size_mb / extracted:.1f} MB/s); leitura do cache em {loaded_in * 1000:.1f}ms, "
+        f"duas agregações em {aggregated * 1000:.1f}ms ({len(by_storey)} pavimentos)"
+    )
+
+
+if __name__ == "__main__":
+    main()
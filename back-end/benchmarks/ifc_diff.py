@@ -0,0 +1,66 @@
+"""Mede o diff entre duas versões de um modelo IFC sintético.
+
+Uso:
+    python -m benchmarks.ifc_diff --size-mb 300
+    python -m benchmarks.ifc_diff --size-mb 300 --every 500 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from app.infrastructure.services.ifc_diff import diff_fingerprints, fingerprint_elements
+from benchmarks.ifc_parser import write_synthetic_ifc
+
+
+def write_revision(source: Path, target: Path, *, every: int) -> int:
+    """Copia o modelo renomeando uma a cada `every` paredes; retorna quantas mudaram."""
+
+    changed = 0
+    walls = 0
+    with source.open("rb") as reader, target.open("wb", buffering=1024 * 1024) as writer:
+        for line in reader:
+            if b"=IFCWALL(" in line:
+                walls += 1
+                if walls % every == 0:
+                    line = line.replace(b"'Parede ", b"'Parede revisada ", 1)
+                    changed += 1
+            writer.write(line)
+    return changed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--every", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        before = Path(directory) / "v1.ifc"
+        after = Path(directory) / "v2.ifc"
+        write_synthetic_ifc(before, size_mb=args.size_mb)
+        changed = write_revision(before, after, every=args.every)
+
+        timings = []
+        fingerprints = []
+        for path in (before, after):
+            started = time.perf_counter()
+            fingerprints.append(fingerprint_elements(path, workers=args.workers))
+            timings.append(time.perf_counter() - started)
+        diff = diff_fingerprints(*fingerprints)
+
+    print(
+        f"{args.size_mb} MB x2, workers={args.workers}: impressões em "
+        f"{timings[0]:.2f}s + {timings[1]:.2f}s "
+        f"({args.size_mb / timings[1]:.1f} MB/s), comparação em {diff.elapsed_seconds:.2f}s; "
+        f"{len(diff.modified)} modificados (esperado {changed}), "
+        f"{diff.unchanged} inalterados"
+    )
+
+
+if __name__ == "__main__":
+    main()
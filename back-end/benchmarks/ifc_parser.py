@@ -0,0 +1,95 @@
+"""Mede a vazão (MB/s) do inventário IFC sobre um arquivo sintético ou real.
+
+Uso:
+    python -m benchmarks.ifc_parser --size-mb 500
+    python -m benchmarks.ifc_parser --file caminho/modelo.ifc
+    python -m benchmarks.ifc_parser --size-mb 1000 --workers 1,2,4,8
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import tempfile
+from pathlib import Path
+
+from app.infrastructure.services.ifc_parser import parse_ifc_inventory
+
+_HEADER = (
+    "ISO-10303-21;\nHEADER;\nFILE_DESCRIPTION(('ViewDefinition [CoordinationView]'),'2;1');\n"
+    "FILE_NAME('sintetico.ifc','2026-10-17T00:00:00',(''),(''),'','','');\n"
+    "FILE_SCHEMA(('IFC4'));\nENDSEC;\nDATA;\n"
+    "#1=IFCPROJECT('0001',$,'Projeto sint\\X2\\00E9\\X0\\tico',$,$,$,$,$,$);\n"
+)
+_FOOTER = "ENDSEC;\nEND-ISO-10303-21;\n"
+
+# Proporção aproximada de um modelo real: muita geometria, poucos elementos.
+_BLOCK = (
+    "#{a}=IFCCARTESIANPOINT((1.5,2.25,{n}.));\n"
+    "#{b}=IFCPOLYLINE((#{a},#{a}));\n"
+    "#{c}=IFCWALL('w{n}',$,'Parede {n}',$,$,$,$,$,.STANDARD.);\n"
+    "#{d}=IFCQUANTITYLENGTH('Length',$,$,4.5,$);\n"
+    "#{e}=IFCPROPERTYSET('p{n}',$,'Pset_WallCommon',$,(#{d}));\n"
+)
+
+
+def write_synthetic_ifc(path: Path, *, size_mb: int, storeys: int = 20) -> None:
+    target = size_mb * 1_000_000
+    with path.open("w", encoding="ascii", buffering=1024 * 1024) as handle:
+        handle.write(_HEADER)
+        for level in range(storeys):
+            handle.write(
+                f"#{10 + level}=IFCBUILDINGSTOREY('s{level}',$,'Pavimento {level}',"
+                f"$,$,$,$,$,.ELEMENT.,{level * 3.5});\n"
+            )
+        written = handle.tell()
+        next_id = 1000
+        walls: list[int] = []
+        while written < target:
+            ids = range(next_id, next_id + 5)
+            written += handle.write(_BLOCK.format(n=next_id, **dict(zip("abcde", ids))))
+            walls.append(next_id + 2)
+            next_id += 5
+            if len(walls) == 1000:
+                storey = 10 + (next_id // 5000) % storeys
+                members = ",".join(f"#{wall}" for wall in walls)
+                written += handle.write(
+                    f"#{next_id}=IFCRELCONTAINEDINSPATIALSTRUCTURE('r{next_id}',$,$,$,"
+                    f"({members}),#{storey});\n"
+                )
+                walls.clear()
+                next_id += 1
+        handle.write(_FOOTER)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--file", type=Path, help="Arquivo IFC existente (ignora --size-mb)")
+    parser.add_argument(
+        "--workers", default="1", help="Quantidades de processos a comparar, ex.: 1,2,4"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.file
+        if path is None:
+            path = Path(directory) / "sintetico.ifc"
+            write_synthetic_ifc(path, size_mb=args.size_mb)
+        baseline = None
+        for workers in (int(value) for value in args.workers.split(",")):
+            inventory = parse_ifc_inventory(path, workers=workers)
+            baseline = baseline or inventory.elapsed_seconds
+            peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(
+                f"workers={workers}: {inventory.bytes_read / 1_000_000:.0f} MB, "
+                f"{inventory.entity_count} entidades em {inventory.elapsed_seconds:.2f}s "
+                f"-> {inventory.throughput_mb_s:.1f} MB/s, "
+                f"speedup {baseline / inventory.elapsed_seconds:.2f}x "
+                f"(pico de memória do processo pai {peak_mb:.0f} MB)"
+            )
+    print(inventory.render(token_budget=1500))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Mede a construção do índice espacial e o tempo das consultas sobre colunas sintéticas.
+
+Uso:
+    python -m benchmarks.ifc_spatial --elements 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from app.infrastructure.services.ifc_columns import QUANTITY_COLUMNS, IfcColumns
+from app.infrastructure.services.ifc_spatial import IfcSpatialIndex, build_grid
+
+
+def synthetic_columns(elements: int, *, storeys: int, spaces: int) -> IfcColumns:
+    """Planta de 200 x 100 m com pé-direito de 3,5 m e algumas lajes inteiras."""
+
+    rng = np.random.default_rng(0)
+    storey = rng.integers(0, storeys, elements).astype(np.int32)
+    low = np.column_stack(
+        [rng.uniform(0, 200, elements), rng.uniform(0, 100, elements), storey * 3.5]
+    )
+    size = rng.uniform(0.1, 3.0, (elements, 3))
+    size[: storeys * 4, :2] = (50.0, 50.0)
+    return IfcColumns(
+        step_ids=np.arange(1000, 1000 + elements, dtype=np.int64),
+        type_codes=rng.integers(0, 3, elements).astype(np.uint16),
+        storeys=storey,
+        spaces=rng.integers(-1, spaces, elements).astype(np.int32),
+        quantities=np.full((elements, len(QUANTITY_COLUMNS)), np.nan),
+        bboxes=np.hstack([low, low + size]),
+        type_names=["IfcDoor", "IfcSlab", "IfcWall"],
+        storey_table=[(10 + code, f"Pavimento {code}", code * 3.5) for code in range(storeys)],
+        space_table=[(100 + code, f"Sala {code}") for code in range(spaces)],
+    )
+
+
+def _timed(function, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--elements", type=int, default=500_000)
+    parser.add_argument("--storeys", type=int, default=20)
+    parser.add_argument("--spaces", type=int, default=2000)
+    args = parser.parse_args()
+
+    columns = synthetic_columns(args.elements, storeys=args.storeys, spaces=args.spaces)
+    started = time.perf_counter()
+    grid = build_grid(columns.bboxes)
+    index = IfcSpatialIndex(columns, grid)
+    built = time.perf_counter() - started
+
+    rows = _timed(lambda: index.query_rows((50, 50, 0), (55, 55, 3.5)), 200)
+    box = _timed(lambda: index.query_box((50, 50, 0), (55, 55, 3.5)), 200)
+    near = _timed(lambda: index.near(1500, 2.0), 200)
+    hint = _timed(lambda: index.resolve("Infiltração na Sala 1234 do pavimento 7"), 200)
+    print(
+        f"{args.elements} elementos: grade {grid.shape[0]}x{grid.shape[1]} "
+        f"({len(grid.large)} caixas grandes) em {built:.2f}s; região {rows:.3f}ms "
+        f"(ids) / {box:.3f}ms (elementos), "
+        f"vizinhos {near:.3f}ms, location_hint {hint:.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
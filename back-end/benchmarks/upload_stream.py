@@ -0,0 +1,146 @@
+"""Compara o upload com spool do Starlette + `save_upload_file` com a recepção em streaming.
+
+Cada modo roda em um subprocesso próprio, para que o pico de memória (`ru_maxrss`)
+e os bytes gravados em disco (`/proc/self/io`) sejam só dele.
+
+Uso:
+    python -m benchmarks.upload_stream --size-mb 512
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from starlette.requests import Request
+
+from app.infrastructure.services.storage import LocalFileStorage
+from app.infrastructure.services.upload_stream import receive_multipart
+
+
+BOUNDARY = "----benchmark"
+_BLOCK = b"#1=IFCWALL('0abc',$,'Parede',$,$,#2,#3,'tag',.STANDARD.);\n" * 1024
+_NETWORK_CHUNK = 64 * 1024
+
+
+async def multipart_body(size: int) -> AsyncIterator[bytes]:
+    """Corpo com um único arquivo IFC de `size` bytes, gerado em blocos da rede."""
+
+    yield (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; "
+        f"filename=\"modelo.ifc\"\r\n\r\nISO-10303-21;\n"
+    ).encode()
+    sent = len(b"ISO-10303-21;\n")
+    while sent < size:
+        block = _BLOCK[: size - sent]
+        for start in range(0, len(block), _NETWORK_CHUNK):
+            yield block[start : start + _NETWORK_CHUNK]
+        sent += len(block)
+    yield f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+async def spooled(storage: LocalFileStorage, size: int) -> None:
+    body = multipart_body(size)
+
+    async def receive() -> dict[str, object]:
+        chunk = await anext(body, None)
+        return {"type": "http.request", "body": chunk or b"", "more_body": chunk is not None}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [
+            (b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())
+        ],
+    }
+    async with Request(scope, receive).form(max_part_size=1024 * 1024) as form:
+        await storage.save_upload_file(form["file"], kinds={"ifc"})
+
+
+async def streamed(storage: LocalFileStorage, size: int) -> None:
+    await receive_multipart(
+        storage,
+        multipart_body(size),
+        f"multipart/form-data; boundary={BOUNDARY}",
+        files={"file": {"ifc"}},
+    )
+
+
+def _written_bytes() -> int | None:
+    try:
+        for line in Path("/proc/self/io").read_text().splitlines():
+            if line.startswith("write_bytes:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def run_mode(mode: str, size: int) -> dict[str, float | None]:
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    baseline_written = _written_bytes()
+    with tempfile.TemporaryDirectory() as directory:
+        storage = LocalFileStorage(base_path=Path(directory))
+        started = time.perf_counter()
+        asyncio.run((spooled if mode == "spool" else streamed)(storage, size))
+        elapsed = time.perf_counter() - started
+        written = _written_bytes()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "seconds": elapsed,
+        "peak_rss_mb": peak_rss / 1024,
+        "rss_growth_mb": (peak_rss - baseline_rss) / 1024,
+        "written_mb": (
+            None
+            if written is None or baseline_written is None
+            else (written - baseline_written) / 2**20
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--mode", choices=("spool", "stream"))
+    args = parser.parse_args()
+    size = args.size_mb * 2**20
+
+    if args.mode is not None:
+        print(json.dumps(run_mode(args.mode, size)))
+        return
+
+    for mode in ("spool", "stream"):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.upload_stream",
+                "--mode",
+                mode,
+                "--size-mb",
+                str(args.size_mb),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output)
+        written = result["written_mb"]
+        print(
+            f"{mode:>6}: {args.size_mb / result['seconds']:7.1f} MB/s, "
+            f"pico RSS {result['peak_rss_mb']:.0f} MB "
+            f"(+{result['rss_growth_mb']:.0f} MB), "
+            f"gravado {'?' if written is None else f'{written:.0f}'} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
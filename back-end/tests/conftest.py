@@ -0,0 +1,41 @@
+"""Fixtures compartilhadas: banco sqlite em memória com o esquema completo."""
+
+from __future__ import annotations
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.infrastructure.db import Base, models
+
+
+@pytest_asyncio.fixture
+async def engine():
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def session(session_factory):
+    async with session_factory() as session:
+        yield session
+
+
+async def ref_counts(session) -> dict[str, int]:
+    """Contagem de referências de cada blob registrado."""
+
+    rows = await session.execute(
+        models.FileBlobModel.__table__.select().with_only_columns(
+            models.FileBlobModel.sha256, models.FileBlobModel.ref_count
+        )
+    )
+    return dict(rows.all())
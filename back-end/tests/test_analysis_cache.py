@@ -0,0 +1,86 @@
+"""Testes para o cache de respostas do OpenAI."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import Settings
+from app.infrastructure import OpenAIService
+from app.infrastructure.services import InMemoryLRUCache, SQLiteAnalysisCache
+
+
+class FakeResponses:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        text = json.dumps({"summary": f"resposta {self.calls}", "issues": []})
+        content = [SimpleNamespace(type="text", text=text)]
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(output=[SimpleNamespace(type="message", message=message)])
+
+
+def _service(cache) -> tuple[OpenAIService, FakeResponses]:
+    responses = FakeResponses()
+    client = SimpleNamespace(responses=responses)
+    return OpenAIService(client=client, settings=Settings(), cache=cache), responses
+
+
+@pytest.mark.asyncio
+async def test_lru_cache_evicts_oldest_and_expires_entries() -> None:
+    cache = InMemoryLRUCache(max_entries=2, ttl_seconds=60)
+    await cache.set("a", "1")
+    await cache.set("b", "2")
+    assert await cache.get("a") == "1"
+    await cache.set("c", "3")
+
+    assert await cache.get("b") is None
+    assert await cache.get("c") == "3"
+    assert cache.stats.evictions == 1
+    assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+
+    expired = InMemoryLRUCache(max_entries=2, ttl_seconds=-1)
+    await expired.set("a", "1")
+    assert await expired.get("a") is None
+    assert expired.stats.expirations == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_is_shared_between_instances(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    first = SQLiteAnalysisCache(path=path, max_entries=2)
+    second = SQLiteAnalysisCache(path=path, max_entries=2)
+
+    await first.set("a", "1")
+    await first.set("b", "2")
+    await first.set("c", "3")
+
+    assert await second.get("a") is None
+    assert await second.get("c") == "3"
+    description = second.describe()
+    assert description["entries"] == 2
+    assert description["shared"]["evictions"] == 1
+    assert description["shared"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_service_reuses_cached_result_for_same_file_content(tmp_path: Path) -> None:
+    first_upload = tmp_path / "run-1.jpg"
+    second_upload = tmp_path / "run-2.jpg"
+    first_upload.write_bytes(b"mesma foto")
+    second_upload.write_bytes(b"mesma foto")
+    service, responses = _service(InMemoryLRUCache())
+
+    first = await service.analyze_image(image_source=str(first_upload))
+    second = await service.analyze_image(image_source=str(second_upload))
+    bypassed = await service.analyze_image(image_source=str(second_upload), use_cache=False)
+
+    assert responses.calls == 2
+    assert first.summary == second.summary == "resposta 1"
+    assert second.image_source_uri == str(second_upload)
+    assert bypassed.summary == "resposta 2"
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
 from typing import Dict, Sequence
 from uuid import UUID
@@ -16,6 +17,7 @@ from app.domain.entities import (
     ImageAnalysis,
     IssueSeverity,
     ProjectAnalysis,
+    ProjectAnalysisPage,
 )
 from app.domain.repositories import ProjectAnalysisRepository
 from app.use_cases import AnalyzeProjectInput, AnalyzeProjectUseCase
@@ -40,15 +42,41 @@ class InMemoryRepository(ProjectAnalysisRepository):
     async def get_by_id(self, analysis_id: UUID) -> ProjectAnalysis | None:
         return self._items.get(analysis_id)
 
-    async def list_recent(self, limit: int = 20) -> Sequence[ProjectAnalysis]:
-        return list(self._items.values())[:limit]
+    async def list_recent(
+        self, *, limit: int = 20, filters=None, after=None
+    ) -> ProjectAnalysisPage:
+        return ProjectAnalysisPage(items=list(self._items.values())[:limit])
+
+    async def get_latest_completed(
+        self, project_name: str, *, exclude_id: UUID | None = None
+    ) -> ProjectAnalysis | None:
+        completed = [
+            item
+            for item in self._items.values()
+            if item.project_name == project_name
+            and item.status is AnalysisStatus.COMPLETED
+            and item.id != exclude_id
+        ]
+        return max(completed, key=lambda item: item.created_at, default=None)
 
 
 class FakeOpenAIService:
-    def __init__(self, fail: bool = False) -> None:
+    def __init__(self, fail: bool = False, failing_images: Sequence[str] = ()) -> None:
         self.fail = fail
+        self.failing_images = set(failing_images)
+        self.in_flight_images = 0
+        self.max_in_flight_images = 0
+        self.previous_bim: BimAnalysis | None = None
 
-    async def analyze_bim(self, *, bim_source: str, project_context: str | None = None) -> BimAnalysis:
+    async def analyze_bim(
+        self,
+        *,
+        bim_source: str,
+        project_context: str | None = None,
+        use_cache: bool = True,
+        previous: BimAnalysis | None = None,
+    ) -> BimAnalysis:
+        self.previous_bim = previous
         if self.fail:
             raise RuntimeError("boom")
         return BimAnalysis(
@@ -59,8 +87,16 @@ class FakeOpenAIService:
         )
 
     async def analyze_image(
-        self, *, image_source: str, project_context: str | None = None
+        self, *, image_source: str, project_context: str | None = None, use_cache: bool = True
     ) -> ImageAnalysis:
+        self.in_flight_images += 1
+        self.max_in_flight_images = max(self.max_in_flight_images, self.in_flight_images)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight_images -= 1
+        if image_source in self.failing_images:
+            raise RuntimeError("imagem corrompida")
         return ImageAnalysis(
             image_source_uri=image_source,
             status=AnalysisStatus.COMPLETED,
@@ -74,6 +110,7 @@ class FakeOpenAIService:
         project_name: str,
         bim_analysis: BimAnalysis,
         image_analysis: ImageAnalysis,
+        use_cache: bool = True,
     ) -> ComparisonResult:
         return ComparisonResult(
             summary="Tudo ok",
@@ -102,6 +139,7 @@ async def test_analyze_project_use_case_success() -> None:
     assert result.image_analysis is not None
     assert result.comparison_result is not None
     assert result.bim_analysis.summary == "Resumo BIM"
+    assert set(result.stage_timings_ms) == {"bim", "image", "comparison"}
     assert repo._items  # type: ignore[attr-defined]
 
 
@@ -123,3 +161,46 @@ async def test_analyze_project_use_case_failure() -> None:
     stored = next(iter(repo._items.values()))  # type: ignore[attr-defined]
     assert stored.status is AnalysisStatus.FAILED
 
+
+
+@pytest.mark.asyncio
+async def test_analyze_project_use_case_fans_out_over_all_images() -> None:
+    repo = InMemoryRepository()
+    service = FakeOpenAIService(failing_images=("/tmp/photo-2.jpg",))
+    use_case = AnalyzeProjectUseCase(repository=repo, ai_service=service, image_concurrency=2)
+    paths = tuple(f"/tmp/photo-{index}.jpg" for index in range(6))
+
+    result = await use_case.execute(
+        AnalyzeProjectInput(
+            project_name="Reforma Estação",
+            bim_file_path="/tmp/file.bim",
+            image_file_paths=paths,
+        )
+    )
+
+    assert result.status is AnalysisStatus.COMPLETED
+    assert [item.image_source_uri for item in result.image_analyses] == list(paths)
+    failed = [item for item in result.image_analyses if item.status is AnalysisStatus.FAILED]
+    assert [item.image_source_uri for item in failed] == ["/tmp/photo-2.jpg"]
+    assert service.max_in_flight_images == 2
+    assert result.image_analysis is not None
+    assert len(result.image_analysis.issues) == 5
+
+
+@pytest.mark.asyncio
+async def test_analyze_project_passes_previous_bim_analysis() -> None:
+    repo = InMemoryRepository()
+    service = FakeOpenAIService()
+    use_case = AnalyzeProjectUseCase(repository=repo, ai_service=service)
+    payload = AnalyzeProjectInput(
+        project_name="Reforma Estação",
+        bim_file_path="/tmp/file.bim",
+        image_file_paths=("/tmp/photo.jpg",),
+    )
+
+    first = await use_case.execute(payload)
+    assert service.previous_bim is None
+
+    await use_case.execute(payload)
+    assert service.previous_bim is first.bim_analysis
+
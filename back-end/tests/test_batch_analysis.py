@@ -0,0 +1,86 @@
+"""Testes para o modo em lote (Batch API) com o backend local em arquivos."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Mapping
+
+import pytest
+
+from app.core.config import Settings
+from app.domain.entities import AnalysisStatus, ProjectAnalysis
+from app.infrastructure import LocalBatchBackend, OpenAIService
+from app.use_cases import AnalyzeProjectInput, BatchAnalyzeProjectsUseCase
+from tests.test_analyze_project_use_case import InMemoryRepository
+
+
+def _service(tmp_path: Path, responder=None) -> OpenAIService:
+    settings = Settings()
+    settings.batch.work_dir = str(tmp_path)
+    settings.batch.poll_interval = 0.01
+    backend = LocalBatchBackend(
+        tmp_path / "local", responder=responder or OpenAIService._mock_batch_response
+    )
+    return OpenAIService(client=None, settings=settings, batch_backend=backend)
+
+
+async def _pending(repo: InMemoryRepository, name: str, images: int) -> AnalyzeProjectInput:
+    analysis = await repo.create(
+        ProjectAnalysis(
+            project_name=name,
+            bim_source_uri=f"/tmp/{name}.ifc",
+            image_source_uri=f"/tmp/{name}-0.jpg",
+        )
+    )
+    return AnalyzeProjectInput(
+        project_name=name,
+        bim_file_path=f"/tmp/{name}.ifc",
+        image_file_paths=tuple(f"/tmp/{name}-{index}.jpg" for index in range(images)),
+        analysis_id=analysis.id,
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_maps_results_back_to_each_analysis(tmp_path: Path) -> None:
+    repo = InMemoryRepository()
+    payloads = [await _pending(repo, "Estação A", 2), await _pending(repo, "Estação B", 1)]
+    use_case = BatchAnalyzeProjectsUseCase(repository=repo, ai_service=_service(tmp_path))
+
+    outcomes = await use_case.execute(payloads)
+
+    assert [outcome.succeeded for outcome in outcomes] == [True, True]
+    first = await repo.get_by_id(payloads[0].analysis_id)
+    assert first.status is AnalysisStatus.COMPLETED
+    assert [image.image_source_uri for image in first.image_analyses] == [
+        "/tmp/Estação A-0.jpg",
+        "/tmp/Estação A-1.jpg",
+    ]
+    assert first.comparison_result is not None
+    assert set(first.stage_timings_ms) == {"bim", "image", "comparison"}
+    assert not list(tmp_path.glob("input_*.jsonl"))
+
+
+@pytest.mark.asyncio
+async def test_batch_isolates_failed_lines(tmp_path: Path) -> None:
+    repo = InMemoryRepository()
+    payloads = [await _pending(repo, "Ok", 2), await _pending(repo, "Quebrado", 1)]
+    def responder(custom_id: str, body: Mapping[str, Any]) -> str:
+        prompt = body["input"][1]["content"]
+        if "Quebrado" in prompt or "Ok-1" in prompt:
+            raise RuntimeError("linha rejeitada")
+        return OpenAIService._mock_batch_response(custom_id, body)
+
+    use_case = BatchAnalyzeProjectsUseCase(
+        repository=repo, ai_service=_service(tmp_path, responder)
+    )
+    outcomes = await use_case.execute(payloads)
+
+    assert outcomes[0].succeeded
+    assert not outcomes[1].succeeded and "linha rejeitada" in outcomes[1].error
+    completed = await repo.get_by_id(payloads[0].analysis_id)
+    assert [image.status for image in completed.image_analyses] == [
+        AnalysisStatus.COMPLETED,
+        AnalysisStatus.FAILED,
+    ]
+    failed = await repo.get_by_id(payloads[1].analysis_id)
+    assert failed.status is AnalysisStatus.FAILED
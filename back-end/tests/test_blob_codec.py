@@ -0,0 +1,93 @@
+"""Testes para os blobs comprimidos com zstd e a leitura com `seek`."""
+
+from __future__ import annotations
+
+import io
+import os
+import random
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+
+from app.infrastructure.services.analysis_cache import _file_sha256_sync
+from app.infrastructure.services.blob_codec import (
+    COMPRESSIBLE_KINDS,
+    CompressedBlobError,
+    SeekableZstdReader,
+    SeekableZstdWriter,
+    content_size,
+    open_blob,
+)
+from app.infrastructure.services.ifc_index import open_entity_index
+from app.infrastructure.services.ifc_parser import iter_elements, parse_ifc_inventory
+from app.infrastructure.services.storage import LocalFileStorage
+from tests.test_ifc_parser import SAMPLE_IFC
+
+zstandard = pytest.importorskip("zstandard")
+
+
+def test_frames_are_standard_zstd_and_readable_at_any_offset(tmp_path: Path) -> None:
+    data = b"".join(b"#%d=IFCWALL('%d',$,'Parede',$);\n" % (i, i) for i in range(20000))
+    path = tmp_path / "modelo.ifc.zst"
+    with SeekableZstdWriter(path, frame_size=4096) as writer:
+        for start in range(0, len(data), 1000):
+            writer.write(memoryview(data)[start : start + 1000])
+
+    assert path.stat().st_size < len(data) // 4
+    # Quadros comuns seguidos de um quadro "skippable": qualquer zstd descomprime.
+    with zstandard.ZstdDecompressor().stream_reader(
+        path.open("rb"), read_across_frames=True
+    ) as stream:
+        assert stream.read() == data
+    assert content_size(path) == len(data)
+
+    rng = random.Random(3)
+    with open_blob(path) as handle, SeekableZstdReader(path, cache_frames=2) as reader:
+        assert handle.read() == data
+        for _ in range(50):
+            offset = rng.randrange(len(data))
+            handle.seek(offset)
+            assert handle.read(9000) == data[offset : offset + 9000]
+            assert reader.read_at(offset, 9000) == data[offset : offset + 9000]
+        handle.seek(-10, os.SEEK_END)
+        assert handle.read() == data[-10:]
+
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(CompressedBlobError):
+        open_blob(path)
+
+
+@pytest.mark.asyncio
+async def test_storage_compresses_ifc_and_readers_see_the_original_content(
+    tmp_path: Path,
+) -> None:
+    raw = (tmp_path / "obra.ifc").resolve()
+    raw.write_text(SAMPLE_IFC)
+    storage = LocalFileStorage(base_path=tmp_path / "uploads", compress_kinds=COMPRESSIBLE_KINDS)
+
+    stored = await storage.save_upload_file(
+        UploadFile(io.BytesIO(raw.read_bytes()), filename="obra.ifc")
+    )
+    path = Path(stored.path)
+    assert path.name.endswith(".ifc.zst") and stored.size == raw.stat().st_size
+    with open_blob(path) as handle:
+        assert handle.read() == raw.read_bytes()
+    path.with_name(path.name + ".sha256").unlink()
+    assert _file_sha256_sync(path) == stored.sha256
+
+    assert list(iter_elements(path)) == list(iter_elements(raw))
+    inventories = [parse_ifc_inventory(source).to_dict() for source in (path, raw)]
+    for inventory in inventories:
+        inventory.pop("elapsed_seconds")
+    assert inventories[0] == inventories[1]
+    with open_entity_index(path, digest=stored.sha256) as index:
+        assert bytes(index.raw(21)) == b"#21=IFCWALL('5',$,'Parede ''norte''',$,$,$,$,$,$);\n"
+        assert index.references(70) == [20, 21, 22, 10]
+
+    # Mesmo conteúdo com a compressão desligada reaproveita o blob comprimido.
+    plain = LocalFileStorage(base_path=tmp_path / "uploads")
+    again = await plain.save_upload_file(
+        UploadFile(io.BytesIO(raw.read_bytes()), filename="copia.ifc")
+    )
+    assert again.path == stored.path
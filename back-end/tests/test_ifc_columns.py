@@ -0,0 +1,139 @@
+"""Testes para o cache colunar de elementos IFC e as agregações."""
+
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import Settings
+from app.domain.entities import AnalysisStatus, BimAnalysis, ImageAnalysis
+from app.infrastructure import OpenAIService
+from app.infrastructure.services.ifc_inventory import IfcInventoryService
+
+pytest.importorskip("numpy")
+
+MODEL_IFC = """ISO-10303-21;
+HEADER;
+FILE_SCHEMA(('IFC4'));
+ENDSEC;
+DATA;
+#1=IFCPROJECT('p',$,'Obra',$,$,$,$,$,$);
+#2=IFCCARTESIANPOINT((0.,0.,0.));
+#3=IFCAXIS2PLACEMENT3D(#2,$,$);
+#4=IFCLOCALPLACEMENT($,#3);
+#5=IFCCARTESIANPOINT((0.,0.,3.5));
+#6=IFCAXIS2PLACEMENT3D(#5,$,$);
+#7=IFCLOCALPLACEMENT(#4,#6);
+#10=IFCBUILDINGSTOREY('s0',$,'Térreo',$,$,#4,$,$,.ELEMENT.,0.);
+#11=IFCBUILDINGSTOREY('s1',$,'Mezanino',$,$,#7,$,$,.ELEMENT.,3.5);
+#20=IFCSPACE('sp',$,'101',$,$,#4,$,'Sala técnica',.ELEMENT.,.INTERNAL.,$);
+#21=IFCRELAGGREGATES('ra',$,$,$,#10,(#20));
+#30=IFCCARTESIANPOINT((10.,0.,0.));
+#31=IFCDIRECTION((0.,1.,0.));
+#32=IFCAXIS2PLACEMENT3D(#30,$,#31);
+#33=IFCLOCALPLACEMENT(#4,#32);
+#34=IFCRECTANGLEPROFILEDEF(.AREA.,$,$,4.,0.2);
+#35=IFCDIRECTION((0.,0.,1.));
+#36=IFCEXTRUDEDAREASOLID(#34,$,#35,3.);
+#37=IFCSHAPEREPRESENTATION($,'Body','SweptSolid',(#36));
+#38=IFCPRODUCTDEFINITIONSHAPE($,$,(#37));
+#40=IFCWALL('w1',$,'Parede 1',$,$,#33,#38,$,$);
+#41=IFCSLAB('l1',$,'Laje 1',$,$,#7,#45,$,.FLOOR.);
+#42=IFCCARTESIANPOINT((0.,0.,-0.2));
+#43=IFCBOUNDINGBOX(#42,8.,6.,0.2);
+#44=IFCSHAPEREPRESENTATION($,'Box','BoundingBox',(#43));
+#45=IFCPRODUCTDEFINITIONSHAPE($,$,(#44));
+#46=IFCDOOR('d1',$,'Porta 1',$,$,#4,$,$,2.1,0.9,$,$,$);
+#50=IFCRELCONTAINEDINSPATIALSTRUCTURE('r0',$,$,$,(#40,#46),#10);
+#51=IFCRELCONTAINEDINSPATIALSTRUCTURE('r1',$,$,$,(#41),#11);
+#60=IFCQUANTITYAREA('GrossSideArea',$,$,13.,$);
+#61=IFCQUANTITYAREA('NetSideArea',$,$,12.,$);
+#62=IFCQUANTITYVOLUME('NetVolume',$,$,2.4,$);
+#63=IFCELEMENTQUANTITY('q1',$,'Qto_WallBaseQuantities',$,$,(#60,#61,#62));
+#64=IFCRELDEFINESBYPROPERTIES('d1',$,$,$,(#40),#63);
+#65=IFCQUANTITYAREA('NetArea',$,$,48.,$);
+#66=IFCELEMENTQUANTITY('q2',$,'Qto_SlabBaseQuantities',$,$,(#65));
+#67=IFCRELDEFINESBYPROPERTIES('d2',$,$,$,(#41),#66);
+ENDSEC;
+END-ISO-10303-21;
+"""
+
+
+def _service(tmp_path: Path) -> IfcInventoryService:
+    return IfcInventoryService(cache_dir=tmp_path / "ifc", token_budget=500, columns=True)
+
+
+@pytest.mark.asyncio
+async def test_columns_resolve_storeys_quantities_and_boxes(tmp_path: Path) -> None:
+    source = tmp_path / "obra.ifc"
+    source.write_text(MODEL_IFC)
+    service = _service(tmp_path)
+
+    columns = await service.columns(str(source))
+
+    assert list(columns.step_ids) == [20, 40, 41, 46]
+    wall = 1
+    assert columns.type_names[columns.type_codes[wall]] == "IfcWall"
+    # Área: `NetSideArea` prevalece sobre `GrossSideArea`.
+    assert list(columns.quantities[wall][:3]) == [pytest.approx(math.nan, nan_ok=True), 12.0, 2.4]
+    # Parede girada 90° em torno de Z, inserida em (10, 0, 0).
+    assert list(columns.bboxes[wall]) == pytest.approx([9.9, -2.0, 0.0, 10.1, 2.0, 3.0])
+    assert list(columns.bboxes[2]) == pytest.approx([0.0, 0.0, 3.3, 8.0, 6.0, 3.5])
+
+    by_storey = await service.columns(str(source))
+    assert service.cache_hits == 1
+    rows = by_storey.aggregate(by=("storey",), measure="area")
+    assert [(row.group["storey"], row.count, row.total) for row in rows] == [
+        ("Mezanino", 1, 48.0),
+        ("Térreo", 3, 12.0),
+    ]
+    doors = by_storey.aggregate(by=("storey", "type"), ifc_type="IFCDOOR")
+    assert [(row.group, row.count) for row in doors] == [
+        ({"storey": "Térreo", "type": "IfcDoor"}, 1)
+    ]
+    with pytest.raises(ValueError):
+        by_storey.aggregate(by=("zona",))
+
+
+@pytest.mark.asyncio
+async def test_aggregates_feed_bim_and_comparison_prompts(tmp_path: Path) -> None:
+    captured: list[dict] = []
+
+    async def create(**kwargs):
+        captured.append(kwargs)
+        text = json.dumps(
+            {
+                "summary": "ok",
+                "issues": [],
+                "similarity_score": 0.5,
+                "completion_percentage": 0.5,
+                "mismatches": [],
+            }
+        )
+        message = SimpleNamespace(content=[SimpleNamespace(type="text", text=text)])
+        return SimpleNamespace(output=[SimpleNamespace(type="message", message=message)])
+
+    source = tmp_path / "obra.ifc"
+    source.write_text(MODEL_IFC)
+    service = OpenAIService(
+        client=SimpleNamespace(responses=SimpleNamespace(create=create)),
+        settings=Settings(),
+        ifc_inventory=_service(tmp_path),
+    )
+
+    bim = await service.analyze_bim(bim_source=str(source))
+    await service.compare_results(
+        project_name="Obra",
+        bim_analysis=bim,
+        image_analysis=ImageAnalysis(status=AnalysisStatus.COMPLETED, summary="Foto"),
+    )
+
+    bim_prompt, comparison_prompt = (call["input"][1]["content"] for call in captured)
+    assert "Térreo: 3 elem., área 12, volume 2.4; Mezanino: 1 elem., área 48" in bim_prompt
+    assert "Quantitativos previstos no modelo BIM" in comparison_prompt
+    assert "Área por tipo: IfcSlab=48 (1); IfcWall=12 (1)" in comparison_prompt
+    assert isinstance(bim, BimAnalysis)
@@ -0,0 +1,176 @@
+"""Testes para o diff entre versões IFC e a análise BIM incremental."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import Settings
+from app.domain.entities import AnalysisStatus, BimAnalysis, DetectedIssue, IssueSeverity
+from app.infrastructure import OpenAIService
+from app.infrastructure.services.ifc_diff import diff_fingerprints, fingerprint_elements
+from app.infrastructure.services.ifc_index import open_entity_index
+from app.infrastructure.services.ifc_inventory import IfcInventoryService
+from app.infrastructure.services.openai_service import MOCK_BIM_OUTPUT
+
+
+def _write_model(path: Path, walls: dict[str, str], *, offset: int = 0) -> Path:
+    lines = ["ISO-10303-21;", "HEADER;", "FILE_SCHEMA(('IFC4'));", "ENDSEC;", "DATA;"]
+    lines.append(f"#{1 + offset}=IFCPROJECT('p',$,'Obra',$,$,$,$,$,$);")
+    for index, (global_id, name) in enumerate(walls.items()):
+        step = 100 + offset + index
+        lines.append(f"#{step}=IFCWALL('{global_id}',$,'{name}',$,$,#{step + 500},$,$);")
+    lines += ["ENDSEC;", "END-ISO-10303-21;"]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_diff_ignores_renumbered_ids_and_detects_changes(tmp_path: Path) -> None:
+    before = _write_model(
+        tmp_path / "v1.ifc", {"a": "Parede A", "b": "Parede B", "c": "Parede C"}
+    )
+    after = _write_model(
+        tmp_path / "v2.ifc",
+        {"a": "Parede A", "b": "Parede B2", "d": "Parede D"},
+        offset=7,
+    )
+
+    diff = diff_fingerprints(fingerprint_elements(before), fingerprint_elements(after))
+
+    assert [item.key for item in diff.added] == ["d"]
+    assert [item.key for item in diff.removed] == ["c"]
+    assert [current.key for _, current in diff.modified] == ["b"]
+    assert diff.unchanged == 1
+    assert {"b", "parede b", "parede b2", "parede c"} <= diff.changed_terms()
+    assert "Modificados: IfcWall 'Parede B2' [b]" in diff.render(token_budget=500)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        parallel = fingerprint_elements(after, workers=2, executor=executor, min_chunk_bytes=64)
+    assert parallel == fingerprint_elements(after)
+
+
+def _write_placed_model(
+    path: Path, points: dict[str, str], fire_rating: str, *, offset: int = 0
+) -> Path:
+    """Paredes com posicionamento e um conjunto de propriedades (ids deslocados por `offset`)."""
+
+    n = offset
+    lines = ["ISO-10303-21;", "HEADER;", "FILE_SCHEMA(('IFC4'));", "ENDSEC;", "DATA;"]
+    lines.append(f"#{n + 1}=IFCOWNERHISTORY($,$,$,.ADDED.,{1700000000 + offset},$,$,0);")
+    for index, (global_id, point) in enumerate(points.items()):
+        step = n + 10 * (index + 1)
+        lines += [
+            f"#{step}=IFCCARTESIANPOINT(({point}));",
+            f"#{step + 1}=IFCAXIS2PLACEMENT3D(#{step},$,$);",
+            f"#{step + 2}=IFCLOCALPLACEMENT($,#{step + 1});",
+            f"#{step + 3}=IFCWALL('{global_id}',#{n + 1},'Parede {global_id}',$,$,"
+            f"#{step + 2},$,$);",
+        ]
+    lines += [
+        f"#{n + 90}=IFCPROPERTYSINGLEVALUE('FireRating',$,IFCLABEL('{fire_rating}'),$);",
+        f"#{n + 91}=IFCPROPERTYSET('pset{offset}',#{n + 1},'Pset_WallCommon',$,(#{n + 90}));",
+        f"#{n + 92}=IFCRELDEFINESBYPROPERTIES('rel{offset}',#{n + 1},$,$,(#{n + 33}),#{n + 91});",
+        "ENDSEC;",
+        "END-ISO-10303-21;",
+    ]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def _indexed_fingerprints(path: Path):
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    with open_entity_index(path, digest=digest) as index:
+        return fingerprint_elements(path, index=index)
+
+
+def test_moved_elements_and_changed_properties_count_as_modified(tmp_path: Path) -> None:
+    points = {"a": "0.,0.,0.", "b": "5.,0.,0.", "c": "10.,0.,0."}
+    before = _write_placed_model(tmp_path / "v1.ifc", points, "REI60")
+    renumbered = _write_placed_model(tmp_path / "v2.ifc", points, "REI60", offset=1000)
+    changed = _write_placed_model(
+        tmp_path / "v3.ifc", points | {"a": "0.,2.5,0."}, "REI90", offset=2000
+    )
+
+    # Sem o índice, só os atributos diretos contam: nada parece ter mudado.
+    plain = diff_fingerprints(fingerprint_elements(before), fingerprint_elements(changed))
+    assert plain.is_empty
+
+    baseline = _indexed_fingerprints(before)
+    assert diff_fingerprints(baseline, _indexed_fingerprints(renumbered)).is_empty
+    diff = diff_fingerprints(baseline, _indexed_fingerprints(changed))
+    # `a` foi movida e `c` é a parede com o Pset_WallCommon alterado.
+    assert sorted(current.key for _, current in diff.modified) == ["a", "c"]
+    assert diff.unchanged == 1
+
+
+@pytest.mark.asyncio
+async def test_analyze_bim_sends_only_changes_and_carries_untouched_issues(
+    tmp_path: Path,
+) -> None:
+    captured: list[dict] = []
+
+    async def create(**kwargs):
+        captured.append(kwargs)
+        text = json.dumps(
+            {
+                "summary": "Parede D sem revestimento",
+                "issues": [
+                    {
+                        "description": "Parede D sem revestimento",
+                        "severity": "low",
+                        "confidence": 0.6,
+                    }
+                ],
+            }
+        )
+        message = SimpleNamespace(content=[SimpleNamespace(type="text", text=text)])
+        return SimpleNamespace(output=[SimpleNamespace(type="message", message=message)])
+
+    walls = {f"w{index}": f"Parede {index}" for index in range(10)}
+    before = _write_model(tmp_path / "v1.ifc", walls)
+    after = _write_model(tmp_path / "v2.ifc", walls | {"w3": "Parede 3 revisada"}, offset=3)
+    previous = BimAnalysis(
+        bim_source_uri=str(before),
+        status=AnalysisStatus.COMPLETED,
+        summary="Versão 1",
+        issues=(
+            DetectedIssue("Fissura", IssueSeverity.HIGH, 0.9, location_hint="Parede 3"),
+            DetectedIssue("Umidade", IssueSeverity.MEDIUM, 0.7, location_hint="Parede 7"),
+        ),
+    )
+    service = OpenAIService(
+        client=SimpleNamespace(responses=SimpleNamespace(create=create)),
+        settings=Settings(),
+        ifc_inventory=IfcInventoryService(cache_dir=tmp_path / "ifc", token_budget=500),
+    )
+
+    result = await service.analyze_bim(bim_source=str(after), previous=previous)
+
+    prompt = captured[0]["input"][1]["content"]
+    assert "Modificados: IfcWall 'Parede 3 revisada' [w3]" in prompt
+    assert "Parede 5" not in prompt
+    assert [issue.description for issue in result.issues] == [
+        "Umidade",
+        "Parede D sem revestimento",
+    ]
+    assert len(list((tmp_path / "ifc").glob("*.fingerprints.v2.json.gz"))) == 2
+
+    unchanged = await service.analyze_bim(bim_source=str(before), previous=previous)
+    assert len(captured) == 1
+    assert unchanged.summary == "Versão 1" and len(unchanged.issues) == 2
+
+    # Um fallback simulado não serve de base: a versão seguinte é analisada inteira.
+    mocked = BimAnalysis(
+        bim_source_uri=str(before),
+        status=AnalysisStatus.COMPLETED,
+        summary="Análise simulada",
+        raw_output=MOCK_BIM_OUTPUT,
+        issues=previous.issues,
+    )
+    await service.analyze_bim(bim_source=str(before), previous=mocked)
+    assert len(captured) == 2 and "Modificados" not in captured[1]["input"][1]["content"]
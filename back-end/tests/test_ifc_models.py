@@ -0,0 +1,126 @@
+"""Testes para a importação de modelos IFC e a paginação dos elementos."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.domain.entities import IfcModelStatus
+from app.infrastructure.db.repositories.ifc_model import SQLAlchemyIfcModelRepository
+from app.use_cases import (
+    ImportIfcElementsUseCase,
+    ListIfcElementsInput,
+    ListIfcElementsUseCase,
+    RegisterIfcModelInput,
+    RegisterIfcModelUseCase,
+)
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.exc import SQLAlchemyError  # noqa: E402
+
+
+def _write_model(path: Path, *, walls: int, slabs: int) -> Path:
+    lines = ["ISO-10303-21;", "HEADER;", "FILE_SCHEMA(('IFC2X3'));", "ENDSEC;", "DATA;"]
+    lines.append("#1=IFCPROJECT('p',$,'Obra',$,$,$,$,$,$);")
+    for index in range(walls):
+        lines.append(f"#{100 + index}=IFCWALL('w{index}',$,'Parede {index}',$,$,$,$,'P{index}');")
+    for index in range(slabs):
+        lines.append(f"#{500 + index}=IFCSLAB('s{index}',$,'Laje {index}',$,$,$,$,$,.FLOOR.);")
+    lines += ["ENDSEC;", "END-ISO-10303-21;"]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.fixture
+def repository(session) -> SQLAlchemyIfcModelRepository:
+    return SQLAlchemyIfcModelRepository(session=session)
+
+
+@pytest.mark.asyncio
+async def test_import_loads_elements_in_chunks_and_pages_by_cursor(
+    tmp_path: Path, repository: SQLAlchemyIfcModelRepository
+) -> None:
+    source = _write_model(tmp_path / "obra.ifc", walls=25, slabs=4)
+    model = await RegisterIfcModelUseCase(repository).execute(
+        RegisterIfcModelInput(project_id="prj_001", file_path=str(source))
+    )
+    assert model.status is IfcModelStatus.PROCESSING
+
+    imported = await ImportIfcElementsUseCase(repository, chunk_size=7).execute(model.id)
+
+    assert imported.status is IfcModelStatus.READY
+    assert (imported.ifc_schema, imported.elements_count) == ("IFC2X3", 29)
+    assert (await repository.get_latest_for_project("prj_001")).id == model.id
+
+    use_case = ListIfcElementsUseCase(repository)
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page = await use_case.execute(
+            ListIfcElementsInput(model_id=model.id, ifc_type="IFCWALL", after=cursor, limit=10)
+        )
+        seen += [element.step_id for element in page.items]
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    assert seen == list(range(100, 125))
+
+    slabs = await use_case.execute(ListIfcElementsInput(model_id=model.id, ifc_type="IfcSlab"))
+    first = slabs.items[0]
+    assert (first.global_id, first.name, first.tag) == ("s0", "Laje 0", None)
+    assert len(slabs.items) == 4 and slabs.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_import_marks_invalid_file_as_error(
+    tmp_path: Path, repository: SQLAlchemyIfcModelRepository
+) -> None:
+    source = tmp_path / "obra.ifc"
+    source.write_text("não é um arquivo STEP")
+    model = await RegisterIfcModelUseCase(repository).execute(
+        RegisterIfcModelInput(project_id="prj_001", file_path=str(source))
+    )
+
+    imported = await ImportIfcElementsUseCase(repository).execute(model.id)
+
+    assert imported.status is IfcModelStatus.ERROR
+    assert imported.error
+
+
+class FailingRepository(SQLAlchemyIfcModelRepository):
+    """Grava o primeiro lote e falha no banco ao gravar o segundo."""
+
+    def __init__(self, session) -> None:
+        super().__init__(session=session)
+        self.batches = 0
+
+    async def add_elements(self, elements) -> None:
+        self.batches += 1
+        if self.batches == 2:
+            try:
+                await self._session.execute(text("INSERT INTO tabela_ausente VALUES (1)"))
+            except SQLAlchemyError:
+                await self._session.rollback()
+                raise
+        await super().add_elements(elements)
+
+
+@pytest.mark.asyncio
+async def test_import_cleans_up_partial_elements_on_database_error(
+    tmp_path: Path, repository: SQLAlchemyIfcModelRepository
+) -> None:
+    source = _write_model(tmp_path / "obra.ifc", walls=25, slabs=4)
+    model = await RegisterIfcModelUseCase(repository).execute(
+        RegisterIfcModelInput(project_id="prj_001", file_path=str(source))
+    )
+    failing = FailingRepository(repository._session)
+
+    imported = await ImportIfcElementsUseCase(failing, chunk_size=7).execute(model.id)
+
+    assert failing.batches == 2
+    assert imported.status is IfcModelStatus.ERROR and imported.error
+    page = await repository.list_elements(model.id, ifc_type=None, after=None, limit=100)
+    assert page.items == []
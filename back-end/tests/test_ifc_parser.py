@@ -0,0 +1,199 @@
+"""Testes para a leitura em streaming de arquivos IFC e o inventário do prompt BIM."""
+
+from __future__ import annotations
+
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import Settings
+from app.infrastructure import OpenAIService
+from app.infrastructure.services.ifc_index import sidecar_path
+from app.infrastructure.services.ifc_inventory import IfcInventoryService
+from app.infrastructure.services.ifc_parser import (
+    EntityRef,
+    decode_step_string,
+    fit_to_token_budget,
+    iter_statements,
+    locate_data_section,
+    parse_ifc_inventory,
+    parse_step_arguments,
+    split_data_section,
+)
+
+SAMPLE_IFC = """ISO-10303-21;
+HEADER;
+FILE_DESCRIPTION(('ViewDefinition [CoordinationView]'),'2;1');
+FILE_NAME('obra.ifc','2026-10-17T10:00:00',(''),(''),'','','');
+FILE_SCHEMA(('IFC4'));
+ENDSEC;
+DATA;
+#1=IFCPROJECT('1',$,'Esta\\X2\\00E7\\X0\\\\X2\\00E3\\X0\\o Central',$,$,$,$,$,$);
+#10=IFCBUILDINGSTOREY('2',$,'T\\X2\\00E9\\X0\\rreo',$,$,$,$,$,.ELEMENT.,0.);
+#11=IFCBUILDINGSTOREY('3',$,'Mezanino',$,$,$,$,$,.ELEMENT.,4.5);
+#20=IFCWALL('4',$,'Parede; externa',$,$,$,$,'tag',$);
+#21=IFCWALL('5',$,'Parede ''norte''',$,$,$,$,$,$);
+#22=IFCSLAB('6',$,'Laje
+multilinha; com ponto e vírgula',$,$,$,$,$,.FLOOR.);
+#30=IFCSPACE('7',$,'101',$,$,$,$,'Sala de controle',.ELEMENT.,.INTERNAL.,$);
+#40=IFCQUANTITYAREA('NetSideArea',$,$,12.5,$);
+#41=IFCQUANTITYAREA('NetSideArea',$,$,7.5,$);
+#42=IFCQUANTITYVOLUME('NetVolume',$,$,3.,$);
+#50=IFCELEMENTQUANTITY('8',$,'Qto_WallBaseQuantities',$,$,(#40,#42));
+#51=IFCPROPERTYSET('9',$,'Pset_WallCommon',$,(#60));
+#52=IFCPROPERTYSET('10',$,'Pset_WallCommon',$,(#60));
+#60=IFCPROPERTYSINGLEVALUE('IsExternal',$,IFCBOOLEAN(.T.),$);
+#70=IFCRELCONTAINEDINSPATIALSTRUCTURE('11',$,$,$,(#20,#21,#22),#10);
+ENDSEC;
+END-ISO-10303-21;
+"""
+
+
+def _write_sample(path: Path) -> Path:
+    path.write_bytes(SAMPLE_IFC.encode("utf-8"))
+    return path
+
+
+def test_statements_keep_semicolons_inside_strings_and_multiline_entities() -> None:
+    handle = io.BytesIO(b"#1=A('x;y');\n#2=B('linha\n;continua');\nENDSEC;\n#3=C();\n")
+
+    statements = [statement for _, statement in iter_statements(handle, start=0)]
+
+    assert statements == [b"#1=A('x;y');\n", b"#2=B('linha\n;continua');\n"]
+
+
+def test_arguments_decode_strings_refs_and_typed_values() -> None:
+    values = parse_step_arguments("'a''b',#12,$,(#1,#2),IFCLABEL('x'),.T.,-1.5E2,3")
+
+    assert values == ["a'b", 12, None, [1, 2], "x", "T", -150.0, 3]
+    assert isinstance(values[1], EntityRef)
+    assert decode_step_string("'T\\X2\\00E9\\X0\\rreo'") == "Térreo"
+
+
+def test_inventory_counts_storeys_spaces_quantities_and_psets(tmp_path: Path) -> None:
+    inventory = parse_ifc_inventory(_write_sample(tmp_path / "obra.ifc"))
+
+    assert inventory.schema == "IFC4"
+    assert inventory.project_name == "Estação Central"
+    assert inventory.entity_count == 15
+    assert inventory.element_counts == {"IFCWALL": 2, "IFCSLAB": 1, "IFCSPACE": 1}
+    storeys = {storey.name: storey for storey in inventory.storeys}
+    assert storeys["Térreo"].element_count == 3
+    assert storeys["Mezanino"].elevation == 4.5
+    assert [(space.name, space.long_name) for space in inventory.spaces] == [
+        ("101", "Sala de controle")
+    ]
+    area = inventory.quantities["NetSideArea"]
+    assert (area.kind, area.total, area.count) == ("área", 20.0, 2)
+    assert inventory.property_sets == {"Pset_WallCommon": 2, "Qto_WallBaseQuantities": 1}
+
+    text = inventory.render(token_budget=400)
+    assert "IfcWall=2" in text and "Térreo (0) 3 elem." in text
+    assert len(inventory.render(token_budget=20)) <= 80
+
+
+def test_fit_to_token_budget_halves_the_limit_then_truncates() -> None:
+    limits: list[int] = []
+
+    def render(limit: int) -> str:
+        limits.append(limit)
+        return "x" * 10 * limit
+
+    assert fit_to_token_budget(render, 40, 30) == "x" * 100
+    assert limits == [40, 20, 10]
+    assert fit_to_token_budget(render, 4, 1) == "xxxx"
+
+
+def test_parallel_chunks_match_single_pass(tmp_path: Path) -> None:
+    path = _write_sample(tmp_path / "obra.ifc")
+    section = locate_data_section(path)
+    serial = parse_ifc_inventory(path)
+
+    ranges = split_data_section(path, section, 6)
+    assert len(ranges) > 1
+    assert ranges[0][0] == section.start and ranges[-1][1] == section.end
+    assert all(path.read_bytes()[start : start + 1] == b"#" for start, _ in ranges)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        parallel = parse_ifc_inventory(path, workers=2, executor=executor, min_chunk_bytes=64)
+
+    assert parallel.to_dict() | {"elapsed_seconds": 0} == serial.to_dict() | {
+        "elapsed_seconds": 0
+    }
+
+
+
+def test_chunk_boundaries_skip_statement_lookalikes_inside_strings(tmp_path: Path) -> None:
+    note = "".join(f"linha {index};\n#9{index}=IFCWALL('falso');\n" for index in range(40))
+    path = tmp_path / "obra.ifc"
+    path.write_bytes(
+        SAMPLE_IFC.replace(
+            "#30=IFCSPACE('7',$,'101',$,$,$,$,'Sala de controle'",
+            f"#30=IFCSPACE('7',$,'101',$,$,$,$,'Sala;\n{note}fim'",
+        ).encode("utf-8")
+    )
+    section = locate_data_section(path)
+    with path.open("rb") as handle:
+        starts = {offset for offset, _ in iter_statements(handle, start=section.start)}
+
+    for parts in range(2, 40):
+        ranges = split_data_section(path, section, parts)
+        assert {start for start, _ in ranges} <= starts
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        parallel = parse_ifc_inventory(path, workers=2, executor=executor, min_chunk_bytes=64)
+    assert parallel.counts_by_type == parse_ifc_inventory(path).counts_by_type
+
+@pytest.mark.asyncio
+async def test_bim_prompt_includes_cached_inventory(tmp_path: Path) -> None:
+    captured: list[dict] = []
+
+    async def create(**kwargs):
+        captured.append(kwargs)
+        text = json.dumps({"summary": "ok", "issues": []})
+        message = SimpleNamespace(content=[SimpleNamespace(type="text", text=text)])
+        return SimpleNamespace(output=[SimpleNamespace(type="message", message=message)])
+
+    inventory = IfcInventoryService(cache_dir=tmp_path / "ifc", token_budget=500)
+    service = OpenAIService(
+        client=SimpleNamespace(responses=SimpleNamespace(create=create)),
+        settings=Settings(),
+        ifc_inventory=inventory,
+    )
+    source = str(_write_sample(tmp_path / "obra.ifc"))
+
+    await service.analyze_bim(bim_source=source)
+
+    prompt = captured[0]["input"][1]["content"]
+    assert "Inventário extraído do modelo IFC" in prompt
+    assert "IfcSlab=1" in prompt
+    assert len(list((tmp_path / "ifc").glob("*.json"))) == 1
+    assert await inventory.render(source) == (await inventory.inventory(source)).render(
+        token_budget=500
+    )
+    assert await inventory.inventory(str(tmp_path / "nao-existe.ifc")) is None
+
+
+@pytest.mark.asyncio
+async def test_entity_index_resolves_entities_and_is_reused(tmp_path: Path) -> None:
+    source = str(_write_sample(tmp_path / "obra.ifc"))
+    service = IfcInventoryService(cache_dir=tmp_path / "ifc", token_budget=500)
+
+    await service.inventory(source)
+    sidecar = sidecar_path(source)
+    assert sidecar.is_file()
+    built_at = sidecar.stat().st_mtime_ns
+
+    index = await service.entity_index(source)
+    try:
+        assert len(index) == 15 and 70 in index and 2 not in index
+        assert bytes(index.raw(21)) == b"#21=IFCWALL('5',$,'Parede ''norte''',$,$,$,$,$,$);\n"
+        assert index.type_of(22) == "IFCSLAB"
+        assert list(index.ids_of_type("IfcWall")) == [20, 21]
+        assert index.references(70) == [20, 21, 22, 10]
+        assert index.entity(11).arguments[2] == "Mezanino"
+    finally:
+        index.close()
+    assert sidecar.stat().st_mtime_ns == built_at
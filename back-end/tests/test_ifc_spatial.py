@@ -0,0 +1,65 @@
+"""Testes para o índice espacial e de nomes dos modelos IFC."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.infrastructure.services.ifc_inventory import IfcInventoryService
+from tests.test_ifc_columns import MODEL_IFC
+
+np = pytest.importorskip("numpy")
+
+from app.infrastructure.services.ifc_spatial import build_grid, normalize_words  # noqa: E402
+
+
+def test_grid_matches_brute_force_including_large_boxes() -> None:
+    rng = np.random.default_rng(7)
+    low = rng.uniform(0, 100, size=(2000, 3))
+    size = rng.uniform(0.1, 2, size=(2000, 3))
+    size[:20, :2] = 80  # lajes que cobrem quase toda a planta
+    boxes = np.hstack([low, low + size])
+    boxes[-1] = np.nan  # sem geometria
+    grid = build_grid(boxes)
+    assert len(grid.large) == 20
+
+    for minimum, maximum in (((10, 10, 0), (30, 20, 50)), ((-5, -5, 99), (0.5, 0.5, 200))):
+        candidates = grid.candidates(minimum, maximum)
+        found = candidates[
+            (boxes[candidates, :3] <= maximum).all(axis=1)
+            & (boxes[candidates, 3:] >= minimum).all(axis=1)
+        ]
+        expected = np.flatnonzero(
+            (boxes[:, :3] <= maximum).all(axis=1) & (boxes[:, 3:] >= minimum).all(axis=1)
+        )
+        assert list(found) == list(expected)
+
+
+@pytest.mark.asyncio
+async def test_spatial_index_queries_regions_and_resolves_location_hints(
+    tmp_path: Path,
+) -> None:
+    source = tmp_path / "obra.ifc"
+    source.write_text(MODEL_IFC)
+    service = IfcInventoryService(cache_dir=tmp_path / "ifc", token_budget=500, columns=True)
+
+    index = await service.spatial(str(source))
+    assert await service.spatial(str(source)) is index
+
+    walls = index.query_box((9, -1, 1), (11, 1, 2), ifc_type="IFCWALL")
+    assert [(element.step_id, element.storey) for element in walls] == [(40, "Térreo")]
+    assert index.query_box((50, 50, 0), (60, 60, 1)) == []
+    nearby = index.near(46, 0.5)
+    assert [element.step_id for element in nearby] == [20]
+    assert index.near(999, 1.0) is None
+
+    assert normalize_words("Saída da Sala Técnica") == ["saida", "sala", "tecnica"]
+    storey = index.resolve("Fissura na laje do mezanino")
+    assert [(match.kind, match.name) for match in storey.matches] == [("storey", "Mezanino")]
+    assert (storey.element_ids, storey.total) == ([41], 1)
+    # O espaço é um ponto em (0, 0, 0): a porta inserida ali também é candidata.
+    space = index.resolve("Sala técnica - térreo")
+    assert [match.kind for match in space.matches] == ["space", "storey"]
+    assert space.element_ids == [46]
+    assert index.resolve("Plataforma central").element_ids == []
@@ -0,0 +1,132 @@
+"""Testes para os derivados compactos das fotos enviadas ao modelo."""
+
+from __future__ import annotations
+
+import io
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import Settings
+from app.infrastructure import OpenAIService
+from app.infrastructure.services.image_preprocessing import (
+    ImagePreprocessingError,
+    ImagePreprocessor,
+    PreprocessOptions,
+    render_derivatives,
+)
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _photo(path: Path, size: tuple[int, int] = (2000, 1000)) -> Path:
+    exif = Image.Exif()
+    exif[0x0112] = 6  # orientação: girar 90°
+    exif[0x010F] = "Fabricante do celular"
+    Image.new("RGB", size, (120, 80, 40)).save(path, format="JPEG", exif=exif)
+    return path
+
+
+def test_render_strips_exif_and_downscales_oriented_image(tmp_path: Path) -> None:
+    options = PreprocessOptions(max_edge=512, format="jpeg", quality=80)
+
+    [overview] = render_derivatives(str(_photo(tmp_path / "foto.jpg")), options)
+
+    assert (overview.width, overview.height) == (256, 512)
+    decoded = Image.open(io.BytesIO(overview.data))
+    assert decoded.format == "JPEG"
+    assert not decoded.getexif()
+    assert overview.data_url.startswith("data:image/jpeg;base64,")
+
+
+@pytest.mark.asyncio
+async def test_prepare_tiles_large_images_and_reuses_cache(tmp_path: Path) -> None:
+    preprocessor = ImagePreprocessor(
+        options=PreprocessOptions(
+            max_edge=256, format="webp", quality=70, tile_threshold=1500, tile_grid=2
+        ),
+        cache_dir=tmp_path / "derivatives",
+        max_workers=1,
+    )
+    photo = str(_photo(tmp_path / "foto.jpg"))
+    try:
+        first = await preprocessor.prepare(photo)
+        second = await preprocessor.prepare(photo)
+    finally:
+        preprocessor.close()
+
+    assert [item.label for item in first] == [
+        "overview",
+        "tile-0-0",
+        "tile-0-1",
+        "tile-1-0",
+        "tile-1-1",
+    ]
+    assert all(item.media_type == "image/webp" for item in first)
+    assert second == first
+    assert (preprocessor.renders_total, preprocessor.cache_hits) == (1, 1)
+
+
+def _broken_pool() -> ProcessPoolExecutor:
+    pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    with pytest.raises(BrokenProcessPool):
+        pool.submit(os._exit, 1).result()  # o processo morre como num OOM
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_prepare_recreates_a_broken_pool(tmp_path: Path, monkeypatch) -> None:
+    preprocessor = ImagePreprocessor(
+        options=PreprocessOptions(max_edge=128, format="jpeg", quality=80),
+        cache_dir=tmp_path / "derivatives",
+        max_workers=1,
+    )
+    photo = str(_photo(tmp_path / "foto.jpg"))
+    preprocessor._executor = _broken_pool()
+    try:
+        [overview] = await preprocessor.prepare(photo)
+        assert max(overview.width, overview.height) == 128
+
+        # Quebra de novo na nova tentativa: vira erro de domínio, sem `BrokenProcessPool`.
+        monkeypatch.setattr(preprocessor, "_pool", _broken_pool)
+        with pytest.raises(ImagePreprocessingError):
+            await preprocessor.prepare(str(_photo(tmp_path / "outra.jpg", (900, 700))))
+    finally:
+        preprocessor.close()
+
+
+@pytest.mark.asyncio
+async def test_image_request_attaches_derivatives_as_data_urls(tmp_path: Path) -> None:
+    captured: list[dict] = []
+
+    async def create(**kwargs):
+        captured.append(kwargs)
+        text = json.dumps({"summary": "ok", "issues": []})
+        message = SimpleNamespace(content=[SimpleNamespace(type="text", text=text)])
+        return SimpleNamespace(output=[SimpleNamespace(type="message", message=message)])
+
+    preprocessor = ImagePreprocessor(
+        options=PreprocessOptions(max_edge=128, format="jpeg", quality=70),
+        cache_dir=tmp_path / "derivatives",
+        max_workers=1,
+    )
+    service = OpenAIService(
+        client=SimpleNamespace(responses=SimpleNamespace(create=create)),
+        settings=Settings(),
+        image_preprocessor=preprocessor,
+    )
+    try:
+        await service.analyze_image(image_source=str(_photo(tmp_path / "foto.jpg")))
+    finally:
+        preprocessor.close()
+
+    content = captured[0]["input"][1]["content"]
+    assert content[0]["type"] == "input_text"
+    assert content[1]["type"] == "input_image"
+    assert content[1]["image_url"].startswith("data:image/jpeg;base64,")
@@ -0,0 +1,83 @@
+"""Testes para o cliente OpenAI compartilhado e as métricas do seu transporte."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+from openai import APIConnectionError
+
+from app.core.config import Settings
+from app.infrastructure.services.openai_client import OpenAIClientManager
+
+
+async def _models(self, request: httpx.Request) -> httpx.Response:
+    assert request.url.path.endswith("/models")
+    return httpx.Response(200, json={"object": "list", "data": []}, request=request)
+
+
+async def _unreachable(self, request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectError("sem rede", request=request)
+
+
+@pytest.mark.asyncio
+async def test_manager_counts_requests_and_releases_the_client(monkeypatch) -> None:
+    settings = Settings()
+    settings.openai.api_key = "sk-teste"
+    settings.openai.max_connections = 7
+    manager = OpenAIClientManager(settings)
+
+    manager.start()
+    client = manager.client
+    assert client is not None
+    manager.start()
+    assert manager.client is client
+
+    monkeypatch.setattr(httpx.AsyncHTTPTransport, "handle_async_request", _models)
+    await client.models.list()
+    monkeypatch.setattr(httpx.AsyncHTTPTransport, "handle_async_request", _unreachable)
+    with pytest.raises(APIConnectionError):
+        await client.models.list()
+
+    stats = manager.stats()
+    assert stats["max_connections"] == 7
+    assert (stats["requests_total"], stats["errors_total"]) == (2, 1)
+    assert (stats["in_flight"], stats["max_in_flight"]) == (0, 1)
+
+    await manager.aclose()
+    assert manager.client is None
+    assert "requests_total" not in manager.stats()
+
+
+def test_manager_without_api_key_does_not_create_a_client() -> None:
+    settings = Settings()
+    settings.openai.api_key = ""
+    manager = OpenAIClientManager(settings)
+
+    manager.start()
+
+    assert manager.client is None
+    assert manager.stats()["max_connections"] == settings.openai.max_connections
+
+
+class _Closeable:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_app_lifespan_releases_pools_and_storage(monkeypatch) -> None:
+    from app import main
+
+    resources = {name: _Closeable() for name in ("preprocessor", "inventory", "storage")}
+    monkeypatch.setattr(main, "get_image_preprocessor", lambda: resources["preprocessor"])
+    monkeypatch.setattr(main, "get_ifc_inventory_service", lambda: resources["inventory"])
+    monkeypatch.setattr(main, "get_file_storage", lambda: resources["storage"])
+
+    async with main.lifespan(main.app):
+        assert not any(resource.closed for resource in resources.values())
+
+    assert all(resource.closed for resource in resources.values())
+    assert main.app.state.openai_clients.client is None
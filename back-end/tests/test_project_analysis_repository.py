@@ -0,0 +1,119 @@
+"""Testes para a escrita do agregado de análise no repositório SQLAlchemy."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.domain.entities import (
+    AnalysisStatus,
+    BimAnalysis,
+    ComparisonResult,
+    ImageAnalysis,
+    ProjectAnalysis,
+)
+from app.infrastructure.db.repositories.project_analysis import (
+    SQLAlchemyProjectAnalysisRepository,
+)
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import event  # noqa: E402
+
+
+@pytest.fixture
+def factory(engine, session_factory):
+    statements: list[str] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda connection, cursor, statement, *args: statements.append(" ".join(statement.split())),
+    )
+    session_factory.statements = statements
+    return session_factory
+
+
+def _completed(analysis: ProjectAnalysis) -> None:
+    images = [
+        ImageAnalysis(
+            image_source_uri=f"foto{n}.jpg", status=AnalysisStatus.COMPLETED, summary="ok"
+        )
+        for n in range(3)
+    ]
+    analysis.mark_completed(
+        BimAnalysis(bim_source_uri="modelo.ifc", status=AnalysisStatus.COMPLETED, raw_output="x"),
+        images,
+        ComparisonResult(similarity_score=0.9, completion_percentage=40.0, summary="Comparação"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_writes_skip_reads_and_update_only_changed_columns(factory) -> None:
+    statements = factory.statements
+    async with factory() as session:
+        repository = SQLAlchemyProjectAnalysisRepository(session=session)
+        analysis = ProjectAnalysis(
+            project_name="Obra",
+            bim_source_uri="modelo.ifc",
+            image_source_uri="foto0.jpg",
+            status=AnalysisStatus.PENDING,
+        )
+        assert await repository.create(analysis) is analysis
+        assert [s.split(" (")[0] for s in statements] == ["INSERT INTO project_analyses"]
+
+        statements.clear()
+        analysis.mark_running()
+        await repository.update(analysis)
+        assert statements == [
+            "UPDATE project_analyses SET status=?, updated_at=? WHERE project_analyses.id = ?"
+        ]
+
+        statements.clear()
+        _completed(analysis)
+        await repository.update(analysis)
+        assert [s.split(" SET")[0].split(" (")[0] for s in statements] == [
+            "UPDATE project_analyses",
+            "INSERT INTO bim_analyses",
+            "INSERT INTO comparison_results",
+            "INSERT INTO image_analyses",
+        ]
+
+        statements.clear()
+        analysis.image_analyses[1].summary = "Fissura na laje"
+        await repository.update(analysis)
+        assert statements[1] == "UPDATE image_analyses SET summary=? WHERE image_analyses.id = ?"
+        assert len(statements) == 2
+
+    async with factory() as session:
+        stored = await SQLAlchemyProjectAnalysisRepository(session=session).get_by_id(analysis.id)
+    assert stored.status is AnalysisStatus.COMPLETED
+    assert [image.summary for image in stored.image_analyses] == ["ok", "Fissura na laje", "ok"]
+    assert stored.comparison_result.summary == "Comparação"
+    # A visão consolidada das imagens mantém o id entre leituras.
+    assert stored.image_analysis.id == analysis.image_analysis.id
+
+
+@pytest.mark.asyncio
+async def test_update_in_a_new_session_reads_the_aggregate_once(factory) -> None:
+    async with factory() as session:
+        analysis = ProjectAnalysis(
+            project_name="Obra",
+            bim_source_uri="modelo.ifc",
+            image_source_uri="foto0.jpg",
+            status=AnalysisStatus.RUNNING,
+        )
+        _completed(analysis)
+        await SQLAlchemyProjectAnalysisRepository(session=session).create(analysis)
+
+    factory.statements.clear()
+    async with factory() as session:
+        repository = SQLAlchemyProjectAnalysisRepository(session=session)
+        analysis.mark_failed("Execução abandonada")
+        await repository.update(analysis)
+        writes = [s for s in factory.statements if not s.startswith("SELECT")]
+        assert writes == [
+            "UPDATE project_analyses SET status=?, notes=?, updated_at=? "
+            "WHERE project_analyses.id = ?"
+        ]
+
+        with pytest.raises(ValueError):
+            await repository.update(ProjectAnalysis(project_name="Outra"))
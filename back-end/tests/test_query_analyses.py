@@ -0,0 +1,131 @@
+"""Testes para a listagem paginada por cursor das análises e seu modelo de leitura."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import pytest
+import pytest_asyncio
+
+from app.domain.entities import AnalysisStatus, ProjectAnalysisSummary
+from app.infrastructure.db import models
+from app.infrastructure.db.repositories.project_analysis import (
+    SQLAlchemyProjectAnalysisRepository,
+)
+from app.interfaces.http.schemas import ProjectAnalysisListResponse
+from app.use_cases import InvalidCursorError, ListAnalysesInput, ListAnalysesUseCase
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import event, text  # noqa: E402
+
+
+START = datetime(2026, 10, 1, 8, 0)
+STATUSES = [AnalysisStatus.COMPLETED, AnalysisStatus.FAILED, AnalysisStatus.PENDING]
+
+
+@pytest_asyncio.fixture
+async def session(session):
+    # Pares com o mesmo `created_at`: o desempate pelo id não pode perder linhas.
+    session.add_all(
+        models.ProjectAnalysisModel(
+            id=UUID(int=index + 1),
+            project_name=f"Obra {index % 2}",
+            requested_by="ana" if index % 3 == 0 else None,
+            bim_source_uri="modelo.ifc",
+            image_source_uri="foto.jpg",
+            status=STATUSES[index % 3],
+            created_at=START + timedelta(hours=index // 2),
+            updated_at=START,
+        )
+        for index in range(30)
+    )
+    await session.commit()
+    return session
+
+
+async def _walk(use_case: ListAnalysesUseCase, **filters) -> list[UUID]:
+    seen: list[UUID] = []
+    cursor = None
+    while True:
+        page = await use_case.execute(ListAnalysesInput(limit=4, cursor=cursor, **filters))
+        assert len(page.items) <= 4
+        seen += [item.id for item in page.items]
+        if page.next_cursor is None:
+            return seen
+        cursor = page.next_cursor.encode()
+
+
+@pytest.mark.asyncio
+async def test_pages_follow_created_at_and_id_without_gaps_or_repeats(session) -> None:
+    use_case = ListAnalysesUseCase(SQLAlchemyProjectAnalysisRepository(session=session))
+
+    ids = await _walk(use_case)
+    expected = sorted(
+        range(30), key=lambda index: (START + timedelta(hours=index // 2), index), reverse=True
+    )
+    assert ids == [UUID(int=index + 1) for index in expected]
+
+    failed = await _walk(use_case, status=AnalysisStatus.FAILED, project_name="Obra 1")
+    assert failed == [
+        UUID(int=index + 1) for index in expected if index % 3 == 1 and index % 2 == 1
+    ]
+    window = await _walk(
+        use_case,
+        requested_by="ana",
+        created_from=START + timedelta(hours=3),
+        created_to=START + timedelta(hours=9),
+    )
+    assert window == [
+        UUID(int=index + 1) for index in expected if index % 3 == 0 and 6 <= index < 18
+    ]
+
+    with pytest.raises(InvalidCursorError):
+        await use_case.execute(ListAnalysesInput(cursor="nao-e-um-cursor"))
+
+
+@pytest.mark.asyncio
+async def test_filtered_listing_reads_the_composite_index_without_sorting(session) -> None:
+    plan = await session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT id FROM project_analyses "
+            "WHERE status = 'failed' AND created_at <= :at AND (created_at < :at OR id < :id) "
+            "ORDER BY created_at DESC, id DESC LIMIT 21"
+        ),
+        {"at": START, "id": UUID(int=5).hex},
+    )
+    details = " ".join(row[-1] for row in plan.all())
+    assert "ix_project_analyses_status_created_at_id" in details
+    assert "TEMP B-TREE" not in details
+
+
+@pytest.mark.asyncio
+async def test_listing_reads_only_the_summary_columns_in_a_single_query(session) -> None:
+    session.add(
+        models.BimAnalysisModel(
+            project_id=UUID(int=30),
+            raw_output="x" * 100_000,
+            issues=[{"title": "Parede fora de prumo"}] * 50,
+            status=AnalysisStatus.COMPLETED,
+        )
+    )
+    await session.commit()
+    statements: list[str] = []
+
+    def record(connection, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(session.bind.sync_engine, "before_cursor_execute", record)
+    try:
+        page = await SQLAlchemyProjectAnalysisRepository(session=session).list_recent(limit=100)
+    finally:
+        event.remove(session.bind.sync_engine, "before_cursor_execute", record)
+
+    assert len(statements) == 1
+    assert "raw_output" not in statements[0] and "bim_analyses" not in statements[0]
+    assert len(page.items) == 30 and page.next_cursor is None
+    assert all(isinstance(item, ProjectAnalysisSummary) for item in page.items)
+    response = ProjectAnalysisListResponse.from_page(page)
+    assert response.items[0].id == UUID(int=30)
+    assert response.items[0].status is AnalysisStatus.PENDING
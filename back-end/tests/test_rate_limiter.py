@@ -0,0 +1,118 @@
+"""Testes para o limitador de taxa por modelo."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import Settings
+from app.infrastructure import OpenAIService
+from app.infrastructure.services.rate_limiter import (
+    AdaptiveConcurrency,
+    BucketRequest,
+    FileBucketStore,
+    ModelRateLimiter,
+)
+
+
+class RateLimitedError(Exception):
+    status_code = 429
+
+
+@pytest.mark.asyncio
+async def test_file_store_shares_budget_between_processes(tmp_path: Path) -> None:
+    path = tmp_path / "limits.json"
+    first = FileBucketStore(path)
+    second = FileBucketStore(path)
+    request = BucketRequest("gpt:requests", 1, capacity=2)
+
+    assert await first.take([request]) == 0
+    assert await second.take([request]) == 0
+    wait = await first.take([request])
+
+    assert 0 < wait <= 30
+
+
+@pytest.mark.asyncio
+async def test_take_is_all_or_nothing_across_buckets(tmp_path: Path) -> None:
+    store = FileBucketStore(tmp_path / "limits.json")
+    requests_bucket = BucketRequest("gpt:requests", 1, capacity=10)
+    tokens_bucket = BucketRequest("gpt:tokens", 80, capacity=100)
+
+    assert await store.take([requests_bucket, tokens_bucket]) == 0
+    assert await store.take([requests_bucket, tokens_bucket]) > 0
+    await store.refund(BucketRequest("gpt:tokens", 60, capacity=100))
+    assert await store.take([requests_bucket, tokens_bucket]) == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_is_aimd() -> None:
+    concurrency = AdaptiveConcurrency(initial=8, minimum=1, maximum=16, latency_target=1.0)
+
+    await concurrency.acquire()
+    await concurrency.release(latency=0.1, overloaded=True)
+    assert concurrency.limit == 4
+
+    await concurrency.acquire()
+    await concurrency.release(latency=0.1, overloaded=False)
+    assert concurrency.limit == pytest.approx(4.25)
+
+    await concurrency.acquire()
+    await concurrency.release(latency=5.0, overloaded=False)
+    assert concurrency.limit == pytest.approx(2.125)
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_call_pauses_model_budget() -> None:
+    settings = Settings()
+    settings.rate_limit.default_retry_after = 30
+    limiter = ModelRateLimiter(settings=settings)
+
+    with pytest.raises(RateLimitedError):
+        async with limiter.acquire("gpt", estimated_tokens=100):
+            raise RateLimitedError()
+
+    stats = limiter.stats()["gpt"]
+    assert stats["rate_limited_total"] == 1
+    assert stats["in_flight"] == 0
+    wait = await limiter._store.take([BucketRequest("gpt:requests", 1, capacity=500)])
+    assert wait > 25
+
+
+class ThrottledResponses:
+    """Responde 429 às primeiras `throttled` chamadas e depois devolve a análise."""
+
+    def __init__(self, throttled: int) -> None:
+        self.throttled = throttled
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        if self.calls <= self.throttled:
+            raise RateLimitedError()
+        text = json.dumps({"summary": "análise real", "issues": []})
+        message = SimpleNamespace(content=[SimpleNamespace(type="text", text=text)])
+        return SimpleNamespace(output=[SimpleNamespace(type="message", message=message)])
+
+
+@pytest.mark.asyncio
+async def test_sustained_throttling_waits_for_the_real_response(tmp_path: Path) -> None:
+    settings = Settings()
+    settings.rate_limit.default_retry_after = 0.01
+    settings.resilience.base_delay = 0.0
+    settings.resilience.max_attempts = 2
+    settings.resilience.breaker_failure_threshold = 2
+    responses = ThrottledResponses(throttled=6)
+    service = OpenAIService(client=SimpleNamespace(responses=responses), settings=settings)
+    photo = tmp_path / "foto.jpg"
+    photo.write_bytes(b"foto")
+
+    result = await service.analyze_image(image_source=str(photo), use_cache=False)
+
+    assert result.summary == "análise real"
+    assert responses.calls == 7
+    resilience = service._resilience.stats()[settings.openai.model_image]
+    assert resilience["circuit"] == "closed" and resilience["throttled_total"] == 6
@@ -0,0 +1,191 @@
+"""Testes para retentativas, hedging e circuit breaker."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core.config import ResilienceSettings
+from app.infrastructure.services.resilience import (
+    CircuitOpenError,
+    CircuitState,
+    ResilientCaller,
+)
+
+
+class ServerError(Exception):
+    status_code = 503
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+class RateLimitedError(Exception):
+    status_code = 429
+
+
+def _config(**overrides) -> ResilienceSettings:
+    values = {"base_delay": 0.0, "jitter": False, **overrides}
+    return ResilienceSettings(**values)
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried() -> None:
+    caller = ResilientCaller(_config(max_attempts=3))
+    attempts = 0
+
+    async def flaky() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise ServerError()
+        return "ok"
+
+    assert await caller.call("gpt", flaky) == "ok"
+    stats = caller.stats()["gpt"]
+    assert stats["retries_total"] == 2
+    assert stats["circuit"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_non_transient_errors_are_not_retried() -> None:
+    caller = ResilientCaller(_config(max_attempts=3))
+    attempts = 0
+
+    async def invalid() -> str:
+        nonlocal attempts
+        attempts += 1
+        raise BadRequestError()
+
+    with pytest.raises(BadRequestError):
+        await caller.call("gpt", invalid)
+    assert attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_calls_wait_without_tripping_the_breaker() -> None:
+    caller = ResilientCaller(_config(max_attempts=2, breaker_failure_threshold=1))
+    attempts = 0
+
+    async def throttled() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts <= 5:
+            raise RateLimitedError()
+        return "ok"
+
+    assert await caller.call("gpt", throttled) == "ok"
+    stats = caller.stats()["gpt"]
+    assert (stats["circuit"], stats["consecutive_failures"]) == ("closed", 0)
+    assert (stats["throttled_total"], stats["retries_total"]) == (5, 0)
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_fails_fast() -> None:
+    caller = ResilientCaller(
+        _config(max_attempts=1, breaker_failure_threshold=2, breaker_reset_timeout=60)
+    )
+    calls = 0
+
+    async def down() -> str:
+        nonlocal calls
+        calls += 1
+        raise ServerError()
+
+    for _ in range(2):
+        with pytest.raises(ServerError):
+            await caller.call("gpt", down)
+    with pytest.raises(CircuitOpenError):
+        await caller.call("gpt", down)
+
+    assert calls == 2
+    assert caller.stats()["gpt"]["circuit"] == CircuitState.OPEN.value
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_and_first_response_wins() -> None:
+    caller = ResilientCaller(
+        _config(hedging_enabled=True, hedge_min_samples=1, hedge_min_delay=0.01)
+    )
+
+    async def fast() -> str:
+        return "warmup"
+
+    await caller.call("gpt", fast)
+    calls = 0
+
+    async def slow_then_fast() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(1.0 if calls == 1 else 0.0)
+        return f"call-{calls}"
+
+    assert await caller.call("gpt", slow_then_fast) == "call-2"
+    stats = caller.stats()["gpt"]
+    assert (stats["hedges_total"], stats["hedge_wins"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_probe_releases_the_circuit() -> None:
+    caller = ResilientCaller(
+        _config(max_attempts=1, breaker_failure_threshold=1, breaker_reset_timeout=0.01)
+    )
+
+    async def down() -> str:
+        raise ServerError()
+
+    with pytest.raises(ServerError):
+        await caller.call("gpt", down)
+    assert caller.stats()["gpt"]["circuit"] == CircuitState.OPEN.value
+    await asyncio.sleep(0.02)
+
+    started = asyncio.Event()
+
+    async def hanging() -> str:
+        started.set()
+        await asyncio.sleep(60)
+        return "tarde"
+
+    probe = asyncio.create_task(caller.call("gpt", hanging))
+    await started.wait()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    async def healthy() -> str:
+        return "ok"
+
+    assert await caller.call("gpt", healthy) == "ok"
+    assert caller.stats()["gpt"]["circuit"] == CircuitState.CLOSED.value
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_caller_cancels_the_hedged_request() -> None:
+    caller = ResilientCaller(
+        _config(hedging_enabled=True, hedge_min_samples=1, hedge_min_delay=5.0)
+    )
+
+    async def fast() -> str:
+        return "warmup"
+
+    await caller.call("gpt", fast)
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def slow() -> str:
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "tarde"
+
+    call = asyncio.create_task(caller.call("gpt", slow))
+    await started.wait()
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
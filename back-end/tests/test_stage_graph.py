@@ -0,0 +1,75 @@
+"""Testes para o executor de etapas em DAG."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from app.use_cases import Stage, StageExecutionError, StageGraph, StageGraphError
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_run_concurrently_and_feed_dependents() -> None:
+    async def slow(value: int) -> int:
+        await asyncio.sleep(0.1)
+        return value
+
+    graph = StageGraph(
+        [
+            Stage("sum", lambda results: slow(results["a"] + results["b"]), depends_on=("a", "b")),
+            Stage("a", lambda _: slow(1)),
+            Stage("b", lambda _: slow(2)),
+        ]
+    )
+
+    started = time.perf_counter()
+    results = await graph.run()
+    elapsed = time.perf_counter() - started
+
+    assert results == {"a": 1, "b": 2, "sum": 3}
+    assert elapsed < 0.28
+    assert set(graph.timings_ms) == {"a", "b", "sum"}
+    assert all(value >= 90 for value in graph.timings_ms.values())
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_sibling_stages() -> None:
+    cancelled = asyncio.Event()
+
+    async def long_running() -> None:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def failing() -> None:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    graph = StageGraph(
+        [
+            Stage("slow", lambda _: long_running()),
+            Stage("bad", lambda _: failing()),
+            Stage("after", lambda _: asyncio.sleep(0), depends_on=("slow", "bad")),
+        ]
+    )
+
+    with pytest.raises(StageExecutionError) as exc_info:
+        await graph.run()
+
+    assert exc_info.value.stage == "bad"
+    assert cancelled.is_set()
+    assert "after" not in graph.timings_ms
+
+
+def test_invalid_graphs_are_rejected() -> None:
+    noop = lambda _: asyncio.sleep(0)  # noqa: E731
+
+    with pytest.raises(StageGraphError):
+        StageGraph([Stage("a", noop, depends_on=("missing",))])
+
+    with pytest.raises(StageGraphError):
+        StageGraph([Stage("a", noop, depends_on=("b",)), Stage("b", noop, depends_on=("a",))])
@@ -0,0 +1,79 @@
+"""Testes para a gravação dos arquivos enviados."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+
+from app.infrastructure.services.analysis_cache import file_sha256
+from app.infrastructure.services.storage import (
+    IMAGE_KINDS,
+    FileTooLargeError,
+    LocalFileStorage,
+    UnsupportedFileTypeError,
+)
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 3000
+JPEG = b"\xff\xd8\xff\xe0" + bytes(range(256)) * 20
+IFC = b"ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\nENDSEC;\nEND-ISO-10303-21;\n"
+
+
+def _upload(data: bytes, filename: str, *, declare_size: bool = True) -> UploadFile:
+    return UploadFile(
+        io.BytesIO(data), filename=filename, size=len(data) if declare_size else None
+    )
+
+
+def _files(directory: Path) -> list[Path]:
+    return sorted(path for path in directory.rglob("*") if path.is_file())
+
+
+@pytest.mark.asyncio
+async def test_saves_concurrently_with_hash_computed_during_copy(tmp_path: Path) -> None:
+    storage = LocalFileStorage(base_path=tmp_path, max_concurrency=2)
+
+    saved = await storage.save_upload_groups(
+        {
+            "bim": ([_upload(IFC, "modelo.ifc")], {"ifc"}),
+            "images": ([_upload(PNG, "a.png"), _upload(JPEG, "b.jpg")], IMAGE_KINDS),
+        }
+    )
+
+    bim, images = saved["bim"][0], saved["images"]
+    assert (bim.kind, bim.size) == ("ifc", len(IFC))
+    assert [image.kind for image in images] == ["png", "jpeg"]
+    assert images[1].sha256 == hashlib.sha256(JPEG).hexdigest()
+    assert Path(images[1].path).read_bytes() == JPEG
+    assert Path(images[1].path).name == f"{images[1].sha256}.jpeg"
+    # O mesmo conteúdo enviado de novo reaproveita o blob.
+    again = await storage.save_upload_file(_upload(JPEG, "c.jpg"), kinds=IMAGE_KINDS)
+    assert again.path == images[1].path
+    # O hash registrado na gravação é reaproveitado sem reler o arquivo.
+    assert await file_sha256(images[1].path) == images[1].sha256
+    Path(images[1].path).write_bytes(PNG)
+    assert await file_sha256(images[1].path) == hashlib.sha256(PNG).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_rejects_wrong_type_and_oversized_uploads_without_leftovers(
+    tmp_path: Path,
+) -> None:
+    storage = LocalFileStorage(base_path=tmp_path, max_file_bytes=4096, max_request_bytes=6000)
+
+    with pytest.raises(UnsupportedFileTypeError):
+        await storage.save_upload_file(_upload(b"MZ\x90\x00", "foto.jpg"), kinds=IMAGE_KINDS)
+    assert _files(tmp_path) == []
+
+    with pytest.raises(FileTooLargeError):
+        await storage.save_upload_file(_upload(JPEG * 2, "b.jpg", declare_size=False))
+    # Cada arquivo cabe no limite, mas não os três juntos.
+    with pytest.raises(FileTooLargeError):
+        await storage.save_upload_files(
+            [_upload(PNG, name, declare_size=False) for name in ("1.png", "2.png", "3.png")]
+        )
+    # Sem temporários; blobs concluídos antes da falha ficam para a coleta de lixo.
+    assert _files(tmp_path / "blobs" / "tmp") == []
@@ -0,0 +1,218 @@
+"""Testes para a contagem de referências dos blobs e a coleta de lixo do armazenamento."""
+
+from __future__ import annotations
+
+import io
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from fastapi import UploadFile
+
+from app.domain.entities import AnalysisStatus, FileBlob, ProjectAnalysis
+from app.infrastructure.db import models
+from app.infrastructure.db.repositories.analysis_job import SQLAlchemyAnalysisJobRepository
+from app.infrastructure.db.repositories.file_blob import SQLAlchemyFileBlobRepository
+from app.infrastructure.db.repositories.project_analysis import (
+    SQLAlchemyProjectAnalysisRepository,
+)
+from app.infrastructure.services.ifc_index import ensure_entity_index, sidecar_path
+from app.infrastructure.services.storage import LocalFileStorage
+from app.use_cases import (
+    AnalysisExecutionError,
+    AnalyzeProjectInput,
+    CollectStorageGarbageUseCase,
+    SubmitAnalysisUseCase,
+)
+from tests.conftest import ref_counts
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import text  # noqa: E402
+
+
+IFC = b"ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\nENDSEC;\nEND-ISO-10303-21;\n"
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 3000
+DAY = 24 * 3600
+
+
+async def _save(storage: LocalFileStorage, data: bytes, name: str):
+    return await storage.save_upload_file(UploadFile(io.BytesIO(data), filename=name))
+
+
+def _blob(stored) -> FileBlob:
+    return FileBlob(sha256=stored.sha256, size=stored.size, kind=stored.kind)
+
+
+def _age(path: Path, seconds: float) -> None:
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.mark.asyncio
+async def test_analyses_share_blobs_and_release_them_when_failing(
+    tmp_path: Path, session
+) -> None:
+    storage = LocalFileStorage(base_path=tmp_path)
+    blobs = SQLAlchemyFileBlobRepository(session=session)
+    jobs = SQLAlchemyAnalysisJobRepository(session=session)
+    use_case = SubmitAnalysisUseCase(
+        job_repository=jobs,
+        blob_repository=blobs,
+        max_attempts=1,
+    )
+
+    for _ in range(2):
+        bim, image = await _save(storage, IFC, "modelo.ifc"), await _save(storage, PNG, "a.png")
+        await use_case.execute(
+            AnalyzeProjectInput(
+                project_name="Estação Norte",
+                bim_file_path=bim.path,
+                image_file_paths=(image.path,),
+            ),
+            blobs=[_blob(bim), _blob(image), _blob(image)],
+        )
+
+    stored = [path for path in (tmp_path / "blobs").rglob("*") if path.is_file()]
+    assert sorted(path.suffix for path in stored) == [".ifc", ".png", ".sha256", ".sha256"]
+    assert await ref_counts(session) == {bim.sha256: 2, image.sha256: 4}
+
+    job = await jobs.claim_next(worker_id="w1", lease_seconds=60)
+    await jobs.mark_failed(job.id, worker_id="w1", error="falhou", retry=False)
+    assert await ref_counts(session) == {bim.sha256: 1, image.sha256: 2}
+
+
+@pytest.mark.asyncio
+async def test_collects_unreferenced_blobs_and_orphan_run_directories(
+    tmp_path: Path, session
+) -> None:
+    storage = LocalFileStorage(base_path=tmp_path)
+    blobs = SQLAlchemyFileBlobRepository(session=session)
+    referenced = await _save(storage, IFC, "modelo.ifc")
+    released = await _save(storage, PNG, "a.png")
+    unregistered = await _save(storage, PNG[:-1], "b.png")
+    recent = await _save(storage, PNG[:-2], "c.png")
+    await blobs.acquire([_blob(referenced), _blob(released)])
+    await blobs.release([released.sha256])
+    await session.execute(
+        models.FileBlobModel.__table__.update().values(
+            updated_at=models.FileBlobModel.updated_at - timedelta(days=2)
+        )
+    )
+    await session.commit()
+
+    live_run, orphan_run = tmp_path / str(uuid4()), tmp_path / str(uuid4())
+    for run in (live_run, orphan_run):
+        (run / "bim").mkdir(parents=True)
+        (run / "bim" / "modelo.ifc").write_bytes(IFC)
+    await SQLAlchemyProjectAnalysisRepository(session=session).create(
+        ProjectAnalysis(
+            project_name="Legado",
+            bim_source_uri=str((live_run / "bim" / "modelo.ifc").resolve()),
+            image_source_uri="",
+            status=AnalysisStatus.COMPLETED,
+        )
+    )
+    (tmp_path / "ifc").mkdir()
+    leftover = storage.new_temporary()
+    leftover.write_bytes(b"parcial")
+    for path in (referenced, released, unregistered):
+        _age(Path(path.path), 2 * DAY)
+    for path in (live_run, orphan_run, tmp_path / "ifc", leftover):
+        _age(path, 2 * DAY)
+
+    report = await CollectStorageGarbageUseCase(
+        storage=storage, blob_repository=blobs, grace=timedelta(days=1)
+    ).execute()
+
+    assert (report.blobs_removed, report.run_directories_removed) == (2, 1)
+    assert report.temporaries_removed == 1
+    assert report.bytes_freed == 2 * len(PNG) - 1 + len(IFC)
+    assert [Path(path.path).exists() for path in (referenced, released, unregistered, recent)] == [
+        True,
+        False,
+        False,
+        True,
+    ]
+    assert not Path(released.path + ".sha256").exists()
+    assert live_run.exists() and not orphan_run.exists() and (tmp_path / "ifc").exists()
+    assert await ref_counts(session) == {referenced.sha256: 1}
+
+
+@pytest.mark.asyncio
+async def test_index_sidecars_are_collected_with_their_blob(tmp_path: Path, session) -> None:
+    storage = LocalFileStorage(base_path=tmp_path)
+    blobs = SQLAlchemyFileBlobRepository(session=session)
+    referenced = await _save(storage, IFC, "modelo.ifc")
+    orphan = await _save(storage, IFC + b"\n", "antigo.ifc")
+    await blobs.acquire([_blob(referenced)])
+    for stored in (referenced, orphan):
+        ensure_entity_index(stored.path, digest=stored.sha256)
+        _age(Path(stored.path), 2 * DAY)
+        _age(sidecar_path(stored.path), 2 * DAY)
+
+    assert sorted(path for _, path in storage.iter_blobs(time.time())) == sorted(
+        Path(stored.path) for stored in (referenced, orphan)
+    )
+    await session.execute(
+        models.FileBlobModel.__table__.update().values(
+            updated_at=models.FileBlobModel.updated_at - timedelta(days=2)
+        )
+    )
+    await session.commit()
+
+    report = await CollectStorageGarbageUseCase(
+        storage=storage, blob_repository=blobs, grace=timedelta(days=1)
+    ).execute()
+
+    assert report.blobs_removed == 1
+    assert Path(referenced.path).exists() and sidecar_path(referenced.path).exists()
+    assert not Path(orphan.path).exists() and not sidecar_path(orphan.path).exists()
+    assert await ref_counts(session) == {referenced.sha256: 1}
+
+
+@pytest.mark.asyncio
+async def test_blob_renewed_during_collection_is_kept(tmp_path: Path) -> None:
+    storage = LocalFileStorage(base_path=tmp_path)
+    stored = await _save(storage, PNG, "a.png")
+    _age(Path(stored.path), 2 * DAY)
+    rename = Path.rename
+
+    def renew_then_rename(self, target):
+        # Um envio do mesmo conteúdo renova o blob logo antes da coleta movê-lo.
+        os.utime(self)
+        return rename(self, target)
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(Path, "rename", renew_then_rename)
+        assert storage.remove_blob(Path(stored.path), time.time() - DAY) == 0
+
+    assert Path(stored.path).read_bytes() == PNG
+    assert not list((tmp_path / "blobs" / "tmp").glob("*.gc"))
+
+
+@pytest.mark.asyncio
+async def test_failed_enqueue_releases_the_blobs(tmp_path: Path, session) -> None:
+    storage = LocalFileStorage(base_path=tmp_path)
+    bim, image = await _save(storage, IFC, "modelo.ifc"), await _save(storage, PNG, "a.png")
+    await session.execute(text("DROP TABLE analysis_jobs"))
+    await session.commit()
+    use_case = SubmitAnalysisUseCase(
+        job_repository=SQLAlchemyAnalysisJobRepository(session=session),
+        blob_repository=SQLAlchemyFileBlobRepository(session=session),
+    )
+
+    with pytest.raises(AnalysisExecutionError):
+        await use_case.execute(
+            AnalyzeProjectInput(
+                project_name="Estação Norte",
+                bim_file_path=bim.path,
+                image_file_paths=(image.path,),
+            ),
+            blobs=[_blob(bim), _blob(image)],
+        )
+
+    assert await ref_counts(session) == {bim.sha256: 0, image.sha256: 0}
@@ -0,0 +1,127 @@
+"""Testes para o enfileiramento e a retomada de análises pelo worker."""
+
+from __future__ import annotations
+
+from typing import Sequence
+from uuid import UUID
+
+import pytest
+
+from app.domain.entities import AnalysisJob, AnalysisStatus, JobQueue, ProjectAnalysis
+from app.domain.repositories import AnalysisJobRepository, ProjectAnalysisRepository
+from app.use_cases import AnalyzeProjectInput, AnalyzeProjectUseCase, SubmitAnalysisUseCase
+from tests.test_analyze_project_use_case import FakeOpenAIService, InMemoryRepository
+
+
+class InMemoryJobRepository(AnalysisJobRepository):
+    def __init__(self, analyses: ProjectAnalysisRepository | None = None) -> None:
+        self.jobs: list[AnalysisJob] = []
+        self._analyses = analyses
+
+    async def enqueue(
+        self, job: AnalysisJob, *, analysis: ProjectAnalysis | None = None
+    ) -> AnalysisJob:
+        if analysis is not None:
+            await self._analyses.create(analysis)
+        self.jobs.append(job)
+        return job
+
+    async def claim_next(
+        self,
+        *,
+        worker_id: str,
+        lease_seconds: int,
+        queue: JobQueue = JobQueue.INTERACTIVE,
+    ) -> AnalysisJob | None:
+        claimed = await self.claim_many(
+            worker_id=worker_id, lease_seconds=lease_seconds, limit=1, queue=queue
+        )
+        return claimed[0] if claimed else None
+
+    async def claim_many(
+        self,
+        *,
+        worker_id: str,
+        lease_seconds: int,
+        limit: int,
+        queue: JobQueue = JobQueue.BATCH,
+    ) -> Sequence[AnalysisJob]:
+        claimed = [job for job in self.jobs if job.queue is queue][:limit]
+        for job in claimed:
+            self.jobs.remove(job)
+        return claimed
+
+    async def renew_lease(self, job_id: UUID, *, worker_id: str, lease_seconds: int) -> bool:
+        return True
+
+    async def mark_completed(self, job_id: UUID, *, worker_id: str) -> None:
+        return None
+
+    async def mark_failed(
+        self, job_id: UUID, *, worker_id: str, error: str, retry: bool
+    ) -> None:
+        return None
+
+    async def release(self, job_id: UUID, *, worker_id: str) -> None:
+        return None
+
+    async def fail_exhausted(self) -> Sequence[UUID]:
+        return []
+
+
+def _payload() -> AnalyzeProjectInput:
+    return AnalyzeProjectInput(
+        project_name="Reforma Estação",
+        bim_file_path="/tmp/file.ifc",
+        image_file_paths=("/tmp/photo.jpg", "/tmp/photo2.jpg"),
+        context="Linha 2",
+    )
+
+
+@pytest.mark.asyncio
+async def test_submit_creates_pending_analysis_and_job() -> None:
+    repo = InMemoryRepository()
+    jobs = InMemoryJobRepository(analyses=repo)
+    use_case = SubmitAnalysisUseCase(job_repository=jobs, max_attempts=5)
+
+    result = await use_case.execute(_payload())
+
+    assert result.status is AnalysisStatus.PENDING
+    assert len(jobs.jobs) == 1
+    job = jobs.jobs[0]
+    assert job.analysis_id == result.id
+    assert job.max_attempts == 5
+    assert job.payload["image_file_paths"] == ["/tmp/photo.jpg", "/tmp/photo2.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_worker_payload_resumes_pending_analysis() -> None:
+    repo = InMemoryRepository()
+    jobs = InMemoryJobRepository(analyses=repo)
+    submitted = await SubmitAnalysisUseCase(job_repository=jobs).execute(
+        _payload()
+    )
+
+    job = await jobs.claim_next(worker_id="w1", lease_seconds=60)
+    assert job is not None
+    use_case = AnalyzeProjectUseCase(repository=repo, ai_service=FakeOpenAIService())
+    result = await use_case.execute(
+        AnalyzeProjectInput.from_job_payload(job.analysis_id, job.payload)
+    )
+
+    assert result.id == submitted.id
+    assert result.status is AnalysisStatus.COMPLETED
+    assert len(repo._items) == 1  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_batch_submissions_are_not_claimed_by_interactive_worker() -> None:
+    repo = InMemoryRepository()
+    jobs = InMemoryJobRepository(analyses=repo)
+    await SubmitAnalysisUseCase(job_repository=jobs).execute(
+        _payload(), queue=JobQueue.BATCH
+    )
+
+    assert await jobs.claim_next(worker_id="w1", lease_seconds=60) is None
+    claimed = await jobs.claim_many(worker_id="b1", lease_seconds=60, limit=10)
+    assert [job.queue for job in claimed] == [JobQueue.BATCH]
@@ -0,0 +1,100 @@
+"""Testes para a recepção de formulários multipart em streaming."""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from app.infrastructure.services.storage import (
+    FileTooLargeError,
+    LocalFileStorage,
+    UnsupportedFileTypeError,
+)
+from app.infrastructure.services.upload_stream import feed_stream, receive_multipart
+
+
+BOUNDARY = "----limite"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+MODEL = b"ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\n" + b"#1=IFCWALL($);\n" * 2000
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 40
+
+
+def _body(*parts: tuple[str, str | None, bytes]) -> bytes:
+    body = bytearray()
+    for name, filename, data in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        body += f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n\r\n".encode()
+        body += data + b"\r\n"
+    body += f"--{BOUNDARY}--\r\n".encode()
+    return bytes(body)
+
+
+async def _chunks(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+@pytest.mark.asyncio
+async def test_receive_multipart_writes_content_addressed_blobs(tmp_path: Path) -> None:
+    storage = LocalFileStorage(base_path=tmp_path)
+    body = _body(
+        ("project_name", None, "Edifício Aurora".encode()),
+        ("bim_file", "modelo.ifc", MODEL),
+        ("image_files", "a.png", PNG),
+        ("image_files", "b.png", PNG),
+    )
+
+    form = await receive_multipart(
+        storage,
+        _chunks(body, 997),
+        CONTENT_TYPE,
+        files={"bim_file": {"ifc"}, "image_files": {"png"}},
+    )
+
+    assert form.fields == {"project_name": "Edifício Aurora"}
+    (bim,) = form.files["bim_file"]
+    digest = hashlib.sha256(MODEL).hexdigest()
+    assert (bim.sha256, bim.size, bim.kind) == (digest, len(MODEL), "ifc")
+    assert Path(bim.path) == (tmp_path / "blobs" / digest[:2] / f"{digest}.ifc").resolve()
+    assert Path(bim.path).read_bytes() == MODEL
+    # Conteúdo repetido aponta para o mesmo blob.
+    first, second = form.files["image_files"]
+    assert first.path == second.path and Path(first.path).read_bytes() == PNG
+    assert list((tmp_path / "blobs" / "tmp").iterdir()) == []
+
+    written: list[bytes] = []
+
+    async def write(buffer: bytearray) -> None:
+        written.append(bytes(buffer))
+
+    await feed_stream(_chunks(body, 333), write, buffer_size=1000)
+    assert b"".join(written) == body
+    assert [len(block) for block in written[:-1]] == [1000] * (len(written) - 1)
+
+
+@pytest.mark.asyncio
+async def test_receive_multipart_rejects_wrong_type_and_oversized_files(
+    tmp_path: Path,
+) -> None:
+    storage = LocalFileStorage(base_path=tmp_path, max_file_bytes=len(MODEL) - 1)
+
+    with pytest.raises(UnsupportedFileTypeError):
+        await receive_multipart(
+            storage,
+            _chunks(_body(("file", "foto.ifc", PNG)), 512),
+            CONTENT_TYPE,
+            files={"file": {"ifc"}},
+        )
+    with pytest.raises(FileTooLargeError):
+        await receive_multipart(
+            storage,
+            _chunks(_body(("file", "modelo.ifc", MODEL)), 4096),
+            CONTENT_TYPE,
+            files={"file": {"ifc"}},
+        )
+
+    assert [path for path in (tmp_path / "blobs").rglob("*") if path.is_file()] == []
@@ -0,0 +1,149 @@
+"""Testes para os envios retomáveis em partes."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from app.infrastructure.db import models
+from app.infrastructure.db.repositories.file_blob import SQLAlchemyFileBlobRepository
+from app.infrastructure.db.repositories.upload_session import SQLAlchemyUploadSessionRepository
+from app.infrastructure.services.resumable_upload import ChunkChecksumError, staging_path
+from app.infrastructure.services.storage import BIM_KINDS, LocalFileStorage
+from app.use_cases import (
+    AppendUploadChunkInput,
+    AppendUploadChunkUseCase,
+    CollectStorageGarbageUseCase,
+    CreateUploadInput,
+    CreateUploadUseCase,
+    FinalizeUploadUseCase,
+    GetCompletedUploadUseCase,
+    UploadIncompleteError,
+    UploadOffsetMismatchError,
+)
+from tests.conftest import ref_counts
+
+pytest.importorskip("aiosqlite")
+
+
+IFC = b"ISO-10303-21;\nHEADER;\nENDSEC;\nDATA;\n" + b"#1=IFCWALL($);\n" * 4000 + b"ENDSEC;\n"
+TTL = timedelta(hours=1)
+
+
+class FailingCommitStorage(LocalFileStorage):
+    def commit_blob(self, *args, **kwargs):
+        raise OSError("disco cheio")
+
+
+async def _stream(data: bytes, size: int = 1000):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def _chunk(upload_id, offset: int, data: bytes, *, sha256: str | None = None):
+    return AppendUploadChunkInput(
+        upload_id=upload_id,
+        offset=offset,
+        sha256=sha256 or hashlib.sha256(data).hexdigest(),
+        stream=_stream(data),
+    )
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_verified_resumed_by_offset_and_finalized_into_a_blob(
+    tmp_path: Path, session
+) -> None:
+    storage = LocalFileStorage(base_path=tmp_path)
+    uploads = SQLAlchemyUploadSessionRepository(session=session)
+    blobs = SQLAlchemyFileBlobRepository(session=session)
+    append = AppendUploadChunkUseCase(uploads, storage, ttl=TTL, max_chunk_bytes=32 * 1024)
+    digest = hashlib.sha256(IFC).hexdigest()
+    upload = await CreateUploadUseCase(uploads, ttl=TTL).execute(
+        CreateUploadInput(size=len(IFC), filename="modelo.ifc", checksum=digest)
+    )
+    half = len(IFC) // 2
+
+    upload = await append.execute(_chunk(upload.id, 0, IFC[:half]))
+    assert upload.offset == half
+
+    # Parte corrompida em trânsito: o arquivo volta ao offset confirmado.
+    with pytest.raises(ChunkChecksumError):
+        await append.execute(_chunk(upload.id, half, IFC[half:], sha256="0" * 64))
+    assert staging_path(storage, upload.id).stat().st_size == half
+    with pytest.raises(UploadOffsetMismatchError) as mismatch:
+        await append.execute(_chunk(upload.id, 0, IFC[:half]))
+    assert mismatch.value.offset == half
+    with pytest.raises(UploadIncompleteError):
+        await GetCompletedUploadUseCase(uploads).execute(upload.id)
+
+    await append.execute(_chunk(upload.id, half, IFC[half:]))
+    finalize = FinalizeUploadUseCase(uploads, blobs, storage, kinds=BIM_KINDS)
+    completed = await finalize.execute(upload.id)
+    assert (completed.sha256, completed.kind) == (digest, "ifc")
+    assert Path(completed.source_uri).read_bytes() == IFC
+    assert not staging_path(storage, upload.id).exists()
+    assert (await finalize.execute(upload.id)).source_uri == completed.source_uri
+    assert await ref_counts(session) == {digest: 1}
+
+    resolved = await GetCompletedUploadUseCase(uploads).execute(upload.id, kinds=BIM_KINDS)
+    assert resolved.source_uri == completed.source_uri
+
+
+@pytest.mark.asyncio
+async def test_failed_finalize_releases_the_blob_reference(tmp_path: Path, session) -> None:
+    storage = FailingCommitStorage(base_path=tmp_path, compress_kinds=BIM_KINDS)
+    uploads = SQLAlchemyUploadSessionRepository(session=session)
+    blobs = SQLAlchemyFileBlobRepository(session=session)
+    upload = await CreateUploadUseCase(uploads, ttl=TTL).execute(CreateUploadInput(size=len(IFC)))
+    await AppendUploadChunkUseCase(uploads, storage, ttl=TTL, max_chunk_bytes=len(IFC)).execute(
+        _chunk(upload.id, 0, IFC)
+    )
+
+    with pytest.raises(OSError):
+        await FinalizeUploadUseCase(uploads, blobs, storage).execute(upload.id)
+
+    assert await ref_counts(session) == {hashlib.sha256(IFC).hexdigest(): 0}
+    assert staging_path(storage, upload.id).exists()
+    assert list((storage.blob_root / "tmp").glob("*.part")) == []
+
+
+@pytest.mark.asyncio
+async def test_expired_uploads_are_collected_with_their_staging_files_and_blobs(
+    tmp_path: Path, session
+) -> None:
+    storage = LocalFileStorage(base_path=tmp_path)
+    uploads = SQLAlchemyUploadSessionRepository(session=session)
+    blobs = SQLAlchemyFileBlobRepository(session=session)
+    append = AppendUploadChunkUseCase(uploads, storage, ttl=TTL, max_chunk_bytes=len(IFC))
+    create = CreateUploadUseCase(uploads, ttl=TTL)
+
+    partial = await create.execute(CreateUploadInput(size=len(IFC)))
+    await append.execute(_chunk(partial.id, 0, IFC[:1000]))
+    finished = await create.execute(CreateUploadInput(size=len(IFC)))
+    await append.execute(_chunk(finished.id, 0, IFC))
+    finished = await FinalizeUploadUseCase(uploads, blobs, storage).execute(finished.id)
+    alive = await create.execute(CreateUploadInput(size=10))
+    await session.execute(
+        models.UploadSessionModel.__table__.update()
+        .where(models.UploadSessionModel.id != alive.id)
+        .values(expires_at=datetime.now(timezone.utc) - timedelta(hours=1))
+    )
+    await session.commit()
+
+    report = await CollectStorageGarbageUseCase(
+        storage=storage,
+        blob_repository=blobs,
+        grace=timedelta(days=1),
+        upload_repository=uploads,
+    ).execute()
+
+    assert report.upload_sessions_expired == 2
+    assert not staging_path(storage, partial.id).exists()
+    assert await uploads.get_by_id(partial.id) is None
+    assert await uploads.get_by_id(alive.id) is not None
+    # O blob fica no disco até a carência; só a referência do envio é liberada.
+    assert await ref_counts(session) == {finished.sha256: 0}
+    assert Path(finished.source_uri).exists()
@@ -0,0 +1,124 @@
+"""Testes para o enfileiramento transacional e o lease dos jobs no worker."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core.config import WorkerSettings, get_settings
+from app.domain.entities import AnalysisStatus, JobStatus
+from app.infrastructure.db import models
+from app.infrastructure.db.repositories.analysis_job import SQLAlchemyAnalysisJobRepository
+from app.use_cases import AnalysisExecutionError, AnalyzeProjectInput, SubmitAnalysisUseCase
+from app.worker import AnalysisWorker
+from tests.test_analyze_project_use_case import FakeOpenAIService
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import func, select, text, update  # noqa: E402
+
+
+class HangingOpenAIService(FakeOpenAIService):
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = asyncio.Event()
+        self.cancelled = False
+
+    async def analyze_bim(self, **kwargs):
+        self.started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return await super().analyze_bim(**kwargs)
+
+
+def _payload() -> AnalyzeProjectInput:
+    return AnalyzeProjectInput(
+        project_name="Estação Norte",
+        bim_file_path="/tmp/modelo.ifc",
+        image_file_paths=("/tmp/foto.jpg",),
+    )
+
+
+async def _count(factory, model) -> int:
+    async with factory() as session:
+        return await session.scalar(select(func.count()).select_from(model))
+
+
+@pytest.mark.asyncio
+async def test_analysis_is_not_left_pending_without_its_job(session_factory) -> None:
+    async with session_factory() as session:
+        await session.execute(text("DROP TABLE analysis_jobs"))
+        await session.commit()
+        use_case = SubmitAnalysisUseCase(
+            job_repository=SQLAlchemyAnalysisJobRepository(session=session)
+        )
+        with pytest.raises(AnalysisExecutionError):
+            await use_case.execute(_payload())
+
+    assert await _count(session_factory, models.ProjectAnalysisModel) == 0
+
+
+@pytest.mark.asyncio
+async def test_lost_lease_stops_the_analysis_without_touching_the_job(session_factory) -> None:
+    async with session_factory() as session:
+        jobs = SQLAlchemyAnalysisJobRepository(session=session)
+        await SubmitAnalysisUseCase(job_repository=jobs).execute(_payload())
+        job = await jobs.claim_next(worker_id="w1", lease_seconds=60)
+
+    settings = get_settings().model_copy(
+        update={"worker": WorkerSettings(worker_id="w1", heartbeat_interval=0.01)}
+    )
+    ai_service = HangingOpenAIService()
+    worker = AnalysisWorker(
+        settings=settings,
+        session_factory=session_factory,
+        ai_service_factory=lambda: ai_service,
+    )
+    processing = asyncio.create_task(worker._process(job, ai_service))
+    await ai_service.started.wait()
+    # Lease expirado e reservado por outro worker.
+    async with session_factory() as session:
+        await session.execute(
+            update(models.AnalysisJobModel).values(locked_by="w2", attempts=2)
+        )
+        await session.commit()
+
+    await asyncio.wait_for(processing, timeout=2)
+
+    assert ai_service.cancelled
+    async with session_factory() as session:
+        stored = await session.get(models.AnalysisJobModel, job.id)
+        analysis = await session.get(models.ProjectAnalysisModel, job.analysis_id)
+    assert (stored.status, stored.locked_by, stored.attempts) == (JobStatus.RUNNING, "w2", 2)
+    assert analysis.status is AnalysisStatus.RUNNING
+
+
+@pytest.mark.asyncio
+async def test_analysis_is_only_failed_after_the_last_attempt(session_factory) -> None:
+    async with session_factory() as session:
+        jobs = SQLAlchemyAnalysisJobRepository(session=session)
+        await SubmitAnalysisUseCase(job_repository=jobs, max_attempts=2).execute(_payload())
+
+    ai_service = FakeOpenAIService(fail=True)
+    worker = AnalysisWorker(
+        settings=get_settings(),
+        session_factory=session_factory,
+        ai_service_factory=lambda: ai_service,
+    )
+    statuses = []
+    for _ in range(2):
+        job = await worker._claim()
+        await worker._process(job, ai_service)
+        async with session_factory() as session:
+            stored = await session.get(models.AnalysisJobModel, job.id)
+            analysis = await session.get(models.ProjectAnalysisModel, job.analysis_id)
+        statuses.append((stored.status, analysis.status))
+
+    assert statuses == [
+        (JobStatus.QUEUED, AnalysisStatus.PENDING),
+        (JobStatus.FAILED, AnalysisStatus.FAILED),
+    ]